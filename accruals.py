@@ -0,0 +1,100 @@
+"""
+accruals.py
+
+Closed-form accrual streams for per-tick payments and charges.
+
+A stream is described by a rate, a start tick and an (optional) end tick.
+Instead of loading rows and writing balances every tick, callers keep the
+tick the stream was last settled at and settle lazily: when the balance is
+touched for another reason, on a coarse settlement interval, or when the
+stream ends. The amounts match per-tick processing exactly for linear
+streams, and for compounding streams whenever the base balance is settled
+before it changes.
+"""
+
+from typing import Optional, Tuple
+
+
+class Accrual:
+    """
+    Stateless helpers for accrual streams.
+
+    All tick arguments are absolute game ticks (see game_clock.py). A stream
+    covers the ticks in (start_tick, end_tick]; settled_tick is the last tick
+    already paid out (defaults to start_tick).
+    """
+
+    @staticmethod
+    def ticks_due(start_tick: int, end_tick: Optional[int],
+                  settled_tick: Optional[int], now_tick: int) -> int:
+        """
+        Number of unsettled ticks as of now_tick.
+
+        Example:
+            - start=100, end=200, settled=150, now=170 -> 20
+            - start=100, end=200, settled=150, now=250 -> 50 (capped at end)
+        """
+        upto = now_tick if end_tick is None else min(now_tick, end_tick)
+        since = start_tick if settled_tick is None else max(start_tick, settled_tick)
+        return max(0, upto - since)
+
+    @staticmethod
+    def linear_due(rate: float, start_tick: int, end_tick: Optional[int],
+                   settled_tick: Optional[int], now_tick: int) -> Tuple[float, int]:
+        """
+        Amount owed by a fixed per-tick stream since it was last settled.
+
+        Returns:
+            (amount, new_settled_tick)
+        """
+        ticks = Accrual.ticks_due(start_tick, end_tick, settled_tick, now_tick)
+        since = start_tick if settled_tick is None else max(start_tick, settled_tick)
+        return rate * ticks, since + ticks
+
+    @staticmethod
+    def compound_decay(balance: float, rate: float, ticks: int) -> Tuple[float, float]:
+        """
+        Apply a per-tick proportional charge for several ticks at once.
+
+        Equivalent to running `balance -= balance * rate` `ticks` times.
+        Non-positive balances are left untouched (matching per-tick code that
+        skips empty balances).
+
+        Returns:
+            (new_balance, total_charged)
+        """
+        if ticks <= 0 or balance <= 0 or rate <= 0:
+            return balance, 0.0
+        new_balance = balance * (1.0 - rate) ** ticks
+        return new_balance, balance - new_balance
+
+    @staticmethod
+    def compound_growth(balance: float, rate: float, periods: int) -> Tuple[float, float]:
+        """
+        Apply per-period compound interest for several periods at once.
+
+        Equivalent to running `balance += balance * rate` `periods` times.
+        Non-positive balances do not accrue.
+
+        Returns:
+            (new_balance, total_interest)
+        """
+        if periods <= 0 or balance <= 0 or rate <= 0:
+            return balance, 0.0
+        new_balance = balance * (1.0 + rate) ** periods
+        return new_balance, new_balance - balance
+
+    @staticmethod
+    def ticks_remaining(end_tick: Optional[int], now_tick: int) -> int:
+        """Ticks left before the stream ends (0 once it has ended)."""
+        if end_tick is None:
+            return 0
+        return max(0, end_tick - now_tick)
+
+
+# ==========================
+# PUBLIC API
+# ==========================
+__all__ = [
+    'Accrual'
+]
@@ -1,9 +1,14 @@
 import asyncio
+import os
 from datetime import datetime
 from typing import Optional
 from fastapi import FastAPI, Cookie
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+import game_clock
+import deadlines
+import scheduler
+import cluster
 
 # ==========================
 # GLOBAL TICK STATE
@@ -39,22 +44,75 @@ def load_modules():
 # TICK LOOP
 # ==========================
 
+async def tick_modules(tick: int, now: datetime, phase=None):
+    """
+    Run every module's tick handler once.
+    phase(name), if given, returns a context manager wrapped around each
+    handler (simulate.py uses it for per-module timing and SQL counts).
+    """
+    for name, module in modules.items():
+        if hasattr(module, 'tick'):
+            try:
+                if phase is None:
+                    await module.tick(tick, now)
+                else:
+                    with phase(name):
+                        await module.tick(tick, now)
+            except Exception as e:
+                print(f"[Tick {tick}] ERROR in {name}: {e}")
+
+
 async def tick_loop():
-    """Global tick loop executing every second."""
+    """
+    Global tick loop executing every TICK_INTERVAL seconds.
+
+    Module ticks (matching, settlement) always run; scheduled jobs get what is
+    left of the tick budget. The sleep is whatever remains until the next tick
+    is due, so overruns are absorbed instead of accumulating as drift.
+    """
     global current_tick
+    pacer = scheduler.start_pacer(TICK_INTERVAL)
     while True:
+        pacer.start_tick()
         current_tick += 1
+        game_clock.set_current(current_tick)
+        cluster.publish_tick(current_tick)
         now = datetime.utcnow()
-        for name, module in modules.items():
-            if hasattr(module, 'tick'):
-                try:
-                    await module.tick(current_tick, now)
-                except Exception as e:
-                    print(f"[Tick {current_tick}] ERROR in {name}: {e}")
-        
+        await tick_modules(current_tick, now)
+
         if current_tick % 60 == 0:
             print(f"[Tick {current_tick}] {now.isoformat()}")
-        await asyncio.sleep(TICK_INTERVAL)
+        if current_tick % game_clock.SAVE_INTERVAL == 0:
+            try:
+                game_clock.save_tick(current_tick)
+            except Exception as e:
+                print(f"[Tick {current_tick}] ERROR saving clock: {e}")
+        # Periodic maintenance, phase-staggered and limited to the remaining budget
+        await scheduler.run_due(current_tick, budget_ms=pacer.remaining_ms())
+        await asyncio.sleep(pacer.finish_tick())
+
+async def start_ticking():
+    """
+    Run the tick loop in this process (it now holds the tick leader lock).
+    On failover the clock resumes from whichever is later: the last
+    checkpoint or the last tick announced by the previous leader.
+    """
+    global tick_task, current_tick
+    current_tick = max(game_clock.load_tick(), game_clock.current())
+    game_clock.set_current(current_tick)
+    if cluster.stats["failovers"]:
+        # Deadline updates were forwarded to the old leader, not applied here
+        deadlines.resync_all()
+    tick_task = asyncio.create_task(tick_loop())
+    print(f"Tick loop started at tick {current_tick} (interval: {TICK_INTERVAL}s)")
+
+
+async def follow_tick(tick: int):
+    """Follower side of a leader tick: advance the clock and refresh local caches."""
+    global current_tick
+    current_tick = tick
+    game_clock.set_current(tick)
+    await scheduler.run_local(tick)
 
 # ==========================
 # MODULE INITIALIZATION
@@ -80,15 +138,23 @@ def initialize_modules():
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global tick_start_time, tick_task
+    global tick_start_time, tick_task, current_tick
     print("=" * 50)
     print("Starting Real-Time Economic Simulation")
     print("=" * 50)
     tick_start_time = datetime.utcnow()
+    current_tick = game_clock.load_tick()
+    game_clock.set_current(current_tick)
+    print(f"Resuming at tick {current_tick}")
     load_modules()
-    initialize_modules()
-    tick_task = asyncio.create_task(tick_loop())
-    print(f"Tick loop started (interval: {TICK_INTERVAL}s)")
+    with cluster.init_lock():
+        initialize_modules()
+    scheduler.every("deadlines.resync", deadlines.RESYNC_INTERVAL, deadlines.resync_all, cost=50.0)
+    scheduler.every("scheduler.log_metrics", 3600, scheduler.log_metrics, priority=scheduler.DEFERRABLE)
+    scheduler.jobs.rebalance()
+    cluster.on_tick(follow_tick)
+    await cluster.start(start_ticking)
+    print(f"Role: {cluster.ROLE} ({'tick leader' if cluster.is_leader else 'follower'})")
     print("=" * 50)
     yield
     print("\nShutting down...")
@@ -98,8 +164,25 @@ async def lifespan(app: FastAPI):
             await tick_task
         except asyncio.CancelledError:
             pass
+    if cluster.is_leader:
+        game_clock.save_tick(current_tick)
+    try:
+        import rolling_stats
+        rolling_stats.flush_series()
+    except Exception as e:
+        print(f"ERROR flushing rolling stats: {e}")
+    await cluster.stop()
     print("Shutdown complete.")
 
+
+async def run_simulation():
+    """Tick-only process for the "sim" role; web workers run with --role web."""
+    async with lifespan(app):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            pass
+
 # ==========================
 # FASTAPI APP
 # ==========================
@@ -119,16 +202,19 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 # Update within app.py @app.get("/api/status")
 @app.get("/api/status")
 async def get_status(session_token: Optional[str] = Cookie(None)):
-    from auth import get_player_from_session, get_db
-    from business import Business # Add this import
+    from auth import get_session_player
+    from business import Business, SessionLocal as BusinessSession # Add this import
     
-    db = get_db()
-    player = get_player_from_session(db, session_token)
+    player = get_session_player(session_token)
     
     # Fetch active business progress for this player
     biz_list = []
     if player:
-        user_biz = db.query(Business).filter(Business.owner_id == player.id).all()
+        db = BusinessSession()
+        try:
+            user_biz = db.query(Business).filter(Business.owner_id == player.id).all()
+        finally:
+            db.close()
         # Fetch cycles_to_complete from your BUSINESS_TYPES config
         from business import BUSINESS_TYPES
         for b in user_biz:
@@ -146,7 +232,6 @@ async def get_status(session_token: Optional[str] = Cookie(None)):
         "businesses": biz_list, # Now the progress bars can move!
         "modules": {name: True for name in modules.keys()}
     }
-    db.close()
     return status_data
 
 @app.get("/api/tick")
@@ -156,6 +241,16 @@ async def get_tick():
         "timestamp": datetime.utcnow().isoformat()
     }
 
+@app.get("/api/scheduler")
+async def get_scheduler_stats():
+    """Periodic job phases, runtimes and the per-tick job time histogram."""
+    return scheduler.get_stats()
+
+@app.get("/api/cluster")
+async def get_cluster_stats():
+    """This process's role, leadership and IPC counters."""
+    return cluster.get_stats()
+
 # ==========================
 # ROUTING
 # ==========================
@@ -245,5 +340,25 @@ except ModuleNotFoundError:
     pass
 
 if __name__ == "__main__":
+    import argparse
     import uvicorn
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
+
+    parser = argparse.ArgumentParser(description="Wadsworth Economic Simulation")
+    parser.add_argument("--role", choices=cluster.ROLES, default=cluster.ROLE,
+                        help="all: web + tick (default); sim: tick only; web: HTTP/websockets only")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes (all/web roles)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    # Worker processes re-import app, so the role travels in the environment
+    os.environ["WADSWORTH_ROLE"] = cluster.ROLE = args.role
+    if args.role == "sim":
+        try:
+            asyncio.run(run_simulation())
+        except KeyboardInterrupt:
+            pass
+    elif args.workers > 1:
+        uvicorn.run("app:app", host=args.host, port=args.port, workers=args.workers)
+    else:
+        uvicorn.run("app:app", host=args.host, port=args.port, reload=True)
@@ -5,26 +5,30 @@ Authentication module for the economic simulation.
 Handles:
 - Player login
 - Player registration
-- Session management
-- Password hashing
+- Session management (bounded in-memory session and player caches)
+- Password hashing (scrypt via passwords.py, legacy hashes upgraded on login)
 - Database models for players
-- Cash transfers between players
+- Cash ledger: atomic, guarded SQL cash adjustments and transfers
 """
 
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 import secrets
-import hashlib
+import threading
 from fastapi import APIRouter, Form, Cookie, Response
 from fastapi.responses import HTMLResponse, RedirectResponse
-from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer
+from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer, event, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker, Session, object_session
+from sqlalchemy.orm import Session as OrmSession
+import passwords
+import cluster
 
 # ==========================
 # DATABASE SETUP
 # ==========================
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 
 engine = create_engine(
     DATABASE_URL,
@@ -61,18 +65,83 @@ class Session(Base):
 # ==========================
 # SESSION STORAGE
 # ==========================
-active_sessions = {}
 SESSION_DURATION = timedelta(days=7)
+SESSION_CACHE_SIZE = 10000                  # cached tokens (least recently used evicted first)
+SESSION_CACHE_TTL = timedelta(minutes=5)    # revalidate a cached token against the sessions table
+PLAYER_CACHE_SIZE = 10000                   # cached player snapshots
+
+
+class LRUCache:
+    """Small thread-safe LRU map (request handlers run on the threadpool)."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._data.get(key, default)
+            if key in self._data:
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def evict_where(self, predicate) -> int:
+        """Drop every entry whose (key, value) matches predicate."""
+        with self._lock:
+            stale = [key for key, value in self._data.items() if predicate(key, value)]
+            for key in stale:
+                del self._data[key]
+        return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+class PlayerSnapshot:
+    """
+    Detached, read-only copy of a Player row for request handlers.
+    Carries the columns pages read; version changes whenever the row is written.
+    """
+    __slots__ = ("id", "business_name", "cash_balance", "created_at", "last_login", "version")
+
+    def __init__(self, player: "Player", version: int):
+        self.id = player.id
+        self.business_name = player.business_name
+        self.cash_balance = player.cash_balance
+        self.created_at = player.created_at
+        self.last_login = player.last_login
+        self.version = version
+
+
+# token -> (player_id, expires_at, checked_at)
+active_sessions = LRUCache(SESSION_CACHE_SIZE)
+# player_id -> PlayerSnapshot
+player_snapshots = LRUCache(PLAYER_CACHE_SIZE)
+# player_id -> write counter (bumped by the Player mapper events below)
+_player_versions = {}
 
 # ==========================
 # HELPER FUNCTIONS
 # ==========================
-def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
-
-def verify_password(password: str, password_hash: str) -> bool:
-    return hash_password(password) == password_hash
-
 def create_session_token() -> str:
     return secrets.token_urlsafe(32)
 
@@ -86,8 +155,102 @@ def get_db():
         raise
 
 # ==========================
-# CASH TRANSFER
+# CASH LEDGER
 # ==========================
+# Cash is adjusted with single UPDATE statements instead of loading the
+# Player row and writing back a new balance, so concurrent writers from
+# other modules' sessions can't overwrite each other, and no SELECT is needed.
+_CASH_UPDATE = text(
+    "UPDATE players SET cash_balance = cash_balance + :delta WHERE id = :player_id"
+)
+_CASH_UPDATE_GUARDED = text(
+    "UPDATE players SET cash_balance = cash_balance + :delta "
+    "WHERE id = :player_id AND cash_balance >= :min_balance"
+)
+
+
+def adjust_cash_many(entries) -> list:
+    """
+    Apply (player_id, delta, min_balance) adjustments in one transaction.
+
+    min_balance=None applies the delta unconditionally; otherwise the row is
+    only updated if its balance is at least min_balance beforehand (use
+    min_balance=amount for a debit that must not overdraw).
+
+    Returns:
+        List of bools, one per entry: True if the row was updated
+    """
+    entries = list(entries)
+    if not entries:
+        return []
+    
+    results = []
+    with engine.begin() as conn:
+        for player_id, delta, min_balance in entries:
+            if min_balance is None:
+                result = conn.execute(_CASH_UPDATE, {"delta": delta, "player_id": player_id})
+            else:
+                result = conn.execute(_CASH_UPDATE_GUARDED, {
+                    "delta": delta, "player_id": player_id, "min_balance": min_balance
+                })
+            results.append(result.rowcount == 1)
+    
+    for player_id in {entry[0] for entry, ok in zip(entries, results) if ok}:
+        invalidate_player(player_id)
+    return results
+
+
+def adjust_cash(player_id: int, delta: float, min_balance: Optional[float] = None) -> bool:
+    """Atomically add delta to a player's cash (see adjust_cash_many)."""
+    return adjust_cash_many([(player_id, delta, min_balance)])[0]
+
+
+class CashLedger:
+    """
+    Collects cash adjustments during a tick and applies them in one batch.
+    
+    Usage:
+        ledger = CashLedger()
+        ledger.debit(player_id, wage)
+        ...
+        db.commit()          # commit the module's own state first
+        results = ledger.commit()
+    """
+
+    def __init__(self):
+        self.entries = []
+        self._pending = {}
+
+    def add(self, player_id: int, delta: float, min_balance: Optional[float] = None) -> int:
+        """Queue an adjustment; returns its index in the commit() results."""
+        self.entries.append((player_id, delta, min_balance))
+        self._pending[player_id] = self._pending.get(player_id, 0.0) + delta
+        return len(self.entries) - 1
+
+    def credit(self, player_id: int, amount: float) -> int:
+        return self.add(player_id, amount)
+
+    def debit(self, player_id: int, amount: float, allow_overdraft: bool = False) -> int:
+        """Queue a debit; by default it fails (per row) instead of overdrawing."""
+        return self.add(player_id, -amount, None if allow_overdraft else amount)
+
+    def pending(self, player_id: int) -> float:
+        """Net queued delta for a player (for balance checks before commit)."""
+        return self._pending.get(player_id, 0.0)
+
+    def commit(self) -> list:
+        """Apply every queued adjustment; returns per-entry success."""
+        entries, self.entries, self._pending = self.entries, [], {}
+        return adjust_cash_many(entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class _TransferAborted(Exception):
+    pass
+
+
 def transfer_cash(from_player_id: int, to_player_id: int, amount: float) -> bool:
     """
     Safely transfer cash between two players.
@@ -99,25 +262,26 @@ def transfer_cash(from_player_id: int, to_player_id: int, amount: float) -> bool
     if amount <= 0:
         return False
     
-    db = get_db()
-    
-    sender = db.query(Player).filter(Player.id == from_player_id).first()
-    receiver = db.query(Player).filter(Player.id == to_player_id).first()
-    
-    if not sender or not receiver:
-        db.close()
-        return False
-    
-    if sender.cash_balance < amount:
-        print(f"[Auth] Transfer failed: Player {from_player_id} has insufficient funds")
-        db.close()
+    try:
+        with engine.begin() as conn:
+            debited = conn.execute(_CASH_UPDATE_GUARDED, {
+                "delta": -amount, "player_id": from_player_id, "min_balance": amount
+            }).rowcount == 1
+            if not debited:
+                raise _TransferAborted(f"Player {from_player_id} has insufficient funds")
+            
+            credited = conn.execute(_CASH_UPDATE, {
+                "delta": amount, "player_id": to_player_id
+            }).rowcount == 1
+            if not credited:
+                # Leaving the block with an exception rolls the debit back too
+                raise _TransferAborted(f"Player {to_player_id} not found")
+    except _TransferAborted as e:
+        print(f"[Auth] Transfer failed: {e}")
         return False
     
-    sender.cash_balance -= amount
-    receiver.cash_balance += amount
-    
-    db.commit()
-    db.close()
+    invalidate_player(from_player_id)
+    invalidate_player(to_player_id)
     
     print(f"[Auth] Transferred ${amount:.2f} from Player {from_player_id} to Player {to_player_id}")
     return True
@@ -125,15 +289,17 @@ def transfer_cash(from_player_id: int, to_player_id: int, amount: float) -> bool
 # ==========================
 # AUTHENTICATION LOGIC
 # ==========================
-def create_player(db: Session, business_name: str, password: str) -> Optional[Player]:
+async def create_player(db: Session, business_name: str, password: str) -> Optional[Player]:
     """Create a new player account."""
     existing = db.query(Player).filter(Player.business_name == business_name).first()
     if existing:
         return None
     
+    password_hash = await passwords.hash_password(password)
+    
     player = Player(
         business_name=business_name,
-        password_hash=hash_password(password),
+        password_hash=password_hash,
         cash_balance=50000.0
     )
     
@@ -168,16 +334,21 @@ def create_player(db: Session, business_name: str, password: str) -> Optional[Pl
     
     return player
 
-def authenticate_player(db: Session, business_name: str, password: str) -> Optional[Player]:
-    """Authenticate a player."""
+async def authenticate_player(db: Session, business_name: str, password: str) -> Optional[Player]:
+    """Authenticate a player, upgrading outdated password hashes on success."""
     player = db.query(Player).filter(Player.business_name == business_name).first()
     
     if not player:
         return None
     
-    if not verify_password(password, player.password_hash):
+    matches, rehash = await passwords.verify_password(password, player.password_hash)
+    if not matches:
         return None
     
+    if rehash:
+        player.password_hash = await passwords.hash_password(password)
+        print(f"[Auth] Upgraded password hash for player {player.id}")
+    
     player.last_login = datetime.utcnow()
     db.commit()
     
@@ -196,38 +367,140 @@ def create_session(db: Session, player_id: int) -> str:
     db.add(session)
     db.commit()
     
-    active_sessions[token] = player_id
+    active_sessions.put(token, (player_id, expires_at, datetime.utcnow()))
     
     return token
 
-def get_player_from_session(db: Session, session_token: Optional[str]) -> Optional[Player]:
-    """Get player from session token."""
+@cluster.replicated(coalesce=True)
+def revoke_session(session_token: str):
+    """Drop a deleted session from the token cache, here and in every other process."""
+    active_sessions.pop(session_token, None)
+
+def get_session_player_id(session_token: Optional[str], db: Optional[Session] = None) -> Optional[int]:
+    """
+    Resolve a session token to a player id.
+    Served from the token cache; the sessions table is read only for unknown
+    tokens or once SESSION_CACHE_TTL has passed since the last check.
+    """
     if not session_token:
         return None
     
-    # Check memory cache first
-    if session_token in active_sessions:
-        player_id = active_sessions[session_token]
+    now = datetime.utcnow()
+    cached = active_sessions.get(session_token)
+    if cached:
+        player_id, expires_at, checked_at = cached
+        if expires_at < now:
+            active_sessions.pop(session_token, None)
+        elif now - checked_at < SESSION_CACHE_TTL:
+            return player_id
+    
+    own_db = db is None
+    if own_db:
+        db = get_db()
+    try:
+        session = db.query(Session).filter(Session.session_token == session_token).first()
+        
+        if not session:
+            active_sessions.pop(session_token, None)
+            return None
+        
+        # Check if expired
+        if session.expires_at < now:
+            active_sessions.pop(session_token, None)
+            db.delete(session)
+            db.commit()
+            return None
+        
+        # Load into cache
+        active_sessions.put(session_token, (session.player_id, session.expires_at, now))
+        return session.player_id
+    finally:
+        if own_db:
+            db.close()
+
+def get_player_snapshot(player_id: int) -> Optional[PlayerSnapshot]:
+    """Cached PlayerSnapshot for a player id (reloaded after the row is written)."""
+    snapshot = player_snapshots.get(player_id)
+    if snapshot is not None:
+        return snapshot
+    
+    version = _player_versions.get(player_id, 0)
+    db = get_db()
+    try:
         player = db.query(Player).filter(Player.id == player_id).first()
-        return player
-    
-    # Check database
-    session = db.query(Session).filter(Session.session_token == session_token).first()
+        if not player:
+            return None
+        snapshot = PlayerSnapshot(player, version)
+    finally:
+        db.close()
     
-    if not session:
+    # Don't cache a row that was written while we were reading it
+    if _player_versions.get(player_id, 0) == version:
+        player_snapshots.put(player_id, snapshot)
+    return snapshot
+
+def get_session_player(session_token: Optional[str]) -> Optional[PlayerSnapshot]:
+    """
+    Player snapshot for a session token.
+    Shared by page auth helpers, /api/status and the chat WebSocket handshake;
+    a warm token costs two dict lookups and no database session.
+    """
+    player_id = get_session_player_id(session_token)
+    if player_id is None:
         return None
-    
-    # Check if expired
-    if session.expires_at < datetime.utcnow():
-        db.delete(session)
-        db.commit()
+    return get_player_snapshot(player_id)
+
+def get_player_from_session(db: Session, session_token: Optional[str]) -> Optional[Player]:
+    """Get player from session token (as a Player row attached to db)."""
+    player_id = get_session_player_id(session_token, db)
+    if player_id is None:
         return None
-    
-    # Load into cache
-    active_sessions[session_token] = session.player_id
-    
-    player = db.query(Player).filter(Player.id == session.player_id).first()
-    return player
+    return db.query(Player).filter(Player.id == player_id).first()
+
+# Callbacks run with the player id whenever a Player row (e.g. its cash) changes
+_change_listeners = []
+
+@cluster.replicated(coalesce=True)
+def invalidate_player(player_id: int):
+    """Drop a player's cached snapshot after its row changed."""
+    _player_versions[player_id] = _player_versions.get(player_id, 0) + 1
+    player_snapshots.pop(player_id, None)
+    for callback in _change_listeners:
+        try:
+            callback(player_id)
+        except Exception as e:
+            print(f"[Auth] Player change listener failed: {e}")
+
+def on_player_change(callback):
+    """Register a callback(player_id) for Player row changes. Must be cheap."""
+    if callback not in _change_listeners:
+        _change_listeners.append(callback)
+
+# ==========================
+# CACHE INVALIDATION
+# ==========================
+# Every ORM write to a Player row (from any module's session) invalidates the
+# snapshot at flush time and again once the transaction commits or rolls back,
+# so a reader can't re-cache the pre-commit value in between.
+_WRITTEN_KEY = "auth_players_written"
+
+@event.listens_for(Player, "after_update")
+@event.listens_for(Player, "after_delete")
+def _on_player_write(mapper, connection, target):
+    if target.id is None:
+        return
+    invalidate_player(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_WRITTEN_KEY, set()).add(target.id)
+
+@event.listens_for(OrmSession, "after_commit")
+@event.listens_for(OrmSession, "after_soft_rollback")
+def _on_transaction_end(session, *args):
+    written = session.info.pop(_WRITTEN_KEY, None)
+    if written:
+        for player_id in written:
+            invalidate_player(player_id)
 
 # ==========================
 # ROUTER
@@ -451,7 +724,14 @@ async def login(
     """Handle login form submission."""
     db = get_db()
     
-    player = authenticate_player(db, business_name, password)
+    try:
+        player = await authenticate_player(db, business_name, password)
+    except passwords.PasswordBusy:
+        db.close()
+        return RedirectResponse(
+            url="/login?error=Server%20busy,%20please%20try%20again",
+            status_code=303
+        )
     
     if not player:
         db.close()
@@ -497,7 +777,14 @@ async def register(
             status_code=303
         )
     
-    player = create_player(db, business_name, password)
+    try:
+        player = await create_player(db, business_name, password)
+    except passwords.PasswordBusy:
+        db.close()
+        return RedirectResponse(
+            url="/login?error=Server%20busy,%20please%20try%20again",
+            status_code=303
+        )
     
     if not player:
         db.close()
@@ -525,12 +812,12 @@ async def logout(session_token: Optional[str] = Cookie(None)):
     db = get_db()
     
     if session_token:
-        active_sessions.pop(session_token, None)
-        
         session = db.query(Session).filter(Session.session_token == session_token).first()
         if session:
             db.delete(session)
             db.commit()
+        # After the delete, so no worker can re-cache the token from the table
+        revoke_session(session_token)
     
     db.close()
     
@@ -546,29 +833,45 @@ def initialize():
     """Initialize auth module."""
     print("[Auth] Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    passwords.initialize()
+    import scheduler
+    scheduler.every("auth.session_cleanup", 300, cleanup_expired_sessions, cost=5.0)
     print("[Auth] Module initialized")
 
-async def tick(current_tick: int, now):
-    """Clean up expired sessions every 5 minutes."""
-    if current_tick % 300 == 0:
-        db = get_db()
-        expired = db.query(Session).filter(Session.expires_at < now).all()
-        
-        for session in expired:
-            active_sessions.pop(session.session_token, None)
-            db.delete(session)
-        
-        if expired:
-            db.commit()
-            print(f"[Auth] Cleaned {len(expired)} expired sessions")
-        
-        db.close()
+def cleanup_expired_sessions(now: Optional[datetime] = None):
+    """Clean up expired sessions (scheduled every 5 minutes)."""
+    now = now or datetime.utcnow()
+    db = get_db()
+    expired = db.query(Session).filter(Session.expires_at < now).all()
+    
+    for session in expired:
+        active_sessions.pop(session.session_token, None)
+        db.delete(session)
+    
+    if expired:
+        db.commit()
+        print(f"[Auth] Cleaned {len(expired)} expired sessions")
+    
+    # Drop cached tokens that expired without being looked up again
+    active_sessions.evict_where(lambda token, entry: entry[1] < now)
+    
+    db.close()
 
 # ==========================
 # PUBLIC API
 # ==========================
 __all__ = [
     'get_player_from_session',
+    'get_session_player',
+    'adjust_cash',
+    'adjust_cash_many',
+    'CashLedger',
+    'get_session_player_id',
+    'revoke_session',
+    'get_player_snapshot',
+    'invalidate_player',
+    'on_player_change',
+    'PlayerSnapshot',
     'transfer_cash',
     'get_db',
     'Player',
@@ -21,7 +21,7 @@ from sqlalchemy.orm import sessionmaker
 # ==========================
 # DATABASE SETUP
 # ==========================
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 
 engine = create_engine(
     DATABASE_URL,
@@ -35,6 +35,7 @@ Base = declarative_base()
 # CONSTANTS
 # ==========================
 RESERVE_TAX_RATE = 0.0000000001  # 0.00000001% per tick (~3.15% annual on cash reserves)
+RESERVE_TAX_SETTLE_INTERVAL = 60  # Fallback settlement for banks whose reserves sit idle
 BANKS_DIRECTORY = "./banks"
 
 # ==========================
@@ -68,6 +69,9 @@ class BankEntity(Base):
     lifetime_revenue = Column(Float, default=0.0)
     lifetime_expenses = Column(Float, default=0.0)
     
+    # Reserve tax is a compounding accrual settled lazily (see accruals.py)
+    tax_settled_tick = Column(Integer, nullable=True)
+    
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow)
     is_active = Column(Boolean, default=True)
@@ -145,6 +149,24 @@ def get_bank_entity(bank_id: str) -> Optional[BankEntity]:
         db.close()
 
 
+def bank_job(bank_id: str, fn, min_reserves: Optional[float] = None):
+    """
+    Wrap a bank's periodic job for the scheduler.
+    
+    The returned callable loads a fresh bank entity and calls fn(entity),
+    skipping the run when the bank has no entity or (with min_reserves) its
+    reserves are below the threshold - the same guards the bank tick applies.
+    """
+    def run():
+        entity = get_bank_entity(bank_id)
+        if not entity:
+            return
+        if min_reserves is not None and entity.cash_reserves < min_reserves:
+            return
+        return fn(entity)
+    return run
+
+
 def update_bank_cache():
     """Refresh the in-memory cache of bank entities."""
     global BANK_CACHE
@@ -256,6 +278,7 @@ def add_bank_revenue(bank_id: str, amount: float, description: str):
         if not bank:
             return
         
+        settle_reserve_tax(bank)
         bank.cash_reserves += amount
         bank.accumulated_profits += amount
         bank.lifetime_revenue += amount
@@ -284,7 +307,11 @@ def add_bank_expense(bank_id: str, amount: float, description: str) -> bool:
     try:
         bank = db.query(BankEntity).filter(BankEntity.bank_id == bank_id).first()
         
-        if not bank or bank.cash_reserves < amount:
+        if not bank:
+            return False
+        
+        settle_reserve_tax(bank)
+        if bank.cash_reserves < amount:
             return False
         
         bank.cash_reserves -= amount
@@ -326,21 +353,47 @@ def update_bank_assets(bank_id: str, new_asset_value: float):
         db.close()
 
 
+def settle_reserve_tax(bank: BankEntity, current_tick: int = None) -> float:
+    """
+    Charge the reserve tax accrued since the bank was last settled.
+    Compounding per-tick decay is applied in closed form, so settling
+    before every reserve change gives the same result as taxing each tick.
+    Returns the tax charged.
+    """
+    from accruals import Accrual
+    import game_clock
+
+    if current_tick is None:
+        current_tick = game_clock.current()
+    
+    since = bank.tax_settled_tick if bank.tax_settled_tick is not None else current_tick
+    bank.tax_settled_tick = max(since, current_tick)
+    
+    new_reserves, tax_amount = Accrual.compound_decay(
+        bank.cash_reserves, RESERVE_TAX_RATE, current_tick - since
+    )
+    if tax_amount > 0:
+        bank.cash_reserves = new_reserves
+        bank.lifetime_expenses += tax_amount
+    return tax_amount
+
+
 def apply_reserve_tax(bank_id: str, current_tick: int):
     """
     Apply per-tick tax on cash reserves (operational costs).
     This creates natural decay and prevents infinite accumulation.
+    
+    Tax accrues every tick but is only written when reserves change
+    (revenue, expense, share price update) or from this periodic pass.
     """
     db = get_db()
     try:
         bank = db.query(BankEntity).filter(BankEntity.bank_id == bank_id).first()
         
-        if not bank or bank.cash_reserves <= 0:
+        if not bank:
             return
         
-        tax_amount = bank.cash_reserves * RESERVE_TAX_RATE
-        bank.cash_reserves -= tax_amount
-        bank.lifetime_expenses += tax_amount
+        tax_amount = settle_reserve_tax(bank, current_tick)
         
         # Log every hour
         if current_tick % 3600 == 0:
@@ -376,6 +429,8 @@ def update_share_price(bank_id: str):
         if not bank or bank.total_shares_issued == 0:
             return
         
+        # Row is written anyway; fold in any pending reserve tax first
+        settle_reserve_tax(bank)
         nav = bank.cash_reserves + bank.asset_value
         bank.share_price = nav / bank.total_shares_issued
         
@@ -397,6 +452,9 @@ def initialize():
     print("[Banks] Creating database tables...")
     Base.metadata.create_all(bind=engine)
     
+    from db_schema import ensure_columns
+    ensure_columns(engine, "bank_entities", {"tax_settled_tick": "INTEGER"})
+    
     # Load bank modules
     load_bank_modules()
     
@@ -410,6 +468,11 @@ def initialize():
     # Update cache
     update_bank_cache()
     
+    import scheduler
+    scheduler.every("banks.update_cache", 60, update_bank_cache, cost=2.0, local=True)
+    scheduler.every("banks.log_stats", 3600, log_banking_stats, cost=5.0,
+                    priority=scheduler.DEFERRABLE)
+    
     print(f"[Banks] System initialized with {len(BANK_MODULES)} active bank(s)")
 
 
@@ -422,15 +485,14 @@ async def tick(current_tick: int, now: datetime):
     - Share price updates
     - Coordinated tick for all bank modules
     """
-    # Update cache every 60 ticks (1 minute)
-    if current_tick % 60 == 0:
-        update_bank_cache()
+    # Cache refresh and hourly stats run as staggered jobs (see initialize)
     
     # Process each registered bank
     for bank_id, module in BANK_MODULES.items():
         try:
-            # Apply reserve tax
-            apply_reserve_tax(bank_id, current_tick)
+            # Settle reserve tax for banks with no other reserve activity
+            if current_tick % RESERVE_TAX_SETTLE_INTERVAL == 0:
+                apply_reserve_tax(bank_id, current_tick)
             
             # Get fresh bank entity
             bank_entity = get_bank_entity(bank_id)
@@ -447,9 +509,12 @@ async def tick(current_tick: int, now: datetime):
         except Exception as e:
             print(f"[Banks] ERROR in {bank_id} tick: {e}")
     
-    # Log system stats every hour
-    if current_tick % 3600 == 0:
-        log_banking_stats()
+    # Accrue and garnish liens for every creditor in one pass
+    try:
+        import liens as lien_registry
+        lien_registry.process_garnishment(current_tick)
+    except Exception as e:
+        print(f"[Banks] ERROR processing liens: {e}")
 
 
 def log_banking_stats():
@@ -476,6 +541,7 @@ def log_banking_stats():
 __all__ = [
     'get_bank_entity',
     'register_bank_entity',
+    'bank_job',
     'add_bank_revenue',
     'add_bank_expense',
     'update_bank_assets',
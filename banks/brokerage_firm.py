@@ -39,6 +39,8 @@ from typing import Optional, List, Dict, Any
 from enum import Enum
 import math
 
+import deadlines
+import liens as lien_registry
 from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer, Boolean, JSON, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
@@ -46,7 +48,7 @@ from sqlalchemy.orm import sessionmaker
 # ==========================
 # DATABASE SETUP
 # ==========================
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -484,6 +486,7 @@ class BrokerageLien(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     last_interest_accrual = Column(DateTime, default=datetime.utcnow)
     last_payment = Column(DateTime, nullable=True)
+    interest_tick = Column(Integer, nullable=True)  # Tick interest was last settled to (liens.py)
     
     @property
     def total_owed(self):
@@ -708,10 +711,13 @@ def modify_credit_score(player_id: int, event: str) -> int:
         rating.last_updated = datetime.utcnow()
         
         db.commit()
-        
-        return rating.credit_score
+        score = rating.credit_score
     finally:
         db.close()
+    
+    # Lien interest follows the credit tier; refresh the registry's cached rate
+    lien_registry.reprice_player(BANK_ID, player_id)
+    return score
 
 
 def get_credit_interest_rate(player_id: int) -> float:
@@ -724,6 +730,24 @@ def get_credit_interest_rate(player_id: int) -> float:
     return 0.20
 
 
+def get_credit_interest_rates(player_ids) -> Dict[int, float]:
+    """get_credit_interest_rate() for many players in one query."""
+    player_ids = list(player_ids)
+    db = get_db()
+    try:
+        scores = dict(db.query(PlayerCreditRating.player_id, PlayerCreditRating.credit_score).filter(
+            PlayerCreditRating.player_id.in_(player_ids)
+        ).all())
+    finally:
+        db.close()
+    
+    rates = {}
+    for player_id in player_ids:
+        tier = get_credit_tier(scores.get(player_id, DEFAULT_CREDIT_RATING))
+        rates[player_id] = CREDIT_TIERS[tier][2] if tier in CREDIT_TIERS else 0.20
+    return rates
+
+
 def get_max_leverage_for_player(player_id: int) -> float:
     rating = get_player_credit(player_id)
     tier = get_credit_tier(rating.credit_score)
@@ -748,8 +772,63 @@ def get_short_borrow_rate(player_id: int) -> float:
 # PRICE & VOLATILITY
 # ==========================
 
+STOCK_VOLATILITY_DAYS = 30
+COMMODITY_VOLATILITY_DAYS = 7
+DEFAULT_VOLATILITY = 0.15
+
+
+def _volatility_key(company_shares_id: int = None, item_type: str = None) -> str:
+    if company_shares_id is not None:
+        return f"stock:{company_shares_id}"
+    return f"commodity:{item_type}"
+
+
+def _volatility_series(company_shares_id: int = None, item_type: str = None):
+    """In-memory return-volatility estimator for a stock or commodity."""
+    import rolling_stats
+    days = STOCK_VOLATILITY_DAYS if company_shares_id is not None else COMMODITY_VOLATILITY_DAYS
+    return rolling_stats.get_series(
+        _volatility_key(company_shares_id, item_type),
+        horizon_seconds=days * 86400
+    )
+
+
+def warm_volatility_series():
+    """
+    Rebuild volatility windows from recent PriceHistory on startup, then
+    restore the longer-memory EWMA state that was persisted alongside them.
+    """
+    import rolling_stats
+    db = get_db()
+    try:
+        cutoff = datetime.utcnow() - timedelta(days=max(STOCK_VOLATILITY_DAYS, COMMODITY_VOLATILITY_DAYS))
+        prices = db.query(PriceHistory).filter(
+            PriceHistory.recorded_at >= cutoff
+        ).order_by(PriceHistory.recorded_at.asc()).all()
+        
+        for record in prices:
+            _volatility_series(record.company_shares_id, record.item_type).push_price(
+                record.price, record.recorded_at
+            )
+        
+        persisted = db.query(rolling_stats.RollingStatRecord).filter(
+            rolling_stats.RollingStatRecord.key.like("stock:%") |
+            rolling_stats.RollingStatRecord.key.like("commodity:%")
+        ).all()
+        for record in persisted:
+            stats = rolling_stats.series.get(record.key)
+            if stats is not None and record.ewma is not None:
+                stats.ewma = record.ewma
+                stats.ewm_var = record.ewm_var or 0.0
+        
+        return len(prices)
+    finally:
+        db.close()
+
+
 def record_price(company_shares_id: int = None, item_type: str = None, 
                  price: float = 0.0, volume: float = 0.0):
+    import rolling_stats
     db = get_db()
     try:
         record = PriceHistory(
@@ -762,20 +841,26 @@ def record_price(company_shares_id: int = None, item_type: str = None,
         db.commit()
     finally:
         db.close()
+    
+    # Estimator state is written in batches by the volatility_flush job; the
+    # window itself is rebuilt from PriceHistory on startup.
+    _volatility_series(company_shares_id, item_type).push_price(price)
+    rolling_stats.mark_dirty(_volatility_key(company_shares_id, item_type))
 
 
-def calculate_stock_volatility(company_shares_id: int, days: int = 30) -> float:
+def _scan_volatility(price_filter, days: int) -> float:
+    """Full recompute from PriceHistory, for non-standard lookback windows."""
     db = get_db()
     try:
         cutoff = datetime.utcnow() - timedelta(days=days)
         
         prices = db.query(PriceHistory).filter(
-            PriceHistory.company_shares_id == company_shares_id,
+            price_filter,
             PriceHistory.recorded_at >= cutoff
         ).order_by(PriceHistory.recorded_at.asc()).all()
         
         if len(prices) < 2:
-            return 0.15
+            return DEFAULT_VOLATILITY
         
         returns = []
         for i in range(1, len(prices)):
@@ -784,7 +869,7 @@ def calculate_stock_volatility(company_shares_id: int, days: int = 30) -> float:
                 returns.append(daily_return)
         
         if not returns:
-            return 0.15
+            return DEFAULT_VOLATILITY
         
         mean_return = sum(returns) / len(returns)
         variance = sum((r - mean_return) ** 2 for r in returns) / len(returns)
@@ -793,33 +878,26 @@ def calculate_stock_volatility(company_shares_id: int, days: int = 30) -> float:
         db.close()
 
 
-def calculate_commodity_volatility(item_type: str, days: int = 7) -> float:
-    db = get_db()
-    try:
-        cutoff = datetime.utcnow() - timedelta(days=days)
-        
-        prices = db.query(PriceHistory).filter(
-            PriceHistory.item_type == item_type,
-            PriceHistory.recorded_at >= cutoff
-        ).order_by(PriceHistory.recorded_at.asc()).all()
-        
-        if len(prices) < 2:
-            return 0.15
-        
-        returns = []
-        for i in range(1, len(prices)):
-            if prices[i-1].price > 0:
-                daily_return = (prices[i].price - prices[i-1].price) / prices[i-1].price
-                returns.append(daily_return)
-        
-        if not returns:
-            return 0.15
-        
-        mean_return = sum(returns) / len(returns)
-        variance = sum((r - mean_return) ** 2 for r in returns) / len(returns)
-        return math.sqrt(variance)
-    finally:
-        db.close()
+def calculate_stock_volatility(company_shares_id: int, days: int = STOCK_VOLATILITY_DAYS) -> float:
+    if days != STOCK_VOLATILITY_DAYS:
+        return _scan_volatility(PriceHistory.company_shares_id == company_shares_id, days)
+    
+    stats = _volatility_series(company_shares_id=company_shares_id)
+    stats.expire()
+    if stats.count == 0:
+        return DEFAULT_VOLATILITY
+    return stats.stddev
+
+
+def calculate_commodity_volatility(item_type: str, days: int = COMMODITY_VOLATILITY_DAYS) -> float:
+    if days != COMMODITY_VOLATILITY_DAYS:
+        return _scan_volatility(PriceHistory.item_type == item_type, days)
+    
+    stats = _volatility_series(item_type=item_type)
+    stats.expire()
+    if stats.count == 0:
+        return DEFAULT_VOLATILITY
+    return stats.stddev
 
 
 # ==========================
@@ -2138,6 +2216,7 @@ def borrow_commodity(borrower_id: int, listing_id: int, quantity: float) -> Opti
         db.add(loan)
         db.commit()
         db.refresh(loan)
+        deadlines.schedule("commodity_loans", loan.id, loan.due_date)
         
         return loan
     
@@ -2262,6 +2341,7 @@ def extend_commodity_loan(loan_id: int) -> bool:
         loan.fees_to_firm += fee_to_firm
         
         db.commit()
+        deadlines.schedule("commodity_loans", loan.id, new_due)
         
         return True
     
@@ -2293,44 +2373,62 @@ def calculate_commodity_due_date(item_type: str, borrower_id: int) -> datetime:
     return datetime.utcnow() + timedelta(hours=base_hours)
 
 
-def check_commodity_loan_due_dates():
+def _load_commodity_loan_deadlines():
     db = get_db()
     try:
-        overdue = db.query(CommodityLoan).filter(
-            CommodityLoan.status == CommodityLoanStatus.ACTIVE.value,
-            CommodityLoan.due_date < datetime.utcnow()
+        rows = db.query(CommodityLoan.id, CommodityLoan.due_date).filter(
+            CommodityLoan.status == CommodityLoanStatus.ACTIVE.value
         ).all()
+        return [(loan_id, due_date) for loan_id, due_date in rows]
+    finally:
+        db.close()
+
+
+def check_commodity_loan_due_dates():
+    now = datetime.utcnow()
+    with deadlines.claim_due("commodity_loans", now) as due_ids:
+        if not due_ids:
+            return
         
-        for loan in overdue:
-            loan.status = CommodityLoanStatus.LATE.value
-            loan.days_late += 1
-            
-            late_fee = loan.collateral_locked * LATE_FEE_DAILY_RATE
-            fee_to_lender = late_fee * (1 - COMMODITY_LENDING_FEE_SPLIT)
-            fee_to_firm = late_fee * COMMODITY_LENDING_FEE_SPLIT
+        db = get_db()
+        try:
+            overdue = db.query(CommodityLoan).filter(
+                CommodityLoan.id.in_(due_ids.keys),
+                CommodityLoan.status == CommodityLoanStatus.ACTIVE.value,
+                CommodityLoan.due_date <= now
+            ).all()
             
-            if loan.collateral_locked >= late_fee:
-                loan.collateral_locked -= late_fee
-                loan.late_fees_paid += late_fee
+            for loan in overdue:
+                loan.status = CommodityLoanStatus.LATE.value
+                loan.days_late += 1
                 
-                from auth import Player, get_db as get_auth_db
-                auth_db = get_auth_db()
-                try:
-                    lender = auth_db.query(Player).filter(Player.id == loan.lender_player_id).first()
-                    if lender:
-                        lender.cash_balance += fee_to_lender
-                        auth_db.commit()
-                finally:
-                    auth_db.close()
+                late_fee = loan.collateral_locked * LATE_FEE_DAILY_RATE
+                fee_to_lender = late_fee * (1 - COMMODITY_LENDING_FEE_SPLIT)
+                fee_to_firm = late_fee * COMMODITY_LENDING_FEE_SPLIT
+                
+                if loan.collateral_locked >= late_fee:
+                    loan.collateral_locked -= late_fee
+                    loan.late_fees_paid += late_fee
+                    
+                    from auth import Player, get_db as get_auth_db
+                    auth_db = get_auth_db()
+                    try:
+                        lender = auth_db.query(Player).filter(Player.id == loan.lender_player_id).first()
+                        if lender:
+                            lender.cash_balance += fee_to_lender
+                            auth_db.commit()
+                    finally:
+                        auth_db.close()
+                    
+                    firm_add_cash(fee_to_firm, "late_fee", f"Late: {loan.item_type}", loan.borrower_player_id)
                 
-                firm_add_cash(fee_to_firm, "late_fee", f"Late: {loan.item_type}", loan.borrower_player_id)
+                if loan.days_late >= MAX_LATE_DAYS_BEFORE_FORCE_CLOSE:
+                    force_close_commodity_loan(loan.id)
             
-            if loan.days_late >= MAX_LATE_DAYS_BEFORE_FORCE_CLOSE:
-                force_close_commodity_loan(loan.id)
-        
-        db.commit()
-    finally:
-        db.close()
+            db.commit()
+            due_ids.done_all()
+        finally:
+            db.close()
 
 
 def force_close_commodity_loan(loan_id: int):
@@ -2394,53 +2492,37 @@ def create_lien(player_id: int, amount: float, source: str):
         ).first()
         
         if lien:
+            lien_registry.settle_row(BANK_ID, lien)
             lien.principal += amount
         else:
             lien = BrokerageLien(player_id=player_id, principal=amount, source=source)
+            lien_registry.settle_row(BANK_ID, lien)
             db.add(lien)
         
         db.commit()
+        lien_registry.refresh_player(player_id)
         modify_credit_score(player_id, "lien_created")
     finally:
         db.close()
 
 
-def process_liens():
-    db = get_db()
-    try:
-        liens = db.query(BrokerageLien).all()
-        
-        for lien in liens:
-            if lien.total_owed <= 0:
-                continue
-            
-            interest_rate = get_credit_interest_rate(lien.player_id) / 525600
-            lien.interest_accrued += lien.total_owed * interest_rate
-            lien.last_interest_accrual = datetime.utcnow()
-            
-            from auth import Player, get_db as get_auth_db
-            auth_db = get_auth_db()
-            try:
-                player = auth_db.query(Player).filter(Player.id == lien.player_id).first()
-                if player and player.cash_balance > 0:
-                    garnish = min(player.cash_balance * 0.5, lien.total_owed)
-                    
-                    if garnish >= 0.01:
-                        player.cash_balance -= garnish
-                        lien.total_paid += garnish
-                        lien.last_payment = datetime.utcnow()
-                        auth_db.commit()
-                        
-                        firm_add_cash(garnish, "lien_payment", f"Garnishment", lien.player_id)
-                        
-                        if lien.total_owed <= 0:
-                            modify_credit_score(lien.player_id, "lien_paid_off")
-            finally:
-                auth_db.close()
-        
-        db.commit()
-    finally:
-        db.close()
+LIEN_INTEREST_MINUTES_PER_YEAR = 525600
+
+
+def _lien_interest_rates(player_ids) -> Dict[int, float]:
+    """Per-tick lien interest from each borrower's annual credit rate."""
+    return {
+        player_id: rate / LIEN_INTEREST_MINUTES_PER_YEAR
+        for player_id, rate in get_credit_interest_rates(player_ids).items()
+    }
+
+
+def _on_liens_collected(payments: dict, cleared: list):
+    """Garnishment callback from liens.process_garnishment()."""
+    for player_id, amount in payments.items():
+        firm_add_cash(amount, "lien_payment", f"Garnishment", player_id)
+    for player_id in cleared:
+        modify_credit_score(player_id, "lien_paid_off")
 
 
 # ==========================
@@ -2600,17 +2682,40 @@ def initialize():
     print(f"[{BANK_NAME}] Creating database tables...")
     Base.metadata.create_all(bind=engine)
     
+    try:
+        import rolling_stats
+        rolling_stats.initialize()
+        samples = warm_volatility_series()
+        print(f"[{BANK_NAME}] Volatility estimators warmed from {samples} price samples")
+    except Exception as e:
+        print(f"[{BANK_NAME}] Volatility warm-up failed: {e}")
+    
     try:
         from banks import brokerage_order_book
         brokerage_order_book.initialize()
     except ImportError:
         pass
     
+    deadlines.register("commodity_loans", _load_commodity_loan_deadlines)
+    
+    from db_schema import ensure_columns
+    ensure_columns(engine, "brokerage_liens", {"interest_tick": "INTEGER"})
+    lien_registry.register_creditor(lien_registry.Creditor(
+        BANK_ID, "Brokerage Firm", BrokerageLien, SessionLocal,
+        interval=1,
+        rate=0.20 / LIEN_INTEREST_MINUTES_PER_YEAR,
+        garnish_rate=0.50,
+        rate_lookup=_lien_interest_rates,
+        on_collected=_on_liens_collected
+    ))
+    
+    _register_jobs()
+    
     try:
         from corporate_actions import initialize as init_corporate_actions
         init_corporate_actions()
-    except ImportError:
-        pass
+    except Exception as e:
+        print(f"[{BANK_NAME}] Corporate actions init failed: {e}")
     
     firm = get_firm_entity()
     
@@ -2637,44 +2742,63 @@ async def tick(current_tick: int, now: datetime, bank_entity=None):
     except ImportError:
         pass
     
-    process_liens()
+    # Margin, loan, interest and corporate-action sweeps plus the status
+    # line are staggered scheduler jobs (see _register_jobs)
     
-    if current_tick % 300 == 0:
-        check_margin_calls()
-        process_margin_call_deadlines()
-        check_commodity_loan_due_dates()
+    process_dividends(current_tick)
+
+
+def _corporate_actions_job():
+    try:
+        from corporate_actions import process_corporate_actions
+        process_corporate_actions()
+    except ImportError:
+        pass
+
+
+def log_hourly_status():
+    """Hourly status line (scheduled job)."""
+    firm = get_firm_entity()
     
-    if current_tick % 3600 == 0:
-        accrue_margin_interest()
-        process_share_loan_interest()
-        check_firm_can_operate()
-        
-        try:
-            from corporate_actions import process_corporate_actions
-            process_corporate_actions()
-        except ImportError:
-            pass
+    db = get_db()
+    try:
+        company_count = db.query(CompanyShares).filter(CompanyShares.is_delisted == False).count()
+        margin_count = db.query(ShareholderPosition).filter(ShareholderPosition.margin_debt > 0).count()
+        short_count = db.query(ShareLoan).filter(ShareLoan.status == ShareLoanStatus.ACTIVE.value).count()
+        commodity_count = db.query(CommodityLoan).filter(
+            CommodityLoan.status.in_([CommodityLoanStatus.ACTIVE.value, CommodityLoanStatus.LATE.value])
+        ).count()
+    finally:
+        db.close()
     
-    process_dividends(current_tick)
+    status = "✓ OPERATIONAL" if firm_is_solvent() else "✗ LOW RESERVES"
+    print(f"[{BANK_NAME}] {status} | Cash: ${firm.cash_reserves:,.2f} | " +
+          f"Companies: {company_count} | Margin: {margin_count} | " +
+          f"Shorts: {short_count} | Commodity Loans: {commodity_count}")
+
+
+def _register_jobs():
+    """Periodic maintenance, staggered by the scheduler instead of firing on tick % period."""
+    import banks
+    import scheduler
     
-    if current_tick % 3600 == 0:
-        firm = get_firm_entity()
-        
-        db = get_db()
-        try:
-            company_count = db.query(CompanyShares).filter(CompanyShares.is_delisted == False).count()
-            margin_count = db.query(ShareholderPosition).filter(ShareholderPosition.margin_debt > 0).count()
-            short_count = db.query(ShareLoan).filter(ShareLoan.status == ShareLoanStatus.ACTIVE.value).count()
-            commodity_count = db.query(CommodityLoan).filter(
-                CommodityLoan.status.in_([CommodityLoanStatus.ACTIVE.value, CommodityLoanStatus.LATE.value])
-            ).count()
-        finally:
-            db.close()
-        
-        status = "✓ OPERATIONAL" if firm_is_solvent() else "✗ LOW RESERVES"
-        print(f"[{BANK_NAME}] {status} | Cash: ${firm.cash_reserves:,.2f} | " +
-              f"Companies: {company_count} | Margin: {margin_count} | " +
-              f"Shorts: {short_count} | Commodity Loans: {commodity_count}")
+    def job(fn):
+        return banks.bank_job(BANK_ID, lambda entity: fn())
+    
+    scheduler.every(f"{BANK_ID}.margin_calls", 300, job(check_margin_calls), cost=20.0,
+                    priority=scheduler.CRITICAL)
+    scheduler.every(f"{BANK_ID}.margin_call_deadlines", 300, job(process_margin_call_deadlines), cost=5.0,
+                    priority=scheduler.CRITICAL)
+    scheduler.every(f"{BANK_ID}.commodity_loan_due", 300, job(check_commodity_loan_due_dates), cost=5.0)
+    scheduler.every(f"{BANK_ID}.margin_interest", 3600, job(accrue_margin_interest), cost=20.0,
+                    priority=scheduler.CRITICAL)
+    scheduler.every(f"{BANK_ID}.share_loan_interest", 3600, job(process_share_loan_interest), cost=20.0,
+                    priority=scheduler.CRITICAL)
+    scheduler.every(f"{BANK_ID}.can_operate", 3600, job(check_firm_can_operate), cost=2.0)
+    scheduler.every(f"{BANK_ID}.corporate_actions", 3600, job(_corporate_actions_job), cost=30.0,
+                    priority=scheduler.CRITICAL)
+    scheduler.every(f"{BANK_ID}.log_status", 3600, job(log_hourly_status), cost=5.0,
+                    priority=scheduler.DEFERRABLE)
 
 
 # ==========================
@@ -2691,7 +2815,7 @@ __all__ = [
     'get_db', 'Base',
     'get_firm_entity', 'firm_add_cash', 'firm_deduct_cash', 'firm_is_solvent', 'FirmEntity',
     'get_player_credit', 'modify_credit_score', 'get_credit_tier',
-    'get_credit_interest_rate', 'get_max_leverage_for_player',
+    'get_credit_interest_rate', 'get_credit_interest_rates', 'get_max_leverage_for_player',
     'PlayerCreditRating', 'CreditTier',
     'calculate_player_total_net_worth', 'calculate_player_company_valuation',
     'calculate_business_valuation',
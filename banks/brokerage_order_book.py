@@ -26,7 +26,7 @@ from stats_ux import log_transaction
 # ==========================
 # DATABASE SETUP
 # ==========================
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -1072,6 +1072,8 @@ def initialize():
     """Initialize order book tables."""
     print("[OrderBook] Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    import scheduler
+    scheduler.every("orderbook.expire_orders", 60, expire_old_orders, cost=5.0)
     print("[OrderBook] Order book system initialized")
 
 
@@ -1081,7 +1083,6 @@ def tick(current_tick: int):
     
     Processes:
     - Order matching for all active companies
-    - Order expiry
     """
     # Match orders every tick
     from banks.brokerage_firm import CompanyShares
@@ -1096,9 +1097,7 @@ def tick(current_tick: int):
     finally:
         db.close()
     
-    # Expire old orders every 60 ticks (1 minute)
-    if current_tick % 60 == 0:
-        expire_old_orders()
+    # Order expiry is a staggered scheduler job (see initialize)
 
 
 # ==========================
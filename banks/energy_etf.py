@@ -16,6 +16,8 @@ from datetime import datetime, timedelta
 from typing import Optional, List
 import random
 
+import liens as lien_registry
+
 # ==========================
 # BANK IDENTITY
 # ==========================
@@ -91,9 +93,8 @@ last_buyback_check_tick = 0
 last_fee_collection_tick = 0
 last_market_making_tick = 0
 last_levy_tick = 0
-last_lien_processing_tick = 0
 last_qe_buy_tick = 0
-price_history = []
+price_history = None  # rolling_stats.RollingStats, created in initialize()
 MAX_PRICE_HISTORY = 3600
 ipo_share_price = None
 
@@ -108,7 +109,7 @@ from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer,
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -128,6 +129,7 @@ class BankLien(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     last_interest_accrual = Column(DateTime, default=datetime.utcnow)
     last_payment = Column(DateTime, nullable=True)
+    interest_tick = Column(Integer, nullable=True)  # Tick interest was last settled to (liens.py)
     
     @property
     def total_owed(self):
@@ -294,6 +296,21 @@ def initialize():
     # Create lien table
     Base.metadata.create_all(bind=engine)
     
+    from db_schema import ensure_columns
+    ensure_columns(engine, "energy_etf_bank_liens", {"interest_tick": "INTEGER"})
+    lien_registry.register_creditor(lien_registry.Creditor(
+        BANK_ID, BANK_NAME, BankLien, SessionLocal,
+        interval=LEVY_FREQUENCY,
+        rate=LIEN_INTEREST_RATE,
+        garnish_rate=LIEN_GARNISHMENT_PERCENTAGE,
+        on_collected=_on_liens_collected
+    ))
+    
+    try:
+        load_price_history()
+    except Exception as e:
+        print(f"[{BANK_NAME}] Could not restore price history: {e}")
+    
     # Calculate IPO price based on market fundamentals
     ipo_share_price = calculate_ipo_price()
     
@@ -329,6 +346,8 @@ def initialize():
     # Execute IPO
     execute_ipo()
     
+    _register_jobs()
+    
     print(f"[{BANK_NAME}] Module initialized")
     print(f"  → Target Commodity: {TARGET_COMMODITY}")
     print(f"  → IPO: {IPO_SHARES:,} shares at ${ipo_share_price:.6f}")
@@ -368,29 +387,49 @@ def update_asset_valuation():
     banks.update_bank_assets(BANK_ID, commodity_value)
 
 
+def _price_history_key() -> str:
+    return f"etf_ma:{BANK_ID}"
+
+
+def load_price_history():
+    """Restore the moving-average window persisted before the last shutdown."""
+    global price_history
+    import rolling_stats
+    
+    rolling_stats.initialize()
+    price_history = rolling_stats.load_series(_price_history_key(), max_samples=MAX_PRICE_HISTORY)
+
+
+def save_price_history():
+    """Snapshot the moving-average window so it survives restarts."""
+    import rolling_stats
+    rolling_stats.save_series(_price_history_key(), include_samples=True)
+
+
 def update_price_history():
     """Track price history for moving average calculations."""
     global price_history
     
     try:
         import market
+        import rolling_stats
+        
+        if price_history is None:
+            price_history = rolling_stats.get_series(_price_history_key(), max_samples=MAX_PRICE_HISTORY)
         
         current_price = market.get_market_price(TARGET_COMMODITY)
         if current_price:
-            price_history.append(current_price)
-            
-            if len(price_history) > MAX_PRICE_HISTORY:
-                price_history = price_history[-MAX_PRICE_HISTORY:]
+            price_history.push(current_price)
     except:
         pass
 
 
 def get_moving_average_price() -> Optional[float]:
-    """Get moving average price from history."""
-    if not price_history:
+    """Get moving average price from history (running mean, O(1))."""
+    if price_history is None or price_history.count == 0:
         return None
     
-    return sum(price_history) / len(price_history)
+    return price_history.mean
 
 
 # ==========================
@@ -533,7 +572,7 @@ def collect_holder_fees():
     try:
         import banks
         import inventory
-        from auth import get_db as get_auth_db, Player
+        from auth import CashLedger
         
         bank_entity = banks.get_bank_entity(BANK_ID)
         if not bank_entity:
@@ -545,7 +584,8 @@ def collect_holder_fees():
             return
         
         nav = bank_entity.cash_reserves + bank_entity.asset_value
-        total_fees_collected = 0.0
+        ledger = CashLedger()
+        fees = []
         
         for player_id, shares_owned in shareholders.items():
             ownership_fraction = shares_owned / bank_entity.total_shares_issued
@@ -554,15 +594,12 @@ def collect_holder_fees():
             if fee_amount < 0.01:
                 continue
             
-            auth_db = get_auth_db()
-            try:
-                player = auth_db.query(Player).filter(Player.id == player_id).first()
-                if player and player.cash_balance >= fee_amount:
-                    player.cash_balance -= fee_amount
-                    total_fees_collected += fee_amount
-                    auth_db.commit()
-            finally:
-                auth_db.close()
+            # Skipped (not charged) if the holder can't cover it
+            ledger.debit(player_id, fee_amount, allow_overdraft=False)
+            fees.append(fee_amount)
+        
+        results = ledger.commit()
+        total_fees_collected = sum(fee for fee, ok in zip(fees, results) if ok)
         
         if total_fees_collected > 0:
             banks.add_bank_revenue(BANK_ID, total_fees_collected, "Holder fees")
@@ -912,6 +949,7 @@ def create_or_update_lien(player_id: int, amount: float):
         ).first()
         
         if lien:
+            lien_registry.settle_row(BANK_ID, lien)
             lien.principal += amount
         else:
             lien = BankLien(
@@ -919,72 +957,26 @@ def create_or_update_lien(player_id: int, amount: float):
                 bank_id=BANK_ID,
                 principal=amount
             )
+            lien_registry.settle_row(BANK_ID, lien)
             db.add(lien)
         
         db.commit()
+        lien_registry.refresh_player(player_id)
     finally:
         db.close()
 
 
-def process_lien_system(current_tick: int):
-    """Process all active liens."""
-    global last_lien_processing_tick
-    
-    if current_tick - last_lien_processing_tick < LEVY_FREQUENCY:
-        return
-    
-    last_lien_processing_tick = current_tick
+def _on_liens_collected(payments: dict, cleared: list):
+    """Garnishment callback from liens.process_garnishment()."""
+    import banks
     
-    db = SessionLocal()
-    try:
-        liens = db.query(BankLien).all()
-        
-        if not liens:
-            return
-        
-        from auth import get_db as get_auth_db, Player
-        import banks
-        
-        total_garnished = 0.0
-        
-        for lien in liens:
-            if lien.total_owed <= 0:
-                continue
-            
-            lien.interest_accrued += lien.total_owed * LIEN_INTEREST_RATE
-            lien.last_interest_accrual = datetime.utcnow()
-            
-            auth_db = get_auth_db()
-            try:
-                player = auth_db.query(Player).filter(Player.id == lien.player_id).first()
-                if not player or player.cash_balance <= 0:
-                    continue
-                
-                garnish_amount = min(
-                    player.cash_balance * LIEN_GARNISHMENT_PERCENTAGE,
-                    lien.total_owed
-                )
-                
-                if garnish_amount >= 0.01:
-                    player.cash_balance -= garnish_amount
-                    lien.total_paid += garnish_amount
-                    lien.last_payment = datetime.utcnow()
-                    total_garnished += garnish_amount
-                    auth_db.commit()
-                    
-                    if lien.total_owed <= 0:
-                        print(f"[{BANK_NAME}] ✅ Lien CLEARED for Player {lien.player_id}")
-            finally:
-                auth_db.close()
-        
-        db.commit()
-        
-        if total_garnished > 0:
-            banks.add_bank_revenue(BANK_ID, total_garnished, "Lien garnishment")
-            print(f"[{BANK_NAME}] 💰 Garnished: ${total_garnished:,.2f}")
+    for player_id in cleared:
+        print(f"[{BANK_NAME}] ✅ Lien CLEARED for Player {player_id}")
     
-    finally:
-        db.close()
+    total = sum(payments.values())
+    if total > 0:
+        banks.add_bank_revenue(BANK_ID, total, "Lien garnishment")
+        print(f"[{BANK_NAME}] 💰 Garnished: ${total:,.2f}")
 
 
 def check_and_trigger_qe(current_tick: int):
@@ -1046,6 +1038,48 @@ def check_and_trigger_qe(current_tick: int):
         print(f"[{BANK_NAME}] QE error: {e}")
 
 
+def log_hourly_stats(bank_entity):
+    """Hourly status line (scheduled job)."""
+    try:
+        import inventory
+        
+        nav = bank_entity.cash_reserves + bank_entity.asset_value
+        energy_held = inventory.get_item_quantity(BANK_PLAYER_ID, TARGET_COMMODITY)
+        total_supply = get_total_commodity_supply()
+        inventory_pct = (energy_held / total_supply * 100) if total_supply > 0 else 0
+        
+        active_liens, total_lien_debt = lien_registry.creditor_totals(BANK_ID)
+        
+        status = "INSOLVENT" if bank_entity.cash_reserves < 0 else "SOLVENT"
+        qe_status = " [QE ACTIVE]" if bank_entity.share_price < QE_TRIGGER_SHARE_PRICE else ""
+        
+        print(f"[{BANK_NAME}] {status}{qe_status} | NAV: ${nav:,.2f} | " +
+              f"Share: ${bank_entity.share_price:.4f} | " +
+              f"Energy: {energy_held:,.0f} ({inventory_pct:.1f}%) | " +
+              f"Liens: {active_liens} (${total_lien_debt:,.2f})")
+    except:
+        pass
+
+
+def _register_jobs():
+    """Periodic maintenance, staggered by the scheduler instead of firing on tick % period."""
+    import banks
+    import scheduler
+    
+    scheduler.every(f"{BANK_ID}.asset_valuation", 60,
+                    banks.bank_job(BANK_ID, lambda entity: update_asset_valuation()), cost=3.0)
+    scheduler.every(f"{BANK_ID}.save_price_history", 60,
+                    banks.bank_job(BANK_ID, lambda entity: save_price_history()), cost=2.0)
+    scheduler.every(f"{BANK_ID}.holder_fees", 60,
+                    banks.bank_job(BANK_ID, lambda entity: collect_holder_fees(), INSOLVENCY_THRESHOLD), cost=10.0)
+    scheduler.every(f"{BANK_ID}.market_making", 300,
+                    banks.bank_job(BANK_ID, lambda entity: execute_market_making(), INSOLVENCY_THRESHOLD), cost=10.0)
+    scheduler.every(f"{BANK_ID}.retire_shares", 3600,
+                    banks.bank_job(BANK_ID, lambda entity: retire_bought_shares()), cost=5.0)
+    scheduler.every(f"{BANK_ID}.log_stats", 3600, banks.bank_job(BANK_ID, log_hourly_stats), cost=3.0,
+                    priority=scheduler.DEFERRABLE)
+
+
 # ==========================
 # TICK HANDLER
 # ==========================
@@ -1056,58 +1090,21 @@ async def tick(current_tick: int, now: datetime, bank_entity):
     
     update_price_history()
     
-    if current_tick % 60 == 0:
-        update_asset_valuation()
+    # Valuation, fees, market making, share retirement and logging are
+    # staggered scheduler jobs (see _register_jobs)
     
     # INSOLVENCY SYSTEM
     check_and_levy_shareholders(current_tick)
-    process_lien_system(current_tick)
     check_and_trigger_qe(current_tick)
     
     # Normal operations (only if solvent)
     if bank_entity.cash_reserves >= INSOLVENCY_THRESHOLD:
-        if current_tick % 60 == 0:
-            collect_holder_fees()
-        
-        if current_tick % 300 == 0:
-            execute_market_making()
-        
         if current_tick - last_dividend_tick >= DIVIDEND_INTERVAL_TICKS:
             pay_dividends()
             last_dividend_tick = current_tick
         
         check_and_execute_split(current_tick)
         check_and_execute_buyback(current_tick)
-    
-    if current_tick % 3600 == 0:
-        retire_bought_shares()
-    
-    # Log stats every hour
-    if current_tick % 3600 == 0:
-        try:
-            import inventory
-            
-            nav = bank_entity.cash_reserves + bank_entity.asset_value
-            energy_held = inventory.get_item_quantity(BANK_PLAYER_ID, TARGET_COMMODITY)
-            total_supply = get_total_commodity_supply()
-            inventory_pct = (energy_held / total_supply * 100) if total_supply > 0 else 0
-            
-            db = SessionLocal()
-            active_liens = db.query(BankLien).filter(
-                BankLien.principal + BankLien.interest_accrued - BankLien.total_paid > 0
-            ).count()
-            total_lien_debt = sum(l.total_owed for l in db.query(BankLien).all())
-            db.close()
-            
-            status = "INSOLVENT" if bank_entity.cash_reserves < 0 else "SOLVENT"
-            qe_status = " [QE ACTIVE]" if bank_entity.share_price < QE_TRIGGER_SHARE_PRICE else ""
-            
-            print(f"[{BANK_NAME}] {status}{qe_status} | NAV: ${nav:,.2f} | " +
-                  f"Share: ${bank_entity.share_price:.4f} | " +
-                  f"Energy: {energy_held:,.0f} ({inventory_pct:.1f}%) | " +
-                  f"Liens: {active_liens} (${total_lien_debt:,.2f})")
-        except:
-            pass
 
 
 # ==========================
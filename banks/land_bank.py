@@ -13,6 +13,8 @@ from datetime import datetime, timedelta
 from typing import Optional, List
 import random
 
+import liens as lien_registry
+
 # ==========================
 # BANK IDENTITY
 # ==========================
@@ -74,7 +76,6 @@ last_asset_valuation = 0.0
 last_split_check_tick = 0
 last_buyback_check_tick = 0
 last_levy_tick = 0
-last_lien_processing_tick = 0
 last_qe_auction_tick = 0
 
 # Special item type for bank shares
@@ -88,7 +89,7 @@ from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer,
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -110,6 +111,7 @@ class BankLien(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     last_interest_accrual = Column(DateTime, default=datetime.utcnow)
     last_payment = Column(DateTime, nullable=True)
+    interest_tick = Column(Integer, nullable=True)  # Tick interest was last settled to (liens.py)
     
     @property
     def total_owed(self):
@@ -128,6 +130,16 @@ def initialize():
     # Create lien table
     Base.metadata.create_all(bind=engine)
     
+    from db_schema import ensure_columns
+    ensure_columns(engine, "bank_liens", {"interest_tick": "INTEGER"})
+    lien_registry.register_creditor(lien_registry.Creditor(
+        BANK_ID, BANK_NAME, BankLien, SessionLocal,
+        interval=LEVY_FREQUENCY,
+        rate=LIEN_INTEREST_RATE,
+        garnish_rate=LIEN_GARNISHMENT_PERCENTAGE,
+        on_collected=_on_liens_collected
+    ))
+    
     # Get or create bank entity
     bank_entity = banks.get_bank_entity(BANK_ID)
     
@@ -152,6 +164,8 @@ def initialize():
     # Execute IPO
     execute_ipo()
     
+    _register_jobs()
+    
     print(f"[{BANK_NAME}] Enhanced Module initialized")
     print(f"  → Insolvency System: Active")
     print(f"  → Lien Interest: {LIEN_INTEREST_RATE*100:.2f}% per minute")
@@ -306,6 +320,7 @@ def create_or_update_lien(player_id: int, amount: float):
         
         if lien:
             # Add to existing lien
+            lien_registry.settle_row(BANK_ID, lien)
             lien.principal += amount
         else:
             # Create new lien
@@ -316,86 +331,27 @@ def create_or_update_lien(player_id: int, amount: float):
                 interest_accrued=0.0,
                 total_paid=0.0
             )
+            lien_registry.settle_row(BANK_ID, lien)
             db.add(lien)
         
         db.commit()
+        lien_registry.refresh_player(player_id)
         print(f"[{BANK_NAME}] Lien for Player {player_id}: ${lien.total_owed:.2f} owed")
     finally:
         db.close()
 
 
-def process_lien_system(current_tick: int):
-    """
-    Process all active liens:
-    1. Accrue interest
-    2. Attempt garnishment
-    """
-    global last_lien_processing_tick
-    
-    if current_tick - last_lien_processing_tick < LEVY_FREQUENCY:
-        return
+def _on_liens_collected(payments: dict, cleared: list):
+    """Garnishment callback from liens.process_garnishment()."""
+    import banks
     
-    last_lien_processing_tick = current_tick
+    for player_id in cleared:
+        print(f"[{BANK_NAME}] ✅ Lien CLEARED for Player {player_id}")
     
-    db = SessionLocal()
-    try:
-        liens = db.query(BankLien).all()
-        
-        if not liens:
-            return
-        
-        from auth import get_db as get_auth_db, Player
-        import banks
-        
-        total_garnished = 0.0
-        
-        for lien in liens:
-            # Skip if fully paid
-            if lien.total_owed <= 0:
-                continue
-            
-            # Accrue interest
-            lien.interest_accrued += lien.total_owed * LIEN_INTEREST_RATE
-            lien.last_interest_accrual = datetime.utcnow()
-            
-            # Attempt garnishment
-            auth_db = get_auth_db()
-            try:
-                player = auth_db.query(Player).filter(Player.id == lien.player_id).first()
-                if not player or player.cash_balance <= 0:
-                    continue
-                
-                # Garnish percentage of available cash
-                garnish_amount = min(
-                    player.cash_balance * LIEN_GARNISHMENT_PERCENTAGE,
-                    lien.total_owed
-                )
-                
-                if garnish_amount >= 0.01:
-                    player.cash_balance -= garnish_amount
-                    lien.total_paid += garnish_amount
-                    lien.last_payment = datetime.utcnow()
-                    total_garnished += garnish_amount
-                    
-                    auth_db.commit()
-                    
-                    remaining = lien.total_owed
-                    if remaining <= 0:
-                        print(f"[{BANK_NAME}] ✅ Lien CLEARED for Player {lien.player_id}")
-                    else:
-                        print(f"[{BANK_NAME}] Garnished ${garnish_amount:.2f} from Player {lien.player_id} (${remaining:.2f} remains)")
-            finally:
-                auth_db.close()
-        
-        db.commit()
-        
-        # Add garnished funds to bank
-        if total_garnished > 0:
-            banks.add_bank_revenue(BANK_ID, total_garnished, "Lien garnishment")
-            print(f"[{BANK_NAME}] 💰 Total garnishment: ${total_garnished:.2f}")
-    
-    finally:
-        db.close()
+    total = sum(payments.values())
+    if total > 0:
+        banks.add_bank_revenue(BANK_ID, total, "Lien garnishment")
+        print(f"[{BANK_NAME}] 💰 Total garnishment: ${total:.2f}")
 
 
 # ==========================
@@ -468,7 +424,7 @@ def create_qe_auction():
     minimum_price = base_price * QE_MINIMUM_PRICE_RATIO
     
     # Create auction directly
-    from land_market import GovernmentAuction, AUCTION_DURATION_TICKS, SessionLocal as LandMarketSession
+    from land_market import GovernmentAuction, AUCTION_DURATION_TICKS, SessionLocal as LandMarketSession, schedule_auction_expiry
     
     db = LandMarketSession()
     try:
@@ -482,6 +438,7 @@ def create_qe_auction():
         
         db.add(auction)
         db.commit()
+        schedule_auction_expiry(auction)
         
         features_str = f" + {', '.join(proximity_features)}" if proximity_features else ""
         print(f"[{BANK_NAME}] 🚨 QE AUCTION #{auction.id}: {terrain.title()}{features_str} @ ${starting_price:,.2f} (Floor: ${minimum_price:,.2f})")
@@ -592,16 +549,7 @@ def get_player_shareholding(player_id: int) -> dict:
 
 def get_player_lien_balance(player_id: int) -> float:
     """Get player's total lien balance."""
-    db = SessionLocal()
-    try:
-        lien = db.query(BankLien).filter(
-            BankLien.player_id == player_id,
-            BankLien.bank_id == BANK_ID
-        ).first()
-        
-        return lien.total_owed if lien else 0.0
-    finally:
-        db.close()
+    return lien_registry.outstanding(player_id, [BANK_ID])
 
 
 # ==========================
@@ -967,6 +915,39 @@ def retire_bought_shares():
         import traceback
         traceback.print_exc()
 
+
+def log_hourly_stats(bank_entity):
+    """Hourly status line (scheduled job)."""
+    nav = bank_entity.cash_reserves + bank_entity.asset_value
+    shareholders = get_all_shareholders()
+    total_player_shares = sum(shares for pid, shares in shareholders.items() if pid != BANK_PLAYER_ID)
+    
+    # Count active liens
+    active_liens, total_lien_debt = lien_registry.creditor_totals(BANK_ID)
+    
+    status = "INSOLVENT" if bank_entity.cash_reserves < 0 else "SOLVENT"
+    qe_status = " [QE ACTIVE]" if bank_entity.share_price < QE_TRIGGER_SHARE_PRICE else ""
+    
+    print(f"[{BANK_NAME}] {status}{qe_status} | NAV: ${nav:,.2f} | " +
+          f"Share Price: ${bank_entity.share_price:.2f} | " +
+          f"Shares: {bank_entity.total_shares_issued:,} | " +
+          f"Player Holdings: {total_player_shares:,.0f} | " +
+          f"Active Liens: {active_liens} (${total_lien_debt:,.2f})")
+
+
+def _register_jobs():
+    """Periodic maintenance, staggered by the scheduler instead of firing on tick % period."""
+    import banks
+    import scheduler
+    
+    scheduler.every(f"{BANK_ID}.asset_valuation", 3600,
+                    banks.bank_job(BANK_ID, lambda entity: update_asset_valuation()), cost=5.0)
+    scheduler.every(f"{BANK_ID}.retire_shares", 3600,
+                    banks.bank_job(BANK_ID, lambda entity: retire_bought_shares(), INSOLVENCY_THRESHOLD), cost=5.0)
+    scheduler.every(f"{BANK_ID}.log_stats", 3600, banks.bank_job(BANK_ID, log_hourly_stats), cost=3.0,
+                    priority=scheduler.DEFERRABLE)
+
+
 # ==========================
 # TICK HANDLER (ENHANCED)
 # ==========================
@@ -977,13 +958,11 @@ async def tick(current_tick: int, now: datetime, bank_entity):
     """
     global last_dividend_tick
     
-    # Update asset valuation every hour
-    if current_tick % 3600 == 0:
-        update_asset_valuation()
+    # Asset valuation, share retirement and logging are staggered
+    # scheduler jobs (see _register_jobs)
     
     # INSOLVENCY SYSTEM - Highest priority
     check_and_levy_shareholders(current_tick)
-    process_lien_system(current_tick)
     check_and_trigger_qe(current_tick)
     
     # Normal operations (only if solvent)
@@ -998,31 +977,6 @@ async def tick(current_tick: int, now: datetime, bank_entity):
         
         # Buyback checks
         check_and_execute_buyback(current_tick)
-        
-        # Retire bought-back shares
-        if current_tick % 3600 == 0:
-            retire_bought_shares()
-    
-    # Log stats every hour
-    if current_tick % 3600 == 0:
-        nav = bank_entity.cash_reserves + bank_entity.asset_value
-        shareholders = get_all_shareholders()
-        total_player_shares = sum(shares for pid, shares in shareholders.items() if pid != BANK_PLAYER_ID)
-        
-        # Count active liens
-        db = SessionLocal()
-        active_liens = db.query(BankLien).filter(BankLien.principal + BankLien.interest_accrued - BankLien.total_paid > 0).count()
-        total_lien_debt = sum(l.total_owed for l in db.query(BankLien).all())
-        db.close()
-        
-        status = "INSOLVENT" if bank_entity.cash_reserves < 0 else "SOLVENT"
-        qe_status = " [QE ACTIVE]" if bank_entity.share_price < QE_TRIGGER_SHARE_PRICE else ""
-        
-        print(f"[{BANK_NAME}] {status}{qe_status} | NAV: ${nav:,.2f} | " +
-              f"Share Price: ${bank_entity.share_price:.2f} | " +
-              f"Shares: {bank_entity.total_shares_issued:,} | " +
-              f"Player Holdings: {total_player_shares:,.0f} | " +
-              f"Active Liens: {active_liens} (${total_lien_debt:,.2f})")
 
 
 # ==========================
@@ -0,0 +1,145 @@
+"""
+bench_district_market.py
+
+Times the district market tick against the number of resting orders.
+Handles:
+- A throwaway in-memory database and a private BookIndex per run (the live
+  engine, SessionLocal and district_market.book_index are never touched)
+- Indexed tick: order updates applied to the index, crossed items picked
+  from it and only their resting orders loaded
+- Full scan (--full-scan): every resting order loaded each tick, as the tick
+  did before the book index
+
+Matching itself (execute_trade) moves cash and inventory in other modules'
+tables, so it is left out; both modes time the order-book work only.
+
+Run from the repository root:
+    python bench_district_market.py --sizes 1000,10000,50000 --crossed 5 --full-scan
+"""
+
+import os
+import random
+import time
+
+# Import the market against a private in-memory URL, never wadsworth.db
+os.environ.setdefault("WADSWORTH_DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import district_market as dm
+
+FALLBACK_ITEM_COUNT = 286  # district items when district_items.json is missing
+
+
+def build_market(resting_orders: int, crossed_items: int, rng: random.Random):
+    """
+    Fill a fresh in-memory database with limit orders spread over every
+    district item. Bids sit at 90-99 and asks at 101-110, except on the first
+    `crossed_items` items, where asks start at 50 so the book is crossed.
+
+    Returns:
+        (Session factory, BookIndex, [(order_id, item_type, side, price)])
+    """
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    dm.Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    items = list(dm.DISTRICT_ITEMS.keys()) or [f"item_{i}" for i in range(FALLBACK_ITEM_COUNT)]
+    crossed = set(items[:crossed_items])
+    db = Session()
+    try:
+        orders = []
+        for i in range(resting_orders):
+            item_type = items[i % len(items)]
+            is_bid = i % 2 == 0
+            if is_bid:
+                price = 90.0 + rng.randrange(10)
+            else:
+                price = (50.0 if item_type in crossed else 101.0) + rng.randrange(10)
+            orders.append(dm.DistrictMarketOrder(
+                player_id=1 + i % 50,
+                order_type=dm.OrderType.BUY if is_bid else dm.OrderType.SELL,
+                order_mode=dm.OrderMode.LIMIT,
+                item_type=item_type,
+                price=price,
+                quantity=10.0,
+                status=dm.OrderStatus.ACTIVE
+            ))
+        db.bulk_save_objects(orders)
+        db.commit()
+
+        index = dm.BookIndex()
+        index.rebuild(db)
+        resting = db.query(
+            dm.DistrictMarketOrder.id, dm.DistrictMarketOrder.item_type,
+            dm.DistrictMarketOrder.order_type, dm.DistrictMarketOrder.price
+        ).all()
+    finally:
+        db.close()
+    return Session, index, resting
+
+
+def time_indexed_ticks(Session, index: dm.BookIndex, resting, ticks: int,
+                       updates_per_tick: int, rng: random.Random) -> float:
+    """Mean ms per tick: re-price some orders in the index, then load crossed books."""
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for order_id, item_type, side, price in rng.sample(resting, min(updates_per_tick, len(resting))):
+            index.track(order_id, item_type, side, price, dm.OrderStatus.ACTIVE)
+        if index.crossed:
+            db = Session()
+            try:
+                for item_type in index.crossed_items():
+                    dm.load_resting_orders(db, item_type)
+            finally:
+                db.close()
+    return (time.perf_counter() - start) * 1000 / ticks
+
+
+def time_full_scan_ticks(Session, ticks: int) -> float:
+    """Mean ms per tick when every resting order is loaded each tick."""
+    start = time.perf_counter()
+    for _ in range(ticks):
+        db = Session()
+        try:
+            db.query(dm.DistrictMarketOrder).filter(
+                dm.DistrictMarketOrder.status.in_(dm.RESTING_STATUSES)
+            ).order_by(dm.DistrictMarketOrder.created_at.asc()).all()
+        finally:
+            db.close()
+    return (time.perf_counter() - start) * 1000 / ticks
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark district market tick cost against resting order count')
+    parser.add_argument('--ticks', type=int, default=200, help='Ticks to time per run')
+    parser.add_argument('--sizes', type=str, default='100,1000,10000,50000', help='Comma-separated resting order counts')
+    parser.add_argument('--crossed', type=int, default=3, help='Items whose book is crossed')
+    parser.add_argument('--updates', type=int, default=20, help='Order updates applied to the index per tick')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed')
+    parser.add_argument('--full-scan', action='store_true', help='Also time the per-order full scan for comparison')
+    args = parser.parse_args()
+
+    dm.load_district_items()
+    for size in (int(n) for n in args.sizes.split(',')):
+        rng = random.Random(args.seed)
+        Session, index, resting = build_market(size, args.crossed, rng)
+        indexed = time_indexed_ticks(Session, index, resting, args.ticks, args.updates, rng)
+        line = (f"{size:>7} resting orders, {len(index.crossed)} crossed: "
+                f"{indexed:8.3f} ms/tick")
+        if args.full_scan:
+            scan_ticks = max(1, args.ticks // 20)
+            line += f"   full scan: {time_full_scan_ticks(Session, scan_ticks):10.3f} ms/tick"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,8 +8,9 @@ from sqlalchemy.ext.declarative import declarative_base
 from stats_ux import log_transaction
 # Integrated Algebraic Engine
 from supplydemand import SupplyDemandEngine
+import game_clock
 
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -25,10 +26,27 @@ class Business(Base):
     land_plot_id = Column(Integer, unique=True, nullable=True)
     business_type = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
-    progress_ticks = Column(Integer, default=0)
+    # Production cycles are scheduled, not counted: a running cycle is
+    # (cycle_start_tick, cycle_length) and due at next_due_tick. progress_base
+    # only holds frozen progress while paused (and legacy rows).
+    progress_base = Column("progress_ticks", Integer, default=0)
+    cycle_start_tick = Column(Integer, nullable=True)
+    cycle_length = Column(Integer, nullable=True)
+    next_due_tick = Column(Integer, index=True, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     district_id = Column(Integer, nullable=True)  # District ID if business is on a district
 
+    @property
+    def progress_ticks(self) -> int:
+        """Ticks into the current cycle, computed from the cycle start."""
+        if self.cycle_start_tick is None or not self.cycle_length:
+            return self.progress_base or 0
+        return max(0, min(self.cycle_length, game_clock.current() - self.cycle_start_tick))
+
+    @progress_ticks.setter
+    def progress_ticks(self, value: int):
+        self.progress_base = value
+
 class RetailPrice(Base):
     __tablename__ = "retail_prices"
     id = Column(Integer, primary_key=True, index=True)
@@ -47,13 +65,19 @@ class BusinessSale(Base):
     ticks_remaining = Column(Integer, nullable=False)
     ticks_total = Column(Integer, nullable=False)
     started_at = Column(DateTime, default=datetime.utcnow)
+    # Refund stream (see accruals.py): pays refund_per_tick over (start_tick, end_tick]
+    start_tick = Column(Integer, nullable=True)
+    end_tick = Column(Integer, index=True, nullable=True)
+    settled_tick = Column(Integer, nullable=True)
 
 # ==========================
 # CONFIG & LIFECYCLE
 # ==========================
 
 BUSINESS_TYPES = {}
+DISTRICT_BUSINESS_TYPES = None  # Loaded lazily from district_businesses.json
 DISMANTLING_TICKS = 100 # Number of ticks to dismantle a business
+DISMANTLING_SETTLE_INTERVAL = 12  # Pay accrued refunds once a minute instead of every tick
 
 def load_business_config():
     global BUSINESS_TYPES
@@ -66,13 +90,82 @@ def load_business_config():
 def initialize():
     Base.metadata.create_all(bind=engine)
     load_business_config()
+
+    from db_schema import ensure_columns, ensure_indexes
+    ensure_columns(engine, "businesses", {
+        "cycle_start_tick": "INTEGER",
+        "cycle_length": "INTEGER",
+        "next_due_tick": "INTEGER",
+    })
+    ensure_columns(engine, "business_sales", {
+        "start_tick": "INTEGER",
+        "end_tick": "INTEGER",
+        "settled_tick": "INTEGER",
+    })
+    ensure_indexes(engine, "businesses", {"ix_businesses_next_due_tick": "next_due_tick"})
+    ensure_indexes(engine, "business_sales", {"ix_business_sales_end_tick": "end_tick"})
+    schedule_unscheduled_businesses()
+    schedule_unscheduled_sales()
+
     print("[Business] Module initialized with production patches and dismantling system")
 
 async def tick(current_tick: int, now: datetime):
     db = SessionLocal()
     try:
-        process_business_tick(db)
-        process_dismantling_tick(db)
+        process_business_tick(db, current_tick)
+        process_dismantling_tick(db, current_tick)
+    finally:
+        db.close()
+
+# ==========================
+# CYCLE SCHEDULING
+# ==========================
+
+def get_business_config(biz) -> dict:
+    """Config for a business, from the district or regular type table."""
+    if biz.district_id:
+        return get_district_business_types().get(biz.business_type, {})
+    return BUSINESS_TYPES.get(biz.business_type, {})
+
+def start_cycle(biz, current_tick: int, cycles: int = None):
+    """Begin a fresh production cycle at current_tick."""
+    if cycles is None:
+        cycles = get_business_config(biz).get("cycles_to_complete", 1)
+    biz.progress_base = 0
+    biz.cycle_start_tick = current_tick
+    biz.cycle_length = cycles
+    biz.next_due_tick = current_tick + cycles
+
+def pause_cycle(biz):
+    """Freeze cycle progress and take the business off the due index."""
+    biz.progress_base = biz.progress_ticks
+    biz.cycle_start_tick = None
+    biz.next_due_tick = None
+
+def resume_cycle(biz, current_tick: int):
+    """Reschedule a paused business so it keeps the progress it had."""
+    cycles = get_business_config(biz).get("cycles_to_complete", 1)
+    progress = min(biz.progress_base or 0, cycles)
+    biz.cycle_start_tick = current_tick - progress
+    biz.cycle_length = cycles
+    biz.next_due_tick = biz.cycle_start_tick + cycles
+
+def schedule_unscheduled_businesses():
+    """
+    One-time pass for rows created before cycle scheduling existed:
+    convert stored progress counters into a start tick and due tick.
+    """
+    db = SessionLocal()
+    try:
+        legacy = db.query(Business).filter(
+            Business.is_active == True,
+            Business.next_due_tick == None
+        ).all()
+        for biz in legacy:
+            resume_cycle(biz, game_clock.current())
+        if legacy:
+            db.commit()
+            print(f"[Business] Scheduled {len(legacy)} legacy business cycles")
     finally:
         db.close()
 
@@ -80,23 +173,64 @@ async def tick(current_tick: int, now: datetime):
 # DISMANTLING SYSTEM
 # ==========================
 
-def process_dismantling_tick(db):
-    """Process one tick of all ongoing business dismantling sales."""
-    from auth import Player
+def schedule_unscheduled_sales():
+    """One-time pass converting legacy per-tick countdowns into refund streams."""
+    db = SessionLocal()
+    try:
+        legacy = db.query(BusinessSale).filter(BusinessSale.end_tick == None).all()
+        now_tick = game_clock.current()
+        for sale in legacy:
+            paid_ticks = sale.ticks_total - sale.ticks_remaining
+            sale.start_tick = now_tick - paid_ticks
+            sale.settled_tick = now_tick
+            sale.end_tick = now_tick + max(0, sale.ticks_remaining)
+        if legacy:
+            db.commit()
+            print(f"[Business] Scheduled {len(legacy)} legacy dismantling refunds")
+    finally:
+        db.close()
+
+def settle_dismantling_refund(db, sale, current_tick: int, ledger) -> float:
+    """
+    Pay the owner everything the refund stream has accrued since it was last
+    settled (credited through the cash ledger). Returns the amount paid.
+    """
+    from accruals import Accrual
+    amount, settled_to = Accrual.linear_due(
+        sale.refund_per_tick, sale.start_tick, sale.end_tick, sale.settled_tick, current_tick
+    )
+    if settled_to == sale.settled_tick:
+        return 0.0
+    ledger.credit(sale.owner_id, amount)
+    sale.settled_tick = settled_to
+    sale.ticks_remaining = Accrual.ticks_remaining(sale.end_tick, settled_to)
+    return amount
+
+def process_dismantling_tick(db, current_tick: int):
+    """
+    Settle dismantling refunds.
+    Streams that end this tick are paid out in full and their business is
+    removed; running streams are settled every DISMANTLING_SETTLE_INTERVAL
+    ticks rather than every tick.
+    """
     from land import LandPlot
-    active_sales = db.query(BusinessSale).all()
-    for sale in active_sales:
-        if sale.ticks_remaining <= 0:
-            continue
-        
-        # Pay the owner this tick's refund
-        player = db.query(Player).filter(Player.id == sale.owner_id).first()
-        if player:
-            player.cash_balance += sale.refund_per_tick
-            sale.ticks_remaining -= 1
+    from auth import CashLedger
+    if current_tick % DISMANTLING_SETTLE_INTERVAL == 0:
+        sales = db.query(BusinessSale).filter(BusinessSale.end_tick != None).all()
+    else:
+        sales = db.query(BusinessSale).filter(
+            BusinessSale.end_tick != None,
+            BusinessSale.end_tick <= current_tick
+        ).all()
+    if not sales:
+        return
+
+    ledger = CashLedger()
+    for sale in sales:
+        settle_dismantling_refund(db, sale, current_tick, ledger)
         
         # If dismantling is complete
-        if sale.ticks_remaining <= 0:
+        if sale.ticks_remaining <= 0 and sale.end_tick <= current_tick:
             # Delete the business
             biz = db.query(Business).filter(Business.id == sale.business_id).first()
             if biz:
@@ -110,6 +244,7 @@ def process_dismantling_tick(db):
             # Delete the sale record
             db.delete(sale)
     db.commit()
+    ledger.commit()
 
 def start_business_dismantling(player_id: int, business_id: int) -> bool:
     """
@@ -145,6 +280,7 @@ def start_business_dismantling(player_id: int, business_id: int) -> bool:
         multiplier = max(1, older_businesses)
         total_refund = (base_cost * multiplier) * 0.5
         refund_per_tick = total_refund / DISMANTLING_TICKS
+        now_tick = game_clock.current()
         
         sale = BusinessSale(
             business_id=business_id,
@@ -152,10 +288,14 @@ def start_business_dismantling(player_id: int, business_id: int) -> bool:
             total_refund=total_refund,
             refund_per_tick=refund_per_tick,
             ticks_remaining=DISMANTLING_TICKS,
-            ticks_total=DISMANTLING_TICKS
+            ticks_total=DISMANTLING_TICKS,
+            start_tick=now_tick,
+            settled_tick=now_tick,
+            end_tick=now_tick + DISMANTLING_TICKS
         )
         db.add(sale)
         biz.is_active = False
+        pause_cycle(biz)
         db.commit()
         print(f"[Business] Started dismantling business {business_id}, will pay ${total_refund:.2f} over {DISMANTLING_TICKS} ticks")
         db.close()
@@ -172,14 +312,19 @@ def get_dismantling_status(business_id: int):
     db.close()
     if not sale:
         return None
-    progress_pct = ((sale.ticks_total - sale.ticks_remaining) / sale.ticks_total) * 100
+    # Computed from the stream, so it is current even between settlements
+    from accruals import Accrual
+    ticks_remaining = sale.ticks_remaining
+    if sale.end_tick is not None:
+        ticks_remaining = Accrual.ticks_remaining(sale.end_tick, game_clock.current())
+    progress_pct = ((sale.ticks_total - ticks_remaining) / sale.ticks_total) * 100
     return {
-        "ticks_remaining": sale.ticks_remaining,
+        "ticks_remaining": ticks_remaining,
         "ticks_total": sale.ticks_total,
         "progress_pct": progress_pct,
         "total_refund": sale.total_refund,
         "refund_per_tick": sale.refund_per_tick,
-        "paid_so_far": sale.refund_per_tick * (sale.ticks_total - sale.ticks_remaining)
+        "paid_so_far": sale.refund_per_tick * (sale.ticks_total - ticks_remaining)
     }
 
 # ==========================
@@ -191,33 +336,46 @@ def get_dismantling_status(business_id: int):
 # ==========================
 # Replace the process_business_tick function in business.py with this corrected version
 
-def process_business_tick(db):
-    from inventory import add_item, remove_item, get_player_inventory
+def process_business_tick(db, current_tick: int):
+    """
+    Run production for businesses whose cycle completes this tick.
+    Only rows on the next_due_tick index are loaded; businesses mid-cycle
+    are not read or written. A due business that cannot run (no cash or
+    inputs) keeps its due tick and is retried next tick.
+    """
+    from auth import CashLedger
+    
+    due_biz = db.query(Business).filter(
+        Business.is_active == True,
+        Business.next_due_tick != None,
+        Business.next_due_tick <= current_tick
+    ).order_by(Business.id).all()
+    ledger = CashLedger()
+    try:
+        _run_due_businesses(db, due_biz, current_tick, ledger)
+    finally:
+        # Entries are only queued after each business commits
+        ledger.commit()
+
+def _run_due_businesses(db, due_biz, current_tick: int, ledger):
+    """
+    Production body of process_business_tick; cash goes through the ledger.
+    Wages are debited first in one guarded batch: a business whose owner
+    cannot cover its wage skips this tick, and one that then runs no
+    production line is refunded.
+    """
     from land import LandPlot
-    from auth import Player
-    import market
+    from auth import CashLedger
     
-    active_biz = db.query(Business).filter(Business.is_active == True).all()
-    for biz in active_biz:
+    runnable = []
+    wages = CashLedger()
+    for biz in due_biz:
         sale = db.query(BusinessSale).filter(BusinessSale.business_id == biz.id).first()
         if sale:
             continue
         
         # FIXED: Check if this is a district business and load appropriate config
-        if biz.district_id:
-            district_business_types = get_district_business_types()
-            config = district_business_types.get(biz.business_type, {})
-        else:
-            config = BUSINESS_TYPES.get(biz.business_type, {})
-        
-        cycles = config.get("cycles_to_complete", 1)
-        if biz.progress_ticks < cycles:
-            biz.progress_ticks += 1
-            
-        if biz.progress_ticks < cycles:
-            continue
-            
-        player = db.query(Player).filter(Player.id == biz.owner_id).first()
+        config = get_business_config(biz)
         
         # FIXED: For district businesses, skip plot lookup
         if biz.district_id:
@@ -229,123 +387,142 @@ def process_business_tick(db):
                 continue
             eff_multiplier = max(0.5, (plot.efficiency / 100.0))
         
-        if not player:
-            continue
-        
         base_wage = config.get("base_wage_cost", 0.0)
         wage_cost = base_wage / eff_multiplier
-        
-        if player.cash_balance < wage_cost:
-            continue 
-
-        player_inv = get_player_inventory(player.id)
-        lines_successfully_produced = 0
-        
-        # ===== RETAIL CLASS =====
-        if config.get("class") == "retail":
-            total_revenue = 0.0
-            for item, rule in config.get("products", {}).items():
-                qty = player_inv.get(item, 0)
-                if qty <= 0: continue
-                
-                price_entry = db.query(RetailPrice).filter(
-                    RetailPrice.player_id == player.id,
-                    RetailPrice.item_type == item
-                ).first()
-                
-                mkt_p = market.get_market_price(item) or 10.0
-                current_p = price_entry.price if price_entry else mkt_p
-                
-                multiplier = SupplyDemandEngine.get_sales_multiplier(
-                    current_p, mkt_p, rule.get("elasticity", 1.0)
-                )
-                chance = SupplyDemandEngine.calculate_chance_per_tick(
-                    rule.get("base_sale_chance", 0.05), multiplier
-                )
-                
-                sold = sum(1 for _ in range(int(qty)) if random.random() < chance)
-                if sold > 0:
-                    remove_item(player.id, item, sold)
-                    total_revenue += sold * current_p
-                    lines_successfully_produced += 1
+        wages.debit(biz.owner_id, wage_cost)
+        runnable.append((biz, config, wage_cost))
+    
+    for (biz, config, wage_cost), paid in zip(runnable, wages.commit()):
+        if not paid:
+            continue  # owner gone or short of cash
+        try:
+            wage_kept = _run_business(db, biz, config, wage_cost, current_tick, ledger)
+        except Exception:
+            ledger.credit(biz.owner_id, wage_cost)
+            raise
+        if not wage_kept:
+            ledger.credit(biz.owner_id, wage_cost)
+
+def _run_business(db, biz, config, wage_cost: float, current_tick: int, ledger) -> bool:
+    """
+    Run one due business whose wage has been paid.
+    Returns False if no production line could run (the wage is refunded).
+    """
+    from inventory import add_item, remove_item, get_player_inventory
+    import market
+    
+    player_id = biz.owner_id
+    cycles = config.get("cycles_to_complete", 1)
+    player_inv = get_player_inventory(player_id)
+    lines_successfully_produced = 0
+    
+    # ===== RETAIL CLASS =====
+    if config.get("class") == "retail":
+        total_revenue = 0.0
+        for item, rule in config.get("products", {}).items():
+            qty = player_inv.get(item, 0)
+            if qty <= 0: continue
             
-            # Always pay wages and reset progress for retail, even if no sales
-            net_revenue = total_revenue - wage_cost  # ← DEFINE net_revenue here!
-            player.cash_balance += net_revenue
-            biz.progress_ticks = 0
-            db.commit()
-            # Log retail revenue (if any)
-            if net_revenue > 0:
-                log_transaction(
-                    biz.owner_id,
-                    "cash_in",
-                    "money",
-                    net_revenue,
-                    f"Retail revenue: {biz.business_type}",
-                    str(biz.id)
-                )
-            continue
+            price_entry = db.query(RetailPrice).filter(
+                RetailPrice.player_id == player_id,
+                RetailPrice.item_type == item
+            ).first()
+            
+            mkt_p = market.get_market_price(item) or 10.0
+            current_p = price_entry.price if price_entry else mkt_p
+            
+            multiplier = SupplyDemandEngine.get_sales_multiplier(
+                current_p, mkt_p, rule.get("elasticity", 1.0)
+            )
+            chance = SupplyDemandEngine.calculate_chance_per_tick(
+                rule.get("base_sale_chance", 0.05), multiplier
+            )
+            
+            sold = sum(1 for _ in range(int(qty)) if random.random() < chance)
+            if sold > 0:
+                remove_item(player_id, item, sold)
+                total_revenue += sold * current_p
+                lines_successfully_produced += 1
+        
+        # Always pay wages and reset progress for retail, even if no sales
+        net_revenue = total_revenue - wage_cost  # ← DEFINE net_revenue here!
+        start_cycle(biz, current_tick, cycles)
+        db.commit()
+        ledger.credit(player_id, total_revenue)  # wage already debited
+        # Log retail revenue (if any)
+        if net_revenue > 0:
+            log_transaction(
+                biz.owner_id,
+                "cash_in",
+                "money",
+                net_revenue,
+                f"Retail revenue: {biz.business_type}",
+                str(biz.id)
+            )
+        return True
 
-        # ===== PRODUCTION CLASS =====
-        production_lines = config.get("production_lines", [])
-        for line in production_lines:
-            line_can_run = True
+    # ===== PRODUCTION CLASS =====
+    production_lines = config.get("production_lines", [])
+    for line in production_lines:
+        line_can_run = True
+        for req in line.get("inputs", []):
+            if player_inv.get(req["item"], 0) < req["quantity"]:
+                line_can_run = False
+                break
+        
+        if line_can_run:
             for req in line.get("inputs", []):
-                if player_inv.get(req["item"], 0) < req["quantity"]:
-                    line_can_run = False
-                    break
-            
-            if line_can_run:
-                for req in line.get("inputs", []):
-                    remove_item(player.id, req["item"], req["quantity"])
-                    # Log resource consumption
-                    log_transaction(
-                        biz.owner_id,
-                        "resource_use",
-                        "resource",
-                        -req["quantity"],  # negative because consumed
-                        f"Used {req['quantity']} {req['item']} in production",
-                        str(biz.id)
-                    )
-                    player_inv[req["item"]] -= req["quantity"]
-                add_item(player.id, line["output_item"], line["output_qty"])
-                # Log resource production
+                remove_item(player_id, req["item"], req["quantity"])
+                # Log resource consumption
                 log_transaction(
                     biz.owner_id,
-                    "resource_gain",
+                    "resource_use",
                     "resource",
-                    line["output_qty"],
-                    f"Produced {line['output_qty']} {line['output_item']}",
+                    -req["quantity"],  # negative because consumed
+                    f"Used {req['quantity']} {req['item']} in production",
                     str(biz.id)
                 )
-                lines_successfully_produced += 1
-                
-        # After all production lines processed - pay wages and subsidy
-        if lines_successfully_produced > 0:
-            # Pay city production subsidy (4.75% of input costs)
-            try:
-                from cities import pay_production_subsidy
-                production_cost = 0.0
-                for line in production_lines:
-                    for req in line.get("inputs", []):
-                        item_price = market.get_market_price(req["item"]) or 1.0
-                        production_cost += item_price * req["quantity"]
-                
-                subsidy = pay_production_subsidy(player.id, biz.id, production_cost)
-                if subsidy > 0:
-                    print(f"[Business] City subsidy: ${subsidy:.2f} to player {player.id}")
-            except ImportError:
-                pass
-            except Exception as e:
-                print(f"[Business] Subsidy error: {e}")
+                player_inv[req["item"]] -= req["quantity"]
+            add_item(player_id, line["output_item"], line["output_qty"])
+            # Log resource production
+            log_transaction(
+                biz.owner_id,
+                "resource_gain",
+                "resource",
+                line["output_qty"],
+                f"Produced {line['output_qty']} {line['output_item']}",
+                str(biz.id)
+            )
+            lines_successfully_produced += 1
             
-            player.cash_balance -= wage_cost
-            biz.progress_ticks = 0
-            db.commit()
+    # Nothing produced: the wage is refunded and the business retries next tick
+    if lines_successfully_produced == 0:
+        return False
+    
+    # Pay city production subsidy (4.75% of input costs)
+    try:
+        from cities import pay_production_subsidy
+        production_cost = 0.0
+        for line in production_lines:
+            for req in line.get("inputs", []):
+                item_price = market.get_market_price(req["item"]) or 1.0
+                production_cost += item_price * req["quantity"]
+        
+        subsidy = pay_production_subsidy(player_id, biz.id, production_cost)
+        if subsidy > 0:
+            print(f"[Business] City subsidy: ${subsidy:.2f} to player {player_id}")
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"[Business] Subsidy error: {e}")
+    
+    start_cycle(biz, current_tick, cycles)
+    db.commit()
+    return True
 
 def create_business(player_id: int, plot_id: int, business_type_key: str):
     """Create a business on a vacant land plot owned by the player."""
-    from land import LandPlot
+    from land import LandPlot, plot_is_compatible
     from auth import Player
     if business_type_key not in BUSINESS_TYPES:
         print(f"[Business] Unknown business type: {business_type_key}")
@@ -360,8 +537,7 @@ def create_business(player_id: int, plot_id: int, business_type_key: str):
             db.close()
             return None
             
-        allowed = config.get("allowed_terrain")
-        if allowed and plot.terrain_type not in allowed:
+        if config.get("allowed_terrain") and not plot_is_compatible(plot, business_type_key):
             print(f"[Business] Terrain {plot.terrain_type} not allowed.")
             db.close()
             return None
@@ -397,6 +573,7 @@ def create_business(player_id: int, plot_id: int, business_type_key: str):
             progress_ticks=0,
             is_active=True
         )
+        start_cycle(business, game_clock.current(), config.get("cycles_to_complete", 1))
         db.add(business)
         db.commit()
         db.refresh(business)
@@ -427,6 +604,10 @@ def toggle_business(player_id: int, business_id: int) -> bool:
             db.close()
             return False
         biz.is_active = not biz.is_active
+        if biz.is_active:
+            resume_cycle(biz, game_clock.current())
+        else:
+            pause_cycle(biz)
         db.commit()
         db.close()
         return True
@@ -472,13 +653,17 @@ def set_retail_price(player_id: int, item_type: str, price: float) -> bool:
 # =========================
 
 def get_district_business_types():
-    """Load district business types from district_businesses.json"""
+    """Load district business types from district_businesses.json (cached after first read)"""
+    global DISTRICT_BUSINESS_TYPES
+    if DISTRICT_BUSINESS_TYPES is not None:
+        return DISTRICT_BUSINESS_TYPES
     try:
         with open('district_businesses.json', 'r') as f:
-            return json.load(f)
+            DISTRICT_BUSINESS_TYPES = json.load(f)
     except FileNotFoundError:
         print("[Business] Warning: district_businesses.json not found")
         return {}
+    return DISTRICT_BUSINESS_TYPES
 
 # ==========================
 # FIXED create_district_business FUNCTION
@@ -556,6 +741,7 @@ def create_district_business(owner_id: int, district_id: int, business_type: str
             progress_ticks=0,
             is_active=True
         )
+        start_cycle(business, game_clock.current(), config.get("cycles_to_complete", 1))
         
         db.add(business)
         db.commit()
@@ -12,11 +12,13 @@ from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer,
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+import cluster
+
 # ==========================
 # DATABASE SETUP
 # ==========================
 
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -101,7 +103,11 @@ def get_db():
 
 
 def initialize():
+    import scheduler
     Base.metadata.create_all(bind=engine)
+    # Cleanup stale avatars every 720 ticks (60 minutes), only when the tick has time
+    scheduler.every("chat.avatar_cleanup", 720, cleanup_stale_avatars, cost=5.0,
+                    priority=scheduler.DEFERRABLE)
 
 
 # ==========================
@@ -307,19 +313,11 @@ def cleanup_stale_avatars(minutes: int = 60):
 
 def get_player_city(player_id: int) -> Optional[dict]:
     try:
-        from cities import get_db as get_cities_db, CityMember, City
-        db = get_cities_db()
-        member = db.query(CityMember).filter(CityMember.player_id == player_id).first()
-        if not member:
-            db.close()
-            return None
-        city = db.query(City).filter(City.id == member.city_id).first()
+        from cities import get_player_city_info
+        city = get_player_city_info(player_id)
         if not city:
-            db.close()
             return None
-        result = {"id": city.id, "name": city.name}
-        db.close()
-        return result
+        return {"id": city.id, "name": city.name}
     except Exception:
         return None
 
@@ -425,15 +423,8 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 
-# ==========================
-# TICK
-# ==========================
-
-_tick_counter = 0
+@cluster.replicated
+async def broadcast_to_room(room_id: str, message: dict):
+    """Send a message to a room's subscribers on every web worker."""
+    await manager.broadcast_to_room(room_id, message)
 
-async def tick(current_tick, now):
-    global _tick_counter
-    _tick_counter += 1
-    # Cleanup stale avatars every 720 ticks (60 minutes)
-    if _tick_counter % 720 == 0:
-        cleanup_stale_avatars(60)
@@ -13,7 +13,7 @@ from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Cookie, Form, Upl
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 
 from chat import (
-    manager, STATIC_ROOMS, ADMIN_PLAYER_IDS, DEFAULT_BAN_WORDS,
+    manager, broadcast_to_room, STATIC_ROOMS, ADMIN_PLAYER_IDS, DEFAULT_BAN_WORDS,
     MAX_MESSAGE_LENGTH, MAX_UPLOAD_BYTES,
     get_rooms_for_player, get_room_messages, save_message,
     get_user_ban_words, initialize_default_ban_words, set_user_ban_words,
@@ -33,9 +33,7 @@ def require_auth(session_token):
     """Check if user is authenticated."""
     try:
         import auth
-        db = auth.get_db()
-        player = auth.get_player_from_session(db, session_token)
-        db.close()
+        player = auth.get_session_player(session_token)
         if not player:
             return RedirectResponse(url="/login", status_code=303)
         return player
@@ -48,9 +46,7 @@ def validate_session_ws(session_token):
     """Validate a session token and return player or None (for WebSocket use)."""
     try:
         import auth
-        db = auth.get_db()
-        player = auth.get_player_from_session(db, session_token)
-        db.close()
+        player = auth.get_session_player(session_token)
         return player
     except Exception:
         return None
@@ -1275,7 +1271,7 @@ async def chat_websocket(websocket: WebSocket):
                 if saved:
                     saved["type"] = "message"
                     saved["avatar"] = manager.avatar_cache.get(player_id)
-                    await manager.broadcast_to_room(room_id, saved)
+                    await broadcast_to_room(room_id, saved)
 
                 manager.clear_typing(room_id, player_id)
                 typing_names = manager.get_typing_names(room_id)
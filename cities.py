@@ -16,18 +16,22 @@ Handles:
 - Poll tax system
 """
 
+import threading
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Optional, List, Tuple
+from typing import Dict, NamedTuple, Optional, List, Tuple
 from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer, Boolean, Text, Enum as SQLEnum
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from enum import Enum
 from stats_ux import log_transaction
+import deadlines
+import cluster
 
 # ==========================
 # DATABASE SETUP
 # ==========================
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 
 engine = create_engine(
     DATABASE_URL,
@@ -49,6 +53,9 @@ PRODUCTION_SUBSIDY_RATE = 0.0475  # 4.75%
 CURRENCY_SELL_DISCOUNT = 0.03  # Bank sells at 3% below market
 RESERVE_REQUIREMENT_PERCENT = 0.10  # 10% of total value
 RESERVE_SHORTFALL_FEE_MULTIPLIER = 1.25  # 125% fee for shortfall
+RESERVE_CHECK_INTERVAL_TICKS = 720  # Check all members every hour
+RESERVE_ENFORCEMENTS_PER_TICK = 5  # Failing members charged per tick
+MEMBERSHIP_CHECK_INTERVAL_TICKS = 3600  # Compare membership index with the database
 MAX_POLL_TAX_PERCENT = 0.035  # 3.5% of bank reserves
 GOVERNMENT_PLAYER_ID = 0
 GOV_GRANT_INTERVAL_TICKS = 8640  # 12 hours at 5 sec/tick
@@ -65,6 +72,10 @@ BANISHMENT_POLL_DURATION_TICKS = 17280  # 24 hours
 CURRENCY_POLL_DURATION_TICKS = 120960  # 7 days
 CURRENCY_CHANGE_COOLDOWN_TICKS = 518400  # 30 days
 
+# Members found below the reserve requirement, waiting for enforcement
+_reserve_queue = deque()
+_reserve_queued = set()
+
 # ==========================
 # ENUMS
 # ==========================
@@ -295,6 +306,55 @@ def get_player_total_value(player_id: int) -> float:
     return total
 
 
+def get_players_total_value(player_ids, prices: Optional[dict] = None, inventories: Optional[dict] = None) -> dict:
+    """
+    get_player_total_value() for many players in three set-based queries
+    (cash, inventory, businesses) priced from one market price snapshot.
+    
+    Args:
+        prices: {item_type: price} snapshot (loaded with market.get_market_prices if omitted)
+        inventories: optional dict filled with {player_id: {item_type: qty}} for reuse
+    """
+    from auth import Player
+    from inventory import InventoryItem
+    import market
+    from business import Business, BUSINESS_TYPES
+    
+    player_ids = list(set(player_ids))
+    totals = {pid: 0.0 for pid in player_ids}
+    if not player_ids:
+        return totals
+    if inventories is None:
+        inventories = {}
+    
+    db = get_db()
+    try:
+        # Cash balance
+        for pid, cash in db.query(Player.id, Player.cash_balance).filter(Player.id.in_(player_ids)).all():
+            totals[pid] += cash or 0.0
+        
+        # Inventory value at market prices
+        rows = db.query(InventoryItem.player_id, InventoryItem.item_type, InventoryItem.quantity).filter(
+            InventoryItem.player_id.in_(player_ids),
+            InventoryItem.quantity > 0
+        ).all()
+        if prices is None:
+            prices = market.get_market_prices({item_type for _, item_type, _ in rows})
+        for pid, item_type, quantity in rows:
+            inventories.setdefault(pid, {})[item_type] = quantity
+            totals[pid] += quantity * (prices.get(item_type) or 1.0)
+        
+        # Business value (startup costs)
+        for pid, business_type in db.query(Business.owner_id, Business.business_type).filter(
+            Business.owner_id.in_(player_ids)
+        ).all():
+            totals[pid] += BUSINESS_TYPES.get(business_type, {}).get("startup_cost", 2500.0)
+    finally:
+        db.close()
+    
+    return totals
+
+
 def get_city_by_id(city_id: int) -> Optional[City]:
     """Get a city by ID."""
     db = get_db()
@@ -313,14 +373,10 @@ def get_city_by_name(name: str) -> Optional[City]:
 
 def get_player_city(player_id: int) -> Optional[City]:
     """Get the city a player belongs to (if any)."""
-    db = get_db()
-    membership = db.query(CityMember).filter(CityMember.player_id == player_id).first()
-    if not membership:
-        db.close()
+    city_id = get_player_city_id(player_id)
+    if city_id is None:
         return None
-    city = db.query(City).filter(City.id == membership.city_id).first()
-    db.close()
-    return city
+    return get_city_by_id(city_id)
 
 
 def get_city_bank(city_id: int) -> Optional[CityBank]:
@@ -341,13 +397,7 @@ def get_city_members(city_id: int) -> List[CityMember]:
 
 def is_city_member(player_id: int, city_id: int) -> bool:
     """Check if a player is a member of a specific city."""
-    db = get_db()
-    member = db.query(CityMember).filter(
-        CityMember.player_id == player_id,
-        CityMember.city_id == city_id
-    ).first()
-    db.close()
-    return member is not None
+    return get_player_city_id(player_id) == city_id
 
 
 def is_mayor(player_id: int, city_id: int) -> bool:
@@ -358,6 +408,121 @@ def is_mayor(player_id: int, city_id: int) -> bool:
     return city is not None and city.mayor_id == player_id
 
 
+# ==========================
+# MEMBERSHIP INDEX
+# ==========================
+class CityInfo(NamedTuple):
+    """Routing view of a city held in memory (field names match City)."""
+    id: int
+    name: str
+    currency_type: Optional[str]
+    bank_id: Optional[int]
+
+
+# player_id -> city_id, city_id -> CityInfo
+# Loaded at startup and kept current by every function that changes
+# membership, a city's currency or its bank. The tables stay authoritative;
+# check_membership_index() repairs any drift.
+_member_city: Dict[int, int] = {}
+_city_info: Dict[int, CityInfo] = {}
+_index_lock = threading.Lock()
+
+
+def _read_membership_index(db) -> Tuple[Dict[int, int], Dict[int, CityInfo]]:
+    members = {pid: city_id for pid, city_id in db.query(CityMember.player_id, CityMember.city_id).all()}
+    bank_ids = {city_id: bank_id for bank_id, city_id in db.query(CityBank.id, CityBank.city_id).all()}
+    cities = {
+        city_id: CityInfo(city_id, name, currency_type, bank_ids.get(city_id))
+        for city_id, name, currency_type in db.query(City.id, City.name, City.currency_type).all()
+    }
+    return members, cities
+
+
+def load_membership_index() -> int:
+    """Build the membership index from the database. Returns the member count."""
+    global _member_city, _city_info
+    db = get_db()
+    try:
+        members, cities = _read_membership_index(db)
+    finally:
+        db.close()
+    with _index_lock:
+        _member_city = members
+        _city_info = cities
+    return len(members)
+
+
+@cluster.replicated
+def index_member(player_id: int, city_id: int):
+    """Record a committed membership."""
+    with _index_lock:
+        _member_city[player_id] = city_id
+
+
+@cluster.replicated
+def unindex_member(player_id: int):
+    """Drop a player from the index after their membership row is deleted."""
+    with _index_lock:
+        _member_city.pop(player_id, None)
+
+
+def index_city(city: City, bank: Optional[CityBank] = None):
+    """Record a committed city (and its bank). Keeps the known bank if none is given."""
+    _index_city_info(city.id, city.name, city.currency_type, bank.id if bank else None)
+
+
+@cluster.replicated
+def _index_city_info(city_id: int, name: str, currency_type, bank_id: Optional[int]):
+    with _index_lock:
+        known = _city_info.get(city_id)
+        if bank_id is None and known:
+            bank_id = known.bank_id
+        _city_info[city_id] = CityInfo(city_id, name, currency_type, bank_id)
+
+
+def get_player_city_id(player_id: int) -> Optional[int]:
+    """City ID a player belongs to (if any), from the index."""
+    return _member_city.get(player_id)
+
+
+def get_player_city_info(player_id: int) -> Optional[CityInfo]:
+    """Routing info for a player's city (if any), from the index."""
+    city_id = _member_city.get(player_id)
+    return _city_info.get(city_id) if city_id is not None else None
+
+
+def check_membership_index(repair: bool = True) -> List[str]:
+    """
+    Compare the index with the database.
+
+    Returns:
+        List of discrepancies (empty when consistent). With repair=True the
+        index is replaced by the database view whenever anything differs.
+    """
+    global _member_city, _city_info
+    db = get_db()
+    try:
+        members, cities = _read_membership_index(db)
+    finally:
+        db.close()
+
+    with _index_lock:
+        problems = []
+        for pid in members.keys() | _member_city.keys():
+            if members.get(pid) != _member_city.get(pid):
+                problems.append(f"player {pid}: index={_member_city.get(pid)} db={members.get(pid)}")
+        for city_id in cities.keys() | _city_info.keys():
+            if cities.get(city_id) != _city_info.get(city_id):
+                problems.append(f"city {city_id}: index={_city_info.get(city_id)} db={cities.get(city_id)}")
+        if problems and repair:
+            _member_city = members
+            _city_info = cities
+
+    if problems:
+        print(f"[Cities] Membership index drift ({len(problems)}): {'; '.join(problems[:5])}")
+    return problems
+
+
 # ==========================
 # CITY CREATION
 # ==========================
@@ -385,8 +550,7 @@ def create_city(founder_id: int, city_name: str, district_ids: List[int]) -> Tup
             return None, "Player not found"
         
         # Check founder isn't already in a city
-        existing_membership = db.query(CityMember).filter(CityMember.player_id == founder_id).first()
-        if existing_membership:
+        if get_player_city_id(founder_id) is not None:
             return None, "You are already a member of a city"
         
         # Validate city name is unique
@@ -458,6 +622,8 @@ def create_city(founder_id: int, city_name: str, district_ids: List[int]) -> Tup
             db.delete(district)
         
         db.commit()
+        index_city(city, bank)
+        index_member(founder_id, city.id)
         
         print(f"[Cities] Created city '{city_name}' (ID: {city.id}) by player {founder_id}")
         print(f"[Cities] Sacrificed {len(districts)} districts, bank reserves: ${CITY_CREATION_COST:,.2f}")
@@ -496,8 +662,7 @@ def apply_to_city(player_id: int, city_id: int) -> Tuple[Optional[CityApplicatio
             return None, "Player not found"
         
         # Check player isn't already in a city
-        existing_membership = db.query(CityMember).filter(CityMember.player_id == player_id).first()
-        if existing_membership:
+        if get_player_city_id(player_id) is not None:
             return None, "You are already a member of a city"
         
         # Validate city
@@ -547,6 +712,7 @@ def apply_to_city(player_id: int, city_id: int) -> Tuple[Optional[CityApplicatio
         db.add(poll)
         
         db.commit()
+        deadlines.schedule("city_polls", poll.id, poll.closes_at)
         
         print(f"[Cities] Application submitted: Player {player_id} → City {city_id}, fee: ${fee:,.2f}")
         
@@ -625,6 +791,7 @@ def process_application_approval(application_id: int) -> Tuple[bool, str]:
         
         application.status = "approved"
         db.commit()
+        index_member(application.applicant_id, application.city_id)
         
         print(f"[Cities] Application approved: Player {application.applicant_id} joined City {application.city_id}")
         print(f"[Cities] Fee ${application.calculated_fee:,.2f} paid to Mayor {city.mayor_id}")
@@ -689,6 +856,7 @@ def leave_city(player_id: int) -> Tuple[bool, str]:
         # Remove membership
         db.delete(membership)
         db.commit()
+        unindex_member(player_id)
         
         print(f"[Cities] Player {player_id} left City {city.id}, paid ${relocation_fee:,.2f} relocation fee")
         
@@ -747,6 +915,7 @@ def initiate_banishment(mayor_id: int, target_player_id: int, city_id: int) -> T
         )
         db.add(poll)
         db.commit()
+        deadlines.schedule("city_polls", poll.id, poll.closes_at)
         
         print(f"[Cities] Banishment poll started: City {city_id} vs Player {target_player_id}")
         
@@ -799,6 +968,7 @@ def process_banishment(city_id: int, player_id: int) -> Tuple[bool, str]:
         # Remove membership
         db.delete(membership)
         db.commit()
+        unindex_member(player_id)
         
         print(f"[Cities] Player {player_id} banished from City {city_id}, reimbursed ${reimbursement:,.2f}")
         
@@ -1016,6 +1186,7 @@ def initiate_currency_change(mayor_id: int, city_id: int, new_currency: str, pol
         city.last_currency_change_vote = datetime.utcnow()
         
         db.commit()
+        deadlines.schedule("city_polls", poll.id, poll.closes_at)
         
         print(f"[Cities] Currency change poll started: City {city_id} → {new_currency}")
         
@@ -1046,6 +1217,7 @@ def set_city_currency(city_id: int, currency_type: str) -> bool:
         bank.currency_type = currency_type
         
         db.commit()
+        index_city(city, bank)
         
         print(f"[Cities] City {city_id} currency set to: {currency_type}")
         
@@ -1286,6 +1458,61 @@ def check_member_reserves(player_id: int) -> Tuple[bool, float]:
         db.close()
 
 
+def find_reserve_shortfalls() -> List[Tuple[int, float]]:
+    """
+    Check every city member's reserve in one pass.
+    Members, their holdings and total values come from set-based queries and
+    a single price snapshot. Returns [(player_id, shortfall_value)] for the
+    members who fail.
+    """
+    import market
+    
+    db = get_db()
+    try:
+        members = db.query(CityMember.player_id, City.currency_type).join(
+            City, City.id == CityMember.city_id
+        ).filter(City.currency_type != None).all()
+    finally:
+        db.close()
+    if not members:
+        return []
+    
+    prices = market.get_market_prices()
+    inventories = {}
+    totals = get_players_total_value([pid for pid, _ in members], prices, inventories)
+    
+    shortfalls = []
+    for player_id, currency_type in members:
+        required_value = totals.get(player_id, 0.0) * RESERVE_REQUIREMENT_PERCENT
+        currency_qty = inventories.get(player_id, {}).get(currency_type, 0.0)
+        current_value = currency_qty * (prices.get(currency_type) or 1.0)
+        if current_value < required_value:
+            shortfalls.append((player_id, required_value - current_value))
+    return shortfalls
+
+
+def process_reserve_checks(current_tick: int):
+    """
+    Queue members failing the reserve check; enforce a few per tick.
+    enforce_reserve_requirement() re-checks each member before charging.
+    """
+    if current_tick % RESERVE_CHECK_INTERVAL_TICKS == 0:
+        failing = find_reserve_shortfalls()
+        queued = 0
+        for player_id, _ in failing:
+            if player_id not in _reserve_queued:
+                _reserve_queued.add(player_id)
+                _reserve_queue.append(player_id)
+                queued += 1
+        if queued:
+            print(f"[Cities] Reserve check: {queued} member(s) below requirement")
+    
+    for _ in range(min(RESERVE_ENFORCEMENTS_PER_TICK, len(_reserve_queue))):
+        player_id = _reserve_queue.popleft()
+        _reserve_queued.discard(player_id)
+        enforce_reserve_requirement(player_id)
+
+
 def enforce_reserve_requirement(player_id: int) -> Tuple[bool, str]:
     """
     Enforce reserve requirement - charge 125% fee and buy currency for member.
@@ -1458,6 +1685,7 @@ def request_government_loan(city_id: int, amount: float, current_tick: int) -> T
         bank.cash_reserves += amount
         
         db.commit()
+        deadlines.schedule("city_loans", loan.id, loan.next_payment_tick)
         
         print(f"[Cities] Loan granted to bank {bank.id}: ${amount:,.2f} principal, ${total_owed:,.2f} total owed")
         
@@ -1474,59 +1702,72 @@ def request_government_loan(city_id: int, amount: float, current_tick: int) -> T
 def process_loan_repayments(current_tick: int):
     """
     Process loan installment payments from city banks to government.
+    Only loans whose payment tick has come up in the deadline queue are loaded.
+    If the pass fails or is skipped, the due loans stay queued for the next tick.
     """
     from auth import Player
-    
-    db = get_db()
-    
-    try:
-        government = db.query(Player).filter(Player.id == GOVERNMENT_PLAYER_ID).first()
-        if not government:
+        
+    with deadlines.claim_due("city_loans", current_tick) as due_ids:
+        if not due_ids:
             return
         
-        # Find loans due for payment
-        due_loans = db.query(CityBankLoan).filter(
-            CityBankLoan.is_active == True,
-            CityBankLoan.next_payment_tick <= current_tick
-        ).all()
+        db = get_db()
         
-        for loan in due_loans:
-            bank = db.query(CityBank).filter(CityBank.id == loan.city_bank_id).first()
-            if not bank:
-                continue
+        try:
+            government = db.query(Player).filter(Player.id == GOVERNMENT_PLAYER_ID).first()
+            if not government:
+                return
             
-            payment = min(loan.installment_amount, loan.total_owed - loan.amount_paid)
+            # Find loans due for payment
+            due_loans = db.query(CityBankLoan).filter(
+                CityBankLoan.id.in_(due_ids.keys),
+                CityBankLoan.is_active == True,
+                CityBankLoan.next_payment_tick <= current_tick
+            ).all()
             
-            if bank.cash_reserves >= payment:
-                # Make payment
-                bank.cash_reserves -= payment
-                government.cash_balance += payment
-                loan.amount_paid += payment
-                loan.installments_remaining -= 1
+            rescheduled = []
+            
+            for loan in due_loans:
+                bank = db.query(CityBank).filter(CityBank.id == loan.city_bank_id).first()
+                if not bank:
+                    continue
                 
-                print(f"[Cities] Loan payment: Bank {bank.id} paid ${payment:,.2f} to government")
-            else:
-                # Bank is insolvent - needs another loan
-                shortfall = payment - bank.cash_reserves
-                print(f"[Cities] Bank {bank.id} is insolvent, needs ${shortfall:,.2f}")
+                payment = min(loan.installment_amount, loan.total_owed - loan.amount_paid)
                 
-                # Auto-request emergency loan
-                request_government_loan(bank.city_id, shortfall * 1.5, current_tick)
+                if bank.cash_reserves >= payment:
+                    # Make payment
+                    bank.cash_reserves -= payment
+                    government.cash_balance += payment
+                    loan.amount_paid += payment
+                    loan.installments_remaining -= 1
+                    
+                    print(f"[Cities] Loan payment: Bank {bank.id} paid ${payment:,.2f} to government")
+                else:
+                    # Bank is insolvent - needs another loan
+                    shortfall = payment - bank.cash_reserves
+                    print(f"[Cities] Bank {bank.id} is insolvent, needs ${shortfall:,.2f}")
+                    
+                    # Auto-request emergency loan
+                    request_government_loan(bank.city_id, shortfall * 1.5, current_tick)
+                
+                # Check if loan is fully paid
+                if loan.amount_paid >= loan.total_owed:
+                    loan.is_active = False
+                    print(f"[Cities] Loan {loan.id} fully repaid")
+                else:
+                    loan.next_payment_tick = current_tick + GOV_LOAN_INSTALLMENT_INTERVAL_TICKS
+                    rescheduled.append((loan.id, loan.next_payment_tick))
             
-            # Check if loan is fully paid
-            if loan.amount_paid >= loan.total_owed:
-                loan.is_active = False
-                print(f"[Cities] Loan {loan.id} fully repaid")
-            else:
-                loan.next_payment_tick = current_tick + GOV_LOAN_INSTALLMENT_INTERVAL_TICKS
-        
-        db.commit()
-        
-    except Exception as e:
-        db.rollback()
-        print(f"[Cities] Error processing loan repayments: {e}")
-    finally:
-        db.close()
+            db.commit()
+            due_ids.done_all()
+            for loan_id, due_tick in rescheduled:
+                deadlines.schedule("city_loans", loan_id, due_tick)
+            
+        except Exception as e:
+            db.rollback()
+            print(f"[Cities] Error processing loan repayments: {e}")
+        finally:
+            db.close()
 
 
 def assume_bank_debt(player_id: int, loan_id: int) -> Tuple[bool, str]:
@@ -1688,55 +1929,53 @@ def handle_outsider_trade(buyer_id: int, seller_id: int, item_type: str, quantit
     import inventory
     from auth import Player
     
+    # Routing is decided from the membership index - no database work
+    # unless the trade actually needs a currency conversion
+    buyer_city_id = get_player_city_id(buyer_id)
+    seller_city_id = get_player_city_id(seller_id)
+    
+    # If neither is in a city, proceed normally
+    if buyer_city_id is None and seller_city_id is None:
+        return True, "Normal trade"
+    
+    # If both are in the same city, proceed normally
+    if buyer_city_id == seller_city_id:
+        return True, "Same city trade"
+    
+    # Determine which city's currency applies (seller's city takes precedence)
+    if seller_city_id is not None:
+        city = _city_info.get(seller_city_id)
+        city_member_id = seller_id
+        outsider_id = buyer_id
+        outsider_is_buyer = True
+    else:
+        city = _city_info.get(buyer_city_id)
+        city_member_id = buyer_id
+        outsider_id = seller_id
+        outsider_is_buyer = False
+    
+    if not city or not city.currency_type:
+        return True, "City has no currency requirement"
+    
+    # If outsider is SELLER, no currency conversion needed
+    if not outsider_is_buyer:
+        return True, "Outsider is seller - normal transfer"
+    
+    # ========================================
+    # PETRODOLLAR: Outsider BUYS from city member
+    # ========================================
+    trade_value = quantity * price
+    
+    if trade_value <= 0:
+        return True, "Zero value trade"
+    
+    if city.bank_id is None:
+        return True, "No city bank"
+    
     db = get_db()
     
     try:
-        # Check if either party is in a city with a currency
-        buyer_membership = db.query(CityMember).filter(CityMember.player_id == buyer_id).first()
-        seller_membership = db.query(CityMember).filter(CityMember.player_id == seller_id).first()
-        
-        # If neither is in a city, proceed normally
-        if not buyer_membership and not seller_membership:
-            return True, "Normal trade"
-        
-        # If both are in the same city, proceed normally
-        if buyer_membership and seller_membership:
-            if buyer_membership.city_id == seller_membership.city_id:
-                return True, "Same city trade"
-        
-        # Determine which city's currency applies (seller's city takes precedence)
-        city = None
-        city_member_id = None
-        outsider_id = None
-        outsider_is_buyer = False
-        
-        if seller_membership:
-            city = db.query(City).filter(City.id == seller_membership.city_id).first()
-            city_member_id = seller_id
-            outsider_id = buyer_id
-            outsider_is_buyer = True
-        elif buyer_membership:
-            city = db.query(City).filter(City.id == buyer_membership.city_id).first()
-            city_member_id = buyer_id
-            outsider_id = seller_id
-            outsider_is_buyer = False
-        
-        if not city or not city.currency_type:
-            return True, "City has no currency requirement"
-        
-        # If outsider is SELLER, no currency conversion needed
-        if not outsider_is_buyer:
-            return True, "Outsider is seller - normal transfer"
-        
-        # ========================================
-        # PETRODOLLAR: Outsider BUYS from city member
-        # ========================================
-        trade_value = quantity * price
-        
-        if trade_value <= 0:
-            return True, "Zero value trade"
-        
-        bank = db.query(CityBank).filter(CityBank.city_id == city.id).first()
+        bank = db.query(CityBank).filter(CityBank.id == city.bank_id).first()
         if not bank:
             return True, "No city bank"
         
@@ -1978,9 +2217,37 @@ def initialize():
     db.close()
     
     print(f"[Cities] Current state: {city_count} cities")
+    
+    member_count = load_membership_index()
+    print(f"[Cities] Membership index: {member_count} members")
+    
+    deadlines.register("city_polls", _load_poll_deadlines)
+    deadlines.register("city_loans", _load_loan_deadlines)
     print("[Cities] Module initialized")
 
 
+def _load_poll_deadlines():
+    db = get_db()
+    try:
+        rows = db.query(CityPoll.id, CityPoll.closes_at).filter(
+            CityPoll.status == PollStatus.ACTIVE
+        ).all()
+        return [(poll_id, closes_at) for poll_id, closes_at in rows]
+    finally:
+        db.close()
+
+
+def _load_loan_deadlines():
+    db = get_db()
+    try:
+        rows = db.query(CityBankLoan.id, CityBankLoan.next_payment_tick).filter(
+            CityBankLoan.is_active == True
+        ).all()
+        return [(loan_id, due_tick) for loan_id, due_tick in rows]
+    finally:
+        db.close()
+
+
 async def tick(current_tick: int, now: datetime):
     """
     Cities module tick handler.
@@ -1990,21 +2257,15 @@ async def tick(current_tick: int, now: datetime):
     - Government grants (every 12 hours)
     - Loan repayments
     - Reserve requirement checks
+    - Membership index consistency
     - Bank currency listing
     """
-    db = get_db()
-    
     try:
         # Close expired polls
-        expired_polls = db.query(CityPoll).filter(
-            CityPoll.status == PollStatus.ACTIVE,
-            CityPoll.closes_at <= now
-        ).all()
-        
-        for poll in expired_polls:
-            close_poll(poll.id)
-        
-        db.close()
+        with deadlines.claim_due("city_polls", now) as due_polls:
+            for poll_id in due_polls:
+                close_poll(poll_id)
+                due_polls.done(poll_id)
         
         # Government grants every 12 hours
         if current_tick % GOV_GRANT_INTERVAL_TICKS == 0:
@@ -2014,15 +2275,11 @@ async def tick(current_tick: int, now: datetime):
         process_loan_repayments(current_tick)
         
         # Reserve requirement checks every hour (720 ticks)
-        if current_tick % 720 == 0:
-            db2 = get_db()
-            members = db2.query(CityMember).all()
-            db2.close()
-            
-            for member in members:
-                meets, shortfall = check_member_reserves(member.player_id)
-                if not meets:
-                    enforce_reserve_requirement(member.player_id)
+        process_reserve_checks(current_tick)
+        
+        # Membership index consistency check every 5 hours
+        if current_tick % MEMBERSHIP_CHECK_INTERVAL_TICKS == 0:
+            check_membership_index()
         
         # Bank currency listing every 30 minutes (360 ticks)
         if current_tick % 360 == 0:
@@ -2063,6 +2320,8 @@ __all__ = [
     'get_city_by_id',
     'get_city_by_name',
     'get_player_city',
+    'get_player_city_id',
+    'get_player_city_info',
     'get_city_stats',
     'get_all_cities',
     
@@ -2073,6 +2332,8 @@ __all__ = [
     'get_city_members',
     'is_city_member',
     'is_mayor',
+    'CityInfo',
+    'check_membership_index',
     
     # Voting
     'cast_vote',
@@ -0,0 +1,458 @@
+"""
+cluster.py
+
+Process roles for running the simulation alongside several web workers.
+Handles:
+- Deployment roles: "all" (web + tick, the default), "sim" (tick only) and
+  "web" (HTTP and websockets only)
+- A tick leader lock so exactly one process runs tick_loop
+- A local IPC hub (Unix socket) owned by the tick leader
+- Replicated calls that keep each process's in-memory indexes in step
+- Tick announcements so web workers follow the game clock
+
+Modules keep in-memory indexes over their tables (player snapshots, lien
+balances, bid books, city membership, deadline queues). In one process they
+stay in step because every write goes through that process. With several, a
+write handled by one web worker must reach the others and the tick leader.
+The functions that maintain those indexes are therefore wrapped with
+@replicated: the call runs locally and is then re-applied in every other
+process. Deadline queues are only read by the tick, so leader_only calls are
+forwarded to the leader instead of being mirrored everywhere.
+
+The leader lock is an OS file lock (flock), released by the kernel when its
+holder exits, so a crashed leader never needs manual cleanup. In the "all"
+role every worker competes for it: one ticks, the rest follow, and a
+follower takes over when the leader's hub goes away. Messages are
+best-effort. deadlines.resync_all and each module's loaders remain the safety
+net, as they already are for rows changed outside the ORM.
+
+Messages are pickled, so the socket is created owner-only next to the
+database; only processes of this deployment can connect.
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import os
+import pickle
+import struct
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # no flock (Windows): single-process deployments only
+    fcntl = None
+
+# ==========================
+# CONFIGURATION
+# ==========================
+ROLES = ("all", "sim", "web")
+ROLE = os.environ.get("WADSWORTH_ROLE", "all")
+LOCK_PATH = os.environ.get("WADSWORTH_TICK_LOCK", "./wadsworth.tick.lock")
+INIT_LOCK_PATH = LOCK_PATH + ".init"
+SOCKET_PATH = os.environ.get("WADSWORTH_IPC_SOCKET", "./wadsworth.ipc.sock")
+
+FLUSH_INTERVAL = 0.05          # seconds between outbox flushes
+RETRY_INTERVAL = 2.0           # seconds between hub reconnects / leader lock attempts
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+_HEADER = struct.Struct("!I")
+
+# ==========================
+# STATE
+# ==========================
+is_leader = False
+_started = False
+_lock_fd: Optional[int] = None
+
+# name -> (function, coalesce, leader_only)
+_handlers: Dict[str, Tuple[Callable, bool, bool]] = {}
+_applying = contextvars.ContextVar("cluster_applying", default=False)
+_outbox: List[tuple] = []
+_outbox_lock = threading.Lock()
+
+_server = None
+_peers: Set[asyncio.StreamWriter] = set()      # leader: connected followers
+_upstream: Optional[asyncio.StreamWriter] = None  # follower: connection to the leader
+_tasks: List[asyncio.Task] = []
+_on_leader: Optional[Callable] = None
+_tick_hooks: List[Callable] = []
+
+stats = {"sent": 0, "received": 0, "dropped": 0, "failovers": 0}
+
+# ==========================
+# LEADER LOCK
+# ==========================
+def _open_lock(path: str) -> int:
+    return os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+
+
+def acquire_leader_lock() -> bool:
+    """Take the tick leader lock without blocking. True if this process holds it."""
+    global _lock_fd
+    if _lock_fd is not None:
+        return True
+    fd = _open_lock(LOCK_PATH)
+    if fcntl is not None:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+    os.ftruncate(fd, 0)
+    os.write(fd, str(os.getpid()).encode())
+    _lock_fd = fd
+    return True
+
+
+def release_leader_lock():
+    global _lock_fd
+    if _lock_fd is None:
+        return
+    if fcntl is not None:
+        fcntl.flock(_lock_fd, fcntl.LOCK_UN)
+    os.close(_lock_fd)
+    _lock_fd = None
+
+
+@contextmanager
+def init_lock():
+    """Run module initialization (create_all, migrations) one process at a time."""
+    fd = _open_lock(INIT_LOCK_PATH)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+# ==========================
+# REPLICATED CALLS
+# ==========================
+def _forwarding(leader_only: bool) -> bool:
+    """True when a leader_only call made here belongs to another process."""
+    return leader_only and _started and not is_leader
+
+
+def replicated(fn: Optional[Callable] = None, *, coalesce: bool = False, leader_only: bool = False):
+    """
+    Mirror calls to fn in every other process.
+
+    Args:
+        coalesce: identical calls within one flush are sent once (idempotent
+                  invalidations)
+        leader_only: only the tick leader applies the call; other processes
+                     forward it and return None
+
+    Replicated functions must take picklable arguments and only touch
+    in-process state (or re-read committed rows).
+    """
+    def wrap(fn):
+        name = f"{fn.__module__}.{fn.__qualname__}"
+        _handlers[name] = (fn, coalesce, leader_only)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def call(*args, **kwargs):
+                result = await fn(*args, **kwargs)
+                publish(name, args, kwargs)
+                return result
+        else:
+            @functools.wraps(fn)
+            def call(*args, **kwargs):
+                if _forwarding(leader_only):
+                    publish(name, args, kwargs)
+                    return None
+                result = fn(*args, **kwargs)
+                if not leader_only:
+                    publish(name, args, kwargs)
+                return result
+        return call
+
+    return wrap(fn) if fn is not None else wrap
+
+
+def _connected() -> bool:
+    return bool(_peers) if is_leader else _upstream is not None
+
+
+def publish(name: str, args: tuple = (), kwargs: Optional[dict] = None):
+    """Queue a call for the other processes (thread-safe; dropped when alone)."""
+    if not _started or _applying.get():
+        return
+    if not _connected():
+        if not is_leader:
+            stats["dropped"] += 1
+        return
+    with _outbox_lock:
+        _outbox.append((name, tuple(args), kwargs or {}))
+
+
+def _coalesce(batch: List[tuple]) -> List[tuple]:
+    seen = set()
+    result = []
+    for message in batch:
+        entry = _handlers.get(message[0])
+        if entry is not None and entry[1]:
+            try:
+                key = (message[0], message[1], tuple(sorted(message[2].items())))
+                if key in seen:
+                    continue
+                seen.add(key)
+            except TypeError:
+                pass
+        result.append(message)
+    return result
+
+
+def _encode(batch: List[tuple]) -> Optional[bytes]:
+    if not batch:
+        return None
+    try:
+        payload = pickle.dumps(batch, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        # Drop only the messages that can't be pickled
+        kept = []
+        for message in batch:
+            try:
+                pickle.dumps(message)
+                kept.append(message)
+            except Exception as e:
+                stats["dropped"] += 1
+                print(f"[Cluster] Cannot send {message[0]}: {e}")
+        if not kept:
+            return None
+        payload = pickle.dumps(kept, protocol=pickle.HIGHEST_PROTOCOL)
+    return _HEADER.pack(len(payload)) + payload
+
+
+async def _send(writer: asyncio.StreamWriter, frame: bytes) -> bool:
+    try:
+        writer.write(frame)
+        await writer.drain()
+        return True
+    except (ConnectionError, RuntimeError):
+        _peers.discard(writer)
+        return False
+
+
+async def flush():
+    """Send everything queued since the last flush."""
+    with _outbox_lock:
+        if not _outbox:
+            return
+        batch = _coalesce(_outbox[:])
+        _outbox.clear()
+    frame = _encode(batch)
+    if frame is None:
+        return
+    targets = list(_peers) if is_leader else ([_upstream] if _upstream is not None else [])
+    for writer in targets:
+        if await _send(writer, frame):
+            stats["sent"] += len(batch)
+
+
+async def _flush_loop():
+    while True:
+        await asyncio.sleep(FLUSH_INTERVAL)
+        try:
+            await flush()
+        except Exception as e:
+            print(f"[Cluster] Flush failed: {e}")
+
+
+async def _read_frames(reader: asyncio.StreamReader):
+    while True:
+        (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+        if size > MAX_FRAME_BYTES:
+            raise ConnectionError(f"frame of {size} bytes")
+        yield pickle.loads(await reader.readexactly(size))
+
+
+async def _apply(batch: List[tuple]):
+    """Run received calls locally without publishing them again."""
+    token = _applying.set(True)
+    try:
+        for name, args, kwargs in batch:
+            entry = _handlers.get(name)
+            if entry is None:
+                continue
+            try:
+                result = entry[0](*args, **kwargs)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                print(f"[Cluster] {name} failed: {e}")
+    finally:
+        _applying.reset(token)
+    stats["received"] += len(batch)
+
+# ==========================
+# TICK ANNOUNCEMENTS
+# ==========================
+def on_tick(callback: Callable):
+    """Register callback(tick) run in follower processes for every leader tick (may be async)."""
+    if callback not in _tick_hooks:
+        _tick_hooks.append(callback)
+
+
+async def _follow_tick(tick: int):
+    for callback in _tick_hooks:
+        result = callback(tick)
+        if inspect.isawaitable(result):
+            await result
+
+_handlers["cluster.tick"] = (_follow_tick, False, False)
+
+
+def publish_tick(tick: int):
+    """Announce a tick to the followers (called by the leader's tick loop)."""
+    publish("cluster.tick", (tick,))
+
+# ==========================
+# HUB (LEADER) AND FOLLOWER
+# ==========================
+async def _serve_peer(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    _peers.add(writer)
+    print(f"[Cluster] Follower connected ({len(_peers)} total)")
+    try:
+        async for batch in _read_frames(reader):
+            await _apply(batch)
+            relay = [m for m in batch if not _handlers.get(m[0], (None, False, False))[2]]
+            frame = _encode(relay)
+            if frame is None:
+                continue
+            for other in list(_peers):
+                if other is not writer:
+                    await _send(other, frame)
+    except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+        pass  # follower left, or the hub is shutting down
+    except Exception as e:
+        print(f"[Cluster] Follower connection error: {e}")
+    finally:
+        _peers.discard(writer)
+        writer.close()
+        print(f"[Cluster] Follower disconnected ({len(_peers)} remaining)")
+
+
+async def _become_leader():
+    global is_leader, _server
+    is_leader = True
+    if hasattr(asyncio, "start_unix_server"):
+        if os.path.exists(SOCKET_PATH):
+            os.unlink(SOCKET_PATH)  # left by a dead leader; we hold the lock now
+        _server = await asyncio.start_unix_server(_serve_peer, path=SOCKET_PATH)
+        os.chmod(SOCKET_PATH, 0o600)
+        print(f"[Cluster] Tick leader (pid {os.getpid()}), hub at {SOCKET_PATH}")
+    else:
+        print(f"[Cluster] Tick leader (pid {os.getpid()}), no IPC on this platform")
+    if _on_leader is not None:
+        await _on_leader()
+
+
+async def _follow():
+    """Stay connected to the leader's hub; take over the tick if it goes away."""
+    global _upstream
+    while True:
+        try:
+            reader, writer = await asyncio.open_unix_connection(SOCKET_PATH)
+        except OSError:
+            reader = writer = None
+        if writer is not None:
+            _upstream = writer
+            print(f"[Cluster] {ROLE} worker (pid {os.getpid()}) following the tick leader")
+            try:
+                async for batch in _read_frames(reader):
+                    await _apply(batch)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass
+            finally:
+                _upstream = None
+                writer.close()
+            print("[Cluster] Lost the tick leader")
+        if ROLE != "web" and acquire_leader_lock():
+            stats["failovers"] += 1
+            await _become_leader()
+            return
+        await asyncio.sleep(RETRY_INTERVAL)
+
+
+async def start(on_leader: Callable):
+    """
+    Join the deployment: take the leader lock if this role may tick, else
+    follow the leader's hub. on_leader() (async) starts the tick loop and is
+    called whenever this process becomes leader, including on failover.
+    """
+    global _started, _on_leader
+    if ROLE not in ROLES:
+        raise ValueError(f"Unknown role {ROLE!r} (expected one of {', '.join(ROLES)})")
+    if not hasattr(asyncio, "open_unix_connection") and ROLE == "web":
+        raise RuntimeError("The web role needs Unix sockets; run the default role instead")
+    _on_leader = on_leader
+    _started = True
+    _tasks.append(asyncio.create_task(_flush_loop()))
+    if ROLE != "web" and acquire_leader_lock():
+        await _become_leader()
+    elif hasattr(asyncio, "open_unix_connection"):
+        _tasks.append(asyncio.create_task(_follow()))
+    else:
+        print("[Cluster] Another process holds the tick; this one will not tick")
+
+
+async def stop():
+    """Leave the deployment: stop IPC and release the leader lock."""
+    global _server, is_leader, _started
+    try:
+        await flush()
+    except Exception:
+        pass
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
+    for writer in list(_peers):
+        writer.close()
+    _peers.clear()
+    if _server is not None:
+        _server.close()
+        await _server.wait_closed()
+        _server = None
+        if os.path.exists(SOCKET_PATH):
+            os.unlink(SOCKET_PATH)
+    release_leader_lock()
+    is_leader = False
+    _started = False
+
+
+def get_stats() -> dict:
+    return {
+        "role": ROLE,
+        "pid": os.getpid(),
+        "leader": is_leader,
+        "followers": len(_peers),
+        "connected": _upstream is not None,
+        **stats
+    }
+
+
+__all__ = [
+    'ROLES',
+    'ROLE',
+    'is_leader',
+    'acquire_leader_lock',
+    'release_leader_lock',
+    'init_lock',
+    'replicated',
+    'publish',
+    'flush',
+    'on_tick',
+    'publish_tick',
+    'start',
+    'stop',
+    'get_stats'
+]
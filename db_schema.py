@@ -0,0 +1,76 @@
+"""
+db_schema.py
+
+Minimal additive schema upgrades for the shared SQLite database.
+
+Base.metadata.create_all() only creates missing tables; it never adds new
+columns to tables that already exist in wadsworth.db. Modules that grow a
+column call ensure_columns() from their initialize() so existing saves keep
+working without a manual migration.
+
+DATABASE_URL is the one place the database location is configured. Every
+module builds its engine from it. WADSWORTH_DATABASE_URL overrides it, e.g.
+to point simulate.py at a scratch database.
+"""
+
+import os
+from typing import Dict
+from sqlalchemy import inspect, text
+
+DATABASE_URL = os.environ.get("WADSWORTH_DATABASE_URL", "sqlite:///./wadsworth.db")
+
+
+def ensure_columns(engine, table_name: str, columns: Dict[str, str]) -> list:
+    """
+    Add any missing columns to an existing table.
+
+    Args:
+        engine: SQLAlchemy engine bound to the database
+        table_name: Table to upgrade
+        columns: {column_name: "SQL type and default"}, e.g.
+                 {"efficiency_tick": "INTEGER DEFAULT 0"}
+
+    Returns:
+        List of column names that were added
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(table_name):
+        return []
+
+    existing = {col["name"] for col in inspector.get_columns(table_name)}
+    added = []
+    with engine.begin() as conn:
+        for name, ddl in columns.items():
+            if name in existing:
+                continue
+            conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {name} {ddl}"))
+            added.append(name)
+
+    if added:
+        print(f"[Schema] {table_name}: added column(s) {', '.join(added)}")
+    return added
+
+
+def ensure_indexes(engine, table_name: str, indexes: Dict[str, str]) -> list:
+    """
+    Create any missing indexes on an existing table.
+
+    Args:
+        indexes: {index_name: "col_a, col_b"}
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(table_name):
+        return []
+
+    existing = {ix["name"] for ix in inspector.get_indexes(table_name)}
+    added = []
+    with engine.begin() as conn:
+        for name, cols in indexes.items():
+            if name in existing:
+                continue
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table_name} ({cols})"))
+            added.append(name)
+    return added
+
+
+__all__ = ['DATABASE_URL', 'ensure_columns', 'ensure_indexes']
@@ -0,0 +1,237 @@
+"""
+deadlines.py
+
+In-memory deadline queues for tick handlers.
+Handles:
+- Min-heap of due events per queue (poll closes, loan payments, auctions, ...)
+- Rescheduling and cancellation (stale heap entries are skipped on pop)
+- Rebuilding each queue from its source table on startup
+- A coarse periodic resync as a safety net for rows changed elsewhere
+
+The source rows remain the durable record of every deadline; a queue is just
+an index over them. Modules register a loader that yields (key, due) pairs,
+schedule keys whenever they write a deadline column, and claim due keys in
+their tick. A tick with nothing due does no database work at all.
+
+A claimed key is only consumed once the handler acknowledges it; keys left
+unacknowledged (an exception, a rollback, an early return) go back on the
+queue at their original deadline and are retried on the next pass. Handlers
+re-check the source row, so retrying a key that was in fact handled is a
+no-op.
+
+Queues are either tick-keyed (due is an absolute game tick, see
+game_clock.py) or time-keyed (due is a naive-UTC datetime); a single queue
+never mixes the two.
+
+Only the tick leader pops queues, so schedule() and cancel() made in a web
+worker are forwarded to it (see cluster.py); keys and dues must be picklable.
+"""
+
+import heapq
+import itertools
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import cluster
+
+RESYNC_INTERVAL = 3600  # ticks between full rebuilds from the database
+
+
+class DeadlineQueue:
+    """
+    Min-heap of (due, key) with at most one live deadline per key.
+
+    schedule() on an existing key supersedes its previous deadline; the old
+    heap entry is left in place and discarded when it surfaces.
+    """
+
+    def __init__(self, name: str, loader: Optional[Callable[[], Iterable[Tuple[Hashable, Any]]]] = None):
+        self.name = name
+        self.loader = loader
+        self._heap = []
+        self._due: Dict[Hashable, Any] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def schedule(self, key: Hashable, due):
+        """Set (or move) the deadline for key. A None due cancels it."""
+        if due is None:
+            self.cancel(key)
+            return
+        with self._lock:
+            self._due[key] = due
+            heapq.heappush(self._heap, (due, next(self._seq), key))
+            self._compact()
+
+    def cancel(self, key: Hashable):
+        with self._lock:
+            self._due.pop(key, None)
+
+    def pop_due(self, now) -> List[Hashable]:
+        """Remove and return every key whose deadline is <= now, oldest first."""
+        return [key for key, _ in self._pop_entries(now)]
+
+    def claim(self, now) -> "DueClaim":
+        """Like pop_due, but keys not acknowledged on the claim are put back."""
+        return DueClaim(self, self._pop_entries(now))
+
+    def restore(self, entries: Iterable[Tuple[Hashable, Any]]):
+        """Re-queue popped keys at their old deadlines, unless rescheduled meanwhile."""
+        with self._lock:
+            for key, due in entries:
+                if key in self._due:
+                    continue
+                self._due[key] = due
+                heapq.heappush(self._heap, (due, next(self._seq), key))
+
+    def _pop_entries(self, now) -> List[Tuple[Hashable, Any]]:
+        fired = []
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= now:
+                due, _, key = heapq.heappop(heap)
+                if self._due.get(key) != due:
+                    continue  # superseded or cancelled
+                del self._due[key]
+                fired.append((key, due))
+        return fired
+
+    def next_due(self):
+        """Earliest live deadline, or None if the queue is empty."""
+        with self._lock:
+            while self._heap and self._due.get(self._heap[0][2]) != self._heap[0][0]:
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def due_for(self, key: Hashable):
+        return self._due.get(key)
+
+    def rebuild(self) -> int:
+        """Replace the queue contents with the loader's current view of the database."""
+        if self.loader is None:
+            return len(self._due)
+        entries = [(key, due) for key, due in self.loader() if due is not None]
+        with self._lock:
+            self._due = dict(entries)
+            self._heap = [(due, next(self._seq), key) for key, due in entries]
+            heapq.heapify(self._heap)
+        return len(entries)
+
+    def _compact(self):
+        # Keep stale entries from piling up when deadlines move often
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._heap = [entry for entry in self._heap if self._due.get(entry[2]) == entry[0]]
+            heapq.heapify(self._heap)
+
+    def __len__(self):
+        return len(self._due)
+
+class DueClaim:
+    """
+    Keys taken off a queue for processing, oldest first.
+
+    Use as a context manager around the handler: keys passed to done() (or
+    all of them, via done_all()) are consumed, everything else is restored
+    to the queue on exit.
+    """
+
+    def __init__(self, queue: DeadlineQueue, entries: List[Tuple[Hashable, Any]]):
+        self.queue = queue
+        self.keys = [key for key, _ in entries]
+        self._pending = dict(entries)
+
+    def done(self, key: Hashable):
+        self._pending.pop(key, None)
+
+    def done_all(self):
+        self._pending.clear()
+
+    def release(self) -> int:
+        """Put unacknowledged keys back on the queue; returns how many."""
+        pending, self._pending = self._pending, {}
+        if pending:
+            self.queue.restore(pending.items())
+        return len(pending)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+        return False
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def __len__(self):
+        return len(self.keys)
+
+# ==========================
+# REGISTRY
+# ==========================
+queues: Dict[str, DeadlineQueue] = {}
+
+
+def get_queue(name: str) -> DeadlineQueue:
+    """Get (or create) a named queue."""
+    queue = queues.get(name)
+    if queue is None:
+        queue = DeadlineQueue(name)
+        queues[name] = queue
+    return queue
+
+
+def register(name: str, loader: Callable[[], Iterable[Tuple[Hashable, Any]]]) -> DeadlineQueue:
+    """
+    Attach a loader to a queue and build it from the database.
+    Called from the owning module's initialize().
+    """
+    queue = get_queue(name)
+    queue.loader = loader
+    try:
+        count = queue.rebuild()
+        print(f"[Deadlines] {name}: {count} pending")
+    except Exception as e:
+        print(f"[Deadlines] {name}: rebuild failed: {e}")
+    return queue
+
+
+@cluster.replicated(leader_only=True)
+def schedule(name: str, key: Hashable, due):
+    get_queue(name).schedule(key, due)
+
+
+@cluster.replicated(leader_only=True)
+def cancel(name: str, key: Hashable):
+    get_queue(name).cancel(key)
+
+
+def pop_due(name: str, now) -> List[Hashable]:
+    return get_queue(name).pop_due(now)
+
+
+def claim_due(name: str, now) -> DueClaim:
+    return get_queue(name).claim(now)
+
+
+def resync_all():
+    """Rebuild every registered queue (scheduled every RESYNC_INTERVAL ticks)."""
+    for name, queue in queues.items():
+        try:
+            queue.rebuild()
+        except Exception as e:
+            print(f"[Deadlines] {name}: resync failed: {e}")
+
+
+__all__ = [
+    'DeadlineQueue',
+    'DueClaim',
+    'get_queue',
+    'register',
+    'schedule',
+    'cancel',
+    'pop_due',
+    'claim_due',
+    'resync_all',
+    'RESYNC_INTERVAL'
+]
@@ -13,20 +13,24 @@ Handles:
 - Trade execution
 - Market statistics
 - District market ticker
+- In-memory best bid/ask per item so ticks only match crossed books
 """
 
 import json
+import threading
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Dict, Optional, List, Set
 from enum import Enum
 from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+import cluster
+
 # ==========================
 # DATABASE SETUP
 # ==========================
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 
 engine = create_engine(
     DATABASE_URL,
@@ -120,6 +124,144 @@ def get_db():
         db.close()
         raise
 
+# ==========================
+# BOOK INDEX
+# ==========================
+RESTING_STATUSES = (OrderStatus.ACTIVE, OrderStatus.PARTIALLY_FILLED)
+BOOK_RESYNC_INTERVAL = 3600  # ticks between full rebuilds from the database
+
+
+class ItemBook:
+    """
+    Resting orders of one item (order_id -> limit price) with cached best
+    bid and ask. Market orders rest with no price; they are treated as a
+    bid at +inf or an ask at -inf, since match_order fills them at any price.
+    """
+
+    __slots__ = ("bids", "asks", "_best_bid", "_best_ask")
+
+    def __init__(self):
+        self.bids: Dict[int, float] = {}
+        self.asks: Dict[int, float] = {}
+        self._best_bid = None  # None = recompute on next read
+        self._best_ask = None
+
+    def add(self, order_id: int, side: str, price: Optional[float]):
+        self.remove(order_id)  # a re-priced best order must not stay cached
+        if side == OrderType.BUY:
+            level = float("inf") if price is None else price
+            self.bids[order_id] = level
+            if self._best_bid is not None and level > self._best_bid:
+                self._best_bid = level
+        else:
+            level = float("-inf") if price is None else price
+            self.asks[order_id] = level
+            if self._best_ask is not None and level < self._best_ask:
+                self._best_ask = level
+
+    def remove(self, order_id: int):
+        level = self.bids.pop(order_id, None)
+        if level is not None and level == self._best_bid:
+            self._best_bid = None
+        level = self.asks.pop(order_id, None)
+        if level is not None and level == self._best_ask:
+            self._best_ask = None
+
+    def best_bid(self) -> Optional[float]:
+        if not self.bids:
+            return None
+        if self._best_bid is None:
+            self._best_bid = max(self.bids.values())
+        return self._best_bid
+
+    def best_ask(self) -> Optional[float]:
+        if not self.asks:
+            return None
+        if self._best_ask is None:
+            self._best_ask = min(self.asks.values())
+        return self._best_ask
+
+    def is_crossed(self) -> bool:
+        bid, ask = self.best_bid(), self.best_ask()
+        return bid is not None and ask is not None and bid >= ask
+
+    def __len__(self):
+        return len(self.bids) + len(self.asks)
+
+
+class BookIndex:
+    """
+    ItemBook per item plus the set of items whose book is currently crossed.
+    Updated (via track_orders, in every process) after every commit that
+    creates, cancels or fills an order; the tick only visits crossed items,
+    so its cost does not grow with the number of resting orders.
+    """
+
+    def __init__(self):
+        self.books: Dict[str, ItemBook] = {}
+        self.crossed: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def _refresh(self, item_type: str):
+        book = self.books.get(item_type)
+        if book is not None and book.is_crossed():
+            self.crossed.add(item_type)
+        else:
+            self.crossed.discard(item_type)
+            if book is not None and not book:
+                del self.books[item_type]
+
+    def track(self, order_id: int, item_type: str, side: str, price: Optional[float], status: str):
+        """Record an order's committed state (non-resting orders are dropped)."""
+        with self._lock:
+            if status in RESTING_STATUSES:
+                self.books.setdefault(item_type, ItemBook()).add(order_id, side, price)
+            elif item_type in self.books:
+                self.books[item_type].remove(order_id)
+            self._refresh(item_type)
+
+    def is_crossed(self, item_type: str) -> bool:
+        return item_type in self.crossed
+
+    def crossed_items(self) -> List[str]:
+        with self._lock:
+            return sorted(self.crossed)
+
+    def best_bid_ask(self, item_type: str):
+        """(best_bid, best_ask) from memory; market orders show as +/-inf."""
+        with self._lock:
+            book = self.books.get(item_type)
+            if book is None:
+                return None, None
+            return book.best_bid(), book.best_ask()
+
+    def rebuild(self, db) -> int:
+        """Replace the index with the resting orders currently in the database."""
+        rows = db.query(
+            DistrictMarketOrder.id, DistrictMarketOrder.item_type,
+            DistrictMarketOrder.order_type, DistrictMarketOrder.price
+        ).filter(DistrictMarketOrder.status.in_(RESTING_STATUSES)).all()
+        books: Dict[str, ItemBook] = {}
+        for order_id, item_type, side, price in rows:
+            books.setdefault(item_type, ItemBook()).add(order_id, side, price)
+        with self._lock:
+            self.books = books
+            self.crossed = {item for item, book in books.items() if book.is_crossed()}
+        return len(rows)
+
+
+book_index = BookIndex()
+
+
+@cluster.replicated
+def track_orders(states: List[tuple]):
+    """
+    Apply committed order states (order_id, item_type, side, price, status)
+    to book_index, here and in every other process.
+    """
+    for state in states:
+        book_index.track(*state)
+
 # ==========================
 # TICKER GENERATION
 # ==========================
@@ -238,6 +380,7 @@ def create_order(
     db.add(order)
     db.commit()
     db.refresh(order)
+    track_orders([(order.id, order.item_type, order.order_type, order.price, order.status)])
     
     print(f"[DistrictMarket] Order {order.id} created: {order_type.value} {quantity} {item_type}" + 
           (f" @ ${price}" if price else " at market price"))
@@ -256,6 +399,7 @@ def match_order(db, order: DistrictMarketOrder) -> bool:
     
     matched_any = False
     remaining_qty = order.quantity - order.quantity_filled
+    touched = [order]
     
     if order.order_type == OrderType.BUY:
         potential_matches = db.query(DistrictMarketOrder).filter(
@@ -302,6 +446,7 @@ def match_order(db, order: DistrictMarketOrder) -> bool:
         match.quantity_filled += fill_qty
         remaining_qty -= fill_qty
         matched_any = True
+        touched.append(match)
         
         # Update statuses
         if order.quantity_filled >= order.quantity:
@@ -316,7 +461,9 @@ def match_order(db, order: DistrictMarketOrder) -> bool:
         elif match.quantity_filled > 0:
             match.status = OrderStatus.PARTIALLY_FILLED
     
+    states = [(o.id, o.item_type, o.order_type, o.price, o.status) for o in touched]
     db.commit()
+    track_orders(states)
     return matched_any
 
 def execute_trade(db, buy_order: DistrictMarketOrder, sell_order: DistrictMarketOrder, quantity: float, price: float):
@@ -494,8 +641,10 @@ def cancel_order(order_id: int, player_id: int) -> bool:
         return False
     
     order.status = OrderStatus.CANCELLED
+    item_type = order.item_type
     db.commit()
     db.close()
+    track_orders([(order_id, item_type, None, None, OrderStatus.CANCELLED)])
     return True
 
 def get_market_stats() -> dict:
@@ -539,22 +688,57 @@ def initialize():
     print("[DistrictMarket] Initializing database...")
     Base.metadata.create_all(bind=engine)
     load_district_items()
+    db = get_db()
+    try:
+        count = book_index.rebuild(db)
+    finally:
+        db.close()
+    print(f"[DistrictMarket] Book index: {count} resting orders, {len(book_index.crossed)} crossed books")
     print("[DistrictMarket] Module initialized")
 
-async def tick(current_tick: int, now: datetime):
-    """Tick handler - match pending orders."""
-    db = get_db()
-    active_orders = db.query(DistrictMarketOrder).filter(
-        DistrictMarketOrder.status.in_([OrderStatus.ACTIVE, OrderStatus.PARTIALLY_FILLED])
+def load_resting_orders(db, item_type: str) -> List[DistrictMarketOrder]:
+    """Resting orders of one item, oldest first (matching priority)."""
+    return db.query(DistrictMarketOrder).filter(
+        DistrictMarketOrder.item_type == item_type,
+        DistrictMarketOrder.status.in_(RESTING_STATUSES)
     ).order_by(DistrictMarketOrder.created_at.asc()).all()
+
+
+def match_crossed_books(db) -> int:
+    """
+    Match resting orders (oldest first) for every item whose best bid meets
+    its best ask. Items stay in the crossed set if a fill fails (e.g. the
+    buyer is short of cash) and are retried next tick.
+    
+    Returns:
+        Number of items visited
+    """
+    items = book_index.crossed_items()
+    for item_type in items:
+        for order in load_resting_orders(db, item_type):
+            if not book_index.is_crossed(item_type):
+                break
+            match_order(db, order)
+    return len(items)
+
+async def tick(current_tick: int, now: datetime):
+    """Tick handler - match orders on crossed books."""
+    if current_tick % BOOK_RESYNC_INTERVAL == 0:
+        db = get_db()
+        try:
+            book_index.rebuild(db)
+        finally:
+            db.close()
     
-    for order in active_orders:
-        match_order(db, order)
+    if book_index.crossed:
+        db = get_db()
+        try:
+            match_crossed_books(db)
+        finally:
+            db.close()
     
     if current_tick % 3600 == 0:
         print(f"[DistrictMarket] Hourly Stats: {get_market_stats()}")
-    
-    db.close()
 
 __all__ = [
     'create_order', 
@@ -567,5 +751,8 @@ __all__ = [
     'get_district_ticker_html',
     'DISTRICT_ITEMS',
     'OrderType',
-    'OrderMode'
+    'OrderMode',
+    'book_index',
+    'track_orders',
+    'match_crossed_books'
 ]
@@ -22,7 +22,7 @@ from stats_ux import log_transaction
 # ==========================
 # DATABASE SETUP
 # ==========================
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 
 engine = create_engine(
     DATABASE_URL,
@@ -248,7 +248,10 @@ def calculate_fibonacci_requirement(merge_count: int) -> int:
 
 
 def get_player_merge_stats(player_id: int) -> PlayerDistrictStats:
-    """Get or create player's district merge statistics."""
+    """
+    Get player's district merge statistics.
+    Players who never merged get unsaved defaults; create_district writes the row.
+    """
     db = get_db()
     
     stats = db.query(PlayerDistrictStats).filter(
@@ -261,9 +264,6 @@ def get_player_merge_stats(player_id: int) -> PlayerDistrictStats:
             total_merges_completed=0,
             current_merge_cost=BASE_MERGE_COST
         )
-        db.add(stats)
-        db.commit()
-        db.refresh(stats)
     
     db.close()
     return stats
@@ -281,6 +281,34 @@ def get_plots_required(player_id: int) -> int:
     return calculate_fibonacci_requirement(stats.total_merges_completed)
 
 
+def get_merge_candidates(player_id: int, plots_required: Optional[int] = None) -> dict:
+    """
+    Which terrains a player can merge now, from the occupied plot index.
+    
+    Returns:
+        {terrain: {"count": int, "can_merge": bool, "plot_ids": [...] (only when can_merge),
+                   "district_types": [district types allowed on this terrain]}}
+    """
+    from land import occupied_plots
+    
+    if plots_required is None:
+        plots_required = get_plots_required(player_id)
+    
+    candidates = {}
+    for terrain, count in occupied_plots.terrain_counts(player_id).items():
+        can_merge = count >= plots_required
+        candidates[terrain] = {
+            "count": count,
+            "can_merge": can_merge,
+            "plot_ids": occupied_plots.plots(player_id, terrain) if can_merge else [],
+            "district_types": [
+                dtype for dtype, config in DISTRICT_TYPES.items()
+                if terrain in config["allowed_terrain"]
+            ],
+        }
+    return candidates
+
+
 def validate_plots_for_merge(plot_ids: List[int], player_id: int) -> tuple[bool, str]:
     """
     Validate that plots can be merged into a district.
@@ -291,45 +319,35 @@ def validate_plots_for_merge(plot_ids: List[int], player_id: int) -> tuple[bool,
     - All plots must be occupied (have businesses)
     - Correct number of plots (Fibonacci progression)
     
+    Answered from the occupied plot index (no plot rows are loaded).
+    
     Returns:
         (success: bool, error_message: str)
     """
-    from land import LandPlot
-    
-    db = get_db()
+    from land import occupied_plots
     
     # Check we have the right number of plots
     required_count = get_plots_required(player_id)
     if len(plot_ids) != required_count:
-        db.close()
         return False, f"District requires exactly {required_count} plots (you provided {len(plot_ids)})"
     
-    # Get all plots
-    plots = db.query(LandPlot).filter(LandPlot.id.in_(plot_ids)).all()
-    
-    if len(plots) != len(plot_ids):
-        db.close()
+    if len(set(plot_ids)) != len(plot_ids):
         return False, "One or more plot IDs are invalid"
     
-    # Validate ownership
-    for plot in plots:
-        if plot.owner_id != player_id:
-            db.close()
-            return False, f"Plot {plot.id} is not owned by you"
+    # Every plot must be an occupied plot of this player's, all on one terrain
+    terrain_types = set()
+    for plot_id in plot_ids:
+        slot = occupied_plots.slot(plot_id)
+        if slot is None:
+            return False, f"Plot {plot_id} must be one of your plots with a business on it (all plots must be occupied)"
+        owner_id, terrain = slot
+        if owner_id != player_id:
+            return False, f"Plot {plot_id} is not owned by you"
+        terrain_types.add(terrain)
     
-    # Validate terrain type (all must match)
-    terrain_types = set(plot.terrain_type for plot in plots)
     if len(terrain_types) != 1:
-        db.close()
         return False, f"All plots must have the same terrain type (found: {', '.join(terrain_types)})"
     
-    # Validate all plots are occupied
-    for plot in plots:
-        if plot.occupied_by_business_id is None:
-            db.close()
-            return False, f"Plot {plot.id} must have a business on it (all plots must be occupied)"
-    
-    db.close()
     return True, "Valid"
 
 
@@ -368,8 +386,13 @@ def create_district(
         db.close()
         return None, error_msg
     
-    # Get plots
+    # Get plots (re-checked against the rows being merged)
     plots = db.query(LandPlot).filter(LandPlot.id.in_(plot_ids)).all()
+    if (len(plots) != len(plot_ids)
+            or any(plot.owner_id != player_id or plot.occupied_by_business_id is None for plot in plots)
+            or len({plot.terrain_type for plot in plots}) != 1):
+        db.close()
+        return None, "Plots changed since selection - please try again"
     source_terrain = plots[0].terrain_type  # Original terrain (for validation)
     terrain_type = DISTRICT_TYPES[district_type]["district_terrain"]  # District's special terrain
     
@@ -653,6 +676,7 @@ __all__ = [
     'get_next_merge_cost',
     'get_plots_required',
     'validate_plots_for_merge',
+    'get_merge_candidates',
     'DISTRICT_TYPES',
     'District'
 ]
@@ -23,10 +23,8 @@ router = APIRouter()
 
 def require_auth(session_token):
     """Check authentication and return player or redirect."""
-    from auth import get_db, get_player_from_session
-    db = get_db()
-    player = get_player_from_session(db, session_token)
-    db.close()
+    from auth import get_session_player
+    player = get_session_player(session_token)
     if not player:
         return RedirectResponse(url="/login", status_code=303)
     return player
@@ -237,21 +235,24 @@ def create_district_page(session_token: Optional[str] = Cookie(None)):
         from districts import (
             get_next_merge_cost, 
             get_plots_required,
+            get_merge_candidates,
             DISTRICT_TYPES
         )
-        from land import get_player_land
+        from land import get_db as get_land_db, LandPlot
         
-        plots = get_player_land(player.id)
         next_cost = get_next_merge_cost(player.id)
         plots_required = get_plots_required(player.id)
         
-        # Group plots by terrain type (only occupied plots)
-        occupied_plots = [p for p in plots if p.occupied_by_business_id]
-        plots_by_terrain = {}
-        for plot in occupied_plots:
-            if plot.terrain_type not in plots_by_terrain:
-                plots_by_terrain[plot.terrain_type] = []
-            plots_by_terrain[plot.terrain_type].append(plot)
+        # Occupied plots grouped by terrain, from the index
+        candidates = get_merge_candidates(player.id, plots_required)
+        
+        # Plot rows only for terrains that can merge now (size/tax display)
+        mergeable_ids = [pid for candidate in candidates.values() for pid in candidate["plot_ids"]]
+        plot_rows = {}
+        if mergeable_ids:
+            land_db = get_land_db()
+            plot_rows = {p.id: p for p in land_db.query(LandPlot).filter(LandPlot.id.in_(mergeable_ids)).all()}
+            land_db.close()
         
         html = f'''
         <a href="/districts" style="color: #38bdf8;"><- Districts Dashboard</a>
@@ -309,7 +310,7 @@ def create_district_page(session_token: Optional[str] = Cookie(None)):
         html += '</div></div>'
         
         # Show plot selection by terrain
-        if not occupied_plots:
+        if not candidates:
             html += '''
             <div class="card" style="text-align: center; background: #0f172a;">
                 <h3 style="color: #ef4444;">❌ No Occupied Plots Available</h3>
@@ -343,17 +344,17 @@ def create_district_page(session_token: Optional[str] = Cookie(None)):
             '''
             
             # Show plots grouped by terrain
-            for terrain, terrain_plots in plots_by_terrain.items():
-                if len(terrain_plots) >= plots_required:
+            for terrain, candidate in candidates.items():
+                if candidate["can_merge"]:
                     html += f'''
                     <div style="margin-bottom: 20px; padding: 12px; background: #020617; border-left: 3px solid #22c55e;">
                         <div style="font-weight: bold; color: #22c55e; margin-bottom: 8px;">
-                            {terrain.title()} Terrain ({len(terrain_plots)} plots available)
+                            {terrain.title()} Terrain ({candidate["count"]} plots available)
                         </div>
                         <div style="display: grid; grid-template-columns: repeat(auto-fill, minmax(200px, 1fr)); gap: 8px;">
                     '''
                     
-                    for plot in terrain_plots:
+                    for plot in (plot_rows[pid] for pid in candidate["plot_ids"] if pid in plot_rows):
                         html += f'''
                         <label style="display: flex; align-items: center; gap: 8px; padding: 8px; background: #0f172a; cursor: pointer; border: 1px solid #1e293b;">
                             <input type="checkbox" name="plot_ids" value="{plot.id}" style="cursor: pointer;">
@@ -369,10 +370,10 @@ def create_district_page(session_token: Optional[str] = Cookie(None)):
                     html += f'''
                     <div style="margin-bottom: 12px; padding: 12px; background: #020617; border-left: 3px solid #64748b; opacity: 0.6;">
                         <div style="color: #64748b; margin-bottom: 4px;">
-                            {terrain.title()} Terrain ({len(terrain_plots)} plots available)
+                            {terrain.title()} Terrain ({candidate["count"]} plots available)
                         </div>
                         <div style="font-size: 0.8rem; color: #64748b;">
-                            ⚠️ Need {plots_required - len(terrain_plots)} more {terrain} plots
+                            ⚠️ Need {plots_required - candidate["count"]} more {terrain} plots
                         </div>
                     </div>
                     '''
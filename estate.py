@@ -6,7 +6,8 @@ Account deletion & estate settlement module for the economic simulation.
 Handles:
 - Voluntary account deletion ("death" by player choice)
 - Automatic deletion for idle players (no login for 30+ days)
-- Estate liquidation process (government seizes all assets)
+- Estate liquidation process (government seizes all assets), batched
+  under a per-tick time budget
 - Government sells assets at market to recoup costs
 - Debt settlement (percentage of debts paid from estate)
 - Heir designation (up to 3 heirs per player)
@@ -15,17 +16,21 @@ Handles:
 - Deceased player records (permanent memorial / death certificate)
 """
 
+import time
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Optional, List
 from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer, Boolean, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from stats_ux import log_transaction
+import deadlines
+import liens as lien_registry
 
 # ==========================
 # DATABASE SETUP
 # ==========================
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 
 engine = create_engine(
     DATABASE_URL,
@@ -47,6 +52,11 @@ INSTALLMENT_INTERVAL = 17280  # 1 day in ticks (86400 seconds / 5 seconds per ti
 GOVERNMENT_PLAYER_ID = 0
 GOV_LOAN_INTEREST_RATE = 0.0  # Government fronts the money interest-free
 LIQUIDATION_DISCOUNT = 0.85  # Assets listed at 85% of market value for faster sale
+LIQUIDATION_TIME_BUDGET = 0.25  # Seconds of estate liquidation per tick (at least one estate runs)
+
+# Estates waiting for liquidation (player_id, cause); refilled by the hourly idle check
+_liquidation_queue = deque()
+_queued_liquidations = set()
 
 # ==========================
 # DATABASE MODELS
@@ -264,160 +274,226 @@ def remove_heir(player_id: int, priority: int) -> bool:
 
 
 # ==========================
-# ESTATE LIQUIDATION ENGINE
+# ESTATE ASSET GRAPH
 # ==========================
 
-def calculate_estate_value(player_id: int, db) -> dict:
-    """Calculate the total value of a player's estate."""
-    from auth import Player
-    player = db.query(Player).filter(Player.id == player_id).first()
-    if not player:
-        return {"total": 0.0, "cash": 0.0, "inventory": 0.0, "land": 0.0,
-                "businesses": 0.0, "shares": 0.0, "districts": 0.0}
+class PriceSnapshot:
+    """
+    One set of prices for valuing estates: market items, bank share prices
+    and brokerage company prices. A liquidation batch shares one snapshot,
+    so every estate in it is priced consistently and without per-row lookups.
+    """
 
-    estate = {
-        "cash": player.cash_balance,
-        "inventory": 0.0,
-        "land": 0.0,
-        "businesses": 0.0,
-        "shares": 0.0,
-        "districts": 0.0,
-        "land_count": 0,
-        "business_count": 0,
-        "district_count": 0,
-    }
+    def __init__(self, items: dict, bank_shares: dict):
+        self.items = items
+        self.bank_shares = bank_shares
+        self.companies = {}  # company_shares_id -> (ticker, price), filled on demand
+
+    @classmethod
+    def load(cls) -> "PriceSnapshot":
+        items = {}
+        bank_shares = {}
+        try:
+            from market import get_market_prices
+            items = get_market_prices()
+        except Exception as e:
+            print(f"[Estate] Market price snapshot error: {e}")
+        try:
+            import banks
+            bank_db = banks.get_db()
+            try:
+                bank_shares = dict(bank_db.query(banks.BankEntity.bank_id, banks.BankEntity.share_price).all())
+            finally:
+                bank_db.close()
+        except Exception as e:
+            print(f"[Estate] Bank price snapshot error: {e}")
+        return cls(items, bank_shares)
+
+    def item_price(self, item_type: str) -> float:
+        return self.items.get(item_type) or 1.0
+
+    def load_companies(self, db, company_ids):
+        """Fetch ticker/price for companies not already in the snapshot (one query)."""
+        missing = {cid for cid in company_ids if cid not in self.companies}
+        if not missing:
+            return
+        from banks.brokerage_firm import CompanyShares
+        rows = db.query(CompanyShares.id, CompanyShares.ticker_symbol, CompanyShares.current_price).filter(
+            CompanyShares.id.in_(missing)
+        ).all()
+        for cid, ticker, price in rows:
+            self.companies[cid] = (ticker, price)
+
+
+def load_estate_assets(player_id: int, db) -> dict:
+    """
+    Prefetch a player's whole asset graph with one set-based query per table.
+    Tables whose module isn't installed come back empty.
+    """
+    assets = {"items": [], "holdings": [], "positions": [], "plots": [],
+              "businesses": [], "sales": [], "districts": []}
 
-    # Inventory value
     try:
         from inventory import InventoryItem
-        from market import get_market_price
-        items = db.query(InventoryItem).filter(
+        assets["items"] = db.query(InventoryItem).filter(
             InventoryItem.player_id == player_id,
             InventoryItem.quantity > 0
         ).all()
-        for item in items:
-            price = get_market_price(item.item_type) or 1.0
-            estate["inventory"] += item.quantity * price
     except Exception as e:
-        print(f"[Estate] Inventory valuation error: {e}")
+        print(f"[Estate] Inventory load error: {e}")
 
-    # Land value
     try:
-        from land import LandPlot
-        plots = db.query(LandPlot).filter(LandPlot.owner_id == player_id).all()
-        estate["land_count"] = len(plots)
-        for plot in plots:
-            estate["land"] += (plot.monthly_tax or 50.0) * 12
+        from banks import BankShareholding
+        assets["holdings"] = db.query(BankShareholding).filter(
+            BankShareholding.player_id == player_id,
+            BankShareholding.shares_owned > 0
+        ).all()
     except Exception as e:
-        print(f"[Estate] Land valuation error: {e}")
+        print(f"[Estate] Bank share load error: {e}")
 
-    # Business value
     try:
-        from business import Business, BUSINESS_TYPES
-        businesses = db.query(Business).filter(
-            Business.owner_id == player_id,
-            Business.is_active == True
+        from banks.brokerage_firm import ShareholderPosition
+        from sqlalchemy import or_
+        assets["positions"] = db.query(ShareholderPosition).filter(
+            ShareholderPosition.player_id == player_id,
+            or_(ShareholderPosition.shares_owned > 0, ShareholderPosition.is_margin_position == True)
         ).all()
-        estate["business_count"] = len(businesses)
-        for biz in businesses:
-            config = BUSINESS_TYPES.get(biz.business_type, {})
-            estate["businesses"] += config.get("startup_cost", 10000)
     except Exception as e:
-        print(f"[Estate] Business valuation error: {e}")
+        print(f"[Estate] Brokerage position load error: {e}")
 
-    # District value
     try:
-        from districts import District, DISTRICT_TYPES
-        districts = db.query(District).filter(District.owner_id == player_id).all()
-        estate["district_count"] = len(districts)
-        for d in districts:
-            config = DISTRICT_TYPES.get(d.district_type, {})
-            estate["districts"] += config.get("base_tax", 50000) * 12
+        from land import LandPlot
+        assets["plots"] = db.query(LandPlot).filter(LandPlot.owner_id == player_id).all()
     except Exception as e:
-        print(f"[Estate] District valuation error: {e}")
+        print(f"[Estate] Land load error: {e}")
 
-    # Share value (bank shares + brokerage shares)
     try:
-        from banks import BankShareholding, BankEntity
-        holdings = db.query(BankShareholding).filter(
-            BankShareholding.player_id == player_id,
-            BankShareholding.shares_owned > 0
-        ).all()
-        for h in holdings:
-            bank = db.query(BankEntity).filter(BankEntity.bank_id == h.bank_id).first()
-            if bank:
-                estate["shares"] += h.shares_owned * (bank.share_price or 0)
+        from business import Business, BusinessSale
+        from sqlalchemy import or_
+        plot_ids = [plot.id for plot in assets["plots"]]
+        condition = Business.owner_id == player_id
+        if plot_ids:
+            condition = or_(condition, Business.land_plot_id.in_(plot_ids))
+        assets["businesses"] = db.query(Business).filter(condition).all()
+        biz_ids = [biz.id for biz in assets["businesses"]]
+        if biz_ids:
+            assets["sales"] = db.query(BusinessSale).filter(BusinessSale.business_id.in_(biz_ids)).all()
     except Exception as e:
-        print(f"[Estate] Bank share valuation error: {e}")
+        print(f"[Estate] Business load error: {e}")
 
     try:
-        from banks.brokerage_firm import ShareholderPosition, CompanyShares
-        positions = db.query(ShareholderPosition).filter(
-            ShareholderPosition.player_id == player_id,
-            ShareholderPosition.shares_owned > 0
-        ).all()
-        for pos in positions:
-            company = db.query(CompanyShares).filter(
-                CompanyShares.id == pos.company_shares_id
-            ).first()
-            if company:
-                estate["shares"] += pos.shares_owned * (company.current_price or 0)
+        from districts import District
+        assets["districts"] = db.query(District).filter(District.owner_id == player_id).all()
     except Exception as e:
-        print(f"[Estate] Brokerage share valuation error: {e}")
+        print(f"[Estate] District load error: {e}")
+
+    return assets
+
+
+def value_estate(player, assets: dict, prices: PriceSnapshot, db) -> dict:
+    """Value a prefetched asset graph against a price snapshot (no per-row queries)."""
+    estate = {
+        "cash": player.cash_balance,
+        "inventory": 0.0,
+        "land": 0.0,
+        "businesses": 0.0,
+        "shares": 0.0,
+        "districts": 0.0,
+        "land_count": len(assets["plots"]),
+        "business_count": 0,
+        "district_count": len(assets["districts"]),
+    }
+
+    for item in assets["items"]:
+        estate["inventory"] += item.quantity * prices.item_price(item.item_type)
+
+    for plot in assets["plots"]:
+        estate["land"] += (plot.monthly_tax or 50.0) * 12
+
+    if assets["businesses"]:
+        from business import BUSINESS_TYPES
+        for biz in assets["businesses"]:
+            if biz.owner_id == player.id and biz.is_active:
+                estate["business_count"] += 1
+                estate["businesses"] += BUSINESS_TYPES.get(biz.business_type, {}).get("startup_cost", 10000)
+
+    if assets["districts"]:
+        from districts import DISTRICT_TYPES
+        for d in assets["districts"]:
+            estate["districts"] += DISTRICT_TYPES.get(d.district_type, {}).get("base_tax", 50000) * 12
+
+    for h in assets["holdings"]:
+        if h.bank_id in prices.bank_shares:
+            estate["shares"] += h.shares_owned * (prices.bank_shares[h.bank_id] or 0)
+
+    held = [pos for pos in assets["positions"] if pos.shares_owned > 0]
+    if held:
+        prices.load_companies(db, {pos.company_shares_id for pos in held})
+        for pos in held:
+            company = prices.companies.get(pos.company_shares_id)
+            if company:
+                estate["shares"] += pos.shares_owned * (company[1] or 0)
 
     estate["total"] = (
         estate["cash"] + estate["inventory"] + estate["land"] +
         estate["businesses"] + estate["shares"] + estate["districts"]
     )
-
     return estate
 
+# ==========================
+# ESTATE LIQUIDATION ENGINE
+# ==========================
+
+def calculate_estate_value(player_id: int, db) -> dict:
+    """Calculate the total value of a player's estate."""
+    from auth import Player
+    player = db.query(Player).filter(Player.id == player_id).first()
+    if not player:
+        return {"total": 0.0, "cash": 0.0, "inventory": 0.0, "land": 0.0,
+                "businesses": 0.0, "shares": 0.0, "districts": 0.0}
+    return value_estate(player, load_estate_assets(player_id, db), PriceSnapshot.load(), db)
+
 
-def calculate_total_debts(player_id: int, db) -> float:
+def calculate_total_debts(player_id: int, db, positions=None) -> float:
     """Calculate total outstanding debts for a player."""
     total_debts = 0.0
 
-    # Bank liens
-    try:
-        from banks.land_bank import BankLien
-        liens = db.query(BankLien).filter(BankLien.player_id == player_id).all()
-        for lien in liens:
-            owed = lien.principal + lien.interest_accrued - lien.total_paid
-            if owed > 0:
-                total_debts += owed
-    except Exception as e:
-        print(f"[Estate] Bank lien calculation error: {e}")
-
-    # Brokerage liens
+    # Bank and brokerage liens (maintained by the lien registry)
     try:
-        from banks.brokerage_firm import BrokerageLien
-        b_liens = db.query(BrokerageLien).filter(
-            BrokerageLien.player_id == player_id
-        ).all()
-        for lien in b_liens:
-            owed = lien.principal + lien.interest_accrued - lien.total_paid
-            if owed > 0:
-                total_debts += owed
+        total_debts += lien_registry.outstanding(player_id, ["land_bank", "brokerage_firm"])
     except Exception as e:
-        print(f"[Estate] Brokerage lien calculation error: {e}")
+        print(f"[Estate] Lien calculation error: {e}")
 
     # Margin debt
     try:
-        from banks.brokerage_firm import ShareholderPosition
-        margin_positions = db.query(ShareholderPosition).filter(
-            ShareholderPosition.player_id == player_id,
-            ShareholderPosition.is_margin_position == True,
-            ShareholderPosition.margin_debt > 0
-        ).all()
-        for pos in margin_positions:
-            total_debts += pos.margin_debt
+        if positions is None:
+            from banks.brokerage_firm import ShareholderPosition
+            positions = db.query(ShareholderPosition).filter(
+                ShareholderPosition.player_id == player_id,
+                ShareholderPosition.is_margin_position == True,
+                ShareholderPosition.margin_debt > 0
+            ).all()
+        for pos in positions:
+            if pos.is_margin_position and (pos.margin_debt or 0) > 0:
+                total_debts += pos.margin_debt
     except Exception as e:
         print(f"[Estate] Margin debt calculation error: {e}")
 
     return total_debts
 
 
-def liquidate_estate(player_id: int, cause: str, current_tick: int) -> Optional[DeceasedPlayer]:
+def _bulk_update(db, model, ids, values: dict):
+    if ids:
+        db.query(model).filter(model.id.in_(ids)).update(values, synchronize_session=False)
+
+
+def _bulk_delete(db, model, ids):
+    if ids:
+        db.query(model).filter(model.id.in_(ids)).delete(synchronize_session=False)
+
+
+def liquidate_estate(player_id: int, cause: str, current_tick: int,
+                     prices: Optional[PriceSnapshot] = None) -> Optional[DeceasedPlayer]:
     """
     Execute the full estate liquidation process:
     1. Snapshot player stats for death certificate
@@ -428,7 +504,13 @@ def liquidate_estate(player_id: int, cause: str, current_tick: int) -> Optional[
     6. Create death tax installments for heirs
     7. Delete player account
     8. Create permanent deceased record
+
+    The asset graph is prefetched in one query per table, priced from a
+    single PriceSnapshot (shared across a batch when given) and seized with
+    bulk UPDATE/DELETE statements.
     """
+    from auth import CashLedger
+    ledger = CashLedger()
     db = get_db()
     try:
         from auth import Player
@@ -446,8 +528,11 @@ def liquidate_estate(player_id: int, cause: str, current_tick: int) -> Optional[
         print(f"[Estate] Beginning estate liquidation for {player.business_name} (ID: {player_id})")
 
         # 1. Snapshot stats
-        estate = calculate_estate_value(player_id, db)
-        total_debts = calculate_total_debts(player_id, db)
+        if prices is None:
+            prices = PriceSnapshot.load()
+        assets = load_estate_assets(player_id, db)
+        estate = value_estate(player, assets, prices, db)
+        total_debts = calculate_total_debts(player_id, db, assets["positions"])
 
         # Get leaderboard rank
         try:
@@ -464,155 +549,144 @@ def liquidate_estate(player_id: int, cause: str, current_tick: int) -> Optional[
 
         # Liquidate inventory (sell to government at discounted market price)
         try:
-            from inventory import InventoryItem
-            from market import get_market_price
-            items = db.query(InventoryItem).filter(
-                InventoryItem.player_id == player_id,
-                InventoryItem.quantity > 0
-            ).all()
-            for item in items:
-                price = get_market_price(item.item_type) or 1.0
-                value = item.quantity * price * LIQUIDATION_DISCOUNT
-                liquidation_value += value
-
-                # Create government estate listing for these items
-                listing = GovernmentEstateListing(
-                    deceased_player_id=player_id,
-                    item_type=item.item_type,
-                    quantity=item.quantity,
-                    listed_price=price * LIQUIDATION_DISCOUNT
-                )
-                db.add(listing)
+            if assets["items"]:
+                from inventory import InventoryItem
+                seized_value = 0.0
+                listings = []
+                for item in assets["items"]:
+                    price = prices.item_price(item.item_type)
+                    seized_value += item.quantity * price * LIQUIDATION_DISCOUNT
+
+                    # Create government estate listing for these items
+                    listings.append(GovernmentEstateListing(
+                        deceased_player_id=player_id,
+                        item_type=item.item_type,
+                        quantity=item.quantity,
+                        listed_price=price * LIQUIDATION_DISCOUNT
+                    ))
+                db.add_all(listings)
 
                 # Transfer items to government (player 0)
-                item.player_id = GOVERNMENT_PLAYER_ID
-                print(f"[Estate] Seized {item.quantity:.0f} {item.item_type} (${value:,.2f})")
+                _bulk_update(db, InventoryItem, [item.id for item in assets["items"]],
+                             {InventoryItem.player_id: GOVERNMENT_PLAYER_ID})
+                liquidation_value += seized_value
+                print(f"[Estate] Seized {len(assets['items'])} inventory lots (${seized_value:,.2f})")
         except Exception as e:
             print(f"[Estate] Inventory liquidation error: {e}")
 
         # Liquidate bank shares
         try:
-            from banks import BankShareholding, BankEntity
-            holdings = db.query(BankShareholding).filter(
-                BankShareholding.player_id == player_id,
-                BankShareholding.shares_owned > 0
-            ).all()
-            for h in holdings:
-                bank = db.query(BankEntity).filter(BankEntity.bank_id == h.bank_id).first()
-                if bank and bank.share_price:
-                    value = h.shares_owned * bank.share_price * LIQUIDATION_DISCOUNT
-                    liquidation_value += value
-                    # Transfer shares to government
-                    h.player_id = GOVERNMENT_PLAYER_ID
-                    print(f"[Estate] Seized {h.shares_owned} {h.bank_id} shares (${value:,.2f})")
+            seized = [h for h in assets["holdings"] if prices.bank_shares.get(h.bank_id)]
+            if seized:
+                from banks import BankShareholding
+                seized_value = sum(
+                    h.shares_owned * prices.bank_shares[h.bank_id] * LIQUIDATION_DISCOUNT for h in seized
+                )
+                # Transfer shares to government
+                _bulk_update(db, BankShareholding, [h.id for h in seized],
+                             {BankShareholding.player_id: GOVERNMENT_PLAYER_ID})
+                liquidation_value += seized_value
+                print(f"[Estate] Seized {len(seized)} bank holdings (${seized_value:,.2f})")
         except Exception as e:
             print(f"[Estate] Bank share liquidation error: {e}")
 
         # Liquidate brokerage positions
         try:
-            from banks.brokerage_firm import ShareholderPosition, CompanyShares
-            positions = db.query(ShareholderPosition).filter(
-                ShareholderPosition.player_id == player_id,
-                ShareholderPosition.shares_owned > 0
-            ).all()
-            for pos in positions:
-                company = db.query(CompanyShares).filter(
-                    CompanyShares.id == pos.company_shares_id
-                ).first()
-                if company and company.current_price:
-                    value = pos.shares_owned * company.current_price * LIQUIDATION_DISCOUNT
-                    liquidation_value += value
-                    # Transfer shares to government
-                    pos.player_id = GOVERNMENT_PLAYER_ID
-                    print(f"[Estate] Seized {pos.shares_owned} {company.ticker_symbol} shares (${value:,.2f})")
+            seized = [
+                pos for pos in assets["positions"]
+                if pos.shares_owned > 0 and (prices.companies.get(pos.company_shares_id) or (None, None))[1]
+            ]
+            if seized:
+                from banks.brokerage_firm import ShareholderPosition
+                seized_value = sum(
+                    pos.shares_owned * prices.companies[pos.company_shares_id][1] * LIQUIDATION_DISCOUNT
+                    for pos in seized
+                )
+                # Transfer shares to government
+                _bulk_update(db, ShareholderPosition, [pos.id for pos in seized],
+                             {ShareholderPosition.player_id: GOVERNMENT_PLAYER_ID})
+                liquidation_value += seized_value
+                print(f"[Estate] Seized {len(seized)} brokerage positions (${seized_value:,.2f})")
         except Exception as e:
             print(f"[Estate] Brokerage liquidation error: {e}")
 
         # Liquidate land (transfer to government for auction)
         try:
-            from land import LandPlot
-            from business import Business, BusinessSale
-            plots = db.query(LandPlot).filter(LandPlot.owner_id == player_id).all()
-            for plot in plots:
-                plot_value = (plot.monthly_tax or 50.0) * 12 * LIQUIDATION_DISCOUNT
+            if assets["plots"]:
+                from land import LandPlot
+                from business import Business, BusinessSale
+                plot_ids = [plot.id for plot in assets["plots"]]
+                plot_value = sum((plot.monthly_tax or 50.0) * 12 * LIQUIDATION_DISCOUNT for plot in assets["plots"])
+
+                # Remove any businesses on this land (and cancel dismantling in progress)
+                plot_id_set = set(plot_ids)
+                on_land = [biz for biz in assets["businesses"] if biz.land_plot_id in plot_id_set]
+                on_land_ids = {biz.id for biz in on_land}
+                _bulk_delete(db, BusinessSale, [sale.id for sale in assets["sales"] if sale.business_id in on_land_ids])
+                _bulk_delete(db, Business, list(on_land_ids))
+                _bulk_update(db, LandPlot, [biz.land_plot_id for biz in on_land],
+                             {LandPlot.occupied_by_business_id: None})
+
+                # Transfer plots to government
+                _bulk_update(db, LandPlot, plot_ids, {LandPlot.owner_id: GOVERNMENT_PLAYER_ID})
                 liquidation_value += plot_value
-
-                # Remove any businesses on this land
-                biz = db.query(Business).filter(Business.land_plot_id == plot.id).first()
-                if biz:
-                    # Cancel any dismantling in progress
-                    sale = db.query(BusinessSale).filter(BusinessSale.business_id == biz.id).first()
-                    if sale:
-                        db.delete(sale)
-                    db.delete(biz)
-                    plot.occupied_by_business_id = None
-
-                # Transfer plot to government
-                plot.owner_id = GOVERNMENT_PLAYER_ID
-                print(f"[Estate] Seized land plot #{plot.id} ({plot.terrain_type}) (${plot_value:,.2f})")
+                print(f"[Estate] Seized {len(plot_ids)} land plots, removed {len(on_land)} businesses (${plot_value:,.2f})")
         except Exception as e:
             print(f"[Estate] Land liquidation error: {e}")
 
         # Liquidate districts
         try:
-            from districts import District, DISTRICT_TYPES
-            districts = db.query(District).filter(District.owner_id == player_id).all()
-            for d in districts:
-                config = DISTRICT_TYPES.get(d.district_type, {})
-                district_value = config.get("base_tax", 50000) * 12 * LIQUIDATION_DISCOUNT
+            if assets["districts"]:
+                from districts import District, DISTRICT_TYPES
+                district_value = sum(
+                    DISTRICT_TYPES.get(d.district_type, {}).get("base_tax", 50000) * 12 * LIQUIDATION_DISCOUNT
+                    for d in assets["districts"]
+                )
+                _bulk_update(db, District, [d.id for d in assets["districts"]],
+                             {District.owner_id: GOVERNMENT_PLAYER_ID})
                 liquidation_value += district_value
-                d.owner_id = GOVERNMENT_PLAYER_ID
-                print(f"[Estate] Seized district {d.id} ({d.district_type}) (${district_value:,.2f})")
+                print(f"[Estate] Seized {len(assets['districts'])} districts (${district_value:,.2f})")
         except Exception as e:
             print(f"[Estate] District liquidation error: {e}")
 
         # 3. Pay debts from estate (60% of debts)
         debt_payment = min(total_debts * DEBT_PAYMENT_PERCENTAGE, liquidation_value * 0.5)
+        remaining_payment = debt_payment
 
-        # Pay bank liens
+        # Pay bank and brokerage liens in order; every lien is settled regardless
+        lien_tables = []
         try:
             from banks.land_bank import BankLien
-            liens = db.query(BankLien).filter(BankLien.player_id == player_id).all()
-            remaining_payment = debt_payment
-            for lien in liens:
-                owed = lien.principal + lien.interest_accrued - lien.total_paid
-                if owed > 0 and remaining_payment > 0:
-                    payment = min(owed, remaining_payment)
-                    lien.total_paid += payment
-                    remaining_payment -= payment
-                    print(f"[Estate] Paid ${payment:,.2f} on bank lien #{lien.id}")
-                # Mark lien as settled regardless
-                db.delete(lien)
+            lien_tables.append(("land_bank", "bank", BankLien))
         except Exception as e:
             print(f"[Estate] Bank lien payment error: {e}")
-
-        # Pay brokerage liens
         try:
             from banks.brokerage_firm import BrokerageLien
-            b_liens = db.query(BrokerageLien).filter(
-                BrokerageLien.player_id == player_id
-            ).all()
-            for lien in b_liens:
-                owed = lien.principal + lien.interest_accrued - lien.total_paid
-                if owed > 0 and remaining_payment > 0:
-                    payment = min(owed, remaining_payment)
-                    lien.total_paid += payment
-                    remaining_payment -= payment
-                    print(f"[Estate] Paid ${payment:,.2f} on brokerage lien #{lien.id}")
-                db.delete(lien)
+            lien_tables.append(("brokerage_firm", "brokerage", BrokerageLien))
         except Exception as e:
             print(f"[Estate] Brokerage lien payment error: {e}")
+        for creditor_name, label, model in lien_tables:
+            try:
+                rows = db.query(model).filter(model.player_id == player_id).all()
+                for lien in rows:
+                    owed = lien_registry.owed(creditor_name, lien)
+                    if owed > 0 and remaining_payment > 0:
+                        payment = min(owed, remaining_payment)
+                        remaining_payment -= payment
+                        print(f"[Estate] Paid ${payment:,.2f} on {label} lien #{lien.id}")
+                _bulk_delete(db, model, [lien.id for lien in rows])
+            except Exception as e:
+                print(f"[Estate] {label.capitalize()} lien payment error: {e}")
 
         # Clear margin positions
         try:
-            from banks.brokerage_firm import ShareholderPosition
-            margin_pos = db.query(ShareholderPosition).filter(
-                ShareholderPosition.player_id == player_id,
-                ShareholderPosition.is_margin_position == True
-            ).all()
-            for pos in margin_pos:
-                pos.margin_debt = 0.0
-                pos.is_margin_position = False
+            margin_ids = [pos.id for pos in assets["positions"] if pos.is_margin_position]
+            if margin_ids:
+                from banks.brokerage_firm import ShareholderPosition
+                _bulk_update(db, ShareholderPosition, margin_ids, {
+                    ShareholderPosition.margin_debt: 0.0,
+                    ShareholderPosition.is_margin_position: False
+                })
         except:
             pass
 
@@ -624,35 +698,32 @@ def liquidate_estate(player_id: int, cause: str, current_tick: int) -> Optional[
             HeirDesignation.player_id == player_id
         ).order_by(HeirDesignation.priority.asc()).all()
 
-        # Filter out any deceased heirs
+        # Filter out any deceased or deleted heirs (two set-based lookups)
         living_heirs = []
-        for h in heirs:
-            heir_deceased = db.query(DeceasedPlayer).filter(
-                DeceasedPlayer.player_id == h.heir_player_id
-            ).first()
-            if not heir_deceased:
-                heir_player = db.query(Player).filter(Player.id == h.heir_player_id).first()
-                if heir_player:
-                    living_heirs.append(h)
+        if heirs:
+            heir_ids = [h.heir_player_id for h in heirs]
+            dead_ids = {pid for (pid,) in db.query(DeceasedPlayer.player_id).filter(
+                DeceasedPlayer.player_id.in_(heir_ids)
+            ).all()}
+            live_ids = {pid for (pid,) in db.query(Player.id).filter(Player.id.in_(heir_ids)).all()}
+            living_heirs = [h for h in heirs if h.heir_player_id in live_ids and h.heir_player_id not in dead_ids]
 
         total_inherited = 0.0
         total_death_tax = 0.0
         government_took_all = len(living_heirs) == 0
 
+        new_installments = []
+        inheritance_logs = []
         if living_heirs and remainder > 0:
             # Split equally among heirs
             per_heir = remainder / len(living_heirs)
 
             for heir in living_heirs:
-                heir_player = db.query(Player).filter(Player.id == heir.heir_player_id).first()
-                if not heir_player:
-                    continue
-
                 death_tax = per_heir * DEATH_TAX_RATE
                 inheritance_after_tax = per_heir - death_tax
 
-                # Pay inheritance immediately
-                heir_player.cash_balance += inheritance_after_tax
+                # Pay inheritance immediately (credited once the estate commits)
+                ledger.credit(heir.heir_player_id, inheritance_after_tax)
                 total_inherited += inheritance_after_tax
                 total_death_tax += death_tax
 
@@ -669,23 +740,15 @@ def liquidate_estate(player_id: int, cause: str, current_tick: int) -> Optional[
                     next_installment_tick=current_tick + INSTALLMENT_INTERVAL
                 )
                 db.add(installment)
-
-                log_transaction(
-                    player_id=heir.heir_player_id,
-                    transaction_type="inheritance",
-                    category="money",
-                    amount=inheritance_after_tax,
-                    description=f"Inherited from {player.business_name} (before tax: ${per_heir:,.2f})"
-                )
+                new_installments.append(installment)
+                inheritance_logs.append((heir.heir_player_id, inheritance_after_tax, per_heir))
 
                 print(f"[Estate] Heir {heir.heir_player_id} receives ${inheritance_after_tax:,.2f} "
                       f"(tax: ${death_tax:,.2f} in {INSTALLMENT_COUNT} installments)")
         else:
             # No heirs - government takes everything
-            gov = db.query(Player).filter(Player.id == GOVERNMENT_PLAYER_ID).first()
-            if gov:
-                gov.cash_balance += remainder
-                print(f"[Estate] No heirs - government receives ${remainder:,.2f}")
+            ledger.credit(GOVERNMENT_PLAYER_ID, remainder)
+            print(f"[Estate] No heirs - government receives ${remainder:,.2f}")
             government_took_all = True
 
         # 6. Create deceased player record (death certificate)
@@ -717,50 +780,47 @@ def liquidate_estate(player_id: int, cause: str, current_tick: int) -> Optional[
             db.query(MarketOrder).filter(
                 MarketOrder.player_id == player_id,
                 MarketOrder.status == "active"
-            ).update({"status": "cancelled"})
+            ).update({"status": "cancelled"}, synchronize_session=False)
         except:
             pass
 
-        # Remove heir designations (they're the deceased's designations)
+        # Remove heir designations (the deceased's own, and any naming the deceased)
+        from sqlalchemy import or_
         db.query(HeirDesignation).filter(
-            HeirDesignation.player_id == player_id
-        ).delete()
-
-        # Remove any designations where deceased was someone else's heir
-        db.query(HeirDesignation).filter(
-            HeirDesignation.heir_player_id == player_id
-        ).delete()
+            or_(HeirDesignation.player_id == player_id, HeirDesignation.heir_player_id == player_id)
+        ).delete(synchronize_session=False)
 
         # Remove sessions
+        session_tokens = []
         try:
-            from auth import Session as AuthSession, active_sessions
-            sessions = db.query(AuthSession).filter(AuthSession.player_id == player_id).all()
-            for s in sessions:
-                active_sessions.pop(s.session_token, None)
-                db.delete(s)
+            from auth import Session as AuthSession
+            session_tokens = [token for (token,) in db.query(AuthSession.session_token).filter(
+                AuthSession.player_id == player_id
+            ).all()]
+            db.query(AuthSession).filter(AuthSession.player_id == player_id).delete(synchronize_session=False)
         except:
             pass
 
         # Remove retail prices
         try:
             from business import RetailPrice
-            db.query(RetailPrice).filter(RetailPrice.player_id == player_id).delete()
+            db.query(RetailPrice).filter(RetailPrice.player_id == player_id).delete(synchronize_session=False)
         except:
             pass
 
         # Remove stats cache
         try:
             from stats_ux import PlayerStats, PlayerCostAverage
-            db.query(PlayerStats).filter(PlayerStats.player_id == player_id).delete()
-            db.query(PlayerCostAverage).filter(PlayerCostAverage.player_id == player_id).delete()
+            db.query(PlayerStats).filter(PlayerStats.player_id == player_id).delete(synchronize_session=False)
+            db.query(PlayerCostAverage).filter(PlayerCostAverage.player_id == player_id).delete(synchronize_session=False)
         except:
             pass
 
         # Remove city memberships
         try:
             from cities import CityMember, CityApplication
-            db.query(CityMember).filter(CityMember.player_id == player_id).delete()
-            db.query(CityApplication).filter(CityApplication.player_id == player_id).delete()
+            db.query(CityMember).filter(CityMember.player_id == player_id).delete(synchronize_session=False)
+            db.query(CityApplication).filter(CityApplication.player_id == player_id).delete(synchronize_session=False)
         except:
             pass
 
@@ -777,6 +837,39 @@ def liquidate_estate(player_id: int, cause: str, current_tick: int) -> Optional[
         db.delete(player)
 
         db.commit()
+        ledger.commit()
+        lien_registry.forget_player(player_id)
+        try:
+            from auth import revoke_session
+            for token in session_tokens:
+                revoke_session(token)
+        except ImportError:
+            pass
+        try:
+            from executive import invalidate_player_bonuses
+            invalidate_player_bonuses(player_id)
+        except ImportError:
+            pass
+        try:
+            from cities import unindex_member
+            unindex_member(player_id)
+        except ImportError:
+            pass
+        try:
+            from land import reload_plot_owner
+            reload_plot_owner(player_id)  # plots were vacated with bulk UPDATEs
+        except ImportError:
+            pass
+        for installment in new_installments:
+            deadlines.schedule("estate_installments", installment.id, installment.next_installment_tick)
+        for heir_id, inheritance_after_tax, per_heir in inheritance_logs:
+            log_transaction(
+                player_id=heir_id,
+                transaction_type="inheritance",
+                category="money",
+                amount=inheritance_after_tax,
+                description=f"Inherited from {deceased.business_name} (before tax: ${per_heir:,.2f})"
+            )
 
         print(f"[Estate] Estate liquidation complete for {deceased.business_name}")
         print(f"[Estate]   Liquidated: ${liquidation_value:,.2f}")
@@ -801,90 +894,125 @@ def liquidate_estate(player_id: int, cause: str, current_tick: int) -> Optional[
 # ==========================
 
 def process_installments(current_tick: int):
-    """Process death tax installment payments each tick."""
-    db = get_db()
-    try:
-        from auth import Player
+    """Process death tax installments whose payment tick has come up."""
+    with deadlines.claim_due("estate_installments", current_tick) as due_ids:
+        if not due_ids:
+            return
 
-        pending = db.query(InheritanceInstallment).filter(
-            InheritanceInstallment.completed == False,
-            InheritanceInstallment.next_installment_tick <= current_tick
-        ).all()
+        db = get_db()
+        try:
+            from auth import Player
 
-        for inst in pending:
-            heir = db.query(Player).filter(Player.id == inst.heir_player_id).first()
-            if not heir:
-                # Heir no longer exists, mark completed
-                inst.completed = True
-                continue
-
-            payment = inst.installment_amount
-            # Take what we can from the heir
-            actual_payment = min(payment, heir.cash_balance)
-
-            if actual_payment > 0:
-                heir.cash_balance -= actual_payment
-                inst.total_tax_paid += actual_payment
-                inst.installments_remaining -= 1
-                inst.next_installment_tick = current_tick + INSTALLMENT_INTERVAL
-
-                # Pay to government
-                gov = db.query(Player).filter(Player.id == GOVERNMENT_PLAYER_ID).first()
-                if gov:
-                    gov.cash_balance += actual_payment
-
-                log_transaction(
-                    player_id=inst.heir_player_id,
-                    transaction_type="death_tax",
-                    category="money",
-                    amount=-actual_payment,
-                    description=f"Death tax installment ({inst.installments_remaining} remaining)"
-                )
+            pending = db.query(InheritanceInstallment).filter(
+                InheritanceInstallment.id.in_(due_ids.keys),
+                InheritanceInstallment.completed == False,
+                InheritanceInstallment.next_installment_tick <= current_tick
+            ).all()
 
-                print(f"[Estate] Heir {inst.heir_player_id} paid ${actual_payment:,.2f} "
-                      f"death tax ({inst.installments_remaining} installments remaining)")
-            else:
-                # Can't pay - push to next cycle
-                inst.next_installment_tick = current_tick + INSTALLMENT_INTERVAL
-                print(f"[Estate] Heir {inst.heir_player_id} insufficient funds for death tax installment")
+            for inst in pending:
+                heir = db.query(Player).filter(Player.id == inst.heir_player_id).first()
+                if not heir:
+                    # Heir no longer exists, mark completed
+                    inst.completed = True
+                    continue
 
-            if inst.installments_remaining <= 0 or inst.total_tax_paid >= inst.total_tax_owed:
-                inst.completed = True
-                print(f"[Estate] Death tax installments complete for heir {inst.heir_player_id}")
+                payment = inst.installment_amount
+                # Take what we can from the heir
+                actual_payment = min(payment, heir.cash_balance)
+
+                if actual_payment > 0:
+                    heir.cash_balance -= actual_payment
+                    inst.total_tax_paid += actual_payment
+                    inst.installments_remaining -= 1
+                    inst.next_installment_tick = current_tick + INSTALLMENT_INTERVAL
+
+                    # Pay to government
+                    gov = db.query(Player).filter(Player.id == GOVERNMENT_PLAYER_ID).first()
+                    if gov:
+                        gov.cash_balance += actual_payment
+
+                    log_transaction(
+                        player_id=inst.heir_player_id,
+                        transaction_type="death_tax",
+                        category="money",
+                        amount=-actual_payment,
+                        description=f"Death tax installment ({inst.installments_remaining} remaining)"
+                    )
+
+                    print(f"[Estate] Heir {inst.heir_player_id} paid ${actual_payment:,.2f} "
+                          f"death tax ({inst.installments_remaining} installments remaining)")
+                else:
+                    # Can't pay - push to next cycle
+                    inst.next_installment_tick = current_tick + INSTALLMENT_INTERVAL
+                    print(f"[Estate] Heir {inst.heir_player_id} insufficient funds for death tax installment")
+
+                if inst.installments_remaining <= 0 or inst.total_tax_paid >= inst.total_tax_owed:
+                    inst.completed = True
+                    print(f"[Estate] Death tax installments complete for heir {inst.heir_player_id}")
+
+            rescheduled = [(inst.id, inst.next_installment_tick) for inst in pending if not inst.completed]
+            db.commit()
+            due_ids.done_all()
+            for inst_id, due_tick in rescheduled:
+                deadlines.schedule("estate_installments", inst_id, due_tick)
+        except Exception as e:
+            print(f"[Estate] Installment processing error: {e}")
+            db.rollback()
+        finally:
+            db.close()
 
-        db.commit()
-    except Exception as e:
-        print(f"[Estate] Installment processing error: {e}")
-        db.rollback()
-    finally:
-        db.close()
+
+def queue_liquidation(player_id: int, cause: str) -> bool:
+    """Queue an estate for the batched liquidation pipeline (no-op if already queued)."""
+    if player_id in _queued_liquidations:
+        return False
+    _queued_liquidations.add(player_id)
+    _liquidation_queue.append((player_id, cause))
+    return True
+
+
+def process_liquidation_queue(current_tick: int) -> int:
+    """
+    Liquidate queued estates until LIQUIDATION_TIME_BUDGET is used up
+    (always at least one). Every estate in the batch is priced from the same
+    PriceSnapshot; whatever is left waits for the next tick.
+    """
+    if not _liquidation_queue:
+        return 0
+
+    started = time.perf_counter()
+    prices = PriceSnapshot.load()
+    processed = 0
+    while _liquidation_queue:
+        player_id, cause = _liquidation_queue.popleft()
+        _queued_liquidations.discard(player_id)
+        liquidate_estate(player_id, cause, current_tick, prices)
+        processed += 1
+        if time.perf_counter() - started >= LIQUIDATION_TIME_BUDGET:
+            break
+
+    if _liquidation_queue:
+        print(f"[Estate] Liquidated {processed} estate(s) this tick, {len(_liquidation_queue)} queued")
+    return processed
 
 
 def check_idle_players(current_tick: int):
-    """Check for players who haven't logged in for too long and auto-delete them."""
+    """Queue players who haven't logged in for too long for auto-deletion."""
     db = get_db()
     try:
         from auth import Player
         cutoff = datetime.utcnow() - timedelta(days=IDLE_DAYS_BEFORE_DEATH)
 
-        idle_players = db.query(Player).filter(
+        idle_players = db.query(Player.id, Player.business_name, Player.last_login).filter(
             Player.last_login < cutoff,
-            Player.id > 0  # Don't delete government
+            Player.id > 0,  # Don't delete government
+            ~Player.id.in_(db.query(DeceasedPlayer.player_id))
         ).all()
 
-        for player in idle_players:
-            # Check if already deceased
-            existing = db.query(DeceasedPlayer).filter(
-                DeceasedPlayer.player_id == player.id
-            ).first()
-            if existing:
-                continue
-
-            print(f"[Estate] Player {player.business_name} (ID: {player.id}) "
-                  f"last login: {player.last_login} - triggering auto-deletion")
-            db.close()
-            liquidate_estate(player.id, "idle_timeout", current_tick)
-            db = get_db()  # Reopen since liquidate_estate closes db
+        for player_id, business_name, last_login in idle_players:
+            if queue_liquidation(player_id, "idle_timeout"):
+                print(f"[Estate] Player {business_name} (ID: {player_id}) "
+                      f"last login: {last_login} - queued for auto-deletion")
 
     except Exception as e:
         print(f"[Estate] Idle check error: {e}")
@@ -900,9 +1028,21 @@ def initialize():
     """Initialize estate module."""
     print("[Estate] Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    deadlines.register("estate_installments", _load_installment_deadlines)
     print("[Estate] Account deletion & estate system initialized")
 
 
+def _load_installment_deadlines():
+    db = get_db()
+    try:
+        rows = db.query(InheritanceInstallment.id, InheritanceInstallment.next_installment_tick).filter(
+            InheritanceInstallment.completed == False
+        ).all()
+        return [(inst_id, due_tick) for inst_id, due_tick in rows]
+    finally:
+        db.close()
+
+
 async def tick(current_tick: int, now):
     """Estate system tick handler."""
     # Process death tax installments every 60 ticks (5 minutes)
@@ -913,6 +1053,9 @@ async def tick(current_tick: int, now):
     if current_tick % IDLE_CHECK_INTERVAL == 0:
         check_idle_players(current_tick)
 
+    # Work through queued estates within the per-tick budget
+    process_liquidation_queue(current_tick)
+
 
 # ==========================
 # PUBLIC API
@@ -930,6 +1073,11 @@ __all__ = [
     'set_heir',
     'remove_heir',
     'liquidate_estate',
+    'queue_liquidation',
+    'process_liquidation_queue',
+    'load_estate_assets',
+    'value_estate',
+    'PriceSnapshot',
     'calculate_estate_value',
     'calculate_total_debts',
     'initialize',
@@ -25,9 +25,7 @@ def require_auth(session_token: Optional[str] = Cookie(None)):
     """Check if user is authenticated."""
     try:
         import auth
-        db = auth.get_db()
-        player = auth.get_player_from_session(db, session_token)
-        db.close()
+        player = auth.get_session_player(session_token)
         if not player:
             return RedirectResponse(url="/login", status_code=303)
         return player
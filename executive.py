@@ -19,11 +19,12 @@ from typing import Optional, List
 from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer, Boolean, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+import cluster
 
 # ==========================
 # DATABASE SETUP
 # ==========================
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 
 engine = create_engine(
     DATABASE_URL,
@@ -212,15 +213,17 @@ class Executive(Base):
     is_retired = Column(Boolean, default=False)
     is_dead = Column(Boolean, default=False)
 
-    # School
+    # School (graduation at school_end_tick)
     is_in_school = Column(Boolean, default=False)
-    school_ticks_remaining = Column(Integer, default=0)
+    school_ticks_base = Column("school_ticks_remaining", Integer, default=0)
+    school_end_tick = Column(Integer, index=True, nullable=True)
     school_cost_remaining = Column(Float, default=0.0)
     pending_upgrade = Column(Boolean, default=False)  # waiting for player to pick upgrade
 
-    # Pension
+    # Pension (an accrual stream ending at pension_end_tick, see accruals.py)
     pension_owed = Column(Float, default=0.0)
-    pension_ticks_remaining = Column(Integer, default=0)
+    pension_ticks_base = Column("pension_ticks_remaining", Integer, default=0)
+    pension_end_tick = Column(Integer, index=True, nullable=True)
 
     # Special
     is_special = Column(Boolean, default=False)
@@ -240,10 +243,58 @@ class Executive(Base):
     on_marketplace = Column(Boolean, default=True)
     marketplace_reason = Column(String, default="new")  # new, fired, retired_available
 
-    # Accumulated tick counters for pay and aging
+    # Lifecycle due ticks: only executives whose event is due are loaded each tick
+    next_birthday_tick = Column(Integer, index=True, nullable=True)
+    next_pay_tick = Column(Integer, index=True, nullable=True)  # null = not employed
+
+    # Legacy per-tick counters (converted to due ticks at startup)
     pay_tick_accumulator = Column(Integer, default=0)
     age_tick_accumulator = Column(Integer, default=0)
 
+    @property
+    def pension_ticks_remaining(self) -> int:
+        """Ticks left on the pension, computed from its end tick."""
+        if self.pension_end_tick is None:
+            return self.pension_ticks_base or 0
+        from accruals import Accrual
+        import game_clock
+        return Accrual.ticks_remaining(self.pension_end_tick, game_clock.current())
+
+    @pension_ticks_remaining.setter
+    def pension_ticks_remaining(self, value: int):
+        import game_clock
+        self.pension_ticks_base = value
+        self.pension_end_tick = game_clock.current() + value if value > 0 else None
+
+    @property
+    def school_ticks_remaining(self) -> int:
+        """Ticks until graduation, computed from school_end_tick."""
+        if self.school_end_tick is None:
+            return self.school_ticks_base or 0
+        from accruals import Accrual
+        import game_clock
+        return Accrual.ticks_remaining(self.school_end_tick, game_clock.current())
+
+    @school_ticks_remaining.setter
+    def school_ticks_remaining(self, value: int):
+        import game_clock
+        self.school_ticks_base = value
+        self.school_end_tick = game_clock.current() + value if value > 0 else None
+
+    @property
+    def ticks_per_year(self) -> int:
+        # Eternal youth special: ages at half speed
+        if self.is_special and self.special_ability == "eternal_youth":
+            return int(TICKS_PER_YEAR * 1.5)
+        return TICKS_PER_YEAR
+
+    def start_payroll(self, current_tick: int):
+        """First payday one full pay cycle after hiring."""
+        self.next_pay_tick = current_tick + PAY_CYCLES.get(self.pay_cycle, 720)
+
+    def stop_payroll(self):
+        self.next_pay_tick = None
+
 
 # ==========================
 # LOAD NAME DATA
@@ -350,8 +401,10 @@ def generate_executive(force_special: bool = False) -> dict:
 
 def create_executive(db, force_special: bool = False) -> Executive:
     """Create a new executive and add to the database."""
+    import game_clock
     attrs = generate_executive(force_special=force_special)
     exec_obj = Executive(**attrs)
+    exec_obj.next_birthday_tick = game_clock.current() + exec_obj.ticks_per_year
     db.add(exec_obj)
     db.commit()
     db.refresh(exec_obj)
@@ -386,14 +439,17 @@ def hire_executive(db, player_id: int, executive_id: int) -> dict:
     if player.cash_balance < hiring_fee:
         return {"success": False, "error": f"Insufficient funds. Hiring fee: ${hiring_fee:,.2f}"}
 
+    import game_clock
     player.cash_balance -= hiring_fee
     exec_obj.player_id = player_id
+    exec_obj.start_payroll(game_clock.current())
     exec_obj.on_marketplace = False
     exec_obj.hired_at = datetime.utcnow()
     exec_obj.fired_at = None
     exec_obj.is_retired = False
     exec_obj.marketplace_reason = None
     db.commit()
+    invalidate_player_bonuses(player_id)
 
     return {
         "success": True,
@@ -420,6 +476,7 @@ def fire_executive(db, player_id: int, executive_id: int) -> dict:
         monthly_wages = 0.0
 
     exec_obj.player_id = None
+    exec_obj.stop_payroll()
     exec_obj.on_marketplace = True
     exec_obj.marketplace_reason = "fired"
     exec_obj.fired_at = datetime.utcnow()
@@ -430,6 +487,7 @@ def fire_executive(db, player_id: int, executive_id: int) -> dict:
     exec_obj.pension_owed = monthly_wages
     exec_obj.pension_ticks_remaining = PENSION_DURATION_TICKS
     db.commit()
+    invalidate_player_bonuses(player_id)
 
     return {
         "success": True,
@@ -479,6 +537,7 @@ def send_to_school(db, player_id: int, executive_id: int) -> dict:
     exec_obj.school_ticks_remaining = ticks
     exec_obj.school_cost_remaining = 0.0  # paid upfront
     db.commit()
+    invalidate_player_bonuses(player_id)
 
     return {
         "success": True,
@@ -523,13 +582,13 @@ def apply_school_upgrade(db, player_id: int, executive_id: int, bonus_key: str)
     exec_obj.wage = round(base_hourly * (cycle_ticks / 720.0), 2)
 
     # Apply wage reduction bonuses
-    for b in (exec_obj.bonuses or "").split(","):
-        if b.startswith("wage_reduction_"):
-            pct = int(b.split("_")[-1])
+    for prefix, pct in parse_bonuses(exec_obj.bonuses):
+        if prefix == "wage_reduction":
             exec_obj.wage *= (1.0 - pct / 100.0)
     exec_obj.wage = round(exec_obj.wage, 2)
 
     db.commit()
+    invalidate_player_bonuses(player_id)
 
     upgrade_info = next((u for u in available if u["bonus"] == bonus_key), {})
     return {
@@ -538,52 +597,94 @@ def apply_school_upgrade(db, player_id: int, executive_id: int, bonus_key: str)
     }
 
 
-def get_player_job_bonus(db, player_id: int, effect: str) -> float:
-    """Calculate total bonus for a given job effect from player's executives."""
-    executives = db.query(Executive).filter(
-        Executive.player_id == player_id,
-        Executive.is_dead == False,
-        Executive.is_in_school == False,
-        Executive.is_retired == False
-    ).all()
+# ==========================
+# BONUS CACHE
+# ==========================
+# Per-player bonus vectors ({effect: bonus}), rebuilt on demand after the
+# player's roster changes (hire, fire, school, upgrade, retirement, death).
+_bonus_vectors = {}
+_parsed_bonuses = {}
+
+
+def parse_bonuses(bonuses: Optional[str]) -> tuple:
+    """Parse a comma-separated bonus string into ((prefix, pct), ...), memoized."""
+    text = bonuses or ""
+    parsed = _parsed_bonuses.get(text)
+    if parsed is None:
+        items = []
+        for b in text.split(","):
+            if not b:
+                continue
+            prefix, _, pct = b.rpartition("_")
+            try:
+                items.append((prefix, int(pct)))
+            except ValueError:
+                continue
+        parsed = tuple(items)
+        _parsed_bonuses[text] = parsed
+    return parsed
 
-    total_bonus = 0.0
-    mentor_count = 0
 
-    for ex in executives:
-        if ex.is_special and ex.special_ability == "mentor":
-            mentor_count += 1
+def _build_bonus_vector(executives) -> dict:
+    """Total bonus per job effect for one player's active executives."""
+    mentor_count = sum(1 for ex in executives if ex.is_special and ex.special_ability == "mentor")
 
+    totals = {}
+    team_boost = 1.0
     for ex in executives:
-        job_info = EXECUTIVE_JOBS.get(ex.job, {})
-        if job_info.get("effect") != effect:
+        parsed = parse_bonuses(ex.bonuses)
+        for prefix, pct in parsed:
+            if prefix == "team_boost":
+                team_boost *= (1.0 + pct / 100.0)
+
+        effect = EXECUTIVE_JOBS.get(ex.job, {}).get("effect")
+        if effect is None:
             continue
 
         # Base bonus: 2% per level
         bonus = 0.02 * (ex.level + mentor_count)
 
         # Apply efficiency bonuses from upgrades
-        for b in (ex.bonuses or "").split(","):
-            if b.startswith("efficiency_"):
-                pct = int(b.split("_")[-1])
+        for prefix, pct in parsed:
+            if prefix == "efficiency":
                 bonus *= (1.0 + pct / 100.0)
-            if b.startswith("team_boost_"):
-                pass  # handled globally
 
         # Double efficiency special
         if ex.is_special and ex.special_ability == "double_efficiency":
             bonus *= 2.0
 
-        total_bonus += bonus
+        totals[effect] = totals.get(effect, 0.0) + bonus
 
-    # Team boost bonuses (from any executive's upgrades)
-    for ex in executives:
-        for b in (ex.bonuses or "").split(","):
-            if b.startswith("team_boost_"):
-                pct = int(b.split("_")[-1])
-                total_bonus *= (1.0 + pct / 100.0)
+    # Team boost bonuses (from any executive's upgrades), cap at 95%
+    return {effect: min(total * team_boost, 0.95) for effect, total in totals.items()}
+
+
+def get_player_bonus_vector(db, player_id: int) -> dict:
+    """Cached {effect: bonus} for a player; other modules can read it in O(1)."""
+    vector = _bonus_vectors.get(player_id)
+    if vector is None:
+        executives = db.query(Executive).filter(
+            Executive.player_id == player_id,
+            Executive.is_dead == False,
+            Executive.is_in_school == False,
+            Executive.is_retired == False
+        ).all()
+        vector = _build_bonus_vector(executives)
+        _bonus_vectors[player_id] = vector
+    return vector
 
-    return min(total_bonus, 0.95)  # Cap at 95%
+
+@cluster.replicated(coalesce=True)
+def invalidate_player_bonuses(*player_ids):
+    """Drop cached bonus vectors (call after the roster change is committed)."""
+    for player_id in player_ids:
+        if player_id is not None:
+            _bonus_vectors.pop(player_id, None)
+
+
+def get_player_job_bonus(db, player_id: int, effect: str) -> float:
+    """Calculate total bonus for a given job effect from player's executives."""
+    return get_player_bonus_vector(db, player_id).get(effect, 0.0)
 
 
 def get_player_executives(db, player_id: int) -> List[Executive]:
@@ -608,15 +709,20 @@ def get_marketplace_executives(db) -> List[Executive]:
 
 async def tick(current_tick: int, now: datetime):
     """Process executive lifecycle each tick."""
+    from auth import CashLedger
+    ledger = CashLedger()
     db = get_db()
+    roster_changed = set()
     try:
-        _process_aging(db, current_tick)
-        _process_wages(db, current_tick)
+        _process_aging(db, current_tick, roster_changed)
+        _process_wages(db, current_tick, ledger)
         _process_pensions(db, current_tick)
-        _process_school(db, current_tick)
+        _process_school(db, current_tick, roster_changed)
         _process_marketplace_spawn(db, current_tick)
-        _process_market_maker(db, current_tick)
+        _process_market_maker(db, current_tick, ledger)
         db.commit()
+        invalidate_player_bonuses(*roster_changed)
+        ledger.commit()
     except Exception as e:
         db.rollback()
         print(f"[Executive Tick {current_tick}] ERROR: {e}")
@@ -624,32 +730,38 @@ async def tick(current_tick: int, now: datetime):
         db.close()
 
 
-def _process_aging(db, current_tick: int):
-    """Age all living executives."""
-    living = db.query(Executive).filter(Executive.is_dead == False).all()
-    for ex in living:
-        ex.age_tick_accumulator += 1
-
-        # Eternal youth special: ages at half speed
-        ticks_needed = TICKS_PER_YEAR
-        if ex.is_special and ex.special_ability == "eternal_youth":
-            ticks_needed = int(TICKS_PER_YEAR * 1.5)
-
-        if ex.age_tick_accumulator >= ticks_needed:
-            ex.age_tick_accumulator = 0
+def _process_aging(db, current_tick: int, roster_changed: set):
+    """
+    Handle birthdays due this tick (employers losing an executive are added
+    to roster_changed). Only executives on the next_birthday_tick index are
+    loaded; ages change only on birthdays, so current_age is always exact.
+    """
+    birthdays = db.query(Executive).filter(
+        Executive.is_dead == False,
+        Executive.next_birthday_tick != None,
+        Executive.next_birthday_tick <= current_tick
+    ).all()
+    for ex in birthdays:
+        ticks_needed = ex.ticks_per_year
+        while ex.next_birthday_tick <= current_tick:
+            ex.next_birthday_tick += ticks_needed
             ex.current_age += 1
 
-            # Check for death
-            if ex.current_age >= ex.max_age:
-                ex.is_dead = True
-                ex.on_marketplace = False
-                if ex.player_id is not None:
-                    ex.player_id = None
-                continue
+        # Check for death
+        if ex.current_age >= ex.max_age:
+            ex.is_dead = True
+            ex.on_marketplace = False
+            ex.next_birthday_tick = None
+            ex.stop_payroll()
+            if ex.player_id is not None:
+                roster_changed.add(ex.player_id)
+                ex.player_id = None
+            continue
 
-            # Check for retirement
-            if ex.current_age >= ex.retirement_age and not ex.is_retired and ex.player_id is not None:
-                _retire_executive(db, ex)
+        # Check for retirement
+        if ex.current_age >= ex.retirement_age and not ex.is_retired and ex.player_id is not None:
+            roster_changed.add(ex.player_id)
+            _retire_executive(db, ex)
 
 
 def _retire_executive(db, ex: Executive):
@@ -664,6 +776,7 @@ def _retire_executive(db, ex: Executive):
     ex.pension_owed = monthly_wages
     ex.pension_ticks_remaining = PENSION_DURATION_TICKS
     ex.player_id = None
+    ex.stop_payroll()
     ex.on_marketplace = True
     ex.marketplace_reason = "retired_available"
     ex.is_in_school = False
@@ -671,75 +784,77 @@ def _retire_executive(db, ex: Executive):
     ex.pending_upgrade = False
 
 
-def _process_wages(db, current_tick: int):
-    """Pay wages to employed executives."""
-    from auth import Player
-    employed = db.query(Executive).filter(
+def _process_wages(db, current_tick: int, ledger):
+    """
+    Pay executives whose payday is due (debited through the cash ledger).
+    Only rows on the next_pay_tick index are loaded.
+    """
+    due = db.query(Executive).filter(
         Executive.player_id != None,
         Executive.is_dead == False,
-        Executive.is_retired == False
+        Executive.is_retired == False,
+        Executive.next_pay_tick != None,
+        Executive.next_pay_tick <= current_tick
     ).all()
 
-    for ex in employed:
-        ex.pay_tick_accumulator += 1
+    for ex in due:
         cycle_ticks = PAY_CYCLES.get(ex.pay_cycle, 720)
+        cycles_due = (current_tick - ex.next_pay_tick) // cycle_ticks + 1
+        ex.next_pay_tick += cycles_due * cycle_ticks
+        wage = ex.wage * cycles_due
 
-        if ex.pay_tick_accumulator >= cycle_ticks:
-            ex.pay_tick_accumulator = 0
-            wage = ex.wage
-
-            # HR Director bonus: reduce wages
-            hr_bonus = get_player_job_bonus(db, ex.player_id, "wages")
-            wage *= max(0.2, 1.0 - hr_bonus)
+        # HR Director bonus: reduce wages
+        hr_bonus = get_player_job_bonus(db, ex.player_id, "wages")
+        wage *= max(0.2, 1.0 - hr_bonus)
 
-            # Half wages special
-            if ex.is_special and ex.special_ability == "half_wages":
-                wage *= 0.5
+        # Half wages special
+        if ex.is_special and ex.special_ability == "half_wages":
+            wage *= 0.5
 
-            player = db.query(Player).filter(Player.id == ex.player_id).first()
-            if player:
-                player.cash_balance -= wage
+        # Payroll is owed even when it overdraws the employer
+        ledger.debit(ex.player_id, wage, allow_overdraft=True)
 
 
 def _process_pensions(db, current_tick: int):
-    """Process pension payments for retired/fired executives."""
-    from auth import Player
+    """
+    Close out pensions for retired/fired executives.
+    Pensions run from firing/retirement to pension_end_tick; only the
+    streams ending this tick are loaded, instead of decrementing every
+    pensioner each tick.
+    """
     pensioners = db.query(Executive).filter(
-        Executive.pension_ticks_remaining > 0,
+        Executive.pension_end_tick != None,
+        Executive.pension_end_tick <= current_tick,
         Executive.pension_owed > 0
     ).all()
 
     for ex in pensioners:
-        # Find the last employer (the one who owes pension)
-        # Pension is collected from any player who fired/had them retire
-        # We track this as a global cost - pension payments happen each tick
-        ex.pension_ticks_remaining -= 1
-        payment = ex.pension_owed / (PENSION_DURATION_TICKS)  # even payments
-
         # Pension is owed by the system (simplification) - but if executive
         # was fired by a specific player, we'd need to track that.
         # For now, pension is handled on firing/retirement by calculating total owed.
-        if ex.pension_ticks_remaining <= 0:
-            ex.pension_owed = 0.0
-            # If still young enough after pension, can re-enter workforce
-            if not ex.is_dead and ex.current_age < ex.max_age - 5:
-                ex.is_retired = False
-                ex.on_marketplace = True
-                ex.marketplace_reason = "retired_available"
-
-
-def _process_school(db, current_tick: int):
-    """Process executives in school."""
-    in_school = db.query(Executive).filter(
+        ex.pension_owed = 0.0
+        ex.pension_ticks_base = 0
+        ex.pension_end_tick = None
+        # If still young enough after pension, can re-enter workforce
+        if not ex.is_dead and ex.current_age < ex.max_age - 5:
+            ex.is_retired = False
+            ex.on_marketplace = True
+            ex.marketplace_reason = "retired_available"
+
+
+def _process_school(db, current_tick: int, roster_changed: set):
+    """Graduate executives whose school_end_tick has passed (they rejoin their employer's bonuses)."""
+    graduates = db.query(Executive).filter(
         Executive.is_in_school == True,
-        Executive.school_ticks_remaining > 0
+        Executive.school_end_tick != None,
+        Executive.school_end_tick <= current_tick
     ).all()
 
-    for ex in in_school:
-        ex.school_ticks_remaining -= 1
-        if ex.school_ticks_remaining <= 0:
-            ex.is_in_school = False
-            ex.pending_upgrade = True  # Player must select upgrade
+    for ex in graduates:
+        ex.school_ticks_remaining = 0
+        ex.is_in_school = False
+        ex.pending_upgrade = True  # Player must select upgrade
+        roster_changed.add(ex.player_id)
 
 
 def _process_marketplace_spawn(db, current_tick: int):
@@ -764,9 +879,8 @@ def _process_marketplace_spawn(db, current_tick: int):
             create_executive(db, force_special=True)
 
 
-def _process_market_maker(db, current_tick: int):
+def _process_market_maker(db, current_tick: int, ledger):
     """Process market_maker special ability passive income."""
-    from auth import Player
     market_makers = db.query(Executive).filter(
         Executive.player_id != None,
         Executive.is_dead == False,
@@ -777,9 +891,7 @@ def _process_market_maker(db, current_tick: int):
     ).all()
 
     for ex in market_makers:
-        player = db.query(Player).filter(Player.id == ex.player_id).first()
-        if player:
-            player.cash_balance += 500.0
+        ledger.credit(ex.player_id, 500.0)
 
 
 # ==========================
@@ -791,6 +903,20 @@ def initialize():
     Base.metadata.create_all(bind=engine)
     load_names()
 
+    from db_schema import ensure_columns, ensure_indexes
+    ensure_columns(engine, "executives", {
+        "pension_end_tick": "INTEGER",
+        "school_end_tick": "INTEGER",
+        "next_birthday_tick": "INTEGER",
+        "next_pay_tick": "INTEGER",
+    })
+    ensure_indexes(engine, "executives", {
+        "ix_executives_pension_end_tick": "pension_end_tick",
+        "ix_executives_school_end_tick": "school_end_tick",
+        "ix_executives_next_birthday_tick": "next_birthday_tick",
+        "ix_executives_next_pay_tick": "next_pay_tick",
+    })
+
     db = get_db()
     try:
         # Seed marketplace if empty
@@ -801,5 +927,44 @@ def initialize():
             # Always seed at least 1 special
             create_executive(db, force_special=True)
             print(f"  Seeded {11} executives on marketplace")
+
+        # Convert legacy pension countdowns into end ticks
+        import game_clock
+        now_tick = game_clock.current()
+        legacy = db.query(Executive).filter(
+            Executive.pension_end_tick == None,
+            Executive.pension_ticks_base > 0
+        ).all()
+        for ex in legacy:
+            ex.pension_end_tick = now_tick + ex.pension_ticks_base
+        if legacy:
+            db.commit()
+
+        # Convert legacy aging / pay / school counters into due ticks
+        converted = 0
+        for ex in db.query(Executive).filter(
+            Executive.is_dead == False,
+            Executive.next_birthday_tick == None
+        ).all():
+            ex.next_birthday_tick = now_tick + max(1, ex.ticks_per_year - (ex.age_tick_accumulator or 0))
+            converted += 1
+        for ex in db.query(Executive).filter(
+            Executive.player_id != None,
+            Executive.is_dead == False,
+            Executive.is_retired == False,
+            Executive.next_pay_tick == None
+        ).all():
+            cycle_ticks = PAY_CYCLES.get(ex.pay_cycle, 720)
+            ex.next_pay_tick = now_tick + max(1, cycle_ticks - (ex.pay_tick_accumulator or 0))
+            converted += 1
+        for ex in db.query(Executive).filter(
+            Executive.is_in_school == True,
+            Executive.school_end_tick == None
+        ).all():
+            ex.school_end_tick = now_tick + (ex.school_ticks_base or 0)
+            converted += 1
+        if converted:
+            db.commit()
+            print(f"[Executive] Scheduled {converted} legacy lifecycle counters")
     finally:
         db.close()
@@ -21,11 +21,8 @@ router = APIRouter()
 # ==========================
 def get_current_player(session_token: Optional[str]):
     """Get player from session token."""
-    from auth import get_player_from_session, get_db
-    db = get_db()
-    player = get_player_from_session(db, session_token)
-    db.close()
-    return player
+    from auth import get_session_player
+    return get_session_player(session_token)
 
 
 # ==========================
@@ -0,0 +1,84 @@
+"""
+game_clock.py
+
+Durable tick counter for the simulation.
+
+app.current_tick used to restart from zero on every launch, so anything that
+stored an absolute tick (delivery schedules, business cycles, decay bases)
+drifted after a restart. The tick loop now restores the counter from here on
+startup and checkpoints it periodically and on shutdown.
+"""
+
+from datetime import datetime
+from sqlalchemy import create_engine, Column, Integer, DateTime
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+
+# ==========================
+# DATABASE SETUP
+# ==========================
+from db_schema import DATABASE_URL
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base = declarative_base()
+
+SAVE_INTERVAL = 60  # ticks between checkpoints
+
+# In-memory tick, advanced by app.tick_loop; readable from request handlers
+current_tick = 0
+
+# ==========================
+# DATABASE MODELS
+# ==========================
+class GameClock(Base):
+    """Single-row checkpoint of the global tick counter."""
+    __tablename__ = "game_clock"
+
+    id = Column(Integer, primary_key=True)
+    tick = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+# ==========================
+# CLOCK ACCESS
+# ==========================
+def current() -> int:
+    """The tick most recently started by the tick loop."""
+    return current_tick
+
+
+def set_current(value: int):
+    global current_tick
+    current_tick = value
+
+
+def load_tick() -> int:
+    """Return the last checkpointed tick (creating the row on first run)."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        clock = db.query(GameClock).filter(GameClock.id == 1).first()
+        if not clock:
+            clock = GameClock(id=1, tick=0)
+            db.add(clock)
+            db.commit()
+        return clock.tick or 0
+    finally:
+        db.close()
+
+
+def save_tick(tick: int):
+    """Checkpoint the tick counter (single-row write)."""
+    db = SessionLocal()
+    try:
+        updated = db.query(GameClock).filter(GameClock.id == 1).update(
+            {GameClock.tick: tick, GameClock.updated_at: datetime.utcnow()},
+            synchronize_session=False
+        )
+        if not updated:
+            db.add(GameClock(id=1, tick=tick))
+        db.commit()
+    finally:
+        db.close()
+
+
+__all__ = ['current', 'set_current', 'load_tick', 'save_tick', 'SAVE_INTERVAL', 'GameClock']
@@ -6,14 +6,15 @@ Inventory management module for the economic simulation.
 
 import json
 from typing import Dict, Optional
-from sqlalchemy import create_engine, Column, String, Float, Integer
+from sqlalchemy import create_engine, Column, String, Float, Integer, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+import cluster
 
 # ==========================
 # DATABASE SETUP
 # ==========================
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -44,6 +45,32 @@ class InventoryItem(Base):
     item_type = Column(String, index=True, nullable=False)
     quantity = Column(Float, default=0.0)
 
+# ==========================
+# CHANGE LISTENERS
+# ==========================
+# Callbacks run with (player_id, item_type) whenever an inventory row is
+# written through the ORM, from any module's session.
+_change_listeners = []
+
+def on_inventory_change(callback):
+    """Register a callback(player_id, item_type) for inventory writes. Must be cheap."""
+    if callback not in _change_listeners:
+        _change_listeners.append(callback)
+
+@event.listens_for(InventoryItem, "after_insert")
+@event.listens_for(InventoryItem, "after_update")
+def _on_item_write(mapper, connection, target):
+    notify_change(target.player_id, target.item_type)
+
+@cluster.replicated(coalesce=True)
+def notify_change(player_id: int, item_type: str):
+    """Run the change listeners for one inventory row (in every process)."""
+    for callback in _change_listeners:
+        try:
+            callback(player_id, item_type)
+        except Exception as e:
+            print(f"[Inventory] Change listener failed: {e}")
+
 # ==========================
 # HELPER FUNCTIONS
 # ==========================
@@ -139,5 +166,6 @@ __all__ = [
     'get_player_inventory', 
     'get_item_info', 
     'get_item_quantity', 
+    'on_inventory_change',
     'InventoryItem'
 ]
@@ -4,23 +4,30 @@ land.py
 Land management module for the economic simulation.
 Handles:
 - Land plot creation and ownership
-- Land efficiency degradation (0.00001% per minute)
+- Land efficiency degradation (0.00001% per minute, computed lazily)
 - Location ratings (determines business compatibility)
 - Land tax system (monthly payments to government)
 - Free starter plot for new players
 - Database models for land plots
+- Index of occupied plots per owner and terrain (district merge candidates)
+- Terrain/proximity bitmasks and SQL plot search (compatibility, sort, paging)
 """
 
+import threading
 from datetime import datetime
-from typing import Optional, List
-from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer, Boolean, func, Index
+from typing import Dict, Optional, List, Set, Tuple
+from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer, Boolean, func, Index, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, object_session
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.ext.hybrid import hybrid_property
+import cluster
+import game_clock
 
 # ==========================
 # DATABASE SETUP
 # ==========================
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 
 engine = create_engine(
     DATABASE_URL,
@@ -35,6 +42,7 @@ Base = declarative_base()
 # ==========================
 EFFICIENCY_DECAY_PER_TICK = 0.00001 / 60  # 0.00001% per minute = per 60 ticks
 STARTING_EFFICIENCY = 100.0  # All land starts at 100% efficiency
+EFFICIENCY_MATERIALIZE_INTERVAL = 17280  # Rebase every plot once a day (5s ticks)
 
 # Terrain types - the base land type
 TERRAIN_TYPES = {
@@ -183,6 +191,65 @@ BUSINESS_COMPATIBILITY = {
     "entertainment_complex": {"allowed_terrain": ['district_entertainment_district'], "allowed_proximity": []},
 }
 
+# ==========================
+# ATTRIBUTE BITMASKS
+# ==========================
+# One bit per terrain / proximity feature, in declaration order. Stored masks
+# are re-derived from the string columns at startup (sync_attribute_masks),
+# so reordering these dicts only costs one backfill pass.
+TERRAIN_BITS = {terrain: 1 << i for i, terrain in enumerate(TERRAIN_TYPES)}
+PROXIMITY_BITS = {feature: 1 << i for i, feature in enumerate(PROXIMITY_FEATURES)}
+
+# Sort keys accepted by search_plots() and the land market search
+PLOT_SORTS = ("id", "terrain", "efficiency", "tax", "status", "size")
+SORT_ORDERS = ("asc", "desc")
+PLOT_PAGE_SIZE = 50
+
+
+def terrain_mask(terrain_type: Optional[str]) -> int:
+    """Bit for a terrain (0 for unknown terrains)."""
+    return TERRAIN_BITS.get(terrain_type, 0)
+
+
+def proximity_mask(features) -> int:
+    """OR of the bits for a comma-separated string or list of proximity features."""
+    if not features:
+        return 0
+    if isinstance(features, str):
+        features = features.split(",")
+    mask = 0
+    for feature in features:
+        mask |= PROXIMITY_BITS.get(feature.strip(), 0)
+    return mask
+
+
+def mask_bits(mask: int) -> List[int]:
+    """Split a mask into its single-bit values."""
+    bits = []
+    while mask:
+        low = mask & -mask
+        bits.append(low)
+        mask ^= low
+    return bits
+
+
+def compatibility_masks(business_type: str) -> Optional[Tuple[int, int]]:
+    """
+    (terrain_mask, proximity_mask) a business type accepts, or None if unknown.
+    
+    Uses the loaded business catalog (business.BUSINESS_TYPES), falling back
+    to BUSINESS_COMPATIBILITY. Terrains that no plot can have ('ocean',
+    'urban') contribute no bits.
+    """
+    from business import BUSINESS_TYPES
+    config = BUSINESS_TYPES.get(business_type) or BUSINESS_COMPATIBILITY.get(business_type)
+    if config is None:
+        return None
+    terrains = 0
+    for terrain in config.get("allowed_terrain", []):
+        terrains |= terrain_mask(terrain)
+    return terrains, proximity_mask(config.get("allowed_proximity", []))
+
 # ==========================
 # DATABASE MODELS
 # ==========================
@@ -199,7 +266,14 @@ class LandPlot(Base):
     # Land attributes
     terrain_type = Column(String, nullable=False)  # prairie, desert, mountain, etc.
     proximity_features = Column(String, nullable=True)  # Comma-separated: "coastal,riverside"
-    efficiency = Column(Float, default=STARTING_EFFICIENCY)  # Starts at 100%, degrades over time
+    # Bitmask mirrors of terrain_type/proximity_features (TERRAIN_BITS, PROXIMITY_BITS),
+    # kept in sync by the before_insert/before_update events below
+    terrain_mask = Column(Integer, default=0)
+    proximity_mask = Column(Integer, default=0)
+    # Efficiency is stored as a base value at a game tick and decayed on read.
+    # Use .efficiency (current value); efficiency_base/efficiency_tick are storage.
+    efficiency_base = Column("efficiency", Float, default=STARTING_EFFICIENCY)
+    efficiency_tick = Column(Integer, default=0)
     size = Column(Float, default=1.0)  # Size in arbitrary units (1.0 = standard plot)
 
     # Tax system
@@ -216,23 +290,192 @@ class LandPlot(Base):
     # Government/Bank flag
     is_government_owned = Column(Boolean, index=True, default=False)  # True if owned by AI gov/bank
 
-    # Composite index for efficiency degradation queries (efficiency > 0)
+    # Composite index for efficiency degradation queries (efficiency > 0);
+    # owner/vacancy/terrain-mask indexes serve search_plots()
     __table_args__ = (
         Index('ix_land_plots_efficiency', 'efficiency'),
         Index('ix_land_plots_gov_tax', 'is_government_owned', 'monthly_tax'),
+        Index('ix_land_plots_owner_vacant_terrain', 'owner_id', 'occupied_by_business_id', 'terrain_mask'),
+        Index('ix_land_plots_owner_tax', 'owner_id', 'monthly_tax'),
+        Index('ix_land_plots_terrain_proximity', 'terrain_mask', 'proximity_mask'),
     )
 
+    @hybrid_property
+    def efficiency(self):
+        """Current efficiency: base value minus decay since it was last materialized."""
+        base = self.efficiency_base if self.efficiency_base is not None else STARTING_EFFICIENCY
+        elapsed = game_clock.current() - (self.efficiency_tick or 0)
+        return max(0.0, base - max(0, elapsed) * EFFICIENCY_DECAY_PER_TICK)
+
+    @efficiency.setter
+    def efficiency(self, value):
+        self.efficiency_base = value
+        self.efficiency_tick = game_clock.current()
+
+    @efficiency.expression
+    def efficiency(cls):
+        return func.max(
+            0,
+            cls.efficiency_base - (game_clock.current() - func.coalesce(cls.efficiency_tick, 0)) * EFFICIENCY_DECAY_PER_TICK
+        )
+
+
+@event.listens_for(LandPlot, "before_insert")
+@event.listens_for(LandPlot, "before_update")
+def _set_plot_masks(mapper, connection, target):
+    terrain_bits = terrain_mask(target.terrain_type)
+    proximity_bits = proximity_mask(target.proximity_features)
+    if target.terrain_mask != terrain_bits:
+        target.terrain_mask = terrain_bits
+    if target.proximity_mask != proximity_bits:
+        target.proximity_mask = proximity_bits
+
 
 # ==========================
 # IN-MEMORY STATE
 # ==========================
-# Track last tick for efficiency degradation
+# Game tick of the last batch materialization (decay itself reads game_clock)
 last_efficiency_update_tick = 0
 
 # Track last month for tax collection
 last_tax_month = datetime.utcnow().month
 
 
+# ==========================
+# OCCUPIED PLOT INDEX
+# ==========================
+class OccupiedPlotIndex:
+    """
+    Occupied plots per owner, grouped by terrain: {owner_id: {terrain: {plot_ids}}}.
+    
+    Kept current by the LandPlot mapper events below: every ORM insert,
+    update or delete of a plot (occupy_land, vacate_land, transfer_land,
+    business placement/removal, district creation) is applied once its
+    transaction commits, in every process (see apply_plot_changes). Bulk
+    UPDATEs bypass the ORM; callers that use them reload the owners they
+    touched with reload_plot_owner().
+    """
+
+    def __init__(self):
+        self._by_owner: Dict[int, Dict[str, Set[int]]] = {}
+        self._slot: Dict[int, Tuple[int, str]] = {}  # plot_id -> (owner_id, terrain)
+        self._lock = threading.Lock()
+
+    def _remove(self, plot_id: int):
+        slot = self._slot.pop(plot_id, None)
+        if slot is None:
+            return
+        owner_id, terrain = slot
+        terrains = self._by_owner.get(owner_id, {})
+        plots = terrains.get(terrain)
+        if plots is not None:
+            plots.discard(plot_id)
+            if not plots:
+                del terrains[terrain]
+                if not terrains:
+                    del self._by_owner[owner_id]
+
+    def _add(self, plot_id: int, owner_id: int, terrain: str):
+        self._by_owner.setdefault(owner_id, {}).setdefault(terrain, set()).add(plot_id)
+        self._slot[plot_id] = (owner_id, terrain)
+
+    def apply(self, plot_id: int, owner_id: Optional[int], terrain: Optional[str], occupied: bool):
+        """Record a plot's committed state (deleted plots pass owner_id=None)."""
+        with self._lock:
+            self._remove(plot_id)
+            if occupied and owner_id is not None:
+                self._add(plot_id, owner_id, terrain)
+
+    def terrain_counts(self, owner_id: int) -> Dict[str, int]:
+        """{terrain: occupied plot count} for an owner."""
+        with self._lock:
+            return {terrain: len(plots) for terrain, plots in self._by_owner.get(owner_id, {}).items()}
+
+    def plots(self, owner_id: int, terrain: str) -> List[int]:
+        """Occupied plot IDs of one terrain for an owner, ascending."""
+        with self._lock:
+            return sorted(self._by_owner.get(owner_id, {}).get(terrain, ()))
+
+    def slot(self, plot_id: int) -> Optional[Tuple[int, str]]:
+        """(owner_id, terrain) if the plot is occupied, else None."""
+        return self._slot.get(plot_id)
+
+    def reload_owner(self, db, owner_id: int):
+        """Re-read one owner's occupied plots (after bulk updates)."""
+        rows = db.query(LandPlot.id, LandPlot.terrain_type).filter(
+            LandPlot.owner_id == owner_id,
+            LandPlot.occupied_by_business_id != None
+        ).all()
+        with self._lock:
+            for plot_id in [pid for pid, (owner, _) in self._slot.items() if owner == owner_id]:
+                self._remove(plot_id)
+            for plot_id, terrain in rows:
+                self._remove(plot_id)
+                self._add(plot_id, owner_id, terrain)
+
+    def rebuild(self, db) -> int:
+        rows = db.query(LandPlot.id, LandPlot.owner_id, LandPlot.terrain_type).filter(
+            LandPlot.occupied_by_business_id != None
+        ).all()
+        with self._lock:
+            self._by_owner = {}
+            self._slot = {}
+            for plot_id, owner_id, terrain in rows:
+                self._add(plot_id, owner_id, terrain)
+        return len(rows)
+
+
+occupied_plots = OccupiedPlotIndex()
+
+
+@cluster.replicated
+def apply_plot_changes(changes: List[Tuple[int, Optional[int], Optional[str], bool]]):
+    """Apply committed (plot_id, owner_id, terrain, occupied) states, here and in every other process."""
+    for change in changes:
+        occupied_plots.apply(*change)
+
+
+@cluster.replicated(coalesce=True)
+def reload_plot_owner(owner_id: int):
+    """Re-read one owner's occupied plots after bulk UPDATEs, in every process."""
+    db = get_db()
+    try:
+        occupied_plots.reload_owner(db, owner_id)
+    finally:
+        db.close()
+
+# Plot writes are staged per session at flush and applied on commit, so a
+# rolled-back transaction never reaches the index.
+_PLOT_CHANGES_KEY = "land_plot_changes"
+
+def _stage_plot_change(target, change):
+    session = object_session(target)
+    if session is None:
+        apply_plot_changes([change])
+        return
+    session.info.setdefault(_PLOT_CHANGES_KEY, {})[change[0]] = change
+
+@event.listens_for(LandPlot, "after_insert")
+@event.listens_for(LandPlot, "after_update")
+def _on_plot_write(mapper, connection, target):
+    _stage_plot_change(target, (target.id, target.owner_id, target.terrain_type,
+                                target.occupied_by_business_id is not None))
+
+@event.listens_for(LandPlot, "after_delete")
+def _on_plot_delete(mapper, connection, target):
+    _stage_plot_change(target, (target.id, None, None, False))
+
+@event.listens_for(OrmSession, "after_commit")
+def _on_plot_commit(session):
+    changes = session.info.pop(_PLOT_CHANGES_KEY, None)
+    if changes:
+        apply_plot_changes(list(changes.values()))
+
+@event.listens_for(OrmSession, "after_soft_rollback")
+def _on_plot_rollback(session, previous_transaction):
+    session.info.pop(_PLOT_CHANGES_KEY, None)
+
+
 # ==========================
 # HELPER FUNCTIONS
 # ==========================
@@ -356,6 +599,7 @@ def transfer_land(plot_id: int, new_owner_id: int) -> bool:
         return False
     
     plot.owner_id = new_owner_id
+    materialize_plot_efficiency(plot)
     db.commit()
     db.close()
     
@@ -425,29 +669,79 @@ def create_starter_plot(player_id: int) -> LandPlot:
     )
 
 
+def load_efficiency_clock() -> int:
+    """
+    Start decay bookkeeping at the current game tick.
+
+    Plots stamped ahead of the game clock (by the former land-only decay
+    counter) are re-stamped at the current tick with their base unchanged,
+    so they neither gain efficiency nor stop decaying. Returns how many.
+    """
+    global last_efficiency_update_tick
+
+    now_tick = game_clock.current()
+    last_efficiency_update_tick = now_tick
+
+    db = get_db()
+    try:
+        rebased = db.query(LandPlot).filter(
+            LandPlot.efficiency_tick > now_tick
+        ).update({LandPlot.efficiency_tick: now_tick}, synchronize_session=False)
+        db.commit()
+        return rebased
+    finally:
+        db.close()
+
+
+def materialize_plot_efficiency(plot: LandPlot):
+    """
+    Fold accumulated decay into a plot's stored base value.
+    Call on plots that are being written anyway (sale, transfer) so the
+    stored row reflects the value the new owner sees.
+    """
+    plot.efficiency = plot.efficiency
+
+
 def degrade_efficiency(current_tick: int):
     """
-    Degrade efficiency of all land plots.
+    Advance land efficiency decay.
     Called every tick.
     Efficiency decreases by 0.00001% per minute (per 60 ticks).
-    Uses a single bulk SQL UPDATE instead of loading all rows into Python.
+
+    Decay is closed-form: each plot stores a base efficiency and the game
+    tick it was recorded at, and LandPlot.efficiency subtracts the elapsed
+    decay on read. A tick writes nothing; plot rows are rebased in one
+    batch every EFFICIENCY_MATERIALIZE_INTERVAL ticks.
+    The clock is the durable game tick, so decay resumes after a restart.
     """
     global last_efficiency_update_tick
 
+    if current_tick - last_efficiency_update_tick >= EFFICIENCY_MATERIALIZE_INTERVAL:
+        materialize_all_efficiency()
+        last_efficiency_update_tick = current_tick
+
+
+def materialize_all_efficiency():
+    """
+    Batch materialization pass: rebase every decaying plot to the current
+    game tick. Runs rarely; keeps stored values close to displayed ones.
+    """
+    now_tick = game_clock.current()
     db = get_db()
 
-    # Single bulk UPDATE: subtract decay from all plots with efficiency > 0
-    # max(0, efficiency - decay) is handled by the CASE expression
-    db.query(LandPlot).filter(LandPlot.efficiency > 0).update(
-        {LandPlot.efficiency: func.max(0, LandPlot.efficiency - EFFICIENCY_DECAY_PER_TICK)},
+    db.query(LandPlot).filter(
+        LandPlot.efficiency_base > 0,
+        func.coalesce(LandPlot.efficiency_tick, 0) < now_tick
+    ).update(
+        {
+            LandPlot.efficiency_base: LandPlot.efficiency,
+            LandPlot.efficiency_tick: now_tick
+        },
         synchronize_session=False
     )
-
     db.commit()
     db.close()
 
-    last_efficiency_update_tick = current_tick
-
 
 def collect_monthly_taxes(current_month: int):
     """
@@ -504,6 +798,148 @@ def get_land_plot(plot_id: int) -> Optional[LandPlot]:
     db.close()
     return plot
 
+# ==========================
+# PLOT SEARCH
+# ==========================
+def plot_is_compatible(plot: LandPlot, business_type: str, require_proximity: bool = False) -> bool:
+    """
+    Whether a business type may be built on a plot.
+    Terrain must match; with require_proximity, the plot must also have one
+    of the business's allowed proximity features (if it lists any).
+    """
+    masks = compatibility_masks(business_type)
+    if masks is None:
+        return False
+    terrains, features = masks
+    if not terrain_mask(plot.terrain_type) & terrains:
+        return False
+    if require_proximity and features and not proximity_mask(plot.proximity_features) & features:
+        return False
+    return True
+
+
+def filter_plots(query, owner_id: Optional[int] = None, vacant: Optional[bool] = None,
+                 terrain: Optional[str] = None, compatible_with: Optional[str] = None,
+                 require_proximity: bool = False, proximity: Optional[List[str]] = None):
+    """
+    Apply plot filters to any query that selects or joins LandPlot.
+    
+    Terrain filters compare terrain_mask against single bits (IN list), so
+    the composite owner/vacancy/terrain index applies; proximity filters
+    test proximity_mask with a bitwise AND.
+    """
+    if owner_id is not None:
+        query = query.filter(LandPlot.owner_id == owner_id)
+    if vacant is True:
+        query = query.filter(LandPlot.occupied_by_business_id == None)
+    elif vacant is False:
+        query = query.filter(LandPlot.occupied_by_business_id != None)
+    if terrain:
+        query = query.filter(LandPlot.terrain_mask == (terrain_mask(terrain) or -1))
+    if compatible_with:
+        masks = compatibility_masks(compatible_with) or (0, 0)
+        terrains, features = masks
+        query = query.filter(LandPlot.terrain_mask.in_(mask_bits(terrains) or [-1]))
+        if require_proximity and features:
+            query = query.filter(LandPlot.proximity_mask.op("&")(features) != 0)
+    if proximity:
+        wanted = proximity_mask(proximity)
+        query = query.filter(LandPlot.proximity_mask.op("&")(wanted) == wanted)
+    return query
+
+
+def plot_sort_column(sort: str):
+    """SQL expression for a PLOT_SORTS key (None for unknown keys)."""
+    return {
+        "id": LandPlot.id,
+        "terrain": LandPlot.terrain_type,
+        "efficiency": LandPlot.efficiency,
+        "tax": LandPlot.monthly_tax,
+        "status": (LandPlot.occupied_by_business_id == None),
+        "size": LandPlot.size,
+    }.get(sort)
+
+
+def search_plots(owner_id: Optional[int] = None, vacant: Optional[bool] = None,
+                 terrain: Optional[str] = None, compatible_with: Optional[str] = None,
+                 require_proximity: bool = False, proximity: Optional[List[str]] = None,
+                 sort: str = "id", order: str = "asc",
+                 limit: Optional[int] = PLOT_PAGE_SIZE, offset: int = 0) -> Tuple[List[LandPlot], int]:
+    """
+    Filter, sort and page plots in SQL.
+    
+    Example - a player's vacant plots that can host a bakery, best first:
+        search_plots(owner_id=pid, vacant=True, compatible_with="bakery",
+                     sort="efficiency", order="desc")
+    
+    Returns:
+        (plots on this page, total matching plots)
+    """
+    db = get_db()
+    try:
+        query = filter_plots(db.query(LandPlot), owner_id, vacant, terrain,
+                             compatible_with, require_proximity, proximity)
+        total = query.order_by(None).count()
+        column = plot_sort_column(sort)
+        if column is None:
+            column = LandPlot.id
+        if order == "desc":
+            query = query.order_by(column.desc(), LandPlot.id.desc())
+        else:
+            query = query.order_by(column.asc(), LandPlot.id.asc())
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        return query.all(), total
+    finally:
+        db.close()
+
+
+def get_portfolio_summary(owner_id: int) -> dict:
+    """Plot count, occupancy, tax and efficiency totals for one owner (one SQL query)."""
+    db = get_db()
+    try:
+        total, occupied, tax, avg_eff = db.query(
+            func.count(LandPlot.id),
+            func.count(LandPlot.occupied_by_business_id),
+            func.coalesce(func.sum(LandPlot.monthly_tax), 0.0),
+            func.coalesce(func.avg(LandPlot.efficiency), 0.0)
+        ).filter(LandPlot.owner_id == owner_id).one()
+    finally:
+        db.close()
+    return {
+        "total_plots": total,
+        "occupied_plots": occupied,
+        "vacant_plots": total - occupied,
+        "monthly_tax": tax,
+        "average_efficiency": avg_eff
+    }
+
+
+def sync_attribute_masks(db) -> int:
+    """
+    Recompute terrain_mask/proximity_mask from the string columns.
+    Works per distinct value, so it is a handful of UPDATEs regardless of
+    plot count. Covers the initial backfill and any bit reassignment.
+    """
+    updated = 0
+    for (terrain,) in db.query(LandPlot.terrain_type).distinct().all():
+        bits = terrain_mask(terrain)
+        updated += db.query(LandPlot).filter(
+            LandPlot.terrain_type == terrain,
+            func.coalesce(LandPlot.terrain_mask, -1) != bits
+        ).update({LandPlot.terrain_mask: bits}, synchronize_session=False)
+    for (features,) in db.query(LandPlot.proximity_features).distinct().all():
+        bits = proximity_mask(features)
+        match = (LandPlot.proximity_features == None) if features is None else (LandPlot.proximity_features == features)
+        updated += db.query(LandPlot).filter(
+            match,
+            func.coalesce(LandPlot.proximity_mask, -1) != bits
+        ).update({LandPlot.proximity_mask: bits}, synchronize_session=False)
+    db.commit()
+    return updated
+
 # ==========================
 # MODULE LIFECYCLE
 # ==========================
@@ -514,23 +950,54 @@ def initialize():
     """
     print("[Land] Creating database tables...")
     Base.metadata.create_all(bind=engine)
+
+    from db_schema import ensure_columns, ensure_indexes
+    ensure_columns(engine, "land_plots", {
+        "efficiency_tick": "INTEGER DEFAULT 0",
+        "terrain_mask": "INTEGER DEFAULT 0",
+        "proximity_mask": "INTEGER DEFAULT 0"
+    })
+    ensure_indexes(engine, "land_plots", {
+        "ix_land_plots_owner_vacant_terrain": "owner_id, occupied_by_business_id, terrain_mask",
+        "ix_land_plots_owner_tax": "owner_id, monthly_tax",
+        "ix_land_plots_terrain_proximity": "terrain_mask, proximity_mask"
+    })
+    rebased = load_efficiency_clock()
+    if rebased:
+        print(f"[Land] Re-stamped decay tick on {rebased} plots ahead of the game clock")
+    
+    db = get_db()
+    try:
+        masked = sync_attribute_masks(db)
+        if masked:
+            print(f"[Land] Attribute masks updated on {masked} plots")
+        print(f"[Land] Occupied plot index: {occupied_plots.rebuild(db)} plots")
+    finally:
+        db.close()
     
     stats = get_land_stats()
     print(f"[Land] Current state: {stats['total_plots']} plots, {stats['average_efficiency']:.2f}% avg efficiency")
+    import scheduler
+    scheduler.every("land.log_stats", 3600, log_land_stats, cost=10.0,
+                    priority=scheduler.DEFERRABLE)
     print("[Land] Module initialized")
 
 
+def log_land_stats():
+    print(f"[Land] Stats: {get_land_stats()}")
+
+
 async def tick(current_tick: int, now: datetime):
     """
     Land module tick handler.
     
     Handles:
-    - Efficiency degradation (every tick)
+    - Efficiency rebase (rows rebased rarely; decay reads game_clock)
     - Monthly tax collection (when month changes)
     """
     global last_tax_month
     
-    # Degrade efficiency every tick
+    # Advance efficiency decay every tick
     degrade_efficiency(current_tick)
     
     # Check if month has changed for tax collection
@@ -540,10 +1007,7 @@ async def tick(current_tick: int, now: datetime):
         collect_monthly_taxes(current_month)
         last_tax_month = current_month
     
-    # Log stats every hour (3600 ticks)
-    if current_tick % 3600 == 0:
-        stats = get_land_stats()
-        print(f"[Land] Stats: {stats}")
+    # Hourly stats logging is a staggered scheduler job (see initialize)
 
 
 # ==========================
@@ -560,6 +1024,23 @@ __all__ = [
     'occupy_land',
     'vacate_land',
     'get_land_stats',
+    'get_land_plot',
+    'search_plots',
+    'filter_plots',
+    'plot_sort_column',
+    'plot_is_compatible',
+    'get_portfolio_summary',
+    'compatibility_masks',
+    'terrain_mask',
+    'proximity_mask',
+    'TERRAIN_BITS',
+    'PROXIMITY_BITS',
+    'PLOT_SORTS',
+    'SORT_ORDERS',
+    'occupied_plots',
+    'apply_plot_changes',
+    'reload_plot_owner',
+    'OccupiedPlotIndex',
     'TERRAIN_TYPES',
     'PROXIMITY_FEATURES',
     'BUSINESS_COMPATIBILITY',
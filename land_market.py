@@ -7,21 +7,25 @@ Handles:
 - Government land auctions (automated based on economy size)
 - Land listing and browsing
 - Price discovery for land plots
-- Auction mechanics (price drops over 24-hour period)
+- Auction mechanics (Dutch price drops, computed in closed form on read)
 - Land bank for expired/unsold plots
+- SQL search over auctions and listings (plot filters, sort, paging)
 """
 
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import random
-from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer, Boolean
+from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer, Boolean, func, case
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.hybrid import hybrid_property
 from stats_ux import log_transaction
+import deadlines
+import game_clock
 # ==========================
 # DATABASE SETUP
 # ==========================
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 
 engine = create_engine(
     DATABASE_URL,
@@ -54,9 +58,12 @@ class GovernmentAuction(Base):
     id = Column(Integer, primary_key=True, index=True)
     land_plot_id = Column(Integer, unique=True, nullable=False)
     
-    # Pricing
+    # Pricing. The price is stored as a base value at a game tick and the
+    # hourly Dutch drops since then are applied on read. Use .current_price;
+    # price_base/price_tick are storage.
     starting_price = Column(Float, nullable=False)
-    current_price = Column(Float, nullable=False)
+    price_base = Column("current_price", Float, nullable=False)
+    price_tick = Column(Integer, default=0)
     minimum_price = Column(Float, nullable=False)  # Floor price
     
     # Timing
@@ -68,6 +75,39 @@ class GovernmentAuction(Base):
     winner_id = Column(Integer, nullable=True)
     final_price = Column(Float, nullable=True)
 
+    def price_at(self, tick: int) -> float:
+        """
+        Price after every drop boundary in (price_tick, tick].
+        Applied step by step, exactly as the old hourly update did.
+        """
+        price = self.price_base
+        for _ in range(price_drops(self.price_tick, tick)):
+            if price <= self.minimum_price:
+                break
+            price = max(price * PRICE_DROP_RATE, self.minimum_price)
+        return price
+
+    @hybrid_property
+    def current_price(self):
+        return self.price_at(game_clock.current())
+
+    @current_price.setter
+    def current_price(self, value):
+        self.price_base = value
+        self.price_tick = game_clock.current()
+
+    @current_price.expression
+    def current_price(cls):
+        # Drop counts per row come from comparing price_tick against
+        # precomputed boundaries; active auctions see at most MAX_PRICE_DROPS.
+        hour = game_clock.current() // PRICE_DROP_INTERVAL
+        whens = [
+            (cls.price_tick < (hour - drops + 1) * PRICE_DROP_INTERVAL,
+             cls.price_base * PRICE_DROP_RATE ** drops)
+            for drops in range(MAX_PRICE_DROPS, 0, -1)
+        ]
+        return func.max(cls.minimum_price, case(*whens, else_=cls.price_base))
+
 
 class LandSale(Base):
     """Record of completed land sales."""
@@ -109,10 +149,18 @@ class EconomicMilestone(Base):
 
 AUCTION_DURATION_TICKS = 4000
 PRICE_DROP_RATE = 0.15  # Price drops to 35% every hour
+PRICE_DROP_INTERVAL = 3600  # Drops land on game ticks that are multiples of this
+MAX_PRICE_DROPS = AUCTION_DURATION_TICKS // PRICE_DROP_INTERVAL + 1
 ECONOMIC_THRESHOLD = 10000000  # $1M triggers 1 new plot
 LAND_BANK_ID = -1  # Special owner ID for land bank
 GOVERNMENT_ID = 0  # Government owner ID
 
+
+def price_drops(price_tick: Optional[int], now_tick: int) -> int:
+    """Number of hourly drop boundaries in (price_tick, now_tick]."""
+    return max(0, now_tick // PRICE_DROP_INTERVAL - (price_tick or 0) // PRICE_DROP_INTERVAL)
+
+
 # Base prices by terrain
 TERRAIN_BASE_PRICES = {
     "prairie": 150000,
@@ -606,7 +654,8 @@ def create_government_auction(from_land_bank: bool = False, bank_entry: Optional
         auction = GovernmentAuction(
             land_plot_id=plot.id,
             starting_price=starting_price,
-            current_price=starting_price,
+            price_base=starting_price,
+            price_tick=game_clock.current(),
             minimum_price=minimum_price,
             end_time=datetime.utcnow() + timedelta(seconds=AUCTION_DURATION_TICKS)
         )
@@ -614,6 +663,7 @@ def create_government_auction(from_land_bank: bool = False, bank_entry: Optional
         db.add(auction)
         db.commit()
         db.refresh(auction)
+        schedule_auction_expiry(auction)
         
         # Remove from land bank if re-auctioning
         if from_land_bank and bank_entry:
@@ -625,45 +675,57 @@ def create_government_auction(from_land_bank: bool = False, bank_entry: Optional
         db.close()
 
 
-def update_auction_prices(current_tick: int):
-    """
-    Update auction prices (Dutch auction - price drops over time).
-    Called every tick.
-    Moves expired auctions to land bank.
-    """
+def schedule_auction_expiry(auction: GovernmentAuction):
+    """Queue an auction's end_time so expiry needs no per-tick scan."""
+    deadlines.schedule("land_auctions", auction.id, auction.end_time)
+
+
+def _load_auction_deadlines():
     db = get_db()
     try:
-        auctions = db.query(GovernmentAuction).filter(
+        rows = db.query(GovernmentAuction.id, GovernmentAuction.end_time).filter(
             GovernmentAuction.is_active == True
         ).all()
+        return [(auction_id, end_time) for auction_id, end_time in rows]
+    finally:
+        db.close()
+
+
+def expire_auctions(now: datetime, current_tick: int):
+    """Move auctions whose end_time has passed to the land bank."""
+    with deadlines.claim_due("land_auctions", now) as expired_ids:
+        if not expired_ids:
+            return
         
-        for auction in auctions:
-            # Check if expired
-            if datetime.utcnow() >= auction.end_time:
+        db = get_db()
+        try:
+            expired = db.query(GovernmentAuction).filter(
+                GovernmentAuction.id.in_(expired_ids.keys),
+                GovernmentAuction.is_active == True
+            ).all()
+            
+            for auction in expired:
+                if auction.end_time > now:
+                    # Deadline moved since it was queued; re-queue at the new time
+                    schedule_auction_expiry(auction)
+                    continue
+                
                 auction.is_active = False
                 
-                # Move to land bank
+                # Move to land bank. Expiry runs before this tick's drop would
+                # have, so the last price excludes a boundary at current_tick.
                 add_to_land_bank(
                     auction.land_plot_id,
                     auction.id,
-                    auction.current_price
+                    auction.price_at(current_tick - 1)
                 )
                 
                 print(f"[LandMarket] Auction {auction.id} expired unsold -> moved to land bank")
-                continue
             
-            # Drop price every hour (3600 ticks)
-            if current_tick % 3600 == 0:
-                new_price = auction.current_price * PRICE_DROP_RATE
-                
-                # Don't go below minimum
-                auction.current_price = max(new_price, auction.minimum_price)
-                
-                print(f"[LandMarket] Auction {auction.id} price dropped to ${auction.current_price:,.2f}")
-        
-        db.commit()
-    finally:
-        db.close()
+            db.commit()
+            expired_ids.done_all()
+        finally:
+            db.close()
 
 
 def buy_auction_land(buyer_id: int, auction_id: int) -> bool:
@@ -690,16 +752,19 @@ def buy_auction_land(buyer_id: int, auction_id: int) -> bool:
         if not auction:
             return False
         
+        # Price is a function of the tick; read it once for the whole purchase
+        price = auction.current_price
+        
         # Check if buyer has funds
         auth_db = get_auth_db()
         try:
             buyer = auth_db.query(Player).filter(Player.id == buyer_id).first()
             
-            if not buyer or buyer.cash_balance < auction.current_price:
+            if not buyer or buyer.cash_balance < price:
                 return False
             
             # Deduct cash (government doesn't receive it - economic sink)
-            buyer.cash_balance -= auction.current_price
+            buyer.cash_balance -= price
             auth_db.commit()
         finally:
             auth_db.close()
@@ -711,7 +776,7 @@ def buy_auction_land(buyer_id: int, auction_id: int) -> bool:
             try:
                 buyer = auth_db.query(Player).filter(Player.id == buyer_id).first()
                 if buyer:
-                    buyer.cash_balance += auction.current_price
+                    buyer.cash_balance += price
                     auth_db.commit()
             finally:
                 auth_db.close()
@@ -722,7 +787,7 @@ def buy_auction_land(buyer_id: int, auction_id: int) -> bool:
             land_plot_id=auction.land_plot_id,
             seller_id=GOVERNMENT_ID,  # Government
             buyer_id=buyer_id,
-            price=auction.current_price,
+            price=price,
             sale_type="government"
         )
         db.add(sale)
@@ -730,7 +795,7 @@ def buy_auction_land(buyer_id: int, auction_id: int) -> bool:
         # Close auction
         auction.is_active = False
         auction.winner_id = buyer_id
-        auction.final_price = auction.current_price
+        auction.final_price = price
         
         # Remove from land bank if it was there
         remove_from_land_bank(auction.land_plot_id)
@@ -755,17 +820,17 @@ def buy_auction_land(buyer_id: int, auction_id: int) -> bool:
             buyer_id,
             "cash_out",
             "money",
-            -auction.current_price,
+            -price,
             f"Auction payment: Plot #{auction.land_plot_id}",
             str(auction.land_plot_id)
         )
         
-        print(f"[LandMarket] Auction won by player {buyer_id} for ${auction.current_price:,.2f}")
+        print(f"[LandMarket] Auction won by player {buyer_id} for ${price:,.2f}")
         
         # Record revenue to land bank
         try:
             from banks.land_bank import record_auction_sale
-            record_auction_sale(auction.current_price, auction.land_plot_id)
+            record_auction_sale(price, auction.land_plot_id)
         except Exception:
             pass
         
@@ -806,6 +871,20 @@ def initialize():
     print("[LandMarket] Creating database tables...")
     Base.metadata.create_all(bind=engine)
     
+    # Auctions saved before closed-form pricing stored an already-dropped
+    # price; anchor it at the current tick so no drop is applied twice
+    from db_schema import ensure_columns
+    if ensure_columns(engine, "government_auctions", {"price_tick": "INTEGER"}):
+        db = get_db()
+        try:
+            db.query(GovernmentAuction).filter(GovernmentAuction.price_tick == None).update(
+                {GovernmentAuction.price_tick: game_clock.load_tick()},
+                synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+    
     # Check land bank status
     db = get_db()
     try:
@@ -815,18 +894,97 @@ def initialize():
     finally:
         db.close()
     
+    deadlines.register("land_auctions", _load_auction_deadlines)
+    
     print("[LandMarket] Module initialized")
 
 
+# ==========================
+# MARKET SEARCH
+# ==========================
+def _market_columns(kind: str):
+    """(model, price column, time column) for "auctions" or "listings"."""
+    if kind == "auctions":
+        return GovernmentAuction, GovernmentAuction.current_price, GovernmentAuction.end_time
+    return LandListing, LandListing.asking_price, LandListing.listed_at
+
+
+# Sort keys accepted by search_market(): price and time, plus land.PLOT_SORTS
+MARKET_SORTS = ("price", "time", "id", "terrain", "efficiency", "tax", "status", "size")
+
+
+def search_market(kind: str = "auctions", terrain: Optional[str] = None,
+                  compatible_with: Optional[str] = None, sort: str = "price",
+                  order: str = "asc", limit: Optional[int] = 50,
+                  offset: int = 0) -> Tuple[List[Tuple[object, "LandPlot"]], int]:
+    """
+    Active auctions or listings joined to their plots, filtered, sorted and
+    paged in SQL (see land.filter_plots for the plot filters).
+    
+    Returns:
+        ([(auction_or_listing, plot), ...] for this page, total matches)
+    """
+    from land import LandPlot, filter_plots, plot_sort_column
+    model, price_col, time_col = _market_columns(kind)
+    db = get_db()
+    try:
+        query = db.query(model, LandPlot).join(
+            LandPlot, LandPlot.id == model.land_plot_id
+        ).filter(model.is_active == True)
+        query = filter_plots(query, terrain=terrain, compatible_with=compatible_with)
+        total = query.order_by(None).count()
+        if sort == "price":
+            column = price_col
+        elif sort == "time":
+            column = time_col
+        else:
+            column = plot_sort_column(sort)
+            if column is None:
+                column = price_col
+        if order == "desc":
+            query = query.order_by(column.desc(), model.id.desc())
+        else:
+            query = query.order_by(column.asc(), model.id.asc())
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        return [tuple(row) for row in query.all()], total
+    finally:
+        db.close()
+
+
+def get_market_summary() -> dict:
+    """Counts, average prices and plot terrains of the active auctions and listings."""
+    from land import LandPlot
+    db = get_db()
+    try:
+        summary = {"terrains": set()}
+        for kind in ("auctions", "listings"):
+            model, price_col, _ = _market_columns(kind)
+            count, avg_price = db.query(
+                func.count(model.id), func.coalesce(func.avg(price_col), 0.0)
+            ).filter(model.is_active == True).one()
+            summary[kind] = count
+            summary[f"avg_{kind[:-1]}_price"] = avg_price
+            terrains = db.query(LandPlot.terrain_type).join(
+                model, model.land_plot_id == LandPlot.id
+            ).filter(model.is_active == True).distinct().all()
+            summary["terrains"].update(t for (t,) in terrains)
+        return summary
+    finally:
+        db.close()
+
+
 async def tick(current_tick: int, now: datetime):
     """
     Land market tick handler.
-    - Updates auction prices (Dutch auction)
+    - Expires finished auctions (prices drop in closed form on read)
     - Checks economic triggers for new land
     - Re-auctions plots from land bank
     """
-    # Update auction prices every tick
-    update_auction_prices(current_tick)
+    # Expire finished auctions (deadline queue; no per-tick auction scan)
+    expire_auctions(now, current_tick)
     
     if current_tick % 30 == 0:
         plots_needed = check_economic_triggers()
@@ -894,6 +1052,9 @@ __all__ = [
     'buy_auction_land',
     'get_active_auctions',
     'get_recent_sales',
+    'search_market',
+    'MARKET_SORTS',
+    'get_market_summary',
     'get_land_bank_plots',
     'generate_random_proximity_features',
     'LandListing',
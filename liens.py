@@ -0,0 +1,470 @@
+"""
+liens.py
+
+Lien registry shared by the lending modules
+(Land Bank, Apple Seeds ETF, Energy ETF, Brokerage Firm).
+Handles:
+- Creditor registration (lien table, interest and garnishment terms)
+- In-memory per-player outstanding balances across all creditors
+- Lazy compound interest, settled from each lien's interest_tick
+- One batched garnishment pass per tick across every creditor
+- Per-player change counters for cached lien summaries
+
+Lien rows stay in each creditor's own table. interest_accrued on a row is
+only brought up to date when the lien is touched (garnished, topped up,
+paid off); in between, owed() and the registry balances add the interest
+earned since interest_tick in closed form. A player with no cash therefore
+costs nothing per tick, and a player with cash is garnished by every due
+creditor in a single pass with one player load and one commit.
+"""
+
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import cluster
+from accruals import Accrual
+
+# ==========================
+# CREDITORS
+# ==========================
+class Creditor:
+    """
+    Terms for one lien table.
+
+    Args:
+        name: registry key (the lending module's BANK_ID)
+        label: display name for the lien badge and liens page
+        model: SQLAlchemy lien model (player_id, principal, interest_accrued,
+               total_paid, interest_tick, last_interest_accrual, last_payment)
+        session_factory: the lending module's SessionLocal
+        interval: ticks per interest / garnishment period
+        rate: interest per period
+        garnish_rate: fraction of cash taken per period
+        rate_lookup: optional fn(player_ids) -> {player_id: rate} for
+                     creditors whose rate depends on the borrower
+        on_collected: optional fn(payments: {player_id: amount},
+                     cleared: [player_id]) called after each committed pass
+    """
+
+    def __init__(self, name: str, label: str, model, session_factory,
+                 interval: int, rate: float, garnish_rate: float,
+                 rate_lookup: Optional[Callable[[Iterable[int]], Dict[int, float]]] = None,
+                 on_collected: Optional[Callable[[Dict[int, float], List[int]], None]] = None):
+        self.name = name
+        self.label = label
+        self.model = model
+        self.session_factory = session_factory
+        self.interval = max(1, interval)
+        self.rate = rate
+        self.garnish_rate = garnish_rate
+        self.rate_lookup = rate_lookup
+        self.on_collected = on_collected
+
+    def rates_for(self, player_ids: Iterable[int]) -> Dict[int, float]:
+        player_ids = set(player_ids)
+        if self.rate_lookup is None or not player_ids:
+            return {player_id: self.rate for player_id in player_ids}
+        return self.rate_lookup(player_ids)
+
+    def periods_since(self, interest_tick: Optional[int], now_tick: int) -> int:
+        if interest_tick is None:
+            return 0
+        return max(0, (now_tick - interest_tick) // self.interval)
+
+
+class LienBalance:
+    """Registry mirror of one lien row."""
+    __slots__ = ("creditor", "lien_id", "player_id", "principal", "interest",
+                 "paid", "interest_tick", "rate")
+
+    def __init__(self, creditor: Creditor, row, rate: float):
+        self.creditor = creditor
+        self.lien_id = row.id
+        self.update(row, rate)
+
+    def update(self, row, rate: float):
+        self.player_id = row.player_id
+        self.principal = row.principal or 0.0
+        self.interest = row.interest_accrued or 0.0
+        self.paid = row.total_paid or 0.0
+        self.interest_tick = row.interest_tick
+        self.rate = rate
+
+    @property
+    def settled_owed(self) -> float:
+        return self.principal + self.interest - self.paid
+
+    def pending_interest(self, now_tick: int) -> float:
+        periods = self.creditor.periods_since(self.interest_tick, now_tick)
+        return Accrual.compound_growth(self.settled_owed, self.rate, periods)[1]
+
+    def owed(self, now_tick: int) -> float:
+        return self.settled_owed + self.pending_interest(now_tick)
+
+
+creditors: Dict[str, Creditor] = {}
+_accounts: Dict[int, Dict[Tuple[str, int], LienBalance]] = {}
+_versions: Dict[int, int] = {}
+_epoch = 0
+
+
+def _now_tick() -> int:
+    import game_clock
+    return game_clock.current()
+
+# ==========================
+# CHANGE COUNTERS
+# ==========================
+def touch(player_id: int):
+    """Record that a player's liens changed."""
+    _versions[player_id] = _versions.get(player_id, 0) + 1
+
+
+def touch_many(player_ids: Iterable[int]):
+    for player_id in set(player_ids):
+        touch(player_id)
+
+
+@cluster.replicated
+def touch_all():
+    """Invalidate every player at once (bulk edits, admin tools)."""
+    global _epoch
+    _epoch += 1
+
+
+def version(player_id: int) -> Tuple[int, int]:
+    """Opaque token that changes whenever the player's liens change."""
+    return (_epoch, _versions.get(player_id, 0))
+
+# ==========================
+# ROW HELPERS
+# ==========================
+def settle_row(creditor_name: str, row, now_tick: Optional[int] = None,
+               rate: Optional[float] = None) -> float:
+    """
+    Bring a lien row's interest_accrued up to now_tick (in the caller's
+    session). Call before changing principal or reading total_owed.
+
+    Returns:
+        Interest added
+    """
+    creditor = creditors[creditor_name]
+    if now_tick is None:
+        now_tick = _now_tick()
+    if row.interest_tick is None:
+        row.interest_tick = now_tick
+        return 0.0
+    if rate is None:
+        rate = creditor.rates_for([row.player_id]).get(row.player_id, creditor.rate)
+
+    periods = creditor.periods_since(row.interest_tick, now_tick)
+    if periods <= 0:
+        return 0.0
+    _, interest = Accrual.compound_growth(row.total_owed, rate, periods)
+    row.interest_accrued = (row.interest_accrued or 0.0) + interest
+    row.interest_tick += periods * creditor.interval
+    row.last_interest_accrual = datetime.utcnow()
+    return interest
+
+
+def owed(creditor_name: str, row, now_tick: Optional[int] = None) -> float:
+    """Outstanding balance of a lien row including unsettled interest."""
+    balance = _accounts.get(row.player_id, {}).get((creditor_name, row.id))
+    if now_tick is None:
+        now_tick = _now_tick()
+    if balance is not None:
+        return balance.owed(now_tick)
+    creditor = creditors.get(creditor_name)
+    if creditor is None or row.interest_tick is None:
+        return row.total_owed
+    rate = creditor.rates_for([row.player_id]).get(row.player_id, creditor.rate)
+    periods = creditor.periods_since(row.interest_tick, now_tick)
+    return row.total_owed + Accrual.compound_growth(row.total_owed, rate, periods)[1]
+
+# ==========================
+# REGISTRY
+# ==========================
+def _index_rows(creditor: Creditor, rows, rates: Dict[int, float]):
+    for row in rows:
+        account = _accounts.setdefault(row.player_id, {})
+        key = (creditor.name, row.id)
+        rate = rates.get(row.player_id, creditor.rate)
+        if row.total_owed <= 0:
+            account.pop(key, None)
+        elif key in account:
+            account[key].update(row, rate)
+        else:
+            account[key] = LienBalance(creditor, row, rate)
+        if not account:
+            _accounts.pop(row.player_id, None)
+
+
+def register_creditor(creditor: Creditor):
+    """
+    Register a lien table and load its outstanding liens.
+    Called from the lending module's initialize(), after create_all and
+    ensure_columns for interest_tick.
+    """
+    model = creditor.model
+    creditors[creditor.name] = creditor
+    now_tick = _now_tick()
+    db = creditor.session_factory()
+    try:
+        # Liens written before interest_tick existed start accruing lazily now
+        db.query(model).filter(model.interest_tick == None).update(
+            {model.interest_tick: now_tick}, synchronize_session=False
+        )
+        db.commit()
+        rows = db.query(model).filter(
+            model.principal + model.interest_accrued - model.total_paid > 0
+        ).all()
+        _index_rows(creditor, rows, creditor.rates_for(row.player_id for row in rows))
+        print(f"[Liens] {creditor.label}: {len(rows)} outstanding lien(s)")
+    finally:
+        db.close()
+
+
+@cluster.replicated(coalesce=True)
+def refresh_player(player_id: int):
+    """Reload a player's liens from every creditor table after a write."""
+    _accounts.pop(player_id, None)
+    for creditor in creditors.values():
+        db = creditor.session_factory()
+        try:
+            rows = db.query(creditor.model).filter(creditor.model.player_id == player_id).all()
+            if rows:
+                _index_rows(creditor, rows, creditor.rates_for([player_id]))
+        finally:
+            db.close()
+    touch(player_id)
+
+
+def forget_player(player_id: int) -> int:
+    """
+    Close a player's liens with every creditor (estate liquidation): delete
+    the remaining rows, then drop them from the registry in every process.
+    Returns the number of rows deleted.
+    """
+    deleted = 0
+    for creditor in creditors.values():
+        db = creditor.session_factory()
+        try:
+            deleted += db.query(creditor.model).filter(
+                creditor.model.player_id == player_id
+            ).delete(synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[Liens] {creditor.label}: could not close liens of player {player_id}: {e}")
+        finally:
+            db.close()
+    _drop_player(player_id)
+    return deleted
+
+
+@cluster.replicated(coalesce=True)
+def _drop_player(player_id: int):
+    _accounts.pop(player_id, None)
+    touch(player_id)
+
+
+def reprice_player(creditor_name: str, player_id: int):
+    """
+    Re-read a borrower's rate after it changed (e.g. a credit score update).
+    Interest earned so far is settled at the cached rate first, so only
+    periods from now on accrue at the new one.
+    """
+    creditor = creditors.get(creditor_name)
+    balances = [
+        balance for (name, _), balance in _accounts.get(player_id, {}).items()
+        if name == creditor_name
+    ]
+    if creditor is None or not balances:
+        return
+    new_rate = creditor.rates_for([player_id]).get(player_id, creditor.rate)
+    if all(balance.rate == new_rate for balance in balances):
+        return
+
+    old_rates = {balance.lien_id: balance.rate for balance in balances}
+    now_tick = _now_tick()
+    db = creditor.session_factory()
+    try:
+        rows = db.query(creditor.model).filter(creditor.model.id.in_(list(old_rates))).all()
+        for row in rows:
+            settle_row(creditor_name, row, now_tick, old_rates[row.id])
+        db.commit()
+    finally:
+        db.close()
+    refresh_player(player_id)
+
+
+def player_liens(player_id: int) -> List[LienBalance]:
+    """Outstanding liens for a player across all creditors."""
+    return list(_accounts.get(player_id, {}).values())
+
+
+def outstanding(player_id: int, creditor_names: Optional[Iterable[str]] = None,
+                now_tick: Optional[int] = None) -> float:
+    """Total owed by a player, optionally limited to some creditors."""
+    if now_tick is None:
+        now_tick = _now_tick()
+    names = set(creditor_names) if creditor_names is not None else None
+    return sum(
+        balance.owed(now_tick)
+        for balance in _accounts.get(player_id, {}).values()
+        if names is None or balance.creditor.name in names
+    )
+
+
+def creditor_totals(creditor_name: str, now_tick: Optional[int] = None) -> Tuple[int, float]:
+    """(active lien count, total owed) for one creditor."""
+    if now_tick is None:
+        now_tick = _now_tick()
+    count = 0
+    total = 0.0
+    for account in _accounts.values():
+        for balance in account.values():
+            if balance.creditor.name == creditor_name:
+                count += 1
+                total += balance.owed(now_tick)
+    return count, total
+
+# ==========================
+# GARNISHMENT
+# ==========================
+@cluster.replicated
+def _apply_synced(synced: List[tuple]):
+    """
+    Copy committed lien rows into the registry:
+    (creditor_name, lien_id, player_id, principal, interest, paid, interest_tick, rate).
+    """
+    for creditor_name, lien_id, player_id, principal, interest, paid, interest_tick, rate in synced:
+        account = _accounts.get(player_id, {})
+        balance = account.get((creditor_name, lien_id))
+        if balance is None:
+            continue
+        balance.principal, balance.interest, balance.paid = principal, interest, paid
+        balance.interest_tick, balance.rate = interest_tick, rate
+        if balance.settled_owed <= 0:
+            account.pop((creditor_name, lien_id), None)
+            if not account:
+                _accounts.pop(player_id, None)
+    touch_many(player_id for _, _, player_id, *_ in synced)
+
+
+def process_garnishment(current_tick: int):
+    """
+    Accrue and garnish every lien whose creditor is due this tick.
+
+    Only debtors with positive cash are loaded (one query), each due
+    creditor's rows are loaded once, and player cash is committed once.
+    Debtors without cash are skipped; their interest keeps accruing lazily.
+    """
+    due = [c for c in creditors.values() if current_tick % c.interval == 0]
+    if not due or not _accounts:
+        return
+
+    due_names = {c.name for c in due}
+    debtor_ids = [
+        player_id for player_id, account in _accounts.items()
+        if any(key[0] in due_names for key in account)
+    ]
+    if not debtor_ids:
+        return
+
+    from auth import get_db as get_auth_db, Player
+
+    auth_db = get_auth_db()
+    sessions = []
+    try:
+        players = {
+            p.id: p for p in auth_db.query(Player).filter(
+                Player.id.in_(debtor_ids),
+                Player.cash_balance > 0
+            ).all()
+        }
+        if not players:
+            return
+
+        now = datetime.utcnow()
+        collected = {c.name: {} for c in due}
+        cleared = {c.name: [] for c in due}
+        synced = []
+
+        for creditor in due:
+            lien_ids = [
+                key[1] for player_id in players
+                for key in _accounts.get(player_id, {})
+                if key[0] == creditor.name
+            ]
+            if not lien_ids:
+                continue
+
+            db = creditor.session_factory()
+            sessions.append(db)
+            rows = db.query(creditor.model).filter(creditor.model.id.in_(lien_ids)).all()
+            rates = creditor.rates_for(row.player_id for row in rows)
+
+            for row in rows:
+                player = players[row.player_id]
+                rate = rates.get(row.player_id, creditor.rate)
+                settle_row(creditor.name, row, current_tick, rate)
+
+                if player.cash_balance > 0 and row.total_owed > 0:
+                    amount = min(player.cash_balance * creditor.garnish_rate, row.total_owed)
+                    if amount >= 0.01:
+                        player.cash_balance -= amount
+                        row.total_paid += amount
+                        row.last_payment = now
+                        payments = collected[creditor.name]
+                        payments[row.player_id] = payments.get(row.player_id, 0.0) + amount
+                        if row.total_owed <= 0:
+                            cleared[creditor.name].append(row.player_id)
+
+                synced.append((creditor.name, row.id, row.player_id, row.principal,
+                               row.interest_accrued, row.total_paid, row.interest_tick, rate))
+
+        auth_db.commit()
+        for db in sessions:
+            db.commit()
+    except Exception as e:
+        print(f"[Liens] Garnishment error: {e}")
+        auth_db.rollback()
+        for db in sessions:
+            db.rollback()
+        return
+    finally:
+        auth_db.close()
+        for db in sessions:
+            db.close()
+
+    _apply_synced(synced)
+
+    for creditor in due:
+        payments = collected[creditor.name]
+        if creditor.on_collected and (payments or cleared[creditor.name]):
+            try:
+                creditor.on_collected(payments, cleared[creditor.name])
+            except Exception as e:
+                print(f"[Liens] {creditor.label} collection callback error: {e}")
+
+
+__all__ = [
+    'Creditor',
+    'LienBalance',
+    'creditors',
+    'register_creditor',
+    'refresh_player',
+    'forget_player',
+    'reprice_player',
+    'player_liens',
+    'outstanding',
+    'creditor_totals',
+    'settle_row',
+    'owed',
+    'process_garnishment',
+    'touch',
+    'touch_many',
+    'touch_all',
+    'version'
+]
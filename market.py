@@ -23,7 +23,7 @@ from stats_ux import log_transaction
 # ==========================
 # DATABASE SETUP
 # ==========================
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 
 engine = create_engine(
     DATABASE_URL,
@@ -242,6 +242,14 @@ def match_order(db, order: MarketOrder) -> bool:
 # TRADE EXECUTION (With Bank IPO Hook)
 # ==========================
 
+def _refund_ipo_buyer(debited: bool, player_id: int, amount: float):
+    """Return an IPO buyer's cash when the trade is rolled back after the debit."""
+    if not debited:
+        return
+    from auth import adjust_cash
+    adjust_cash(player_id, amount)
+    print(f"[Market] Refunded ${amount:.2f} to Player {player_id}")
+
 def execute_trade(db, buy_order, sell_order, quantity, price):
     """
     Transfers inventory and cash between players.
@@ -276,6 +284,7 @@ def execute_trade(db, buy_order, sell_order, quantity, price):
     # 4. Determine if this is a bank IPO sale
     is_bank_ipo = False
     bank_id = None
+    buyer_debited = False
     
     # Land Bank IPO detection
     if sell_order.player_id == -2 and sell_order.item_type == "land_bank_shares":
@@ -301,23 +310,14 @@ def execute_trade(db, buy_order, sell_order, quantity, price):
     if is_bank_ipo:
         # Special bank IPO handling: buyer pays, money goes to BANK RESERVES (not player account)
         try:
-            from auth import Player
-            
-            # Get buyer
-            buyer = db.query(Player).filter(Player.id == buy_order.player_id).first()
-            if not buyer:
-                print(f"[Market] CRITICAL ERROR: Buyer {buy_order.player_id} not found!")
-                db.rollback()
-                return
+            from auth import adjust_cash
             
-            # Verify buyer has enough money
-            if buyer.cash_balance < total_cost:
-                print(f"[Market] CRITICAL ERROR: Buyer {buy_order.player_id} has insufficient funds (need ${total_cost:.2f}, have ${buyer.cash_balance:.2f})")
+            # Deduct from buyer's account (guarded: fails if missing or short of funds)
+            if not adjust_cash(buy_order.player_id, -total_cost, min_balance=total_cost):
+                print(f"[Market] CRITICAL ERROR: Buyer {buy_order.player_id} not found or has insufficient funds (need ${total_cost:.2f})")
                 db.rollback()
                 return
-            
-            # Deduct from buyer's account
-            buyer.cash_balance -= total_cost
+            buyer_debited = True
             
             # Route to appropriate bank
             if bank_id.startswith("city_bank_"):
@@ -349,6 +349,7 @@ def execute_trade(db, buy_order, sell_order, quantity, price):
             import traceback
             traceback.print_exc()
             db.rollback()
+            _refund_ipo_buyer(buyer_debited, buy_order.player_id, total_cost)
             return
 
     # 6. Transfer inventory
@@ -363,10 +364,12 @@ def execute_trade(db, buy_order, sell_order, quantity, price):
         if not success:
             print(f"[Market] Inventory transfer failed!")
             db.rollback()
+            _refund_ipo_buyer(buyer_debited, buy_order.player_id, total_cost)
             return
     except Exception as e:
         print(f"[Market] Inventory Transfer Error: {e}")
         db.rollback()
+        _refund_ipo_buyer(buyer_debited, buy_order.player_id, total_cost)
         return
 
     # 7. Commit everything
@@ -468,6 +471,46 @@ def get_market_price(item_type: str) -> Optional[float]:
     if best_bid and best_ask: return (best_bid.price + best_ask.price) / 2
     return best_bid.price if best_bid else best_ask.price if best_ask else None
 
+def get_market_prices(item_types: Optional[List[str]] = None) -> dict:
+    """
+    get_market_price() for many items in three queries:
+    last trade per item, else midpoint of best bid/ask, else the single side.
+    """
+    from sqlalchemy import func, and_
+    db = get_db()
+    try:
+        latest = db.query(
+            Trade.item_type, func.max(Trade.executed_at).label("executed_at")
+        ).group_by(Trade.item_type).subquery()
+        last_prices = dict(db.query(Trade.item_type, Trade.price).join(
+            latest, and_(Trade.item_type == latest.c.item_type, Trade.executed_at == latest.c.executed_at)
+        ).all())
+
+        active = [MarketOrder.status == OrderStatus.ACTIVE, MarketOrder.price != None]
+        best_bids = dict(db.query(MarketOrder.item_type, func.max(MarketOrder.price)).filter(
+            MarketOrder.order_type == OrderType.BUY, *active
+        ).group_by(MarketOrder.item_type).all())
+        best_asks = dict(db.query(MarketOrder.item_type, func.min(MarketOrder.price)).filter(
+            MarketOrder.order_type == OrderType.SELL, *active
+        ).group_by(MarketOrder.item_type).all())
+    finally:
+        db.close()
+
+    if item_types is None:
+        item_types = set(last_prices) | set(best_bids) | set(best_asks)
+
+    prices = {}
+    for item in item_types:
+        if item in last_prices:
+            prices[item] = last_prices[item]
+            continue
+        bid, ask = best_bids.get(item), best_asks.get(item)
+        if bid is not None and ask is not None:
+            prices[item] = (bid + ask) / 2
+        else:
+            prices[item] = bid if bid is not None else ask
+    return prices
+
 def cancel_order(order_id: int, player_id: int) -> bool:
     db = get_db()
     order = db.query(MarketOrder).filter(MarketOrder.id == order_id, MarketOrder.player_id == player_id, MarketOrder.status == OrderStatus.ACTIVE).first()
@@ -500,15 +543,19 @@ def get_market_stats() -> dict:
 def initialize():
     print("[Market] Initializing database...")
     Base.metadata.create_all(bind=engine)
+    import scheduler
+    scheduler.every("market.log_stats", 3600, log_market_stats, cost=10.0,
+                    priority=scheduler.DEFERRABLE)
     print("[Market] Module initialized")
 
+def log_market_stats():
+    print(f"[Market] Hourly Stats: {get_market_stats()}")
+
 async def tick(current_tick: int, now: datetime):
     db = get_db()
     active_orders = db.query(MarketOrder).filter(MarketOrder.status.in_([OrderStatus.ACTIVE, OrderStatus.PARTIALLY_FILLED])).order_by(MarketOrder.created_at.asc()).all()
     for order in active_orders:
         match_order(db, order)
-    if current_tick % 3600 == 0:
-        print(f"[Market] Hourly Stats: {get_market_stats()}")
     db.close()
 
-__all__ = ['create_order', 'cancel_order', 'get_order_book', 'get_market_price', 'get_market_stats', 'give_starter_inventory']
+__all__ = ['create_order', 'cancel_order', 'get_order_book', 'get_market_price', 'get_market_prices', 'get_market_stats', 'give_starter_inventory']
@@ -10,17 +10,21 @@ Handles:
 - Breach of contract detection and penalties
 """
 
+import heapq
+import threading
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Dict, Optional, List, Set, Tuple
 from enum import Enum
 from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer, Boolean, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+import deadlines
+import cluster
 
 # ==========================
 # DATABASE SETUP
 # ==========================
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 
 engine = create_engine(
     DATABASE_URL,
@@ -368,6 +372,7 @@ def list_contract(contract_id: int, player_id: int, minimum_bid: float = 0.0,
     contract.bid_end_tick = app_mod.current_tick + duration_ticks
     contract.minimum_bid = max(0.0, minimum_bid)
     db.commit()
+    _schedule_contract(contract)
     db.close()
     return True
 
@@ -421,27 +426,28 @@ def place_bid(contract_id: int, bidder_id: int, bid_amount: float) -> Optional[s
             return f"Must offer at least {contract.minimum_bid:,.1f} units per delivery."
 
     # Check if already has an active bid - allow updating
-    existing = db.query(ContractBid).filter(
-        ContractBid.contract_id == contract_id,
-        ContractBid.bidder_id == bidder_id,
-        ContractBid.status == BidStatus.ACTIVE
-    ).first()
+    lower_wins = not is_relist and contract.contract_mode == "price_bid"
+    existing = get_listing_bids(contract_id).bid_for(bidder_id)
 
     if existing:
+        bid_id, current_amount = existing
         if is_relist or contract.contract_mode == "quantity_bid":
             # Higher is better - must increase
-            if bid_amount <= existing.bid_amount:
+            if bid_amount <= current_amount:
                 db.close()
                 label = "$" if is_relist else "units"
-                return f"New bid must be higher than your current bid of {existing.bid_amount:,.2f} {label}."
+                return f"New bid must be higher than your current bid of {current_amount:,.2f} {label}."
         else:
             # price_bid - lower is better - must decrease
-            if bid_amount >= existing.bid_amount:
+            if bid_amount >= current_amount:
                 db.close()
-                return f"New bid must be lower than your current bid of ${existing.bid_amount:,.2f}."
-        existing.bid_amount = bid_amount
+                return f"New bid must be lower than your current bid of ${current_amount:,.2f}."
+        db.query(ContractBid).filter(ContractBid.id == bid_id).update(
+            {"bid_amount": bid_amount}, synchronize_session=False
+        )
         db.commit()
         db.close()
+        record_listing_bid(contract_id, lower_wins, bid_id, bidder_id, bid_amount)
         return None
 
     bid = ContractBid(
@@ -451,6 +457,7 @@ def place_bid(contract_id: int, bidder_id: int, bid_amount: float) -> Optional[s
     )
     db.add(bid)
     db.commit()
+    record_listing_bid(contract_id, lower_wins, bid.id, bidder_id, bid_amount)
     db.close()
     return None
 
@@ -464,116 +471,188 @@ def resolve_listing(contract_id: int) -> bool:
     For relists, highest cash bid wins, winner pays lister.
     Returns True if a winner was found.
     """
-    from auth import get_db as get_auth_db, Player, transfer_cash
-    from stats_ux import log_transaction
+    return resolve_listings([contract_id]).get(contract_id, False)
 
-    db = get_db()
-    contract = db.query(Contract).filter(
-        Contract.id == contract_id,
-        Contract.status == ContractStatus.LISTED
-    ).first()
 
-    if not contract:
-        db.close()
-        return False
+def resolve_listings(contract_ids: List[int]) -> Dict[int, bool]:
+    """
+    Resolve a batch of expired listings in one transaction (see resolve_listing).
+    Winners come from the in-memory bid books; bid rows are settled with two
+    bulk updates. If the batch fails it is retried one listing at a time.
+
+    Relist winners pay only after the transaction has committed, so a batch
+    that rolls back (and is retried) has not moved any cash. A winner whose
+    payment then fails loses the contract again, which goes back to draft as
+    if there had been no payable bid.
+
+    Returns:
+        {contract_id: True if a winner was found} for every listing resolved,
+        None for a listing that failed and should be retried
+    """
+    from auth import Player, transfer_cash
+    from stats_ux import log_transaction
+    import app as app_mod
 
-    is_relist = contract.listing_type == "relist"
+    results: Dict[int, bool] = {}
+    if not contract_ids:
+        return results
 
-    # Sort bids: ascending for price_bid initial (lowest wins), descending otherwise
-    if not is_relist and contract.contract_mode == "price_bid":
-        bids = db.query(ContractBid).filter(
-            ContractBid.contract_id == contract_id,
-            ContractBid.status == BidStatus.ACTIVE
-        ).order_by(ContractBid.bid_amount.asc()).all()
-    else:
-        bids = db.query(ContractBid).filter(
-            ContractBid.contract_id == contract_id,
+    db = get_db()
+    try:
+        contracts = db.query(Contract).filter(
+            Contract.id.in_(contract_ids),
+            Contract.status == ContractStatus.LISTED
+        ).all()
+        if not contracts:
+            return results
+
+        quantity_ids = [c.id for c in contracts if c.listing_type != "relist" and c.contract_mode == "quantity_bid"]
+        quantity_items = {}
+        if quantity_ids:
+            for item in db.query(ContractItem).filter(ContractItem.contract_id.in_(quantity_ids)).all():
+                quantity_items.setdefault(item.contract_id, item)
+
+        ranked = {c.id: get_listing_bids(c.id).ranked() for c in contracts}
+
+        # Cash for every relist bidder, read once (decremented as they win)
+        relist_bidders = {
+            bidder_id
+            for c in contracts if c.listing_type == "relist"
+            for _, bidder_id, _ in ranked[c.id]
+        }
+        cash = {}
+        if relist_bidders:
+            cash = dict(db.query(Player.id, Player.cash_balance).filter(Player.id.in_(relist_bidders)).all())
+
+        winners = []
+        payments = []
+        for contract in contracts:
+            is_relist = contract.listing_type == "relist"
+            bids = ranked[contract.id]
+
+            # For relists, the winner is the best bidder who can pay
+            winner = None
+            if is_relist:
+                for bid_id, bidder_id, amount in bids:
+                    if (cash.get(bidder_id) or 0.0) < amount:
+                        continue
+                    # Winner pays lister once the batch is committed
+                    cash[bidder_id] -= amount
+                    winner = (bid_id, bidder_id, amount)
+                    payments.append((contract.id, bid_id, bidder_id, contract.lister_id, amount))
+                    break
+            elif bids:
+                # Initial listings - best bid wins (no cash check needed)
+                winner = bids[0]
+
+            if not winner:
+                # No (payable) bids - return to draft
+                contract.status = ContractStatus.DRAFT
+                contract.listed_at = None
+                contract.bid_end_tick = None
+                contract.listing_type = None
+                contract.lister_id = None
+                results[contract.id] = False
+                continue
+
+            bid_id, bidder_id, amount = winner
+            winners.append(bid_id)
+
+            # Apply the winning bid
+            if not is_relist and contract.contract_mode == "price_bid":
+                # Winning bid sets the price per delivery
+                contract.price_per_delivery = amount
+            elif not is_relist and contract.contract_mode == "quantity_bid":
+                # Winning bid sets the quantity on the single contract item
+                item = quantity_items.get(contract.id)
+                if item:
+                    item.quantity_per_delivery = amount
+
+            # Activate the contract
+            interval_ticks = DELIVERY_INTERVALS[contract.delivery_interval]["ticks"]
+            contract.status = ContractStatus.ACTIVE
+            contract.holder_id = bidder_id
+            contract.activated_at = datetime.utcnow()
+            contract.next_delivery_tick = app_mod.current_tick + interval_ticks
+            results[contract.id] = True
+
+        # Mark all bids
+        resolved_ids = [c.id for c in contracts]
+        db.query(ContractBid).filter(
+            ContractBid.contract_id.in_(resolved_ids),
             ContractBid.status == BidStatus.ACTIVE
-        ).order_by(ContractBid.bid_amount.desc()).all()
-
-    if not bids:
-        # No bids - return to draft
-        contract.status = ContractStatus.DRAFT
-        contract.listed_at = None
-        contract.bid_end_tick = None
-        contract.listing_type = None
-        contract.lister_id = None
-        db.commit()
-        db.close()
-        return False
+        ).update({"status": BidStatus.LOST}, synchronize_session=False)
+        if winners:
+            db.query(ContractBid).filter(ContractBid.id.in_(winners)).update(
+                {"status": BidStatus.WON}, synchronize_session=False
+            )
 
-    # For relists, verify winner can afford their cash bid
-    winner_bid = None
-    if is_relist:
-        for bid in bids:
-            auth_db = get_auth_db()
-            bidder = auth_db.query(Player).filter(Player.id == bid.bidder_id).first()
-            if bidder and bidder.cash_balance >= bid.bid_amount:
-                winner_bid = bid
-                auth_db.close()
-                break
-            auth_db.close()
-    else:
-        # Initial listings - first bid in sorted order wins (no cash check needed)
-        winner_bid = bids[0] if bids else None
-
-    if not winner_bid:
-        for bid in bids:
-            bid.status = BidStatus.LOST
-        contract.status = ContractStatus.DRAFT
-        contract.listed_at = None
-        contract.bid_end_tick = None
-        contract.listing_type = None
-        contract.lister_id = None
+        states = {c.id: (c.status, c.bid_end_tick, c.next_delivery_tick) for c in contracts}
         db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"[P2P] Error resolving {len(contract_ids)} listings: {e}")
+        results.clear()  # nothing from the failed batch was committed
+        if len(contract_ids) > 1:
+            db.close()
+            for contract_id in contract_ids:
+                results.update(resolve_listings([contract_id]))
+        else:
+            results[contract_ids[0]] = None
+        return results
+    finally:
         db.close()
-        return False
-
-    # Mark all bids
-    for bid in bids:
-        bid.status = BidStatus.WON if bid.id == winner_bid.id else BidStatus.LOST
 
-    # Apply the winning bid
-    if is_relist:
-        # Cash transfer: winner pays lister
-        lister_id = contract.lister_id
-        if winner_bid.bid_amount > 0:
-            transfer_cash(winner_bid.bidder_id, lister_id, winner_bid.bid_amount)
-            log_transaction(
-                player_id=winner_bid.bidder_id,
-                transaction_type="p2p_contract_acquired",
-                category="money",
-                amount=-winner_bid.bid_amount,
-                description=f"Acquired contract #{contract.id} for ${winner_bid.bid_amount:,.0f}"
-            )
-            log_transaction(
-                player_id=lister_id,
-                transaction_type="p2p_contract_sold",
-                category="money",
-                amount=winner_bid.bid_amount,
-                description=f"Sold contract #{contract.id} for ${winner_bid.bid_amount:,.0f}"
-            )
-    elif contract.contract_mode == "price_bid":
-        # Winning bid sets the price per delivery
-        contract.price_per_delivery = winner_bid.bid_amount
-    elif contract.contract_mode == "quantity_bid":
-        # Winning bid sets the quantity on the single contract item
-        item = db.query(ContractItem).filter(ContractItem.contract_id == contract.id).first()
-        if item:
-            item.quantity_per_delivery = winner_bid.bid_amount
-
-    # Activate the contract
-    import app as app_mod
-    interval_ticks = DELIVERY_INTERVALS[contract.delivery_interval]["ticks"]
+    logs = []
+    for contract_id, bid_id, bidder_id, lister_id, amount in payments:
+        if transfer_cash(bidder_id, lister_id, amount):
+            logs.append((bidder_id, "p2p_contract_acquired", -amount,
+                         f"Acquired contract #{contract_id} for ${amount:,.0f}"))
+            logs.append((lister_id, "p2p_contract_sold", amount,
+                         f"Sold contract #{contract_id} for ${amount:,.0f}"))
+        elif _unwind_relist(contract_id, bid_id):
+            states[contract_id] = (ContractStatus.DRAFT, None, None)
+            results[contract_id] = False
+
+    for contract_id, state in states.items():
+        _schedule_state(contract_id, *state)
+        drop_listing_bids(contract_id)
+    for player_id, transaction_type, amount, description in logs:
+        log_transaction(
+            player_id=player_id,
+            transaction_type=transaction_type,
+            category="money",
+            amount=amount,
+            description=description
+        )
+    return results
 
-    contract.status = ContractStatus.ACTIVE
-    contract.holder_id = winner_bid.bidder_id
-    contract.activated_at = datetime.utcnow()
-    contract.next_delivery_tick = app_mod.current_tick + interval_ticks
 
-    db.commit()
-    db.close()
-    return True
+def _unwind_relist(contract_id: int, bid_id: int) -> bool:
+    """Undo a relist win whose payment failed: back to draft, winning bid lost."""
+    db = get_db()
+    try:
+        db.query(Contract).filter(Contract.id == contract_id).update({
+            "status": ContractStatus.DRAFT,
+            "holder_id": None,
+            "listed_at": None,
+            "bid_end_tick": None,
+            "next_delivery_tick": None,
+            "listing_type": None,
+            "lister_id": None
+        }, synchronize_session=False)
+        db.query(ContractBid).filter(ContractBid.id == bid_id).update(
+            {"status": BidStatus.LOST}, synchronize_session=False
+        )
+        db.commit()
+        print(f"[P2P] Contract #{contract_id}: winning relist payment failed, returned to draft")
+        return True
+    except Exception as e:
+        db.rollback()
+        print(f"[P2P] Error unwinding unpaid relist of contract #{contract_id}: {e}")
+        return False
+    finally:
+        db.close()
 
 
 def relist_contract(contract_id: int, player_id: int, minimum_bid: float = 0.0,
@@ -638,6 +717,7 @@ def relist_contract(contract_id: int, player_id: int, minimum_bid: float = 0.0,
     contract.next_delivery_tick = None  # Pause deliveries while listed
 
     db.commit()
+    _schedule_contract(contract)
     db.close()
     return None
 
@@ -649,8 +729,8 @@ def process_delivery(contract_id: int, current_tick: int) -> Optional[str]:
     The buyer must have the cash to pay.
     Returns None on success, error string on failure/breach.
     """
-    from inventory import get_item_quantity, remove_item, add_item
-    from auth import get_db as get_auth_db, Player
+    from inventory import InventoryItem, transfer_item
+    from auth import Player
     from stats_ux import log_transaction
 
     db = get_db()
@@ -660,50 +740,53 @@ def process_delivery(contract_id: int, current_tick: int) -> Optional[str]:
     ).first()
 
     if not contract:
+        _unpark(contract_id)
         db.close()
         return "Contract not found."
 
     items = db.query(ContractItem).filter(ContractItem.contract_id == contract_id).all()
 
-    # Check holder has all items
+    # Check holder has all items (stock and buyer cash read in this session)
     holder_id = contract.holder_id
     buyer_id = contract.buyer_id
-    can_deliver = True
-
-    for item in items:
-        qty = get_item_quantity(holder_id, item.item_type)
-        if qty < item.quantity_per_delivery:
-            can_deliver = False
-            break
-
-    if not can_deliver:
+    grace_ends = contract.next_delivery_tick + DELIVERY_GRACE_PERIOD
+    stock = dict(db.query(InventoryItem.item_type, InventoryItem.quantity).filter(
+        InventoryItem.player_id == holder_id,
+        InventoryItem.item_type.in_([item.item_type for item in items])
+    ).all())
+
+    missing = next(
+        (item.item_type for item in items if (stock.get(item.item_type) or 0.0) < item.quantity_per_delivery),
+        None
+    )
+    if missing is not None:
         # Check if grace period expired
-        if current_tick > contract.next_delivery_tick + DELIVERY_GRACE_PERIOD:
+        if current_tick > grace_ends:
             # BREACH by holder - can't deliver
             _handle_breach(db, contract, holder_id, "Holder failed to deliver items within grace period")
             db.close()
             return "breach_holder"
+        _park(contract_id, stock_key=(holder_id, missing))
+        deadlines.schedule("p2p_deliveries", contract_id, grace_ends + 1)
         db.close()
         return "holder_missing_items"
 
     # Check buyer has cash
-    auth_db = get_auth_db()
-    buyer = auth_db.query(Player).filter(Player.id == buyer_id).first()
-    if not buyer or buyer.cash_balance < contract.price_per_delivery:
-        auth_db.close()
+    buyer_cash = db.query(Player.cash_balance).filter(Player.id == buyer_id).scalar()
+    if buyer_cash is None or buyer_cash < contract.price_per_delivery:
         # Check grace period for buyer
-        if current_tick > contract.next_delivery_tick + DELIVERY_GRACE_PERIOD:
+        if current_tick > grace_ends:
             _handle_breach(db, contract, buyer_id, "Buyer failed to pay within grace period")
             db.close()
             return "breach_buyer"
+        _park(contract_id, buyer_id=buyer_id)
+        deadlines.schedule("p2p_deliveries", contract_id, grace_ends + 1)
         db.close()
         return "buyer_insufficient_funds"
-    auth_db.close()
 
     # Execute delivery: transfer items holder -> buyer
     for item in items:
-        remove_item(holder_id, item.item_type, item.quantity_per_delivery)
-        add_item(buyer_id, item.item_type, item.quantity_per_delivery)
+        transfer_item(holder_id, buyer_id, item.item_type, item.quantity_per_delivery)
 
         log_transaction(
             player_id=holder_id,
@@ -757,6 +840,7 @@ def process_delivery(contract_id: int, current_tick: int) -> Optional[str]:
         contract.next_delivery_tick = current_tick + interval_ticks
 
     db.commit()
+    _schedule_contract(contract)
     db.close()
     return None
 
@@ -814,6 +898,223 @@ def _handle_breach(db, contract, breacher_id: int, reason: str):
     contract.breach_reason = reason
     contract.next_delivery_tick = None
     db.commit()
+    _schedule_contract(contract)
+
+
+def _schedule_contract(contract):
+    """Sync a contract's bid-end and delivery deadlines into the queues."""
+    _schedule_state(contract.id, contract.status, contract.bid_end_tick, contract.next_delivery_tick)
+
+
+def _schedule_state(contract_id: int, status: str, bid_end_tick: Optional[int], next_delivery_tick: Optional[int]):
+    _unpark(contract_id)
+    if status == ContractStatus.LISTED:
+        deadlines.schedule("p2p_listings", contract_id, bid_end_tick)
+    else:
+        deadlines.cancel("p2p_listings", contract_id)
+
+    if status == ContractStatus.ACTIVE:
+        deadlines.schedule("p2p_deliveries", contract_id, next_delivery_tick)
+    else:
+        deadlines.cancel("p2p_deliveries", contract_id)
+
+
+# ==========================
+# BID BOOKS
+# ==========================
+class ListingBids:
+    """
+    Active bids on one listing: a heap ordered best-first plus each bidder's
+    current bid. Raising or lowering a bid pushes a new entry; superseded
+    entries are dropped when they reach the top. Ties go to the earlier bid.
+    """
+
+    __slots__ = ("lower_wins", "_heap", "_by_bidder")
+
+    def __init__(self, lower_wins: bool):
+        self.lower_wins = lower_wins
+        self._heap = []
+        self._by_bidder: Dict[int, Tuple[int, float]] = {}
+
+    def _key(self, bid_id: int, amount: float):
+        return (amount if self.lower_wins else -amount, bid_id)
+
+    def put(self, bid_id: int, bidder_id: int, amount: float):
+        self._by_bidder[bidder_id] = (bid_id, amount)
+        heapq.heappush(self._heap, self._key(bid_id, amount) + (bidder_id, amount))
+        if len(self._heap) > 2 * len(self._by_bidder) + 16:
+            self._heap = [self._key(b, a) + (bidder, a) for bidder, (b, a) in self._by_bidder.items()]
+            heapq.heapify(self._heap)
+
+    def bid_for(self, bidder_id: int) -> Optional[Tuple[int, float]]:
+        """(bid_id, amount) of a bidder's active bid, if any."""
+        return self._by_bidder.get(bidder_id)
+
+    def best(self) -> Optional[float]:
+        heap = self._heap
+        while heap:
+            _, bid_id, bidder_id, amount = heap[0]
+            if self._by_bidder.get(bidder_id) == (bid_id, amount):
+                return amount
+            heapq.heappop(heap)
+        return None
+
+    def ranked(self) -> List[Tuple[int, int, float]]:
+        """Every active bid as (bid_id, bidder_id, amount), best first."""
+        entries = sorted(
+            (self._key(bid_id, amount), bid_id, bidder_id, amount)
+            for bidder_id, (bid_id, amount) in self._by_bidder.items()
+        )
+        return [(bid_id, bidder_id, amount) for _, bid_id, bidder_id, amount in entries]
+
+    def __len__(self):
+        return len(self._by_bidder)
+
+
+# contract_id -> ListingBids for listed contracts; rebuilt from ContractBid at startup
+_listing_bids: Dict[int, ListingBids] = {}
+_bids_lock = threading.Lock()
+
+
+def get_listing_bids(contract_id: int, create: bool = False, lower_wins: bool = False) -> ListingBids:
+    """Bid book for a listed contract (an empty, untracked book if it has no bids)."""
+    with _bids_lock:
+        book = _listing_bids.get(contract_id)
+        if book is None:
+            book = ListingBids(lower_wins)
+            if create:
+                _listing_bids[contract_id] = book
+        return book
+
+
+@cluster.replicated
+def record_listing_bid(contract_id: int, lower_wins: bool, bid_id: int, bidder_id: int, amount: float):
+    """Add (or improve) a committed bid in the listing's book, in every process."""
+    get_listing_bids(contract_id, create=True, lower_wins=lower_wins).put(bid_id, bidder_id, amount)
+
+
+@cluster.replicated
+def drop_listing_bids(contract_id: int):
+    with _bids_lock:
+        _listing_bids.pop(contract_id, None)
+
+
+def load_listing_bids() -> int:
+    """Rebuild every bid book from the active bids on listed contracts."""
+    global _listing_bids
+    db = get_db()
+    try:
+        listed = db.query(Contract.id, Contract.listing_type, Contract.contract_mode).filter(
+            Contract.status == ContractStatus.LISTED
+        ).all()
+        books = {
+            contract_id: ListingBids(listing_type != "relist" and mode == "price_bid")
+            for contract_id, listing_type, mode in listed
+        }
+        rows = []
+        if books:
+            rows = db.query(ContractBid.id, ContractBid.contract_id, ContractBid.bidder_id, ContractBid.bid_amount).filter(
+                ContractBid.contract_id.in_(list(books)),
+                ContractBid.status == BidStatus.ACTIVE
+            ).order_by(ContractBid.id.asc()).all()
+    finally:
+        db.close()
+    for bid_id, contract_id, bidder_id, amount in rows:
+        books[contract_id].put(bid_id, bidder_id, amount)
+    with _bids_lock:
+        _listing_bids = {contract_id: book for contract_id, book in books.items() if book}
+    return len(rows)
+
+
+# ==========================
+# DELIVERY WAKEUPS
+# ==========================
+# A delivery that can't go through yet is parked on what it is waiting for:
+# the holder's stock of one item, or the buyer's cash. Inventory and Player
+# writes wake the contracts parked on them, and the next tick retries only
+# those. The grace deadline stays in the p2p_deliveries queue, so a contract
+# whose wakeup never comes (e.g. stock written with a bulk UPDATE) is still
+# retried, and breached if it still can't deliver, once the grace period ends.
+_parked: Dict[int, tuple] = {}                              # contract_id -> wait key
+_waiting: Dict[tuple, Set[int]] = {}                        # wait key -> contract ids
+_woken: Set[int] = set()
+_wake_lock = threading.Lock()
+
+
+def _park(contract_id: int, stock_key: Optional[Tuple[int, str]] = None, buyer_id: Optional[int] = None):
+    key = ("stock",) + stock_key if stock_key is not None else ("cash", buyer_id)
+    with _wake_lock:
+        _unpark_locked(contract_id)
+        _parked[contract_id] = key
+        _waiting.setdefault(key, set()).add(contract_id)
+
+
+def _unpark_locked(contract_id: int):
+    key = _parked.pop(contract_id, None)
+    if key is not None:
+        waiters = _waiting.get(key)
+        if waiters is not None:
+            waiters.discard(contract_id)
+            if not waiters:
+                del _waiting[key]
+    _woken.discard(contract_id)
+
+
+def _unpark(contract_id: int):
+    with _wake_lock:
+        _unpark_locked(contract_id)
+
+
+def _wake(key: tuple):
+    if key not in _waiting:
+        return
+    with _wake_lock:
+        for contract_id in _waiting.pop(key, ()):
+            _parked.pop(contract_id, None)
+            _woken.add(contract_id)
+
+
+def _on_inventory_change(player_id: int, item_type: str):
+    _wake(("stock", player_id, item_type))
+
+
+def _on_player_change(player_id: int):
+    _wake(("cash", player_id))
+
+
+def _pop_woken() -> List[int]:
+    global _woken
+    with _wake_lock:
+        woken, _woken = _woken, set()
+    return sorted(woken)
+
+
+def get_parked_deliveries() -> Dict[int, tuple]:
+    """Contracts waiting on stock or cash: {contract_id: ("stock", holder, item) | ("cash", buyer)}."""
+    with _wake_lock:
+        return dict(_parked)
+
+
+def _load_listing_deadlines():
+    db = get_db()
+    try:
+        rows = db.query(Contract.id, Contract.bid_end_tick).filter(
+            Contract.status == ContractStatus.LISTED
+        ).all()
+        return [(contract_id, due_tick) for contract_id, due_tick in rows]
+    finally:
+        db.close()
+
+
+def _load_delivery_deadlines():
+    db = get_db()
+    try:
+        rows = db.query(Contract.id, Contract.next_delivery_tick).filter(
+            Contract.status == ContractStatus.ACTIVE
+        ).all()
+        return [(contract_id, due_tick) for contract_id, due_tick in rows]
+    finally:
+        db.close()
 
 
 def get_contract_details(contract_id: int) -> Optional[dict]:
@@ -863,6 +1164,14 @@ def initialize():
     """Initialize the P2P module."""
     print("[P2P] Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    deadlines.register("p2p_listings", _load_listing_deadlines)
+    deadlines.register("p2p_deliveries", _load_delivery_deadlines)
+    print(f"[P2P] Bid books: {load_listing_bids()} active bids")
+
+    import inventory
+    import auth
+    inventory.on_inventory_change(_on_inventory_change)
+    auth.on_player_change(_on_player_change)
     print("[P2P] Module initialized")
 
 
@@ -872,40 +1181,39 @@ async def tick(current_tick: int, now):
     - Resolve expired listings
     - Process pending deliveries
     - Check for breaches
+    Only contracts whose deadline has come up in the queues, or whose
+    holder's stock or buyer's cash changed while parked, are touched.
     """
     # Only run every 12 ticks (~1 minute) to save resources
     if current_tick % 12 != 0:
         return
 
-    db = get_db()
-
     try:
-        # 1. Resolve expired listings
-        expired_listings = db.query(Contract).filter(
-            Contract.status == ContractStatus.LISTED,
-            Contract.bid_end_tick <= current_tick
-        ).all()
-
-        for contract in expired_listings:
-            db.close()
-            resolve_listing(contract.id)
-            db = get_db()
-
-        # 2. Process deliveries for active contracts
-        active_contracts = db.query(Contract).filter(
-            Contract.status == ContractStatus.ACTIVE,
-            Contract.next_delivery_tick <= current_tick
-        ).all()
-
-        contract_ids = [c.id for c in active_contracts]
-        db.close()
-
-        for cid in contract_ids:
-            process_delivery(cid, current_tick)
+        # 1. Resolve expired listings (one batch transaction); failed ones stay queued
+        with deadlines.claim_due("p2p_listings", current_tick) as expired:
+            if expired:
+                results = resolve_listings(expired.keys)
+                for contract_id in expired:
+                    if results.get(contract_id, False) is not None:
+                        expired.done(contract_id)
+
+        # 2. Process deliveries for active contracts (due or woken)
+        with deadlines.claim_due("p2p_deliveries", current_tick) as due:
+            due_set = set(due)
+            woken = [cid for cid in _pop_woken() if cid not in due_set]
+            retry_woken = []
+            for contract_id in due.keys + woken:
+                try:
+                    process_delivery(contract_id, current_tick)
+                except Exception as e:
+                    print(f"[P2P] Delivery error on contract {contract_id}: {e}")
+                    if contract_id not in due_set:
+                        retry_woken.append(contract_id)
+                    continue
+                due.done(contract_id)
+            if retry_woken:
+                with _wake_lock:
+                    _woken.update(retry_woken)
 
     except Exception as e:
         print(f"[P2P] Tick error: {e}")
-        try:
-            db.close()
-        except:
-            pass
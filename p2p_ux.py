@@ -27,9 +27,7 @@ def require_auth(session_token):
     """Check if user is authenticated."""
     try:
         import auth
-        db = auth.get_db()
-        player = auth.get_player_from_session(db, session_token)
-        db.close()
+        player = auth.get_session_player(session_token)
         if not player:
             return RedirectResponse(url="/login", status_code=303)
         return player
@@ -230,7 +228,7 @@ def contracts_dashboard(session_token: Optional[str] = Cookie(None), tab: str =
 
 def _render_trading_market(player, current_tick):
     """Render the contract trading market - listed contracts available for bidding."""
-    from p2p import get_db, Contract, ContractItem, ContractBid, ContractStatus, BidStatus, DELIVERY_INTERVALS, CONTRACT_LENGTHS
+    from p2p import get_db, Contract, ContractItem, ContractStatus, DELIVERY_INTERVALS, CONTRACT_LENGTHS, get_listing_bids
     from auth import get_db as get_auth_db, Player
 
     db = get_db()
@@ -254,30 +252,16 @@ def _render_trading_market(player, current_tick):
         is_relist = contract.listing_type == "relist"
         is_price_bid = contract.contract_mode == "price_bid"
 
-        # Sort bids appropriately: price_bid initial = ascending (lowest best), otherwise descending
-        if not is_relist and is_price_bid:
-            active_bids = db.query(ContractBid).filter(
-                ContractBid.contract_id == contract.id,
-                ContractBid.status == BidStatus.ACTIVE
-            ).order_by(ContractBid.bid_amount.asc()).all()
-            best_bid = active_bids[0].bid_amount if active_bids else None
-        else:
-            active_bids = db.query(ContractBid).filter(
-                ContractBid.contract_id == contract.id,
-                ContractBid.status == BidStatus.ACTIVE
-            ).order_by(ContractBid.bid_amount.desc()).all()
-            best_bid = active_bids[0].bid_amount if active_bids else None
-
-        bid_count = len(active_bids)
+        # Best bid from the in-memory bid book: price_bid initial = lowest, otherwise highest
+        bids = get_listing_bids(contract.id)
+        best_bid = bids.best()
+        bid_count = len(bids)
 
         lister = auth_db.query(Player).filter(Player.id == contract.lister_id).first()
         lister_name = lister.business_name if lister else "Unknown"
 
-        my_bid = db.query(ContractBid).filter(
-            ContractBid.contract_id == contract.id,
-            ContractBid.bidder_id == player.id,
-            ContractBid.status == BidStatus.ACTIVE
-        ).first()
+        my_bid = bids.bid_for(player.id)
+        my_bid_amount = my_bid[1] if my_bid else None
 
         ticks_left = max(0, contract.bid_end_tick - current_tick) if contract.bid_end_tick else 0
         minutes_left = (ticks_left * 5) / 60
@@ -322,16 +306,16 @@ def _render_trading_market(player, current_tick):
             bid_section = '<span style="color: #64748b; font-size: 0.85rem;">Your listing</span>'
         elif my_bid:
             if not is_relist and is_price_bid:
-                leading = my_bid.bid_amount <= best_bid if best_bid else True
-                my_display = f"${my_bid.bid_amount:,.2f}/del"
+                leading = my_bid_amount <= best_bid if best_bid else True
+                my_display = f"${my_bid_amount:,.2f}/del"
                 update_hint = "Lower your price"
             elif is_relist:
-                leading = my_bid.bid_amount >= best_bid if best_bid else True
-                my_display = f"${my_bid.bid_amount:,.0f}"
+                leading = my_bid_amount >= best_bid if best_bid else True
+                my_display = f"${my_bid_amount:,.0f}"
                 update_hint = "Raise offer"
             else:
-                leading = my_bid.bid_amount >= best_bid if best_bid else True
-                my_display = f"{my_bid.bid_amount:,.1f} units"
+                leading = my_bid_amount >= best_bid if best_bid else True
+                my_display = f"{my_bid_amount:,.1f} units"
                 update_hint = "Raise quantity"
 
             status_color = "#22c55e" if leading else "#f59e0b"
@@ -399,10 +383,10 @@ def _render_trading_market(player, current_tick):
 def _render_my_contracts(player, current_tick):
     """Render the player's contracts (created, holding, buying)."""
     from p2p import (
-        get_db, Contract, ContractItem, ContractBid, ContractStatus, BidStatus,
+        get_db, Contract, ContractItem, ContractStatus,
         DELIVERY_INTERVALS, CONTRACT_LENGTHS, DELIVERY_GRACE_PERIOD,
         BREACH_PENALTY_GOV_PCT, BREACH_PENALTY_DAMAGED_PCT,
-        BID_DURATION_OPTIONS, RELIST_FEE
+        BID_DURATION_OPTIONS, RELIST_FEE, get_listing_bids
     )
     from auth import get_db as get_auth_db, Player
 
@@ -476,10 +460,7 @@ def _render_my_contracts(player, current_tick):
         html += '<h4 style="color: #38bdf8; margin-top: 20px;">My Active Listings</h4>'
         for contract in my_listings:
             items = db.query(ContractItem).filter(ContractItem.contract_id == contract.id).all()
-            bid_count = db.query(ContractBid).filter(
-                ContractBid.contract_id == contract.id,
-                ContractBid.status == BidStatus.ACTIVE
-            ).count()
+            bid_count = len(get_listing_bids(contract.id))
             ticks_left = max(0, contract.bid_end_tick - current_tick) if contract.bid_end_tick else 0
             minutes_left = (ticks_left * 5) / 60
             items_html = ", ".join([f"{format_item_name(i.item_type)}" for i in items])
@@ -0,0 +1,252 @@
+"""
+passwords.py
+
+Password hashing service for the auth module.
+Handles:
+- Salted scrypt hashes (memory-hard, standard library only)
+- Running the KDF in a small process pool so login storms never block the
+  event loop that also drives tick_loop
+- A bounded number of in-flight hashing jobs (overflow is refused, not queued)
+- Verifying legacy unsalted SHA-256 hashes and flagging them for rehash
+- Calibrating scrypt cost to a target latency on this machine
+
+Hash format: scrypt$<n>$<r>$<p>$<salt_b64>$<key_b64>. Cost parameters travel
+with each hash, so recalibrating never invalidates stored passwords; hashes
+made with weaker parameters are simply upgraded on the next successful login.
+"""
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional, Tuple
+
+# ==========================
+# CONFIGURATION
+# ==========================
+SCHEME = "scrypt"
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+TARGET_MS = 100         # calibration target per hash
+MIN_LOG2_N = 14         # never calibrate below N = 16384
+MAX_LOG2_N = 20
+DEFAULT_PARAMS = {"n": 2 ** 14, "r": 8, "p": 1}
+
+POOL_WORKERS = 2        # KDF processes
+MAX_PENDING = 16        # hashing jobs allowed in flight across all requests
+
+# Active cost parameters (replaced by calibrate() at startup)
+params: Dict[str, int] = dict(DEFAULT_PARAMS)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+class PasswordBusy(Exception):
+    """Raised when the hashing queue is full; callers should ask the user to retry."""
+
+# ==========================
+# KDF (runs in pool workers)
+# ==========================
+def _derive(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode(), salt=salt, n=n, r=r, p=p,
+        maxmem=256 * n * r * p, dklen=KEY_BYTES
+    )
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode().rstrip("=")
+
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _hash_sync(password: str, n: int, r: int, p: int) -> str:
+    salt = os.urandom(SALT_BYTES)
+    key = _derive(password, salt, n, r, p)
+    return f"{SCHEME}${n}${r}${p}${_b64(salt)}${_b64(key)}"
+
+
+def _verify_scrypt_sync(password: str, stored: str) -> bool:
+    try:
+        _, n, r, p, salt, key = stored.split("$")
+        expected = _unb64(key)
+        derived = _derive(password, _unb64(salt), int(n), int(r), int(p))
+    except (ValueError, TypeError):
+        return False
+    return hmac.compare_digest(derived, expected)
+
+
+def _is_legacy(stored: str) -> bool:
+    """Unsalted SHA-256 hex digests written before scrypt hashing."""
+    return len(stored) == 64 and all(c in "0123456789abcdef" for c in stored)
+
+
+def needs_rehash(stored: str) -> bool:
+    """
+    True for legacy hashes and scrypt hashes weaker than the current parameters.
+    Hashes at or above the current cost are left alone, so calibration noise
+    between restarts doesn't churn every account.
+    """
+    if not stored.startswith(SCHEME + "$"):
+        return True
+    try:
+        _, n, r, p, _, _ = stored.split("$")
+        n, r, p = int(n), int(r), int(p)
+    except ValueError:
+        return True
+    return n < params["n"] or (r, p) != (params["r"], params["p"])
+
+# ==========================
+# WORKER POOL
+# ==========================
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: workers import only this module, not the app and its db engines
+            _pool = ProcessPoolExecutor(
+                max_workers=POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = None
+
+
+async def _run(fn, *args):
+    """Run fn in the pool, refusing work once MAX_PENDING jobs are in flight."""
+    global _pending
+    with _pending_lock:
+        if _pending >= MAX_PENDING:
+            raise PasswordBusy("Password hashing queue is full")
+        _pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(_get_pool(), fn, *args)
+        except BrokenProcessPool:
+            print("[Passwords] Worker pool died, restarting")
+            _reset_pool()
+            return await loop.run_in_executor(_get_pool(), fn, *args)
+    finally:
+        with _pending_lock:
+            _pending -= 1
+
+# ==========================
+# PUBLIC API
+# ==========================
+async def hash_password(password: str) -> str:
+    """Hash a password with the current cost parameters (off the event loop)."""
+    return await _run(_hash_sync, password, params["n"], params["r"], params["p"])
+
+
+async def verify_password(password: str, stored: str) -> Tuple[bool, bool]:
+    """
+    Check a password against a stored hash.
+
+    Returns:
+        (matches, needs_rehash) - needs_rehash is only meaningful on a match
+    """
+    if not stored:
+        return False, False
+    if _is_legacy(stored):
+        # Cheap enough to check inline; always upgraded on success
+        digest = hashlib.sha256(password.encode()).hexdigest()
+        return hmac.compare_digest(digest, stored), True
+    if not stored.startswith(SCHEME + "$"):
+        return False, False  # system accounts etc.
+    matches = await _run(_verify_scrypt_sync, password, stored)
+    return matches, matches and needs_rehash(stored)
+
+# ==========================
+# CALIBRATION
+# ==========================
+def benchmark(n: int, r: int = 8, p: int = 1, rounds: int = 3) -> float:
+    """Median milliseconds for one hash with the given parameters."""
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        _derive("calibration-password", b"\x00" * SALT_BYTES, n, r, p)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def calibrate(target_ms: float = TARGET_MS, r: int = 8, p: int = 1) -> Dict[str, int]:
+    """
+    Pick the largest N (a power of two) whose hash time stays under target_ms,
+    never going below MIN_LOG2_N.
+    """
+    best = 2 ** MIN_LOG2_N
+    for log2_n in range(MIN_LOG2_N, MAX_LOG2_N + 1):
+        n = 2 ** log2_n
+        if benchmark(n, r, p) > target_ms:
+            break
+        best = n
+    return {"n": best, "r": r, "p": p}
+
+
+def initialize(target_ms: float = TARGET_MS):
+    """Calibrate cost parameters and warm up the worker pool."""
+    global params
+    try:
+        params = calibrate(target_ms)
+    except (ValueError, MemoryError) as e:
+        print(f"[Passwords] Calibration failed, using defaults: {e}")
+        params = dict(DEFAULT_PARAMS)
+    _get_pool()
+    print(f"[Passwords] scrypt N={params['n']} r={params['r']} p={params['p']} "
+          f"(target {target_ms:.0f}ms, {POOL_WORKERS} workers, {MAX_PENDING} max pending)")
+
+
+__all__ = [
+    'hash_password',
+    'verify_password',
+    'needs_rehash',
+    'benchmark',
+    'calibrate',
+    'initialize',
+    'PasswordBusy'
+]
+
+# ==========================
+# CLI INTERFACE
+# ==========================
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark and calibrate password hashing cost')
+    parser.add_argument('--target-ms', type=float, default=TARGET_MS, help='Target milliseconds per hash')
+    parser.add_argument('--r', type=int, default=8, help='scrypt block size')
+    parser.add_argument('--p', type=int, default=1, help='scrypt parallelism')
+    args = parser.parse_args()
+
+    for log2_n in range(MIN_LOG2_N, MAX_LOG2_N + 1):
+        n = 2 ** log2_n
+        ms = benchmark(n, args.r, args.p)
+        mem_mb = 128 * n * args.r * args.p / (1024 * 1024)
+        print(f"N=2^{log2_n:<2} ({mem_mb:6.0f} MiB): {ms:8.1f} ms")
+        if ms > args.target_ms * 4:
+            break
+
+    chosen = calibrate(args.target_ms, args.r, args.p)
+    print(f"\nChosen for {args.target_ms:.0f}ms: N={chosen['n']} r={chosen['r']} p={chosen['p']}")
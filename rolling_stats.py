@@ -0,0 +1,337 @@
+"""
+rolling_stats.py
+
+Incremental statistics for price series.
+Handles:
+- Sliding-window mean/variance (Welford add/remove updates)
+- Exponentially weighted mean/variance (EWMA)
+- Return-based volatility fed by price samples
+- Persistence of estimator state across restarts
+
+Estimators are updated once per trade or price sample and queried in O(1),
+instead of re-reading price history and recomputing from scratch.
+"""
+
+import json
+import math
+from collections import deque
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set
+from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer, Text
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+
+# ==========================
+# DATABASE SETUP
+# ==========================
+from db_schema import DATABASE_URL
+engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+Base = declarative_base()
+
+EPOCH = datetime(1970, 1, 1)
+DEFAULT_EWMA_ALPHA = 0.06  # ~ RiskMetrics lambda of 0.94
+FLUSH_INTERVAL = 60  # ticks between batched writes of dirty series
+
+# ==========================
+# DATABASE MODELS
+# ==========================
+class RollingStatRecord(Base):
+    """Persisted estimator state, one row per series key."""
+    __tablename__ = "rolling_stats"
+
+    key = Column(String, primary_key=True, index=True)
+    count = Column(Integer, default=0)
+    mean = Column(Float, default=0.0)
+    m2 = Column(Float, default=0.0)
+    ewma = Column(Float, nullable=True)
+    ewm_var = Column(Float, default=0.0)
+    last_value = Column(Float, nullable=True)
+    last_at = Column(Float, nullable=True)
+    samples = Column(Text, nullable=True)  # JSON window, only for series with no backing table
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+# ==========================
+# ESTIMATOR
+# ==========================
+def to_seconds(when: datetime) -> float:
+    """Naive-UTC datetime to float seconds (matches datetime.utcnow usage)."""
+    return (when - EPOCH).total_seconds()
+
+
+class RollingStats:
+    """
+    Sliding-window Welford mean/variance plus an EWMA over the same samples.
+
+    The window is bounded by sample count (max_samples), by age
+    (horizon_seconds), or both. Each sample is kept once in a deque so it can
+    be subtracted back out when it leaves the window.
+    """
+
+    def __init__(self, max_samples: Optional[int] = None,
+                 horizon_seconds: Optional[float] = None,
+                 ewma_alpha: float = DEFAULT_EWMA_ALPHA):
+        self.max_samples = max_samples
+        self.horizon_seconds = horizon_seconds
+        self.ewma_alpha = ewma_alpha
+        self.window = deque()  # (timestamp_seconds, value)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.ewma = None
+        self.ewm_var = 0.0
+        self.last_value = None
+        self.last_at = None
+
+    # ---- window maintenance ----
+    def _add(self, value: float):
+        n = len(self.window)
+        delta = value - self.mean
+        self.mean += delta / n
+        self.m2 += delta * (value - self.mean)
+
+    def _remove(self, value: float):
+        n = len(self.window)
+        if n == 0:
+            self.mean = 0.0
+            self.m2 = 0.0
+            return
+        delta = value - self.mean
+        self.mean -= delta / n
+        self.m2 -= delta * (value - self.mean)
+        if self.m2 < 0:
+            self.m2 = 0.0
+
+    def push(self, value: float, at: Optional[float] = None):
+        """Add a sample to the window and the EWMA."""
+        if at is None:
+            at = to_seconds(datetime.utcnow())
+        self.window.append((at, value))
+        self._add(value)
+
+        if self.max_samples and len(self.window) > self.max_samples:
+            _, old = self.window.popleft()
+            self._remove(old)
+        if self.horizon_seconds:
+            self._expire_before(at - self.horizon_seconds)
+
+        if self.ewma is None:
+            self.ewma = value
+            self.ewm_var = 0.0
+        else:
+            diff = value - self.ewma
+            incr = self.ewma_alpha * diff
+            self.ewma += incr
+            self.ewm_var = (1 - self.ewma_alpha) * (self.ewm_var + diff * incr)
+
+    def push_price(self, price: float, at: Optional[datetime] = None):
+        """
+        Record a price sample and push the simple return since the last one.
+
+        The return is timestamped with the previous sample so it leaves the
+        window together with the price it was measured from.
+        """
+        at_s = to_seconds(at or datetime.utcnow())
+        if self.last_value is not None and self.last_value > 0:
+            self.push((price - self.last_value) / self.last_value, self.last_at)
+        self.last_value = price
+        self.last_at = at_s
+        if self.horizon_seconds:
+            self._expire_before(at_s - self.horizon_seconds)
+
+    def expire(self, now: Optional[datetime] = None):
+        """Drop samples older than the horizon (amortised O(1))."""
+        if not self.horizon_seconds:
+            return
+        self._expire_before(to_seconds(now or datetime.utcnow()) - self.horizon_seconds)
+
+    def _expire_before(self, cutoff: float):
+        while self.window and self.window[0][0] < cutoff:
+            _, old = self.window.popleft()
+            self._remove(old)
+
+    # ---- queries ----
+    @property
+    def count(self) -> int:
+        return len(self.window)
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the window."""
+        n = len(self.window)
+        return self.m2 / n if n else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def ewm_stddev(self) -> float:
+        return math.sqrt(max(0.0, self.ewm_var))
+
+    # ---- persistence ----
+    def save_to(self, record: RollingStatRecord, include_samples: bool = False):
+        record.count = len(self.window)
+        record.mean = self.mean
+        record.m2 = self.m2
+        record.ewma = self.ewma
+        record.ewm_var = self.ewm_var
+        record.last_value = self.last_value
+        record.last_at = self.last_at
+        if include_samples:
+            record.samples = json.dumps(list(self.window))
+
+    def load_from(self, record: RollingStatRecord):
+        self.ewma = record.ewma
+        self.ewm_var = record.ewm_var or 0.0
+        self.last_value = record.last_value
+        self.last_at = record.last_at
+        if record.samples:
+            self.window.clear()
+            self.mean = 0.0
+            self.m2 = 0.0
+            for at, value in json.loads(record.samples):
+                self.window.append((at, value))
+                self._add(value)
+            while self.max_samples and len(self.window) > self.max_samples:
+                _, old = self.window.popleft()
+                self._remove(old)
+
+# ==========================
+# REGISTRY
+# ==========================
+series: Dict[str, RollingStats] = {}
+dirty_keys: Set[str] = set()  # series changed since the last flush_series()
+
+
+def get_db():
+    db = SessionLocal()
+    try:
+        return db
+    except Exception as e:
+        print(f"[RollingStats] Database error: {e}")
+        db.close()
+        raise
+
+
+def get_series(key: str, max_samples: Optional[int] = None,
+               horizon_seconds: Optional[float] = None,
+               ewma_alpha: float = DEFAULT_EWMA_ALPHA) -> RollingStats:
+    """Get (or create) the in-memory estimator for a series key."""
+    stats = series.get(key)
+    if stats is None:
+        stats = RollingStats(max_samples, horizon_seconds, ewma_alpha)
+        series[key] = stats
+    return stats
+
+
+def load_series(key: str, max_samples: Optional[int] = None,
+                horizon_seconds: Optional[float] = None,
+                ewma_alpha: float = DEFAULT_EWMA_ALPHA) -> RollingStats:
+    """Create the estimator for a key and restore any persisted state."""
+    stats = RollingStats(max_samples, horizon_seconds, ewma_alpha)
+    db = get_db()
+    try:
+        record = db.query(RollingStatRecord).filter(RollingStatRecord.key == key).first()
+        if record:
+            stats.load_from(record)
+    finally:
+        db.close()
+    series[key] = stats
+    return stats
+
+
+def save_series(key: str, db=None, include_samples: bool = False):
+    """
+    Persist a series' state. Pass an open session to ride along with the
+    caller's commit; otherwise a short-lived session is used.
+    """
+    stats = series.get(key)
+    if stats is None:
+        return
+    own_session = db is None
+    if own_session:
+        db = get_db()
+    try:
+        record = db.query(RollingStatRecord).filter(RollingStatRecord.key == key).first()
+        if not record:
+            record = RollingStatRecord(key=key)
+            db.add(record)
+        stats.save_to(record, include_samples=include_samples)
+        if own_session:
+            db.commit()
+    finally:
+        if own_session:
+            db.close()
+
+def mark_dirty(key: str):
+    """Queue a series for the next batched flush_series() instead of writing now."""
+    dirty_keys.add(key)
+
+
+def save_many(keys: Iterable[str], db=None) -> int:
+    """
+    Persist several series with one SELECT for the existing rows.
+    Returns the number of series written.
+    """
+    keys = [key for key in keys if key in series]
+    if not keys:
+        return 0
+    own_session = db is None
+    if own_session:
+        db = get_db()
+    try:
+        records = {
+            record.key: record
+            for record in db.query(RollingStatRecord).filter(RollingStatRecord.key.in_(keys)).all()
+        }
+        for key in keys:
+            record = records.get(key)
+            if not record:
+                record = RollingStatRecord(key=key)
+                db.add(record)
+            series[key].save_to(record)
+        if own_session:
+            db.commit()
+        return len(keys)
+    finally:
+        if own_session:
+            db.close()
+
+
+def flush_series() -> int:
+    """Write every series marked dirty since the last flush, in one transaction."""
+    if not dirty_keys:
+        return 0
+    keys = list(dirty_keys)
+    dirty_keys.clear()
+    try:
+        return save_many(keys)
+    except Exception as e:
+        dirty_keys.update(keys)
+        print(f"[RollingStats] Flush failed for {len(keys)} series: {e}")
+        return 0
+
+# ==========================
+# MODULE LIFECYCLE
+# ==========================
+def initialize():
+    import scheduler
+
+    Base.metadata.create_all(bind=engine)
+    # Every process records prices, so each flushes its own dirty series
+    scheduler.every("rolling_stats.flush", FLUSH_INTERVAL, flush_series, cost=5.0,
+                    priority=scheduler.DEFERRABLE, local=True)
+
+
+__all__ = [
+    'RollingStats',
+    'RollingStatRecord',
+    'get_series',
+    'load_series',
+    'save_series',
+    'save_many',
+    'mark_dirty',
+    'flush_series',
+    'to_seconds',
+    'initialize'
+]
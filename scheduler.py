@@ -0,0 +1,465 @@
+"""
+scheduler.py
+
+Staggered periodic jobs for the tick loop.
+Handles:
+- Registering maintenance jobs with a period and a cost hint
+- Assigning each job a phase so expected cost is spread evenly over ticks
+- Timing every run and feeding observed runtimes back into placement
+- A histogram of per-tick job time for spotting spikes
+- Job priorities and a per-tick time budget (deferrable work carries over)
+- Fixed-cadence tick pacing with budget, deferral and drift metrics
+
+Modules used to gate periodic work on `current_tick % period == 0`, so every
+hourly job in the game fired on the same tick (and every per-minute job on
+the same sixtieth tick). A registered job keeps its period but runs on the
+ticks where (tick - phase) % period == 0. Phases are chosen greedily, most
+expensive job first, to minimise the busiest tick over one PLACEMENT_HORIZON.
+
+Re-placement on REBALANCE_INTERVAL may move a job's phase; that run is then
+up to one period early or late, once. Nothing registered here depends on
+landing on a particular tick.
+
+Module tick handlers (matching, settlement) always run. After them, due jobs
+run in priority order against what is left of the tick budget: CRITICAL jobs
+always run, NORMAL jobs wait while the budget is spent, and DEFERRABLE jobs
+wait unless their expected cost still fits. Waiting jobs stay in a backlog
+and run on a later tick with spare time; a job due again while waiting runs
+once, not twice. Starvation is bounded by MAX_NORMAL_DEFER_TICKS and, for
+deferrable jobs, by the longer of that and one period.
+
+Jobs registered with local=True only refresh in-process caches. Processes
+that follow the tick leader (see cluster.py) run just those, via run_local.
+"""
+
+import inspect
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+PLACEMENT_HORIZON = 3600    # ticks over which load is balanced (longest common period)
+REBALANCE_INTERVAL = 21600  # ticks between re-placements from observed runtimes
+RUNTIME_EMA_ALPHA = 0.2     # weight of the newest run in a job's average runtime
+
+# Upper bounds (ms) of the per-tick job time histogram; the last bucket is open
+HISTOGRAM_BUCKETS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# Job priorities (lower runs first)
+CRITICAL = 0     # always runs when due
+NORMAL = 1       # waits while the tick budget is spent
+DEFERRABLE = 2   # runs only if its expected cost fits the remaining budget
+PRIORITY_NAMES = {CRITICAL: "critical", NORMAL: "normal", DEFERRABLE: "deferrable"}
+
+MAX_NORMAL_DEFER_TICKS = 12   # a NORMAL job runs regardless after waiting this long
+TICK_BUDGET_FRACTION = 0.8    # share of the tick interval available for work
+MAX_CATCHUP_TICKS = 3         # lateness (in intervals) beyond which the cadence re-anchors
+
+
+class PeriodicJob:
+    """A registered job and its runtime statistics (milliseconds)."""
+
+    def __init__(self, name: str, period: int, fn: Callable, cost_hint: float,
+                 priority: int = NORMAL, local: bool = False):
+        self.name = name
+        self.period = max(1, int(period))
+        self.fn = fn
+        self.cost_hint = cost_hint
+        self.priority = priority
+        self.local = local
+        self.phase = 0
+        self.runs = 0
+        self.errors = 0
+        self.deferrals = 0   # ticks spent waiting in the backlog
+        self.coalesced = 0   # due runs folded into a run that was still waiting
+        self.avg_ms: Optional[float] = None
+        self.max_ms = 0.0
+        self.last_tick: Optional[int] = None
+
+    @property
+    def cost(self) -> float:
+        """Expected ms per run: observed average once the job has run, else the hint."""
+        return self.avg_ms if self.avg_ms is not None else self.cost_hint
+
+    def is_due(self, tick: int) -> bool:
+        return (tick - self.phase) % self.period == 0
+
+    @property
+    def max_defer(self) -> int:
+        """Ticks this job may wait before it runs regardless of budget."""
+        if self.priority == CRITICAL:
+            return 0
+        if self.priority == NORMAL:
+            return MAX_NORMAL_DEFER_TICKS
+        return max(self.period, MAX_NORMAL_DEFER_TICKS)
+
+    def record(self, elapsed_ms: float):
+        self.runs += 1
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if self.avg_ms is None:
+            self.avg_ms = elapsed_ms
+        else:
+            self.avg_ms += RUNTIME_EMA_ALPHA * (elapsed_ms - self.avg_ms)
+
+    def slots(self, phase: int) -> List[int]:
+        """Ticks within the horizon (mod PLACEMENT_HORIZON) this job runs on for a phase."""
+        if self.period >= PLACEMENT_HORIZON:
+            return [phase % PLACEMENT_HORIZON]
+        return sorted({(phase + k * self.period) % PLACEMENT_HORIZON
+                       for k in range(-(-PLACEMENT_HORIZON // self.period))})
+
+    def slot_weight(self) -> float:
+        """Expected ms this job adds to each of its slots per horizon."""
+        if self.period >= PLACEMENT_HORIZON:
+            return self.cost * PLACEMENT_HORIZON / self.period
+        return self.cost
+
+
+class JobScheduler:
+    """Phase-staggered periodic jobs keyed by name."""
+
+    def __init__(self):
+        self.jobs: Dict[str, PeriodicJob] = {}
+        self._load = [0.0] * PLACEMENT_HORIZON  # expected ms per horizon slot
+        self._histogram = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        self._backlog: Dict[str, int] = {}  # job name -> tick it became due
+        self.deferrals = 0
+        self._lock = threading.Lock()
+
+    # ----- placement -----
+
+    def _place(self, job: PeriodicJob):
+        """Pick the phase that keeps the busiest slot (then total overlap) lowest."""
+        weight = job.slot_weight()
+        best_phase, best_score = 0, None
+        for phase in range(min(job.period, PLACEMENT_HORIZON)):
+            loads = [self._load[slot] for slot in job.slots(phase)]
+            score = (max(loads) + weight, sum(loads))
+            if best_score is None or score < best_score:
+                best_phase, best_score = phase, score
+        job.phase = best_phase
+        for slot in job.slots(best_phase):
+            self._load[slot] += weight
+
+    def _unplace(self, job: PeriodicJob):
+        weight = job.slot_weight()
+        for slot in job.slots(job.phase):
+            self._load[slot] = max(0.0, self._load[slot] - weight)
+
+    def every(self, name: str, period: int, fn: Callable, cost: float = 1.0,
+              priority: int = NORMAL, local: bool = False) -> PeriodicJob:
+        """
+        Register (or replace) a job that runs once every `period` ticks.
+
+        Args:
+            name: Unique job name, conventionally "module.job"
+            period: Ticks between runs
+            fn: Callable taking no arguments (may be async)
+            cost: Expected milliseconds per run, used until the job has been timed
+            priority: CRITICAL, NORMAL or DEFERRABLE
+            local: refreshes in-process state only; also run by follower processes
+        """
+        with self._lock:
+            old = self.jobs.pop(name, None)
+            if old is not None:
+                self._unplace(old)
+            job = PeriodicJob(name, period, fn, cost, priority, local)
+            self._place(job)
+            self.jobs[name] = job
+        return job
+
+    def cancel(self, name: str):
+        with self._lock:
+            job = self.jobs.pop(name, None)
+            self._backlog.pop(name, None)
+            if job is not None:
+                self._unplace(job)
+
+    def rebalance(self):
+        """Re-place every job from scratch using observed runtimes, heaviest first."""
+        with self._lock:
+            self._load = [0.0] * PLACEMENT_HORIZON
+            for job in sorted(self.jobs.values(), key=lambda j: (-j.slot_weight(), j.name)):
+                self._place(job)
+
+    # ----- execution -----
+
+    def due(self, tick: int) -> List[PeriodicJob]:
+        with self._lock:
+            return [job for job in self.jobs.values() if job.is_due(tick)]
+
+    def _pending(self, tick: int) -> List[Tuple[PeriodicJob, int]]:
+        """Backlog plus newly due jobs as (job, due_since), in run order."""
+        with self._lock:
+            for job in self.jobs.values():
+                if not job.is_due(tick):
+                    continue
+                if job.name in self._backlog:
+                    job.coalesced += 1
+                else:
+                    self._backlog[job.name] = tick
+            pending = [(self.jobs[name], since) for name, since in self._backlog.items() if name in self.jobs]
+        pending.sort(key=lambda item: (item[0].priority, item[1], item[0].phase))
+        return pending
+
+    async def run_job(self, job: PeriodicJob, tick: int) -> float:
+        """Run one job, record its runtime and return it (ms)."""
+        start = time.perf_counter()
+        try:
+            result = job.fn()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            job.errors += 1
+            print(f"[Scheduler] {job.name} failed at tick {tick}: {e}")
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        job.record(elapsed_ms)
+        job.last_tick = tick
+        return elapsed_ms
+
+    def record_tick(self, elapsed_ms: float):
+        for i, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self._histogram[i] += 1
+                return
+        self._histogram[-1] += 1
+
+    async def run_due(self, tick: int, budget_ms: Optional[float] = None) -> float:
+        """
+        Run the jobs due this tick (and any backlog) within budget_ms.
+        With no budget every pending job runs. Returns total job time (ms).
+        """
+        total_ms = 0.0
+        deferred = 0
+        for job, since in self._pending(tick):
+            if budget_ms is not None and tick - since < job.max_defer:
+                remaining = budget_ms - total_ms
+                if remaining <= 0 or (job.priority == DEFERRABLE and job.cost > remaining):
+                    job.deferrals += 1
+                    deferred += 1
+                    continue
+            with self._lock:
+                self._backlog.pop(job.name, None)
+            total_ms += await self.run_job(job, tick)
+        self.deferrals += deferred
+        self.record_tick(total_ms)
+        if tick % REBALANCE_INTERVAL == 0 and self.jobs:
+            self.rebalance()
+            self.log_stats()
+        return total_ms
+
+    # ----- reporting -----
+
+    def load_profile(self) -> Dict[str, float]:
+        """Peak and mean expected ms per tick over the horizon (flat when peak ~ mean)."""
+        with self._lock:
+            peak = max(self._load)
+            mean = sum(self._load) / PLACEMENT_HORIZON
+        return {"peak_ms": peak, "mean_ms": mean, "peak_to_mean": (peak / mean) if mean else 0.0}
+
+    def histogram(self) -> Dict[str, int]:
+        labels = [f"<={bound}ms" for bound in HISTOGRAM_BUCKETS_MS] + [f">{HISTOGRAM_BUCKETS_MS[-1]}ms"]
+        return dict(zip(labels, self._histogram))
+
+    async def run_local(self, tick: int) -> float:
+        """Run only the local (cache) jobs due this tick, in a follower process."""
+        total_ms = 0.0
+        for job in self.due(tick):
+            if job.local:
+                total_ms += await self.run_job(job, tick)
+        return total_ms
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            jobs = [{
+                "name": job.name,
+                "period": job.period,
+                "phase": job.phase,
+                "priority": PRIORITY_NAMES.get(job.priority, str(job.priority)),
+                "local": job.local,
+                "cost_hint_ms": job.cost_hint,
+                "avg_ms": job.avg_ms,
+                "max_ms": job.max_ms,
+                "runs": job.runs,
+                "errors": job.errors,
+                "deferrals": job.deferrals,
+                "coalesced": job.coalesced,
+                "last_tick": job.last_tick
+            } for job in sorted(self.jobs.values(), key=lambda j: j.name)]
+            backlog = len(self._backlog)
+        return {
+            "jobs": jobs,
+            "load": self.load_profile(),
+            "tick_histogram": self.histogram(),
+            "deferrals": self.deferrals,
+            "backlog": backlog
+        }
+
+    def log_stats(self):
+        profile = self.load_profile()
+        print(f"[Scheduler] {len(self.jobs)} jobs | expected load peak {profile['peak_ms']:.1f}ms, "
+              f"mean {profile['mean_ms']:.2f}ms per tick")
+        print(f"[Scheduler] Tick job time histogram: {self.histogram()}")
+        print(f"[Scheduler] Deferrals: {self.deferrals} total, {len(self._backlog)} job(s) waiting")
+
+
+# ==========================
+# TICK CADENCE
+# ==========================
+class TickPacer:
+    """
+    Fixed-cadence tick timing and per-tick budget accounting.
+
+    Tick n is due at anchor + n * interval. The sleep after a tick is the time
+    left until the next one is due, so a slow tick shortens the following
+    sleep instead of pushing every later tick back. A tick that starts late
+    runs without sleeping to catch up. After falling more than
+    MAX_CATCHUP_TICKS intervals behind, the pacer re-anchors and the lost
+    time is counted as drift.
+    """
+
+    def __init__(self, interval: float, budget_fraction: float = TICK_BUDGET_FRACTION):
+        self.interval = interval
+        self.budget = interval * budget_fraction
+        self._anchor: Optional[float] = None
+        self._index = 0
+        self._tick_start = 0.0
+        self.ticks = 0
+        self.overruns = 0          # ticks whose work exceeded the budget
+        self.late_ticks = 0        # ticks that started after their due time
+        self.reanchors = 0
+        self.lag = 0.0             # how late the current tick started (s)
+        self.max_lag = 0.0
+        self.drift = 0.0           # cadence time given up by re-anchoring (s)
+        self.work_total = 0.0
+        self.work_max = 0.0
+        self.last_utilization = 0.0
+
+    def start_tick(self):
+        now = time.perf_counter()
+        if self._anchor is None:
+            self._anchor, self._index = now, 0
+        self._tick_start = now
+        self.lag = max(0.0, now - (self._anchor + self._index * self.interval))
+        self.max_lag = max(self.max_lag, self.lag)
+        if self.lag > 0.001:
+            self.late_ticks += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._tick_start
+
+    def remaining_ms(self) -> float:
+        """Budget left in the current tick (ms, may be negative)."""
+        return (self.budget - self.elapsed()) * 1000
+
+    def finish_tick(self) -> float:
+        """Record the tick's work and return how long to sleep before the next one."""
+        work = self.elapsed()
+        self.ticks += 1
+        self.work_total += work
+        self.work_max = max(self.work_max, work)
+        self.last_utilization = work / self.budget if self.budget else 0.0
+        if work > self.budget:
+            self.overruns += 1
+
+        self._index += 1
+        now = time.perf_counter()
+        sleep = self._anchor + self._index * self.interval - now
+        if sleep < -MAX_CATCHUP_TICKS * self.interval:
+            # Too far behind to catch up; accept the loss and restart the cadence
+            self.drift += -sleep
+            self.reanchors += 1
+            self._anchor, self._index = now, 0
+            return 0.0
+        return max(0.0, sleep)
+
+    def get_metrics(self) -> dict:
+        ticks = self.ticks or 1
+        return {
+            "interval_s": self.interval,
+            "budget_s": self.budget,
+            "ticks": self.ticks,
+            "avg_utilization": (self.work_total / ticks) / self.budget if self.budget else 0.0,
+            "last_utilization": self.last_utilization,
+            "max_work_s": self.work_max,
+            "overruns": self.overruns,
+            "late_ticks": self.late_ticks,
+            "lag_s": self.lag,
+            "max_lag_s": self.max_lag,
+            "drift_s": self.drift,
+            "reanchors": self.reanchors
+        }
+
+    def log_metrics(self):
+        m = self.get_metrics()
+        print(f"[Scheduler] Tick budget {m['budget_s']:.2f}s: avg {m['avg_utilization'] * 100:.1f}% used, "
+              f"max work {m['max_work_s']:.2f}s, {m['overruns']} overrun(s), {m['late_ticks']} late tick(s), "
+              f"drift {m['drift_s']:.1f}s ({m['reanchors']} re-anchor(s))")
+
+
+# ==========================
+# MODULE-LEVEL SCHEDULER
+# ==========================
+jobs = JobScheduler()
+
+
+pacer: Optional[TickPacer] = None
+
+
+def every(name: str, period: int, fn: Callable, cost: float = 1.0,
+          priority: int = NORMAL, local: bool = False) -> PeriodicJob:
+    """Register a periodic job on the shared scheduler (see JobScheduler.every)."""
+    return jobs.every(name, period, fn, cost, priority, local)
+
+
+def start_pacer(interval: float) -> TickPacer:
+    """Create the tick pacer used by app.tick_loop."""
+    global pacer
+    pacer = TickPacer(interval)
+    return pacer
+
+
+def cancel(name: str):
+    jobs.cancel(name)
+
+
+async def run_due(current_tick: int, budget_ms: Optional[float] = None) -> float:
+    return await jobs.run_due(current_tick, budget_ms)
+
+
+async def run_local(current_tick: int) -> float:
+    return await jobs.run_local(current_tick)
+
+
+def get_stats() -> dict:
+    stats = jobs.get_stats()
+    if pacer is not None:
+        stats["tick"] = pacer.get_metrics()
+    return stats
+
+
+def log_metrics():
+    """Hourly budget/deferral/drift report (registered as a deferrable job)."""
+    if pacer is not None:
+        pacer.log_metrics()
+    print(f"[Scheduler] Deferrals: {jobs.deferrals} total")
+
+
+__all__ = [
+    'PeriodicJob',
+    'JobScheduler',
+    'TickPacer',
+    'jobs',
+    'pacer',
+    'every',
+    'cancel',
+    'run_due',
+    'run_local',
+    'start_pacer',
+    'get_stats',
+    'log_metrics',
+    'CRITICAL',
+    'NORMAL',
+    'DEFERRABLE',
+    'PLACEMENT_HORIZON',
+    'REBALANCE_INTERVAL'
+]
@@ -0,0 +1,523 @@
+"""
+simulate.py
+
+Headless accelerated simulation for load and soak testing.
+Handles:
+- Loading and initializing the same modules as app.py against a scratch database
+- Driving ticks as fast as possible or at a chosen speed-up
+- Scripted bot players that trade items, start businesses, list companies,
+  trade shares and chat
+- Per-module tick time and SQL statement counts (module ticks, scheduled jobs
+  and each bot action are measured separately)
+- Database growth per simulated day (file size and rows per table)
+
+Run from the repository root:
+    python simulate.py --days 2 --bots 100            # as fast as possible
+    python simulate.py --days 1 --speed 20 --bots 25  # 20x real time
+
+The scratch database (./sim_scratch.db by default) is recreated on every run
+unless --keep is given. Only databases the runner created (marked by a
+<db>.simulate file) are deleted or reused; wadsworth.db and any other
+existing file are refused unless --force is given. A simulated day is
+--ticks-per-day ticks, by default one real day at TICK_INTERVAL.
+
+Module tick handlers receive a simulated `now` (TICK_INTERVAL seconds per
+tick), so time-keyed deadlines keep pace with the accelerated clock. Code that
+reads datetime.utcnow() directly (session expiry, some timestamps) still sees
+wall-clock time.
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import random
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+DEFAULT_DB_PATH = "./sim_scratch.db"
+LIVE_DB_PATH = "./wadsworth.db"          # db_schema's default; never touched without --force
+SCRATCH_MARKER_SUFFIX = ".simulate"      # sidecar file marking a database as the runner's
+BOT_PREFIX = "SimBot"
+BOT_PASSWORD = "simulation-bot"
+COMPANY_REFRESH_TICKS = 60   # ticks between reloads of the listed-company list
+TOP_TABLES = 10              # tables shown in the growth report
+
+# Relative weights of bot actions
+BOT_ACTIONS = {
+    "trade_items": 5.0,
+    "trade_shares": 3.0,
+    "chat": 2.0,
+    "start_business": 1.0,
+    "list_company": 0.2,
+}
+
+CHAT_LINES = [
+    "anyone selling water?", "buying paper in bulk", "prices look high today",
+    "new farm up and running", "who runs the land bank anyway", "gm all",
+]
+
+# ==========================
+# PROFILING
+# ==========================
+class Profiler:
+    """Wall time, call counts and SQL statements per named phase."""
+
+    def __init__(self):
+        self.current = "idle"
+        self.time = defaultdict(float)
+        self.max_time = defaultdict(float)
+        self.calls = defaultdict(int)
+        self.sql = defaultdict(int)
+
+    def attach(self, engines):
+        from sqlalchemy import event
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._on_sql)
+
+    def _on_sql(self, conn, cursor, statement, parameters, context, executemany):
+        self.sql[self.current] += 1
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        previous, self.current = self.current, name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.time[name] += elapsed
+            self.max_time[name] = max(self.max_time[name], elapsed)
+            self.calls[name] += 1
+            self.current = previous
+
+    def snapshot(self) -> Dict[str, dict]:
+        names = set(self.time) | set(self.sql)
+        return {
+            name: {
+                "calls": self.calls.get(name, 0),
+                "total_s": self.time.get(name, 0.0),
+                "max_ms": self.max_time.get(name, 0.0) * 1000,
+                "sql": self.sql.get(name, 0),
+            }
+            for name in names
+        }
+
+    def reset(self):
+        self.time.clear()
+        self.max_time.clear()
+        self.calls.clear()
+        self.sql.clear()
+
+
+def find_engines() -> list:
+    """Every module engine loaded from this repository (one per module)."""
+    from sqlalchemy.engine import Engine
+    root = os.path.dirname(os.path.abspath(__file__))
+    engines, seen = [], set()
+    for module in list(sys.modules.values()):
+        path = getattr(module, "__file__", None) or ""
+        engine = getattr(module, "engine", None)
+        if isinstance(engine, Engine) and os.path.abspath(path).startswith(root) and id(engine) not in seen:
+            seen.add(id(engine))
+            engines.append(engine)
+    return engines
+
+# ==========================
+# DATABASE GROWTH
+# ==========================
+def db_stats(db_path: str) -> dict:
+    """File size (including WAL) and row count per table, read with sqlite3 directly."""
+    size = sum(os.path.getsize(p) for p in (db_path, db_path + "-wal") if os.path.exists(p))
+    rows = {}
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        tables = [r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+        )]
+        for table in tables:
+            rows[table] = conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+    finally:
+        conn.close()
+    return {"bytes": size, "rows": rows}
+
+
+def growth(before: dict, after: dict) -> dict:
+    row_delta = {
+        table: after["rows"].get(table, 0) - before["rows"].get(table, 0)
+        for table in set(before["rows"]) | set(after["rows"])
+    }
+    return {
+        "bytes": after["bytes"] - before["bytes"],
+        "rows": {t: d for t, d in sorted(row_delta.items(), key=lambda kv: -kv[1]) if d}
+    }
+
+# ==========================
+# BOTS
+# ==========================
+class Bot:
+    """A scripted player. Each action returns True if the game accepted it."""
+
+    def __init__(self, index: int, player_id: int, name: str, rng: random.Random):
+        self.index = index
+        self.player_id = player_id
+        self.name = name
+        self.rng = rng
+        self.company_id: Optional[int] = None
+
+    def ticker(self) -> str:
+        letters, n = "", self.index
+        while True:
+            n, r = divmod(n, 26)
+            letters = chr(ord("A") + r) + letters
+            if n == 0:
+                break
+        return ("SB" + letters)[:5]
+
+    def trade_items(self, world: "World") -> bool:
+        import market
+        item = self.rng.choice(world.items)
+        price = market.get_market_price(item) or world.rng.uniform(1.0, 50.0)
+        side = self.rng.choice([market.OrderType.BUY, market.OrderType.SELL])
+        order = market.create_order(
+            self.player_id, side, market.OrderMode.LIMIT, item,
+            float(self.rng.randint(1, 20)), round(price * self.rng.uniform(0.9, 1.1), 2)
+        )
+        return order is not None
+
+    def start_business(self, world: "World") -> bool:
+        import business
+        import land
+        vacant = land.get_vacant_land(self.player_id)
+        if not vacant:
+            return False
+        plot = self.rng.choice(vacant)
+        types = [key for key in business.BUSINESS_TYPES if land.plot_is_compatible(plot, key)]
+        if not types:
+            return False
+        return business.create_business(self.player_id, plot.id, self.rng.choice(types)) is not None
+
+    def list_company(self, world: "World") -> bool:
+        if self.company_id is not None:
+            return False
+        from banks import brokerage_firm as firm
+        config = firm.IPO_CONFIG[firm.IPOType.DIRECT_LISTING]
+        total = 100000
+        offer = min(int(total * config["max_float_pct"]), max(config["min_shares"], total // 10))
+        company, error = firm.create_player_ipo(
+            self.player_id, f"{self.name} Holdings", self.ticker(),
+            firm.IPOType.DIRECT_LISTING, offer, total
+        )
+        if company is None:
+            return False
+        self.company_id = company.id
+        return True
+
+    def trade_shares(self, world: "World") -> bool:
+        from banks import brokerage_order_book as book
+        if not world.companies:
+            return False
+        company_id, price = self.rng.choice(world.companies)
+        price = round(max(0.01, (price or 1.0) * self.rng.uniform(0.95, 1.05)), 2)
+        quantity = self.rng.randint(1, 50)
+        if self.rng.random() < 0.5:
+            return book.player_place_buy_order(self.player_id, company_id, quantity, price)
+        return book.player_place_sell_order(self.player_id, company_id, quantity, price)
+
+    async def chat(self, world: "World") -> bool:
+        import chat
+        room = self.rng.choice(["global", "trade"])
+        saved = chat.save_message(room, self.player_id, self.name, self.rng.choice(CHAT_LINES))
+        if not saved:
+            return False
+        saved["type"] = "message"
+        await chat.broadcast_to_room(room, saved)
+        return True
+
+
+class World:
+    """Shared lookups for the bots (refreshed periodically, not per action)."""
+
+    def __init__(self, rng: random.Random):
+        import inventory
+        import market
+        self.rng = rng
+        self.items = list(inventory.ITEM_RECIPES.keys()) or list(market.STARTER_INVENTORY.keys())
+        self.companies = []
+
+    def refresh(self):
+        from banks import brokerage_firm as firm
+        db = firm.get_db()
+        try:
+            self.companies = [
+                (c.id, c.current_price) for c in db.query(firm.CompanyShares).filter(
+                    firm.CompanyShares.is_delisted == False
+                ).all()
+            ]
+        finally:
+            db.close()
+
+
+async def create_bots(count: int, rng: random.Random) -> List[Bot]:
+    """Create (or reuse, with --keep) bot player accounts."""
+    import auth
+    bots = []
+    db = auth.get_db()
+    try:
+        for i in range(count):
+            name = f"{BOT_PREFIX}{i:04d}"
+            player = db.query(auth.Player).filter(auth.Player.business_name == name).first()
+            if player is None:
+                player = await auth.create_player(db, name, BOT_PASSWORD)
+            if player is not None:
+                bots.append(Bot(i, player.id, name, random.Random(rng.random())))
+    finally:
+        db.close()
+    return bots
+
+
+async def run_bots(bots: List[Bot], world: World, activity: float, profiler: Profiler,
+                   results: Dict[str, Dict[str, int]]):
+    actions, weights = list(BOT_ACTIONS), list(BOT_ACTIONS.values())
+    for bot in bots:
+        if bot.rng.random() >= activity:
+            continue
+        action = bot.rng.choices(actions, weights)[0]
+        counts = results[action]
+        with profiler.phase(f"bot:{action}"):
+            try:
+                result = getattr(bot, action)(world)
+                if asyncio.iscoroutine(result):
+                    result = await result
+                counts["ok" if result else "rejected"] += 1
+            except Exception as e:
+                counts["error"] += 1
+                if counts["error"] <= 3:
+                    print(f"[Simulate] {action} failed for {bot.name}: {e}", file=sys.__stderr__)
+
+# ==========================
+# REPORTING
+# ==========================
+def print_report(title: str, phases: Dict[str, dict], ticks: int, db_growth: Optional[dict] = None,
+                 out=None):
+    out = out or sys.__stdout__
+    total = sum(p["total_s"] for p in phases.values()) or 1e-9
+    print(f"\n=== {title} ({ticks} ticks) ===", file=out)
+    print(f"{'phase':<28}{'calls':>9}{'total s':>10}{'share':>8}{'avg ms':>9}{'max ms':>9}{'sql':>10}{'sql/call':>10}",
+          file=out)
+    for name, p in sorted(phases.items(), key=lambda kv: -kv[1]["total_s"]):
+        calls = p["calls"] or 1
+        print(f"{name:<28}{p['calls']:>9}{p['total_s']:>10.2f}{p['total_s'] / total * 100:>7.1f}%"
+              f"{p['total_s'] / calls * 1000:>9.2f}{p['max_ms']:>9.1f}{p['sql']:>10}{p['sql'] / calls:>10.1f}",
+              file=out)
+    if db_growth is not None:
+        print(f"DB growth: {db_growth['bytes'] / 1024:,.0f} KiB", file=out)
+        for table, delta in list(db_growth["rows"].items())[:TOP_TABLES]:
+            print(f"  {table:<34}{delta:>+10}", file=out)
+
+
+def slowest_jobs(limit: int = 10) -> List[dict]:
+    import scheduler
+    jobs = scheduler.get_stats()["jobs"]
+    return sorted(jobs, key=lambda j: -(j["avg_ms"] or 0) * j["runs"])[:limit]
+
+# ==========================
+# RUNNER
+# ==========================
+def _module_output(verbose: bool, sink):
+    """Module log lines go to sink unless --verbose; reports use sys.__stdout__."""
+    return contextlib.nullcontext() if verbose else contextlib.redirect_stdout(sink)
+
+
+async def simulate(args) -> dict:
+    import app
+    import deadlines
+    import game_clock
+    import scheduler
+
+    rng = random.Random(args.seed)
+    profiler = Profiler()
+    quiet = open(os.devnull, "w")
+    tick = game_clock.load_tick()
+    game_clock.set_current(tick)
+    with _module_output(args.verbose, quiet):
+        app.load_modules()
+        app.initialize_modules()
+        scheduler.every("deadlines.resync", deadlines.RESYNC_INTERVAL, deadlines.resync_all, cost=50.0)
+        scheduler.jobs.rebalance()
+        profiler.attach(find_engines())
+        with profiler.phase("setup:bots"):
+            bots = await create_bots(args.bots, rng)
+    world = World(rng)
+    world.refresh()
+    print(f"[Simulate] {len(app.modules)} modules, {len(bots)} bots, database {args.db}", file=sys.__stdout__)
+
+    start_tick = tick
+    sim_start = datetime.utcnow()
+    pacer = scheduler.TickPacer(app.TICK_INTERVAL / args.speed) if args.speed > 0 else None
+    results = defaultdict(lambda: defaultdict(int))
+    days = []
+    day_start_db = db_stats(args.db)
+    day_start_tick = tick
+    profiler.reset()
+    cumulative = defaultdict(lambda: {"calls": 0, "total_s": 0.0, "max_ms": 0.0, "sql": 0})
+    wall_start = time.perf_counter()
+
+    def close_day():
+        nonlocal day_start_db, day_start_tick
+        phases = profiler.snapshot()
+        for name, p in phases.items():
+            c = cumulative[name]
+            c["calls"] += p["calls"]
+            c["total_s"] += p["total_s"]
+            c["sql"] += p["sql"]
+            c["max_ms"] = max(c["max_ms"], p["max_ms"])
+        now_db = db_stats(args.db)
+        day = {
+            "day": len(days) + 1,
+            "ticks": tick - day_start_tick,
+            "phases": phases,
+            "db_bytes": now_db["bytes"],
+            "growth": growth(day_start_db, now_db),
+        }
+        days.append(day)
+        print_report(f"Day {day['day']}", phases, day["ticks"], day["growth"])
+        profiler.reset()
+        day_start_db, day_start_tick = now_db, tick
+
+    with _module_output(args.verbose, quiet):
+        for _ in range(args.days * args.ticks_per_day):
+            if pacer is not None:
+                pacer.start_tick()
+            tick += 1
+            app.current_tick = tick
+            game_clock.set_current(tick)
+            now = sim_start + timedelta(seconds=(tick - start_tick) * app.TICK_INTERVAL)
+
+            await app.tick_modules(tick, now, profiler.phase)
+            if tick % game_clock.SAVE_INTERVAL == 0:
+                game_clock.save_tick(tick)
+            with profiler.phase("scheduler"):
+                await scheduler.run_due(tick, budget_ms=pacer.remaining_ms() if pacer else None)
+
+            if tick % COMPANY_REFRESH_TICKS == 1:
+                world.refresh()
+            await run_bots(bots, world, args.activity, profiler, results)
+
+            if pacer is not None:
+                await asyncio.sleep(pacer.finish_tick())
+            if (tick - start_tick) % args.ticks_per_day == 0:
+                close_day()
+        game_clock.save_tick(tick)
+    if tick != day_start_tick:
+        close_day()
+    quiet.close()
+
+    wall = time.perf_counter() - wall_start
+    simulated = (tick - start_tick) * app.TICK_INTERVAL
+    print_report("Total", dict(cumulative), tick - start_tick)
+    print(f"\nSimulated {timedelta(seconds=simulated)} in {wall:.1f}s "
+          f"({simulated / wall if wall else 0:.1f}x real time, {(tick - start_tick) / wall if wall else 0:.1f} ticks/s)",
+          file=sys.__stdout__)
+    print("Bot actions: " + ", ".join(
+        f"{a} {dict(c)}" for a, c in sorted(results.items())), file=sys.__stdout__)
+    print("Slowest scheduled jobs (total ms): " + ", ".join(
+        f"{j['name']} {(j['avg_ms'] or 0) * j['runs']:.0f}" for j in slowest_jobs()), file=sys.__stdout__)
+    if pacer is not None:
+        pacer.log_metrics()
+
+    return {
+        "ticks": tick - start_tick,
+        "wall_s": wall,
+        "bots": len(bots),
+        "days": days,
+        "total": dict(cumulative),
+        "bot_actions": {a: dict(c) for a, c in results.items()},
+        "jobs": scheduler.get_stats()["jobs"],
+        "tick": pacer.get_metrics() if pacer else None,
+    }
+
+
+def _live_database_paths() -> set:
+    """
+    Absolute paths of the game's own database: the db_schema default and any
+    WADSWORTH_DATABASE_URL already set that is not a scratch database (read
+    without importing db_schema, which would fix DATABASE_URL too early).
+    """
+    paths = {os.path.abspath(LIVE_DB_PATH)}
+    url = os.environ.get("WADSWORTH_DATABASE_URL", "")
+    if url.startswith("sqlite:///"):
+        path = os.path.abspath(url[len("sqlite:///"):])
+        if not os.path.exists(path + SCRATCH_MARKER_SUFFIX):
+            paths.add(path)
+    return paths
+
+
+def prepare_database(db_path: str, keep: bool, force: bool = False):
+    """
+    Point every module at the scratch database (before any of them is imported).
+
+    The runner only deletes or reuses databases it created itself, marked by
+    a "<db>.simulate" file next to them. The live database and any other
+    existing file are refused unless force is set.
+
+    Raises:
+        ValueError: if db_path is the live database or an unmarked file
+    """
+    db_path = os.path.abspath(db_path)
+    marker = db_path + SCRATCH_MARKER_SUFFIX
+    if not force:
+        if db_path in _live_database_paths() or os.path.basename(db_path) == os.path.basename(LIVE_DB_PATH):
+            raise ValueError(f"{db_path} is the game database; pick another --db (or pass --force)")
+        if os.path.exists(db_path) and not os.path.exists(marker):
+            raise ValueError(f"{db_path} was not created by simulate.py; pick another --db (or pass --force)")
+    if not keep:
+        for path in (db_path, db_path + "-wal", db_path + "-shm", db_path + "-journal"):
+            if os.path.exists(path):
+                os.remove(path)
+    with open(marker, "w") as f:
+        f.write(f"Scratch database created by simulate.py at {datetime.utcnow().isoformat()}\n")
+    os.environ["WADSWORTH_DATABASE_URL"] = f"sqlite:///{db_path}"
+    # Keep clear of a live server's tick lock and IPC socket
+    os.environ["WADSWORTH_TICK_LOCK"] = db_path + ".tick.lock"
+    os.environ["WADSWORTH_IPC_SOCKET"] = db_path + ".ipc.sock"
+    return db_path
+
+
+__all__ = ['Profiler', 'Bot', 'World', 'simulate', 'prepare_database', 'db_stats']
+
+# ==========================
+# CLI INTERFACE
+# ==========================
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Headless accelerated simulation with scripted bots')
+    parser.add_argument('--days', type=int, default=1, help='Simulated days to run')
+    parser.add_argument('--ticks-per-day', type=int, default=17280, help='Ticks per simulated day')
+    parser.add_argument('--speed', type=float, default=0, help='Speed-up over real time (0 = as fast as possible)')
+    parser.add_argument('--bots', type=int, default=50, help='Number of bot players')
+    parser.add_argument('--activity', type=float, default=0.2, help='Chance each bot acts on a given tick')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for bot behaviour')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='Scratch database path')
+    parser.add_argument('--keep', action='store_true', help='Reuse the scratch database instead of recreating it')
+    parser.add_argument('--force', action='store_true',
+                        help='Allow a --db the runner did not create (it is deleted unless --keep)')
+    parser.add_argument('--json', help='Write the full report to this file')
+    parser.add_argument('--verbose', action='store_true', help='Show module log output')
+    args = parser.parse_args()
+
+    try:
+        args.db = prepare_database(args.db, args.keep, args.force)
+    except ValueError as e:
+        parser.error(str(e))
+    report = asyncio.run(simulate(args))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"Report written to {args.json}")
@@ -19,7 +19,7 @@ from sqlalchemy import create_engine, Column, String, Float, DateTime, Integer,
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-DATABASE_URL = "sqlite:///./wadsworth.db"
+from db_schema import DATABASE_URL
 
 engine = create_engine(
     DATABASE_URL,
@@ -1759,27 +1759,28 @@ def initialize():
     """Initialize stats module."""
     Base.metadata.create_all(bind=engine)
     print("[Stats] Database tables created")
+    
+    # Rankings every 10 minutes, price snapshots every hour (staggered)
+    import scheduler
+    scheduler.every("stats.rankings", 600, update_all_rankings, cost=50.0,
+                    priority=scheduler.DEFERRABLE)
+    scheduler.every("stats.price_snapshots", 3600, record_price_snapshots, cost=20.0,
+                    priority=scheduler.DEFERRABLE)
     print("[Stats] Analytics dashboard initialized")
 
 
-async def tick(current_tick: int, now: datetime):
-    """Stats tick handler."""
-    # Update rankings every 10 minutes
-    if current_tick % 600 == 0:
-        update_all_rankings()
-    
-    # Record price snapshots every hour
-    if current_tick % 3600 == 0:
-        try:
-            from inventory import ITEM_RECIPES
-            from market import get_market_price
-            
-            for item_type in ITEM_RECIPES.keys():
-                price = get_market_price(item_type)
-                if price:
-                    record_price_snapshot(item_type, price)
-        except:
-            pass
+def record_price_snapshots():
+    """Record the current market price of every craftable item."""
+    try:
+        from inventory import ITEM_RECIPES
+        from market import get_market_price
+        
+        for item_type in ITEM_RECIPES.keys():
+            price = get_market_price(item_type)
+            if price:
+                record_price_snapshot(item_type, price)
+    except:
+        pass
 
 
 # ==========================
@@ -1789,7 +1790,6 @@ async def tick(current_tick: int, now: datetime):
 __all__ = [
     "router",
     "initialize",
-    "tick",
     "log_transaction",
     "calculate_player_stats",
     "update_all_rankings",
@@ -0,0 +1,21 @@
+"""
+Shared test setup.
+
+Modules are imported from the repository root. Every module builds its engine
+from db_schema.DATABASE_URL at import time, so the URL (and the cluster lock
+and socket paths) are pointed at a scratch directory before anything is
+imported; the tests never touch wadsworth.db.
+"""
+
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+SCRATCH_DIR = tempfile.mkdtemp(prefix="wadsworth-tests-")
+os.environ["WADSWORTH_DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH_DIR, 'test.db')}"
+os.environ["WADSWORTH_TICK_LOCK"] = os.path.join(SCRATCH_DIR, "tick.lock")
+os.environ["WADSWORTH_IPC_SOCKET"] = os.path.join(SCRATCH_DIR, "ipc.sock")
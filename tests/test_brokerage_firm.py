@@ -0,0 +1,39 @@
+"""
+Tests for brokerage firm start-up: its periodic jobs are registered with the
+scheduler even when an optional module fails to initialize.
+"""
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+import scheduler
+from banks import brokerage_firm
+
+BROKERAGE_JOBS = {
+    "margin_calls", "margin_call_deadlines", "commodity_loan_due", "margin_interest",
+    "share_loan_interest", "can_operate", "corporate_actions", "log_status"
+}
+
+
+def registered_jobs():
+    prefix = f"{brokerage_firm.BANK_ID}."
+    return {name[len(prefix):] for name in scheduler.jobs.jobs if name.startswith(prefix)}
+
+
+def test_initialize_registers_the_brokerage_jobs():
+    brokerage_firm.initialize()
+    assert BROKERAGE_JOBS <= registered_jobs()
+
+
+def test_jobs_are_registered_when_corporate_actions_fail(monkeypatch):
+    import corporate_actions
+
+    def broken():
+        raise NameError("engine")
+
+    monkeypatch.setattr(corporate_actions, "initialize", broken)
+    for name in BROKERAGE_JOBS:
+        scheduler.cancel(f"{brokerage_firm.BANK_ID}.{name}")
+    brokerage_firm.initialize()
+    assert BROKERAGE_JOBS <= registered_jobs()
@@ -0,0 +1,116 @@
+"""
+Tests for business production wages: debited up front with guarded cash
+updates, skipped when the owner cannot pay and refunded when the cycle does
+not run.
+"""
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("fastapi")
+
+import auth
+import business
+import land
+
+WAGE = 10.0
+RICH, POOR = 1, 2
+
+
+@pytest.fixture
+def owners(monkeypatch):
+    """Two owners (10000 and 5 cash), each with one due business on a full-efficiency plot."""
+    for module in (auth, land, business):
+        module.Base.metadata.drop_all(bind=module.engine)
+        module.Base.metadata.create_all(bind=module.engine)
+    monkeypatch.setitem(business.BUSINESS_TYPES, "test_works",
+                        {"base_wage_cost": WAGE, "cycles_to_complete": 5})
+
+    db = business.SessionLocal()
+    try:
+        for player_id, cash in ((RICH, 10000.0), (POOR, 5.0)):
+            db.add(auth.Player(id=player_id, business_name=f"owner{player_id}",
+                               password_hash="x", cash_balance=cash))
+            db.add(land.LandPlot(id=player_id, owner_id=player_id, terrain_type="prairie",
+                                 monthly_tax=10.0, occupied_by_business_id=player_id))
+            db.add(business.Business(id=player_id, owner_id=player_id, land_plot_id=player_id,
+                                     business_type="test_works", next_due_tick=0))
+        db.commit()
+    finally:
+        db.close()
+
+    ran = []
+
+    def run_business(db, biz, config, wage_cost, current_tick, ledger):
+        ran.append((biz.owner_id, wage_cost))
+        return outcome["result"]()
+
+    outcome = {"result": lambda: True}
+    monkeypatch.setattr(business, "_run_business", run_business)
+    return ran, outcome
+
+
+def cash(player_id):
+    db = auth.get_db()
+    try:
+        return db.query(auth.Player.cash_balance).filter(auth.Player.id == player_id).scalar()
+    finally:
+        db.close()
+
+
+def run_tick():
+    db = business.SessionLocal()
+    try:
+        business.process_business_tick(db, 1)
+    finally:
+        db.close()
+
+
+def test_owner_short_of_cash_skips_the_cycle_without_overdrawing(owners):
+    ran, _ = owners
+    run_tick()
+    assert ran == [(RICH, WAGE)]
+    assert cash(RICH) == 10000.0 - WAGE
+    assert cash(POOR) == 5.0
+
+
+def test_wage_checked_against_the_committed_balance(owners):
+    ran, _ = owners
+    db = business.SessionLocal()
+    try:
+        db.query(auth.Player).filter(auth.Player.id == RICH).first()  # stale ORM copy
+        assert auth.adjust_cash(RICH, -9995.0)  # spent elsewhere
+        business.process_business_tick(db, 1)
+    finally:
+        db.close()
+    assert ran == []
+    assert cash(RICH) == 5.0
+
+
+def test_wage_refunded_when_no_line_runs(owners):
+    ran, outcome = owners
+    outcome["result"] = lambda: False
+    run_tick()
+    assert ran == [(RICH, WAGE)]
+    assert cash(RICH) == 10000.0
+
+
+def test_wage_refunded_when_the_cycle_fails(owners):
+    ran, outcome = owners
+
+    def fail():
+        raise RuntimeError("inventory unavailable")
+
+    outcome["result"] = fail
+    with pytest.raises(RuntimeError):
+        run_tick()
+    assert cash(RICH) == 10000.0
+
+
+def test_ledger_debits_are_guarded_unless_overdraft_is_allowed(owners):
+    ledger = auth.CashLedger()
+    ledger.debit(POOR, 4.0)
+    ledger.debit(POOR, 4.0)  # only 1.0 left after the first debit
+    ledger.debit(POOR, 4.0, allow_overdraft=True)
+    assert ledger.commit() == [True, False, True]
+    assert cash(POOR) == -3.0
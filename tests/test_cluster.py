@@ -0,0 +1,231 @@
+"""
+Tests for the cluster hub: a leader applying and relaying follower calls,
+leader_only calls staying with the leader, coalescing, received calls not
+being published again, and session revocation reaching every worker. Followers are raw socket clients (or, for the follower
+side, a raw hub) speaking the frame protocol, so one process plays every role.
+"""
+
+import asyncio
+import pickle
+from datetime import datetime, timedelta
+
+import pytest
+
+import cluster
+
+calls = []
+
+
+@cluster.replicated
+def record(value):
+    calls.append(("record", value))
+
+
+@cluster.replicated(coalesce=True)
+def invalidate(key):
+    calls.append(("invalidate", key))
+
+
+@cluster.replicated(leader_only=True)
+def leader_job(value):
+    calls.append(("leader_job", value))
+    return value
+
+
+RECORD = f"{record.__module__}.{record.__qualname__}"
+INVALIDATE = f"{invalidate.__module__}.{invalidate.__qualname__}"
+LEADER_JOB = f"{leader_job.__module__}.{leader_job.__qualname__}"
+
+
+@pytest.fixture(autouse=True)
+def fresh_cluster(tmp_path, monkeypatch):
+    """Private lock/socket paths and clean module state for every test."""
+    monkeypatch.setattr(cluster, "LOCK_PATH", str(tmp_path / "tick.lock"))
+    monkeypatch.setattr(cluster, "SOCKET_PATH", str(tmp_path / "ipc.sock"))
+    monkeypatch.setattr(cluster, "ROLE", "all")
+    monkeypatch.setattr(cluster, "FLUSH_INTERVAL", 3600)  # tests flush explicitly
+    for name, value in (("is_leader", False), ("_started", False), ("_lock_fd", None),
+                        ("_server", None), ("_upstream", None), ("_on_leader", None)):
+        monkeypatch.setattr(cluster, name, value)
+    for name, value in (("_peers", set()), ("_tasks", []), ("_outbox", []),
+                        ("_tick_hooks", []), ("stats", dict.fromkeys(cluster.stats, 0))):
+        monkeypatch.setattr(cluster, name, value)
+    calls.clear()
+
+
+def frame(batch):
+    payload = pickle.dumps(batch)
+    return cluster._HEADER.pack(len(payload)) + payload
+
+
+async def read_batch(reader, timeout=2.0):
+    (size,) = cluster._HEADER.unpack(await asyncio.wait_for(reader.readexactly(cluster._HEADER.size), timeout))
+    return pickle.loads(await asyncio.wait_for(reader.readexactly(size), timeout))
+
+
+async def wait_for(condition, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        if loop.time() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+async def noop():
+    pass
+
+# ==========================
+# ALONE
+# ==========================
+def test_calls_run_locally_when_not_started():
+    record(1)
+    assert leader_job(2) == 2
+    assert calls == [("record", 1), ("leader_job", 2)]
+    assert cluster._outbox == []
+
+# ==========================
+# LEADER
+# ==========================
+def test_leader_applies_follower_calls_and_relays_all_but_leader_only():
+    async def scenario():
+        await cluster.start(noop)
+        try:
+            assert cluster.is_leader
+            reader_a, writer_a = await asyncio.open_unix_connection(cluster.SOCKET_PATH)
+            reader_b, writer_b = await asyncio.open_unix_connection(cluster.SOCKET_PATH)
+            await wait_for(lambda: len(cluster._peers) == 2)
+
+            writer_a.write(frame([(RECORD, (1,), {}), (LEADER_JOB, (2,), {})]))
+            await writer_a.drain()
+
+            assert await read_batch(reader_b) == [(RECORD, (1,), {})]
+            assert calls == [("record", 1), ("leader_job", 2)]
+            assert cluster._outbox == []  # applied calls are not published again
+            with pytest.raises(asyncio.TimeoutError):
+                await read_batch(reader_a, timeout=0.2)  # never echoed to the sender
+
+            writer_a.close()
+            writer_b.close()
+        finally:
+            await cluster.stop()
+
+    asyncio.run(scenario())
+
+
+def test_leader_publishes_its_own_calls_coalesced():
+    async def scenario():
+        await cluster.start(noop)
+        try:
+            reader, writer = await asyncio.open_unix_connection(cluster.SOCKET_PATH)
+            await wait_for(lambda: len(cluster._peers) == 1)
+
+            record(1)
+            record(1)
+            invalidate("k")
+            invalidate("k")
+            invalidate("other")
+            assert leader_job(3) == 3  # runs here, never mirrored
+            await cluster.flush()
+
+            assert await read_batch(reader) == [
+                (RECORD, (1,), {}), (RECORD, (1,), {}),
+                (INVALIDATE, ("k",), {}), (INVALIDATE, ("other",), {})
+            ]
+            assert calls.count(("invalidate", "k")) == 2
+            writer.close()
+        finally:
+            await cluster.stop()
+
+    asyncio.run(scenario())
+
+
+def test_second_process_cannot_take_the_leader_lock():
+    assert cluster.acquire_leader_lock()
+    try:
+        fd = cluster._lock_fd
+        cluster._lock_fd = None  # look like another process
+        try:
+            assert not cluster.acquire_leader_lock()
+        finally:
+            cluster._lock_fd = fd
+    finally:
+        cluster.release_leader_lock()
+    assert cluster.acquire_leader_lock()
+    cluster.release_leader_lock()
+
+# ==========================
+# FOLLOWER
+# ==========================
+def test_follower_forwards_leader_only_calls_and_applies_received_ones(monkeypatch):
+    monkeypatch.setattr(cluster, "ROLE", "web")
+    ticks = []
+    cluster.on_tick(ticks.append)
+
+    async def scenario():
+        connected = asyncio.Queue()
+
+        async def hub(reader, writer):
+            await connected.put((reader, writer))
+
+        server = await asyncio.start_unix_server(hub, path=cluster.SOCKET_PATH)
+        try:
+            await cluster.start(noop)
+            reader, writer = await asyncio.wait_for(connected.get(), 2.0)
+            await wait_for(lambda: cluster._upstream is not None)
+            assert not cluster.is_leader
+
+            assert leader_job(5) is None  # belongs to the leader
+            record(6)
+            await cluster.flush()
+            assert await read_batch(reader) == [(LEADER_JOB, (5,), {}), (RECORD, (6,), {})]
+            assert calls == [("record", 6)]
+
+            writer.write(frame([(RECORD, (7,), {}), ("cluster.tick", (42,), {})]))
+            await writer.drain()
+            await wait_for(lambda: ticks == [42])
+            assert calls == [("record", 6), ("record", 7)]
+            assert cluster._outbox == []
+            writer.close()
+        finally:
+            await cluster.stop()
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(scenario())
+
+# ==========================
+# SESSION REVOCATION
+# ==========================
+def test_session_revocation_reaches_every_process():
+    pytest.importorskip("sqlalchemy")
+    pytest.importorskip("fastapi")
+    import auth
+
+    revoke = f"{auth.revoke_session.__module__}.{auth.revoke_session.__qualname__}"
+    cached = (1, datetime.utcnow() + timedelta(days=1), datetime.utcnow())
+
+    async def scenario():
+        await cluster.start(noop)
+        try:
+            reader, writer = await asyncio.open_unix_connection(cluster.SOCKET_PATH)
+            await wait_for(lambda: len(cluster._peers) == 1)
+
+            # A logout handled by another worker evicts the token here
+            auth.active_sessions.put("remote-token", cached)
+            writer.write(frame([(revoke, ("remote-token",), {})]))
+            await writer.drain()
+            await wait_for(lambda: auth.active_sessions.get("remote-token") is None)
+            assert cluster._outbox == []
+
+            # A logout handled here is sent to the other workers
+            auth.active_sessions.put("local-token", cached)
+            auth.revoke_session("local-token")
+            assert auth.active_sessions.get("local-token") is None
+            await cluster.flush()
+            assert await read_batch(reader) == [(revoke, ("local-token",), {})]
+            writer.close()
+        finally:
+            await cluster.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,192 @@
+"""
+Tests for the district market book index (ItemBook / BookIndex): cached best
+levels, the crossed set, and incremental tracking against a rebuild from the
+database.
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+import district_market as dm
+
+BUY, SELL = dm.OrderType.BUY, dm.OrderType.SELL
+ACTIVE, FILLED, CANCELLED = dm.OrderStatus.ACTIVE, dm.OrderStatus.FILLED, dm.OrderStatus.CANCELLED
+INF = float("inf")
+
+
+@pytest.fixture
+def db():
+    dm.Base.metadata.drop_all(bind=dm.engine)
+    dm.Base.metadata.create_all(bind=dm.engine)
+    session = dm.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def expected_best(orders, item_type):
+    """Brute-force (best_bid, best_ask) over {order_id: (item, side, price)}."""
+    bids = [INF if p is None else p for i, s, p in orders.values() if i == item_type and s == BUY]
+    asks = [-INF if p is None else p for i, s, p in orders.values() if i == item_type and s == SELL]
+    return (max(bids) if bids else None), (min(asks) if asks else None)
+
+# ==========================
+# ITEM BOOK
+# ==========================
+def test_item_book_best_levels_follow_adds_and_removes():
+    book = dm.ItemBook()
+    book.add(1, BUY, 10.0)
+    book.add(2, BUY, 12.0)
+    book.add(3, SELL, 15.0)
+    assert (book.best_bid(), book.best_ask()) == (12.0, 15.0)
+    assert not book.is_crossed()
+
+    book.remove(2)
+    assert book.best_bid() == 10.0
+    book.add(4, SELL, 9.0)
+    assert book.best_ask() == 9.0
+    assert book.is_crossed()
+    assert len(book) == 3
+
+
+def test_item_book_repricing_the_best_order_refreshes_the_cache():
+    book = dm.ItemBook()
+    book.add(1, BUY, 20.0)
+    book.add(2, BUY, 10.0)
+    assert book.best_bid() == 20.0
+    book.add(1, BUY, 5.0)
+    assert book.best_bid() == 10.0
+
+    book.add(3, SELL, 30.0)
+    assert book.best_ask() == 30.0
+    book.add(3, SELL, 40.0)
+    assert book.best_ask() == 40.0
+
+
+def test_item_book_market_orders_cross_any_limit():
+    book = dm.ItemBook()
+    book.add(1, SELL, 1000.0)
+    book.add(2, BUY, None)
+    assert book.best_bid() == INF
+    assert book.is_crossed()
+
+    book.remove(2)
+    book.add(3, SELL, None)
+    book.add(4, BUY, 1.0)
+    assert book.best_ask() == -INF
+    assert book.is_crossed()
+
+
+def test_item_book_duplicate_levels_survive_removing_one():
+    book = dm.ItemBook()
+    book.add(1, BUY, 10.0)
+    book.add(2, BUY, 10.0)
+    book.remove(1)
+    assert book.best_bid() == 10.0
+    book.remove(2)
+    assert book.best_bid() is None
+    assert len(book) == 0
+
+# ==========================
+# BOOK INDEX
+# ==========================
+def test_book_index_crossed_set_and_empty_books():
+    index = dm.BookIndex()
+    index.track(1, "iron", BUY, 100.0, ACTIVE)
+    index.track(2, "iron", SELL, 110.0, ACTIVE)
+    assert not index.is_crossed("iron")
+
+    index.track(3, "iron", SELL, 95.0, ACTIVE)
+    assert index.crossed_items() == ["iron"]
+    assert index.best_bid_ask("iron") == (100.0, 95.0)
+
+    index.track(3, "iron", SELL, 95.0, FILLED)
+    assert not index.is_crossed("iron")
+    assert index.best_bid_ask("iron") == (100.0, 110.0)
+
+    index.track(1, "iron", BUY, 100.0, CANCELLED)
+    index.track(2, "iron", SELL, 110.0, CANCELLED)
+    assert "iron" not in index.books
+    assert index.best_bid_ask("iron") == (None, None)
+
+
+def test_book_index_untracked_order_leaves_no_book():
+    index = dm.BookIndex()
+    index.track(7, "copper", BUY, 5.0, FILLED)
+    assert "copper" not in index.books
+    assert index.crossed_items() == []
+
+
+def test_book_index_matches_brute_force_under_random_updates():
+    rng = random.Random(7)
+    items = ["iron", "copper", "wheat"]
+    index = dm.BookIndex()
+    resting = {}
+    for _ in range(3000):
+        order_id = rng.randrange(60)
+        item_type = resting[order_id][0] if order_id in resting else rng.choice(items)
+        side = resting[order_id][1] if order_id in resting else rng.choice((BUY, SELL))
+        price = None if rng.random() < 0.05 else float(rng.randrange(90, 111))
+        status = rng.choice((ACTIVE, ACTIVE, dm.OrderStatus.PARTIALLY_FILLED, FILLED, CANCELLED))
+        index.track(order_id, item_type, side, price, status)
+        if status in dm.RESTING_STATUSES:
+            resting[order_id] = (item_type, side, price)
+        else:
+            resting.pop(order_id, None)
+
+        for item in items:
+            bid, ask = expected_best(resting, item)
+            assert index.best_bid_ask(item) == (bid, ask)
+            crossed = bid is not None and ask is not None and bid >= ask
+            assert index.is_crossed(item) == crossed
+            assert (item in index.books) == any(r[0] == item for r in resting.values())
+
+# ==========================
+# DATABASE
+# ==========================
+def add_order(db, side, item_type, price, status=ACTIVE, mode=dm.OrderMode.LIMIT):
+    order = dm.DistrictMarketOrder(
+        player_id=1, order_type=side, order_mode=mode, item_type=item_type,
+        price=price, quantity=10.0, status=status
+    )
+    db.add(order)
+    db.flush()
+    return order
+
+
+def test_rebuild_matches_incremental_tracking(db):
+    orders = [
+        add_order(db, BUY, "iron", 100.0),
+        add_order(db, SELL, "iron", 95.0),
+        add_order(db, BUY, "copper", 10.0, dm.OrderStatus.PARTIALLY_FILLED),
+        add_order(db, SELL, "copper", 12.0),
+        add_order(db, SELL, "wheat", None, mode=dm.OrderMode.MARKET),
+        add_order(db, BUY, "wheat", 3.0),
+        add_order(db, BUY, "coal", 50.0, FILLED),
+    ]
+    db.commit()
+
+    tracked = dm.BookIndex()
+    for o in orders:
+        tracked.track(o.id, o.item_type, o.order_type, o.price, o.status)
+    rebuilt = dm.BookIndex()
+    assert rebuilt.rebuild(db) == 6
+
+    assert rebuilt.crossed == tracked.crossed == {"iron", "wheat"}
+    assert set(rebuilt.books) == set(tracked.books) == {"iron", "copper", "wheat"}
+    for item_type in rebuilt.books:
+        assert rebuilt.best_bid_ask(item_type) == tracked.best_bid_ask(item_type)
+    assert {o.id for o in dm.load_resting_orders(db, "iron")} == {orders[0].id, orders[1].id}
+
+
+def test_track_orders_applies_to_the_module_index(monkeypatch):
+    index = dm.BookIndex()
+    monkeypatch.setattr(dm, "book_index", index)
+    dm.track_orders([(1, "iron", BUY, 100.0, ACTIVE), (2, "iron", SELL, 90.0, ACTIVE)])
+    assert index.crossed_items() == ["iron"]
+    dm.track_orders([(2, "iron", SELL, 90.0, FILLED)])
+    assert index.crossed_items() == []
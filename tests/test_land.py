@@ -0,0 +1,136 @@
+"""
+Tests for the occupied plot index (OccupiedPlotIndex): in-memory updates,
+commit/rollback staging through the LandPlot mapper events, and reloads after
+bulk UPDATEs.
+"""
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+import land
+
+# ==========================
+# INDEX
+# ==========================
+def test_apply_groups_occupied_plots_by_owner_and_terrain():
+    index = land.OccupiedPlotIndex()
+    index.apply(1, 10, "prairie", True)
+    index.apply(2, 10, "prairie", True)
+    index.apply(3, 10, "desert", True)
+    index.apply(4, 11, "desert", True)
+    index.apply(5, 10, "forest", False)  # vacant plots are not indexed
+
+    assert index.terrain_counts(10) == {"prairie": 2, "desert": 1}
+    assert index.plots(10, "prairie") == [1, 2]
+    assert index.slot(4) == (11, "desert")
+    assert index.slot(5) is None
+    assert index.terrain_counts(99) == {}
+    assert index.plots(99, "prairie") == []
+
+
+def test_apply_moves_vacates_and_deletes():
+    index = land.OccupiedPlotIndex()
+    index.apply(1, 10, "prairie", True)
+    index.apply(2, 10, "prairie", True)
+
+    index.apply(1, 11, "prairie", True)  # transferred
+    assert index.plots(10, "prairie") == [2]
+    assert index.plots(11, "prairie") == [1]
+
+    index.apply(2, 10, "prairie", False)  # business removed
+    assert index.terrain_counts(10) == {}
+    assert 10 not in index._by_owner
+
+    index.apply(1, None, None, False)  # plot deleted
+    assert index.slot(1) is None
+    assert index._by_owner == {}
+
+
+def test_apply_is_idempotent():
+    index = land.OccupiedPlotIndex()
+    for _ in range(3):
+        index.apply(1, 10, "prairie", True)
+    assert index.terrain_counts(10) == {"prairie": 1}
+
+# ==========================
+# DATABASE
+# ==========================
+@pytest.fixture
+def index(monkeypatch):
+    land.Base.metadata.drop_all(bind=land.engine)
+    land.Base.metadata.create_all(bind=land.engine)
+    fresh = land.OccupiedPlotIndex()
+    monkeypatch.setattr(land, "occupied_plots", fresh)
+    return fresh
+
+
+def add_plot(db, owner_id, terrain, business_id=None):
+    plot = land.LandPlot(owner_id=owner_id, terrain_type=terrain, monthly_tax=10.0,
+                         occupied_by_business_id=business_id)
+    db.add(plot)
+    return plot
+
+
+def test_committed_plot_writes_reach_the_index(index):
+    db = land.get_db()
+    try:
+        occupied = add_plot(db, 10, "prairie", business_id=1)
+        vacant = add_plot(db, 10, "desert")
+        db.commit()
+        assert index.plots(10, "prairie") == [occupied.id]
+        assert index.slot(vacant.id) is None
+
+        vacant.occupied_by_business_id = 2
+        occupied.owner_id = 11
+        db.commit()
+        assert index.terrain_counts(10) == {"desert": 1}
+        assert index.slot(occupied.id) == (11, "prairie")
+
+        db.delete(occupied)
+        db.commit()
+        assert index.terrain_counts(11) == {}
+    finally:
+        db.close()
+
+
+def test_rolled_back_plot_writes_never_reach_the_index(index):
+    db = land.get_db()
+    try:
+        plot = add_plot(db, 10, "prairie", business_id=1)
+        db.flush()
+        db.rollback()
+        assert index.terrain_counts(10) == {}
+
+        add_plot(db, 10, "desert", business_id=2)
+        db.commit()  # nothing left over from the rolled-back flush
+        assert index.terrain_counts(10) == {"desert": 1}
+    finally:
+        db.close()
+
+
+def test_reload_owner_and_rebuild_match_the_database(index):
+    db = land.get_db()
+    try:
+        plots = [add_plot(db, 10, "prairie", business_id=1),
+                 add_plot(db, 10, "desert", business_id=2),
+                 add_plot(db, 11, "desert", business_id=3)]
+        db.commit()
+
+        # Bulk UPDATE bypasses the mapper events
+        db.query(land.LandPlot).filter(land.LandPlot.id == plots[0].id).update(
+            {"occupied_by_business_id": None}, synchronize_session=False
+        )
+        db.commit()
+        assert index.terrain_counts(10) == {"prairie": 1, "desert": 1}
+
+        index.reload_owner(db, 10)
+        assert index.terrain_counts(10) == {"desert": 1}
+        assert index.terrain_counts(11) == {"desert": 1}
+
+        rebuilt = land.OccupiedPlotIndex()
+        assert rebuilt.rebuild(db) == 2
+        assert rebuilt._by_owner == index._by_owner
+        assert rebuilt._slot == index._slot
+    finally:
+        db.close()
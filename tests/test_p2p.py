@@ -0,0 +1,183 @@
+"""
+Tests for p2p listing bid books (ListingBids) and batched listing resolution
+(resolve_listings), including the per-listing retry after a failed batch.
+"""
+
+import random
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+import p2p
+
+# ==========================
+# LISTING BIDS
+# ==========================
+def brute_force_ranked(current, lower_wins):
+    """Ranked (bid_id, bidder_id, amount) from {bidder_id: (bid_id, amount)}."""
+    return sorted(
+        ((bid_id, bidder_id, amount) for bidder_id, (bid_id, amount) in current.items()),
+        key=lambda bid: (bid[2] if lower_wins else -bid[2], bid[0])
+    )
+
+
+def test_highest_bid_wins_and_ties_go_to_the_earlier_bid():
+    book = p2p.ListingBids(lower_wins=False)
+    book.put(1, 100, 50.0)
+    book.put(2, 101, 70.0)
+    book.put(3, 102, 70.0)
+    assert book.best() == 70.0
+    assert book.ranked() == [(2, 101, 70.0), (3, 102, 70.0), (1, 100, 50.0)]
+
+
+def test_lowest_bid_wins_when_lower_wins():
+    book = p2p.ListingBids(lower_wins=True)
+    book.put(1, 100, 50.0)
+    book.put(2, 101, 30.0)
+    assert book.best() == 30.0
+    assert book.ranked()[0] == (2, 101, 30.0)
+
+
+def test_superseded_bids_are_skipped():
+    book = p2p.ListingBids(lower_wins=False)
+    book.put(1, 100, 90.0)
+    book.put(2, 101, 60.0)
+    book.put(3, 100, 40.0)  # bidder 100 lowers their bid
+    assert book.best() == 60.0
+    assert book.bid_for(100) == (3, 40.0)
+    assert len(book) == 2
+    assert book.ranked() == [(2, 101, 60.0), (3, 100, 40.0)]
+
+
+def test_empty_book():
+    book = p2p.ListingBids(lower_wins=False)
+    assert book.best() is None
+    assert book.ranked() == []
+    assert book.bid_for(1) is None
+
+
+def test_heap_is_compacted_and_stays_consistent():
+    rng = random.Random(3)
+    for lower_wins in (False, True):
+        book = p2p.ListingBids(lower_wins)
+        current = {}
+        for bid_id in range(1, 2001):
+            bidder_id = rng.randrange(8)
+            amount = float(rng.randrange(1, 50))
+            book.put(bid_id, bidder_id, amount)
+            current[bidder_id] = (bid_id, amount)
+
+            assert len(book._heap) <= 2 * len(current) + 16
+            expected = brute_force_ranked(current, lower_wins)
+            assert book.ranked() == expected
+            assert book.best() == expected[0][2]
+            assert len(book) == len(current)
+
+# ==========================
+# RESOLVE LISTINGS
+# ==========================
+@pytest.fixture
+def market(monkeypatch):
+    """
+    Fresh p2p and player tables, cash transfers and transaction logs recorded
+    instead of applied, and the game clock at tick 1000.
+    """
+    pytest.importorskip("fastapi")
+    import auth
+    import stats_ux
+
+    for module in (p2p, auth):
+        module.Base.metadata.drop_all(bind=module.engine)
+        module.Base.metadata.create_all(bind=module.engine)
+    monkeypatch.setattr(p2p, "_listing_bids", {})
+
+    transfers = []
+    state = {"transfer_ok": True}
+
+    def transfer_cash(from_player_id, to_player_id, amount):
+        transfers.append((from_player_id, to_player_id, amount))
+        return state["transfer_ok"]
+
+    monkeypatch.setattr(auth, "transfer_cash", transfer_cash)
+    monkeypatch.setattr(stats_ux, "log_transaction", lambda **kwargs: None)
+    # resolve_listings only reads app.current_tick; the web app itself is not needed
+    monkeypatch.setitem(sys.modules, "app", types.SimpleNamespace(current_tick=1000))
+
+    db = auth.SessionLocal()
+    try:
+        for player_id in (1, 2, 3):
+            db.add(auth.Player(id=player_id, business_name=f"player{player_id}",
+                               password_hash="x", cash_balance=10000.0))
+        db.commit()
+    finally:
+        db.close()
+    return types.SimpleNamespace(transfers=transfers, state=state)
+
+
+def list_contract(delivery_interval="daily", listing_type="relist", bids=()):
+    """Insert a LISTED contract (lister 1) with active bids [(bidder_id, amount)]."""
+    db = p2p.get_db()
+    try:
+        contract = p2p.Contract(
+            creator_id=1, lister_id=1, status=p2p.ContractStatus.LISTED,
+            contract_mode="price_bid", delivery_interval=delivery_interval,
+            contract_length="extended", total_deliveries=30, listing_type=listing_type,
+            bid_end_tick=900, price_per_delivery=10.0
+        )
+        db.add(contract)
+        db.flush()
+        for bidder_id, amount in bids:
+            bid = p2p.ContractBid(contract_id=contract.id, bidder_id=bidder_id, bid_amount=amount)
+            db.add(bid)
+            db.flush()
+            p2p.record_listing_bid(contract.id, False, bid.id, bidder_id, amount)
+        db.commit()
+        return contract.id
+    finally:
+        db.close()
+
+
+def load(contract_id):
+    db = p2p.get_db()
+    try:
+        contract = db.query(p2p.Contract).filter(p2p.Contract.id == contract_id).first()
+        bids = {b.bidder_id: b.status for b in
+                db.query(p2p.ContractBid).filter(p2p.ContractBid.contract_id == contract_id)}
+        return contract.status, contract.holder_id, bids
+    finally:
+        db.close()
+
+
+def test_relist_winner_pays_once(market):
+    contract_id = list_contract(bids=[(2, 500.0), (3, 400.0)])
+
+    assert p2p.resolve_listings([contract_id]) == {contract_id: True}
+    assert market.transfers == [(2, 1, 500.0)]
+    assert load(contract_id) == (p2p.ContractStatus.ACTIVE, 2,
+                                 {2: p2p.BidStatus.WON, 3: p2p.BidStatus.LOST})
+
+
+def test_failed_batch_is_retried_without_charging_twice(market):
+    good = list_contract(bids=[(2, 500.0)])
+    bad = list_contract(delivery_interval="fortnightly", bids=[(3, 300.0)])
+
+    results = p2p.resolve_listings([good, bad])
+
+    # The batch rolled back on the bad listing; the retry resolved the good
+    # one alone and paid its winner exactly once.
+    assert results == {good: True, bad: None}
+    assert market.transfers == [(2, 1, 500.0)]
+    assert load(good)[:2] == (p2p.ContractStatus.ACTIVE, 2)
+    assert load(bad) == (p2p.ContractStatus.LISTED, None, {3: p2p.BidStatus.ACTIVE})
+
+
+def test_failed_payment_returns_the_contract_to_draft(market):
+    market.state["transfer_ok"] = False
+    contract_id = list_contract(bids=[(2, 500.0)])
+
+    assert p2p.resolve_listings([contract_id]) == {contract_id: False}
+    assert market.transfers == [(2, 1, 500.0)]
+    assert load(contract_id) == (p2p.ContractStatus.DRAFT, None, {2: p2p.BidStatus.LOST})
@@ -0,0 +1,53 @@
+"""
+Tests for rolling_stats persistence: the periodic flush job and batched
+writes of series marked dirty.
+"""
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+import rolling_stats
+import scheduler
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    rolling_stats.Base.metadata.drop_all(bind=rolling_stats.engine)
+    rolling_stats.initialize()
+    monkeypatch.setattr(rolling_stats, "series", {})
+    monkeypatch.setattr(rolling_stats, "dirty_keys", set())
+
+
+def test_initialize_registers_the_flush_job(registry):
+    job = scheduler.jobs.jobs["rolling_stats.flush"]
+    assert job.period == rolling_stats.FLUSH_INTERVAL
+    assert job.local
+
+
+def test_flush_writes_dirty_series_once(registry):
+    for key, price in (("a", 10.0), ("b", 20.0)):
+        stats = rolling_stats.get_series(key)
+        stats.push_price(price, None)
+        stats.push_price(price * 1.1, None)
+        rolling_stats.mark_dirty(key)
+
+    assert rolling_stats.flush_series() == 2
+    assert rolling_stats.dirty_keys == set()
+    assert rolling_stats.flush_series() == 0
+
+    restored = rolling_stats.load_series("b")
+    assert restored.last_value == pytest.approx(22.0)
+    assert restored.ewma == pytest.approx(0.1)
+
+
+def test_failed_flush_keeps_series_dirty(registry, monkeypatch):
+    rolling_stats.get_series("a").push(1.0)
+    rolling_stats.mark_dirty("a")
+
+    def broken(keys, db=None):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(rolling_stats, "save_many", broken)
+    assert rolling_stats.flush_series() == 0
+    assert rolling_stats.dirty_keys == {"a"}
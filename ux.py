@@ -17,6 +17,7 @@ from fastapi import APIRouter, Cookie, Form, Query
 from fastapi.responses import HTMLResponse, RedirectResponse
 from datetime import timedelta
 from datetime import datetime
+import scheduler
 
 router = APIRouter()
 
@@ -41,23 +42,7 @@ def shell(title: str, body: str, balance: float = 0.0, player_id: int = None) ->
         </a>
         '''
     
-    ticker_html = ""
-    try:
-        import market as market_mod
-        import inventory as inv_mod
-        
-        all_items = list(inv_mod.ITEM_RECIPES.keys()) if inv_mod.ITEM_RECIPES else list(market_mod.STARTER_INVENTORY.keys())
-        
-        ticker_items = []
-        for item in all_items:
-            price = market_mod.get_market_price(item)
-            if price:
-                ticker_items.append(f"{item.replace('_', ' ').upper()}: ${price:,.2f}")
-            else:
-                ticker_items.append(f"{item.replace('_', ' ').upper()}: N/A")
-        ticker_html = " | ".join(ticker_items) if ticker_items else "MARKET OPENING..."
-    except:
-        ticker_html = "MARKET FEED OFFLINE"
+    ticker_html = get_ticker_html()
     
     return f"""
     <!DOCTYPE html>
@@ -257,6 +242,56 @@ def shell(title: str, body: str, balance: float = 0.0, player_id: int = None) ->
     </html>
     """
 
+# ==========================
+# SHELL FRAGMENT CACHES
+# ==========================
+# The ticker is global and only changes with market activity, so it is
+# rebuilt by a deferrable scheduler job every TICKER_REFRESH_TICKS rather than
+# on page loads. Lien badges are per player and keyed on liens.version(),
+# which the lending modules bump on every lien write.
+
+TICKER_REFRESH_TICKS = 12
+LIEN_INFO_CACHE_SIZE = 10000  # cached lien badges (least recently used evicted first)
+_ticker_cache = {"tick": None, "html": ""}
+_lien_info_cache = None  # auth.LRUCache: player_id -> ((lien version, tick), info dict)
+
+
+def get_ticker_html() -> str:
+    """Market ticker text for the page footer (built on first use, then by the scheduler)."""
+    if _ticker_cache["tick"] is None:
+        return refresh_ticker()
+    return _ticker_cache["html"]
+
+
+def refresh_ticker() -> str:
+    """Rebuild the cached ticker text from current market prices."""
+    import game_clock
+    try:
+        import market as market_mod
+        import inventory as inv_mod
+        
+        all_items = list(inv_mod.ITEM_RECIPES.keys()) if inv_mod.ITEM_RECIPES else list(market_mod.STARTER_INVENTORY.keys())
+        prices = market_mod.get_market_prices(all_items)
+        
+        ticker_items = []
+        for item in all_items:
+            price = prices.get(item)
+            if price:
+                ticker_items.append(f"{item.replace('_', ' ').upper()}: ${price:,.2f}")
+            else:
+                ticker_items.append(f"{item.replace('_', ' ').upper()}: N/A")
+        ticker_html = " | ".join(ticker_items) if ticker_items else "MARKET OPENING..."
+    except:
+        ticker_html = "MARKET FEED OFFLINE"
+    
+    _ticker_cache["tick"] = game_clock.current()
+    _ticker_cache["html"] = ticker_html
+    return ticker_html
+
+
+scheduler.every("ux.ticker", TICKER_REFRESH_TICKS, refresh_ticker, cost=5.0,
+                priority=scheduler.DEFERRABLE, local=True)
+
 # ==========================
 # AUTHENTICATION HELPER
 # ==========================
@@ -265,9 +300,7 @@ def require_auth(session_token: Optional[str] = Cookie(None)):
     """Check if user is authenticated."""
     try:
         import auth
-        db = auth.get_db()
-        player = auth.get_player_from_session(db, session_token)
-        db.close()
+        player = auth.get_session_player(session_token)
         if not player:
             return RedirectResponse(url="/login", status_code=303)
         return player
@@ -281,6 +314,28 @@ def require_auth(session_token: Optional[str] = Cookie(None)):
 # This now includes brokerage firm liens in addition to bank liens
 
 def get_player_lien_info(player_id: int) -> dict:
+    """
+    Cached wrapper around _build_player_lien_info().
+    Rebuilt after one of the player's liens has been written, and once per
+    tick while interest accrues.
+    """
+    global _lien_info_cache
+    import liens as lien_registry
+    import game_clock
+    if _lien_info_cache is None:
+        from auth import LRUCache
+        _lien_info_cache = LRUCache(LIEN_INFO_CACHE_SIZE)
+    version = (lien_registry.version(player_id), game_clock.current())
+    cached = _lien_info_cache.get(player_id)
+    if cached and cached[0] == version:
+        return cached[1]
+    
+    info = _build_player_lien_info(player_id)
+    _lien_info_cache.put(player_id, (version, info))
+    return info
+
+
+def _build_player_lien_info(player_id: int) -> dict:
     """
     Get comprehensive lien information for display in the UI.
     Includes liens from:
@@ -302,118 +357,37 @@ def get_player_lien_info(player_id: int) -> dict:
         - sources: list of source names
     """
     try:
-        from sqlalchemy import create_engine
-        from sqlalchemy.orm import sessionmaker
-        from datetime import datetime
+        import liens as lien_registry
+        import game_clock
         
-        DATABASE_URL = "sqlite:///./wadsworth.db"
-        engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        now_tick = game_clock.current()
+        balances = [b for b in lien_registry.player_liens(player_id) if b.owed(now_tick) > 0]
         
-        all_liens = []
-        total_principal = 0.0
-        total_interest = 0.0
-        total_paid = 0.0
-        sources = []
-        
-        # Check Land Bank liens
-        try:
-            from banks.land_bank import BankLien as LandBankLien, LIEN_INTEREST_RATE as LB_RATE, LIEN_GARNISHMENT_PERCENTAGE as LB_GARNISH
-            db = SessionLocal()
-            try:
-                land_liens = db.query(LandBankLien).filter(LandBankLien.player_id == player_id).all()
-                for lien in land_liens:
-                    if lien.principal + lien.interest_accrued - lien.total_paid > 0:
-                        all_liens.append(("land_bank", lien, LB_RATE, LB_GARNISH))
-                        total_principal += lien.principal
-                        total_interest += lien.interest_accrued
-                        total_paid += lien.total_paid
-                        if "Land Bank" not in sources:
-                            sources.append("Land Bank")
-            finally:
-                db.close()
-        except Exception as e:
-            print(f"[UX] Land bank lien check error: {e}")
-        
-        # Check Apple Seeds ETF liens
-        try:
-            from banks.apple_seeds_etf import BankLien as ETFBankLien, LIEN_INTEREST_RATE as ETF_RATE, LIEN_GARNISHMENT_PERCENTAGE as ETF_GARNISH
-            db = SessionLocal()
-            try:
-                etf_liens = db.query(ETFBankLien).filter(ETFBankLien.player_id == player_id).all()
-                for lien in etf_liens:
-                    if lien.principal + lien.interest_accrued - lien.total_paid > 0:
-                        all_liens.append(("apple_seeds_etf", lien, ETF_RATE, ETF_GARNISH))
-                        total_principal += lien.principal
-                        total_interest += lien.interest_accrued
-                        total_paid += lien.total_paid
-                        if "Apple Seeds ETF" not in sources:
-                            sources.append("Apple Seeds ETF")
-            finally:
-                db.close()
-        except Exception as e:
-            print(f"[UX] ETF lien check error: {e}")
-        
-        # Check Energy ETF liens
-        try:
-            from banks.energy_etf import BankLien as EnergyBankLien, LIEN_INTEREST_RATE as EN_RATE, LIEN_GARNISHMENT_PERCENTAGE as EN_GARNISH
-            db = SessionLocal()
-            try:
-                energy_liens = db.query(EnergyBankLien).filter(EnergyBankLien.player_id == player_id).all()
-                for lien in energy_liens:
-                    if lien.principal + lien.interest_accrued - lien.total_paid > 0:
-                        all_liens.append(("energy_etf", lien, EN_RATE, EN_GARNISH))
-                        total_principal += lien.principal
-                        total_interest += lien.interest_accrued
-                        total_paid += lien.total_paid
-                        if "Energy ETF" not in sources:
-                            sources.append("Energy ETF")
-            finally:
-                db.close()
-        except Exception as e:
-            print(f"[UX] Energy ETF lien check error: {e}")
-        
-        # Check Brokerage Firm liens
-        try:
-            from banks.brokerage_firm import BrokerageLien, get_credit_interest_rate, get_db as get_firm_db
-            db = get_firm_db()
-            try:
-                broker_liens = db.query(BrokerageLien).filter(BrokerageLien.player_id == player_id).all()
-                for lien in broker_liens:
-                    balance = lien.principal + lien.interest_accrued - lien.total_paid
-                    if balance > 0:
-                        # Brokerage firm uses dynamic interest based on credit
-                        broker_rate = get_credit_interest_rate(player_id) / 525600  # Per minute
-                        all_liens.append(("brokerage_firm", lien, broker_rate, 0.50))
-                        total_principal += lien.principal
-                        total_interest += lien.interest_accrued
-                        total_paid += lien.total_paid
-                        if "Brokerage Firm" not in sources:
-                            sources.append("Brokerage Firm")
-            finally:
-                db.close()
-        except Exception as e:
-            print(f"[UX] Brokerage lien check error: {e}")
-        
-        # Calculate totals
+        total_principal = sum(b.principal for b in balances)
+        total_interest = sum(b.interest + b.pending_interest(now_tick) for b in balances)
+        total_paid = sum(b.paid for b in balances)
         total_owed = total_principal + total_interest - total_paid
         
-        if total_owed <= 0 or not all_liens:
+        if total_owed <= 0 or not balances:
             return {
-                "has_lien": False,
-                "total_owed": 0.0,
-                "principal": 0.0,
-                "interest": 0.0,
-                "interest_rate_per_minute": 0.0,
-                "garnishment_rate": 0.0,
-                "status": "ok",
-                "lien_count": 0,
-                "sources": []
-            }
+            "has_lien": False,
+            "total_owed": 0.0,
+            "principal": 0.0,
+            "interest": 0.0,
+            "interest_rate_per_minute": 0.0,
+            "garnishment_rate": 0.0,
+            "status": "ok",
+            "lien_count": 0,
+            "sources": []
+        }
+        
+        # Sources in creditor registration order
+        owing = {b.creditor.name for b in balances}
+        sources = [c.label for name, c in lien_registry.creditors.items() if name in owing]
         
         # Use the highest rate for display (most aggressive)
-        max_rate = max(lien[2] for lien in all_liens) * 100  # Convert to percentage
-        max_garnish = max(lien[3] for lien in all_liens) * 100  # Convert to percentage
+        max_rate = max(b.rate for b in balances) * 100  # Convert to percentage
+        max_garnish = max(b.creditor.garnish_rate for b in balances) * 100  # Convert to percentage
         
         # Determine status based on debt size
         if total_owed > 50000:
@@ -431,14 +405,12 @@ def get_player_lien_info(player_id: int) -> dict:
             "interest_rate_per_minute": max_rate,
             "garnishment_rate": max_garnish,
             "status": status,
-            "lien_count": len(all_liens),
+            "lien_count": len(balances),
             "sources": sources
         }
     
     except Exception as e:
         print(f"[UX] Error getting lien info: {e}")
-        import traceback
-        traceback.print_exc()
         return {
             "has_lien": False,
             "total_owed": 0.0,
@@ -675,14 +647,19 @@ def inventory_page(session_token: Optional[str] = Cookie(None), filter: str = "a
         return shell("Inventory", f"Error: {e}", player.cash_balance, player.id)
 
 @router.get("/land", response_class=HTMLResponse)
-def land(session_token: Optional[str] = Cookie(None), sort: str = "id", order: str = "asc"):
+def land(session_token: Optional[str] = Cookie(None), sort: str = "id", order: str = "asc", page: int = 1, business: str = ""):
     """Land management view with organized layout, sorting, and explanatory info."""
     player = require_auth(session_token)
     if isinstance(player, RedirectResponse): return player
     try:
-        from land import get_player_land, TERRAIN_TYPES, PROXIMITY_FEATURES
+        from land import search_plots, get_portfolio_summary, TERRAIN_TYPES, PROXIMITY_FEATURES, PLOT_PAGE_SIZE, PLOT_SORTS, SORT_ORDERS
         from business import BUSINESS_TYPES
-        plots = get_player_land(player.id)
+
+        # Query params are echoed into links and hidden inputs; keep only known values
+        if sort not in PLOT_SORTS:
+            sort = "id"
+        if order not in SORT_ORDERS:
+            order = "asc"
 
         # Calculate player's business count for cost multiplier
         from business import Business
@@ -690,24 +667,26 @@ def land(session_token: Optional[str] = Cookie(None), sort: str = "id", order: s
         land_db = get_land_db()
         owned_businesses_count = land_db.query(Business).filter(Business.owner_id == player.id).count()
 
-        # Sort plots
-        def sort_key(p):
-            if sort == "terrain": return p.terrain_type
-            if sort == "efficiency": return p.efficiency
-            if sort == "tax": return p.monthly_tax
-            if sort == "status": return (0 if p.occupied_by_business_id else 1)
-            if sort == "size": return p.size
-            return p.id
-
-        reverse = (order == "desc")
-        plots = sorted(plots, key=sort_key, reverse=reverse)
-
-        # Compute portfolio stats
-        total_plots = len(plots)
-        occupied_count = sum(1 for p in plots if p.occupied_by_business_id)
-        vacant_count = total_plots - occupied_count
-        total_monthly_tax = sum(p.monthly_tax for p in plots)
-        avg_efficiency = (sum(p.efficiency for p in plots) / total_plots) if total_plots else 0
+        # Compute portfolio stats in SQL; only the current page of plots is loaded
+        summary = get_portfolio_summary(player.id)
+        total_plots = summary["total_plots"]
+        occupied_count = summary["occupied_plots"]
+        vacant_count = summary["vacant_plots"]
+        total_monthly_tax = summary["monthly_tax"]
+        avg_efficiency = summary["average_efficiency"]
+
+        # Filter (vacant plots compatible with a business), sort and page in SQL
+        if business not in BUSINESS_TYPES:
+            business = ""
+        page = max(1, page)
+        plots, matching = search_plots(
+            owner_id=player.id,
+            vacant=True if business else None,
+            compatible_with=business or None,
+            sort=sort, order=order,
+            limit=PLOT_PAGE_SIZE, offset=(page - 1) * PLOT_PAGE_SIZE
+        )
+        page_count = max(1, -(-matching // PLOT_PAGE_SIZE))
 
         # Terrain colors for visual grouping
         terrain_colors = {
@@ -726,7 +705,7 @@ def land(session_token: Optional[str] = Cookie(None), sort: str = "id", order: s
             arrow = ""
             if sort == field:
                 arrow = " ▲" if order == "asc" else " ▼"
-            return f'<a href="/land?sort={field}&order={new_order}" style="padding: 6px 12px; font-size: 0.8rem; background: {"#1e293b" if sort == field else "#0f172a"}; color: {"#38bdf8" if sort == field else "#94a3b8"}; border: 1px solid #1e293b; border-radius: 3px; text-decoration: none; white-space: nowrap;">{label}{arrow}</a>'
+            return f'<a href="/land?sort={field}&order={new_order}&business={business}" style="padding: 6px 12px; font-size: 0.8rem; background: {"#1e293b" if sort == field else "#0f172a"}; color: {"#38bdf8" if sort == field else "#94a3b8"}; border: 1px solid #1e293b; border-radius: 3px; text-decoration: none; white-space: nowrap;">{label}{arrow}</a>'
 
         land_html = '<a href="/" style="color: #38bdf8;"><- Dashboard</a>'
 
@@ -793,6 +772,33 @@ def land(session_token: Optional[str] = Cookie(None), sort: str = "id", order: s
                 {sort_link("size", "Size")}
             </div>'''
 
+            # Vacant plots that can host a given business
+            land_html += '''
+            <form action="/land" method="get" style="display: flex; align-items: center; gap: 8px; margin-bottom: 16px; flex-wrap: wrap;">
+                <input type="hidden" name="sort" value="''' + sort + '''">
+                <input type="hidden" name="order" value="''' + order + '''">
+                <span style="font-size: 0.8rem; color: #64748b;">Vacant plots for:</span>
+                <select name="business" onchange="this.form.submit()" style="min-width: 180px;">
+                    <option value="">All plots</option>'''
+            for btype, config in sorted(BUSINESS_TYPES.items(), key=lambda x: x[1].get("name", x[0])):
+                selected = " selected" if btype == business else ""
+                land_html += f'<option value="{btype}"{selected}>{config.get("name", btype)}</option>'
+            land_html += '</select></form>'
+
+            if not plots:
+                land_html += '<p style="color: #64748b;">No vacant plots can host that business.</p>'
+
+            # Business options per terrain, computed once for the page
+            business_options = {}
+            for btype, config in sorted(BUSINESS_TYPES.items(), key=lambda x: x[1].get("name", x[0])):
+                base_cost = config.get("startup_cost", 2500.0)
+                multiplier = max(1.25, owned_businesses_count)
+                actual_cost = base_cost * multiplier
+                business_name = config.get("name", btype)
+                option = f'<option value="{btype}">{business_name} (${actual_cost:,.0f})</option>'
+                for terrain_key in config.get("allowed_terrain", []):
+                    business_options.setdefault(terrain_key, []).append(option)
+
             # Plot cards
             for plot in plots:
                 status = 'OCCUPIED' if plot.occupied_by_business_id else 'VACANT'
@@ -871,14 +877,7 @@ def land(session_token: Optional[str] = Cookie(None), sort: str = "id", order: s
                                 <select name="business_type" required style="flex: 1; min-width: 140px;">
                                     <option value="">Build Business...</option>'''
 
-                    # Calculate actual startup costs for each business type
-                    for btype, config in sorted(BUSINESS_TYPES.items(), key=lambda x: x[1].get("name", x[0])):
-                        if plot.terrain_type in config.get("allowed_terrain", []):
-                            base_cost = config.get("startup_cost", 2500.0)
-                            multiplier = max(1.25, owned_businesses_count)
-                            actual_cost = base_cost * multiplier
-                            business_name = config.get("name", btype)
-                            land_html += f'<option value="{btype}">{business_name} (${actual_cost:,.0f})</option>'
+                    land_html += "".join(business_options.get(plot.terrain_type, []))
 
                     land_html += '''</select><button type="submit" class="btn-blue">Build</button>
                             </form>
@@ -900,6 +899,18 @@ def land(session_token: Optional[str] = Cookie(None), sort: str = "id", order: s
 
                 land_html += '</div></div>'
 
+            # Pagination
+            if page_count > 1:
+                def page_link(n, label):
+                    return f'<a href="/land?sort={sort}&order={order}&business={business}&page={n}" style="padding: 6px 12px; font-size: 0.8rem; background: #0f172a; color: #38bdf8; border: 1px solid #1e293b; border-radius: 3px; text-decoration: none;">{label}</a>'
+                land_html += '<div style="display: flex; align-items: center; justify-content: center; gap: 8px; margin-top: 16px;">'
+                if page > 1:
+                    land_html += page_link(page - 1, "Prev")
+                land_html += f'<span style="font-size: 0.8rem; color: #64748b;">Page {page} of {page_count} ({matching} plots)</span>'
+                if page < page_count:
+                    land_html += page_link(page + 1, "Next")
+                land_html += '</div>'
+
         land_db.close()
         return shell("Land", land_html, player.cash_balance, player.id)
     except Exception as e:
@@ -908,17 +919,26 @@ def land(session_token: Optional[str] = Cookie(None), sort: str = "id", order: s
         return shell("Land", f"Error: {e}", player.cash_balance, player.id)
 
 @router.get("/land-market", response_class=HTMLResponse)
-def land_market_page(session_token: Optional[str] = Cookie(None), sort: str = "price", order: str = "asc", terrain: str = "all", tab: str = "auctions"):
+def land_market_page(session_token: Optional[str] = Cookie(None), sort: str = "price", order: str = "asc", terrain: str = "all", tab: str = "auctions", page: int = 1):
     """Land market view - government auctions and player listings with search, sort, and filter."""
     player = require_auth(session_token)
     if isinstance(player, RedirectResponse): return player
 
     try:
-        from land_market import get_active_auctions, get_active_listings, get_land_bank_plots, get_recent_sales
-        from land import get_land_plot, TERRAIN_TYPES, PROXIMITY_FEATURES
-
-        auctions = get_active_auctions()
-        listings = get_active_listings()
+        from land_market import search_market, get_market_summary, get_land_bank_plots, get_recent_sales, MARKET_SORTS
+        from land import get_land_plot, TERRAIN_TYPES, PROXIMITY_FEATURES, PLOT_PAGE_SIZE, SORT_ORDERS
+
+        # Query params are echoed into links; keep only known values
+        if sort not in MARKET_SORTS:
+            sort = "price"
+        if order not in SORT_ORDERS:
+            order = "asc"
+        if terrain != "all" and terrain not in TERRAIN_TYPES:
+            terrain = "all"
+        if tab not in ("auctions", "listings", "history"):
+            tab = "auctions"
+
+        summary = get_market_summary()
         bank_plots = get_land_bank_plots()
         recent_sales = get_recent_sales(limit=8)
 
@@ -930,27 +950,26 @@ def land_market_page(session_token: Optional[str] = Cookie(None), sort: str = "p
             "island": "#3b82f6"
         }
 
-        # Gather all plots for terrain filter tabs
-        all_terrains = set()
-        auction_plots = {}
-        for a in auctions:
-            p = get_land_plot(a.land_plot_id)
-            if p:
-                auction_plots[a.id] = p
-                all_terrains.add(p.terrain_type)
-        listing_plots = {}
-        for l in listings:
-            p = get_land_plot(l.land_plot_id)
-            if p:
-                listing_plots[l.id] = p
-                all_terrains.add(p.terrain_type)
+        # Terrains present in the market (for filter tabs)
+        all_terrains = summary["terrains"]
 
         # Market stats
-        total_auctions = len(auctions)
-        total_listings = len(listings)
+        total_auctions = summary["auctions"]
+        total_listings = summary["listings"]
         total_available = total_auctions + total_listings
-        avg_auction_price = (sum(a.current_price for a in auctions) / total_auctions) if total_auctions else 0
-        avg_listing_price = (sum(l.asking_price for l in listings) / total_listings) if total_listings else 0
+        avg_auction_price = summary["avg_auction_price"]
+        avg_listing_price = summary["avg_listing_price"]
+
+        # Current tab's page, filtered and sorted in SQL
+        page = max(1, page)
+        page_rows, page_matching = [], 0
+        if tab in ("auctions", "listings"):
+            page_rows, page_matching = search_market(
+                tab, terrain=None if terrain == "all" else terrain,
+                sort=sort, order=order,
+                limit=PLOT_PAGE_SIZE, offset=(page - 1) * PLOT_PAGE_SIZE
+            )
+        page_count = max(1, -(-page_matching // PLOT_PAGE_SIZE))
 
         market_html = '<a href="/" style="color: #38bdf8;"><- Dashboard</a>'
 
@@ -1048,34 +1067,14 @@ def land_market_page(session_token: Optional[str] = Cookie(None), sort: str = "p
 
         # ===== AUCTIONS TAB =====
         if tab == "auctions":
-            if not auctions:
+            if not total_auctions:
                 market_html += '''
                 <div class="card" style="text-align: center; padding: 30px;">
                     <p style="color: #94a3b8;">No active government auctions at this time.</p>
                     <p style="font-size: 0.8rem; color: #64748b;">New auctions appear as the economy grows. Check back soon.</p>
                 </div>'''
             else:
-                # Build sortable auction data
-                auction_data = []
-                for auction in auctions:
-                    plot = auction_plots.get(auction.id)
-                    if not plot:
-                        continue
-                    if terrain != "all" and plot.terrain_type != terrain:
-                        continue
-                    auction_data.append((auction, plot))
-
-                # Sort
-                def auction_sort_key(item):
-                    a, p = item
-                    if sort == "price": return a.current_price
-                    if sort == "terrain": return p.terrain_type
-                    if sort == "efficiency": return p.efficiency
-                    if sort == "tax": return p.monthly_tax
-                    if sort == "size": return p.size
-                    if sort == "time": return a.end_time.timestamp() if a.end_time else 0
-                    return a.current_price
-                auction_data.sort(key=auction_sort_key, reverse=(order == "desc"))
+                auction_data = page_rows
 
                 if not auction_data:
                     market_html += f'<p style="color: #64748b;">No auctions match the "{terrain}" terrain filter.</p>'
@@ -1169,7 +1168,7 @@ def land_market_page(session_token: Optional[str] = Cookie(None), sort: str = "p
 
         # ===== PLAYER LISTINGS TAB =====
         elif tab == "listings":
-            if not listings:
+            if not total_listings:
                 market_html += '''
                 <div class="card" style="text-align: center; padding: 30px;">
                     <p style="color: #94a3b8;">No player listings available.</p>
@@ -1178,27 +1177,7 @@ def land_market_page(session_token: Optional[str] = Cookie(None), sort: str = "p
             else:
                 from auth import get_db as get_auth_db, Player as AuthPlayer
 
-                # Build sortable listing data
-                listing_data = []
-                for listing in listings:
-                    plot = listing_plots.get(listing.id)
-                    if not plot:
-                        continue
-                    if terrain != "all" and plot.terrain_type != terrain:
-                        continue
-                    listing_data.append((listing, plot))
-
-                # Sort
-                def listing_sort_key(item):
-                    l, p = item
-                    if sort == "price": return l.asking_price
-                    if sort == "terrain": return p.terrain_type
-                    if sort == "efficiency": return p.efficiency
-                    if sort == "tax": return p.monthly_tax
-                    if sort == "size": return p.size
-                    if sort == "time": return l.listed_at.timestamp() if l.listed_at else 0
-                    return l.asking_price
-                listing_data.sort(key=listing_sort_key, reverse=(order == "desc"))
+                listing_data = page_rows
 
                 if not listing_data:
                     market_html += f'<p style="color: #64748b;">No listings match the "{terrain}" terrain filter.</p>'
@@ -1323,6 +1302,18 @@ def land_market_page(session_token: Optional[str] = Cookie(None), sort: str = "p
 
                 market_html += '</tbody></table></div>'
 
+        # Pagination for auctions/listings
+        if tab in ("auctions", "listings") and page_count > 1:
+            def page_link(n, label):
+                return f'<a href="/land-market?tab={tab}&sort={sort}&order={order}&terrain={terrain}&page={n}" style="padding: 6px 12px; font-size: 0.8rem; background: #0f172a; color: #38bdf8; border: 1px solid #1e293b; border-radius: 3px; text-decoration: none;">{label}</a>'
+            market_html += '<div style="display: flex; align-items: center; justify-content: center; gap: 8px; margin: 16px 0;">'
+            if page > 1:
+                market_html += page_link(page - 1, "Prev")
+            market_html += f'<span style="font-size: 0.8rem; color: #64748b;">Page {page} of {page_count} ({page_matching} results)</span>'
+            if page < page_count:
+                market_html += page_link(page + 1, "Next")
+            market_html += '</div>'
+
         # Land Bank status (always shown at bottom)
         if bank_plots:
             market_html += f'''
@@ -2498,6 +2489,7 @@ def brokerage_firm_dashboard(session_token: Optional[str] = Cookie(None)):
             MarginCall, CommodityLoanStatus, ShareLoanStatus, BANK_NAME, BANK_DESCRIPTION,
             BANK_PLAYER_ID, get_db as get_firm_db
         )
+        import liens as lien_registry
         
         firm = get_firm_entity()
         player_credit = get_player_credit(player.id)
@@ -2533,7 +2525,7 @@ def brokerage_firm_dashboard(session_token: Optional[str] = Cookie(None)):
             liens = db.query(BrokerageLien).filter(
                 BrokerageLien.player_id == player.id
             ).all()
-            total_lien_debt = sum(l.principal + l.interest_accrued - l.total_paid for l in liens)
+            total_lien_debt = sum(lien_registry.owed("brokerage_firm", l) for l in liens)
             
             # Get active margin calls
             margin_calls = db.query(MarginCall).filter(
@@ -4276,6 +4268,7 @@ def brokerage_credit_page(session_token: Optional[str] = Cookie(None)):
             get_credit_interest_rate, BrokerageLien, CREDIT_TIERS, CREDIT_MODIFIERS,
             get_db as get_firm_db
         )
+        import liens as lien_registry
         
         player_credit = get_player_credit(player.id)
         credit_tier = get_credit_tier(player_credit.credit_score)
@@ -4288,7 +4281,7 @@ def brokerage_credit_page(session_token: Optional[str] = Cookie(None)):
                 BrokerageLien.player_id == player.id
             ).all()
             
-            total_lien_debt = sum(l.principal + l.interest_accrued - l.total_paid for l in liens)
+            total_lien_debt = sum(lien_registry.owed("brokerage_firm", l) for l in liens)
         finally:
             db.close()
         
@@ -4333,12 +4326,13 @@ def brokerage_credit_page(session_token: Optional[str] = Cookie(None)):
                 <tbody>'''
             
             for lien in liens:
-                balance = lien.principal + lien.interest_accrued - lien.total_paid
+                balance = lien_registry.owed("brokerage_firm", lien)
+                interest = balance - lien.principal + lien.total_paid
                 liens_html += f'''
                 <tr style="border-bottom: 1px solid #1e293b;">
                     <td style="padding: 10px 8px;">{lien.source.upper()}</td>
                     <td style="padding: 10px 8px;">${lien.principal:,.2f}</td>
-                    <td style="padding: 10px 8px; color: #ef4444;">${lien.interest_accrued:,.2f}</td>
+                    <td style="padding: 10px 8px; color: #ef4444;">${interest:,.2f}</td>
                     <td style="padding: 10px 8px; color: #22c55e;">${lien.total_paid:,.2f}</td>
                     <td style="padding: 10px 8px; font-weight: bold; color: #ef4444;">${balance:,.2f}</td>
                     <td style="padding: 10px 8px; color: #64748b;">{lien.created_at.strftime("%Y-%m-%d")}</td>